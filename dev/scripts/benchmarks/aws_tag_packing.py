@@ -0,0 +1,79 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare row-wise and columnar resourceTags JSON packing on a wide synthetic CUR."""
+import argparse
+import json
+import random
+
+from common import report
+from common import setup_django
+from common import timed
+
+setup_django()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from masu.util.aws.aws_post_processor import AWSPostProcessor  # noqa: E402
+from masu.util.aws.aws_post_processor import handle_user_defined_json_columns  # noqa: E402
+from masu.util.aws.aws_post_processor import scrub_resource_col_name  # noqa: E402
+
+PREFIX = AWSPostProcessor.RESOURCE_TAG_USER_PREFIX
+
+
+def row_wise(data_frame, columns, column_prefix):
+    """The previous implementation: one python call per row."""
+    columns_of_interest = [column for column in columns if column_prefix in column]
+    unique_keys = {scrub_resource_col_name(column, column_prefix) for column in columns_of_interest}
+    df = data_frame[columns_of_interest]
+    column_dict = df.apply(
+        lambda row: {scrub_resource_col_name(column, column_prefix): value for column, value in row.items() if value},
+        axis=1,
+    )
+    column_dict.where(column_dict.notna(), lambda _: [{}], inplace=True)
+    return column_dict.apply(json.dumps), unique_keys
+
+
+def generate(rows, tag_columns, density):
+    """Build a CUR chunk with `tag_columns` user tags, each populated with probability `density`."""
+    rng = np.random.default_rng(42)
+    values = np.array([f"value-{i}" for i in range(50)], dtype=object)
+    data = {"lineItem/ResourceId": [f"i-{i % 5000}" for i in range(rows)]}
+    for i in range(tag_columns):
+        column = np.full(rows, "", dtype=object)
+        populated = rng.random(rows) < density
+        column[populated] = values[rng.integers(0, len(values), populated.sum())]
+        data[f"{PREFIX}key{i}"] = column
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--tags", type=int, default=300)
+    parser.add_argument("--density", type=float, default=0.03)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(42)
+    data_frame = generate(args.rows, args.tags, args.density)
+    columns = sorted(data_frame.columns)
+
+    old_seconds, (old_result, _) = timed(row_wise, data_frame, columns, PREFIX, repeat=args.repeat)
+    new_seconds, (new_result, _) = timed(
+        handle_user_defined_json_columns, data_frame, columns, PREFIX, repeat=args.repeat
+    )
+    report(
+        f"resourceTags packing: {args.rows:,} rows x {args.tags} tag columns, density {args.density}",
+        [
+            ("row-wise apply + json.dumps", old_seconds, ""),
+            ("columnar encoder", new_seconds, f"{old_seconds / new_seconds:.1f}x faster"),
+        ],
+    )
+    print(f"identical output: {old_result.tolist() == new_result.tolist()}")
+
+
+if __name__ == "__main__":
+    main()
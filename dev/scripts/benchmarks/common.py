@@ -0,0 +1,45 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Shared helpers for the benchmark scripts."""
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+KOKU_DIR = Path(__file__).resolve().parents[3] / "koku"
+
+logging.basicConfig(stream=sys.stderr, format="%(asctime)s %(name)s %(levelname)s %(message)s", level=logging.INFO)
+LOG = logging.getLogger("benchmark")
+
+
+def setup_django():
+    """Make the koku packages importable and configure Django."""
+    sys.path.insert(0, str(KOKU_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "koku.settings")
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp")
+    import django
+
+    django.setup()
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """Return (best wall time in seconds, last result) of `repeat` calls."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def report(title, rows):
+    """Print a small aligned result table. `rows` is a list of (label, seconds, extra) tuples."""
+    print(f"\n{title}")
+    print("-" * len(title))
+    for label, seconds, extra in rows:
+        print(f"{label:<40} {seconds:>10.3f}s  {extra}")
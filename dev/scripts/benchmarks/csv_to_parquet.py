@@ -0,0 +1,118 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the pandas and arrow CSV engines used by ParquetReportProcessor.convert_csv_to_parquet."""
+import argparse
+import csv
+import gzip
+import os
+import random
+import tempfile
+from datetime import datetime
+from datetime import timedelta
+
+from common import report
+from common import setup_django
+from common import timed
+
+setup_django()
+
+import pandas as pd  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from masu.processor.parquet.arrow_csv_reader import ArrowCSVReader  # noqa: E402
+from masu.util.aws.aws_post_processor import AWSPostProcessor  # noqa: E402
+
+FLOAT_COLUMNS = {
+    "lineItem/UsageAmount",
+    "lineItem/NormalizationFactor",
+    "lineItem/NormalizedUsageAmount",
+    "lineItem/UnblendedRate",
+    "lineItem/UnblendedCost",
+    "lineItem/BlendedRate",
+    "lineItem/BlendedCost",
+    "pricing/publicOnDemandCost",
+    "pricing/publicOnDemandRate",
+    "savingsPlan/SavingsPlanEffectiveCost",
+}
+DATE_COLUMNS = {
+    "bill/BillingPeriodStartDate",
+    "bill/BillingPeriodEndDate",
+    "lineItem/UsageStartDate",
+    "lineItem/UsageEndDate",
+}
+
+
+def generate_cur(path, rows, tag_columns):
+    """Write a synthetic gzipped AWS CUR."""
+    columns = sorted(AWSPostProcessor.INGRESS_REQUIRED_COLUMNS) + [
+        f"resourceTags/user:tag{i}" for i in range(tag_columns)
+    ]
+    start = datetime(2023, 1, 1)
+    with gzip.open(path, "wt", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for i in range(rows):
+            usage_start = start + timedelta(hours=i % 720)
+            row = []
+            for col in columns:
+                if col in FLOAT_COLUMNS:
+                    row.append(f"{random.random() * 10:.9f}")
+                elif col in DATE_COLUMNS:
+                    value = usage_start if "Usage" in col else start
+                    row.append(value.strftime("%Y-%m-%dT%H:%M:%SZ"))
+                elif col.startswith("resourceTags/"):
+                    row.append(random.choice(["", "", "", "dev", "prod", "qa"]))
+                else:
+                    row.append(f"{col.split('/')[-1]}-{i % 97}")
+            writer.writerow(row)
+
+
+def convert(csv_filename, out_dir, engine):
+    """Run the conversion loop of convert_csv_to_parquet with the chosen engine."""
+    post_processor = AWSPostProcessor(schema="benchmark")
+    kwargs = {"compression": "gzip"}
+    col_names = pd.read_csv(csv_filename, nrows=0, **kwargs).columns
+    converters, kwargs = post_processor.get_column_converters(col_names, kwargs)
+    if engine == "arrow":
+        reader = ArrowCSVReader(csv_filename, converters, settings.PARQUET_PROCESSING_BATCH_SIZE, col_names, **kwargs)
+    else:
+        reader = pd.read_csv(
+            csv_filename, converters=converters, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, **kwargs
+        )
+    files = []
+    with reader:
+        for i, data_frame in enumerate(reader):
+            data_frame, _ = post_processor.process_dataframe(data_frame)
+            parquet_file = os.path.join(out_dir, f"{engine}_{i}.parquet")
+            data_frame.to_parquet(parquet_file, allow_truncated_timestamps=True, coerce_timestamps="ms", index=False)
+            files.append(parquet_file)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--tags", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_filename = os.path.join(tmp_dir, "cur.csv.gz")
+        generate_cur(csv_filename, args.rows, args.tags)
+
+        results = []
+        schemas = {}
+        for engine in ("pandas", "arrow"):
+            seconds, files = timed(convert, csv_filename, tmp_dir, engine, repeat=args.repeat)
+            schemas[engine] = [pq.read_schema(f) for f in files]
+            results.append((engine, seconds, f"{args.rows / seconds:,.0f} rows/s"))
+        report(f"convert_csv_to_parquet: {args.rows:,} rows, {args.tags} tag columns", results)
+        same = all(a.equals(b) for a, b in zip(schemas["pandas"], schemas["arrow"]))
+        print(f"parquet schemas identical: {same and len(schemas['pandas']) == len(schemas['arrow'])}")
+
+
+if __name__ == "__main__":
+    main()
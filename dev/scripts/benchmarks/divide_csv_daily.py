@@ -0,0 +1,134 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the single-frame and streaming OCP daily splitters used by create_daily_archives."""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import tracemalloc
+from datetime import datetime
+from datetime import timedelta
+
+from common import report
+from common import setup_django
+from common import timed
+
+setup_django()
+
+import pandas as pd  # noqa: E402
+
+from masu.external.downloader.ocp.ocp_report_downloader import divide_csv_daily  # noqa: E402
+from masu.util.ocp.common import CPU_MEM_USAGE_COLUMNS  # noqa: E402
+
+COLUMNS = [
+    "report_period_start",
+    "report_period_end",
+    "pod",
+    "namespace",
+    "node",
+    "resource_id",
+    "interval_start",
+    "interval_end",
+    "pod_usage_cpu_core_seconds",
+    "pod_request_cpu_core_seconds",
+    "pod_limit_cpu_core_seconds",
+    "pod_usage_memory_byte_seconds",
+    "pod_request_memory_byte_seconds",
+    "pod_limit_memory_byte_seconds",
+    "node_capacity_cpu_cores",
+    "node_capacity_cpu_core_seconds",
+    "node_capacity_memory_bytes",
+    "node_capacity_memory_byte_seconds",
+    "pod_labels",
+]
+OCP_TIME_FORMAT = "%Y-%m-%d %H:%M:%S +0000 UTC"
+
+
+def generate_pod_usage(path, rows, days):
+    """Write a synthetic operator pod_usage report spread over `days` days."""
+    assert set(COLUMNS) == CPU_MEM_USAGE_COLUMNS
+    start = datetime(2023, 1, 1)
+    period = (start.strftime(OCP_TIME_FORMAT), datetime(2023, 2, 1).strftime(OCP_TIME_FORMAT))
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            interval_start = start + timedelta(hours=i % (days * 24))
+            node = f"node-{i % 50}"
+            writer.writerow(
+                [
+                    *period,
+                    f"pod-{i % 5000}",
+                    f"namespace-{i % 200}",
+                    node,
+                    f"i-{node}",
+                    interval_start.strftime(OCP_TIME_FORMAT),
+                    (interval_start + timedelta(minutes=59, seconds=59)).strftime(OCP_TIME_FORMAT),
+                    f"{random.random() * 3600:.6f}",
+                    3600,
+                    7200,
+                    f"{random.random() * 2**33:.1f}",
+                    2**33,
+                    2**34,
+                    8,
+                    28800,
+                    2**36,
+                    2**36 * 3600,
+                    f"label_app:app-{i % 31}|label_environment:{random.choice(['dev', 'prod', 'qa'])}",
+                ]
+            )
+
+
+def divide_csv_daily_single_frame(file_path, filename):
+    """The previous implementation: load the whole report and filter it once per day."""
+    daily_files = []
+    directory = os.path.dirname(file_path)
+    data_frame = pd.read_csv(file_path)
+    days = list({cur_dt[:10] for cur_dt in data_frame.interval_start.unique()})
+    for day in days:
+        day_filepath = f"{directory}/pod_usage.{day}.csv"
+        data_frame[data_frame.interval_start.str.contains(day)].to_csv(day_filepath, index=False, header=True)
+        daily_files.append({"filename": os.path.basename(day_filepath), "filepath": day_filepath})
+    return daily_files
+
+
+def peak_memory(func, *args, **kwargs):
+    """Return the peak python heap allocation of one call in MiB."""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = "pod_usage.csv"
+        file_path = os.path.join(tmp_dir, filename)
+        generate_pod_usage(file_path, args.rows, args.days)
+
+        candidates = [
+            ("single frame (csv)", divide_csv_daily_single_frame, {}),
+            ("streaming (csv)", divide_csv_daily, {}),
+            ("streaming (parquet)", divide_csv_daily, {"output_format": "parquet"}),
+        ]
+        results = []
+        for label, func, kwargs in candidates:
+            seconds, daily_files = timed(func, file_path, filename, repeat=args.repeat, **kwargs)
+            peak = peak_memory(func, file_path, filename, **kwargs)
+            results.append((label, seconds, f"{len(daily_files)} files, peak heap {peak:,.0f} MiB"))
+        report(f"divide_csv_daily: {args.rows:,} pod_usage rows over {args.days} days", results)
+
+
+if __name__ == "__main__":
+    main()
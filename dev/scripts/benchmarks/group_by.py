@@ -0,0 +1,156 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the itertools.groupby based and the single-pass grouping of report query results."""
+import argparse
+import copy
+import random
+from collections import OrderedDict
+from datetime import datetime
+from datetime import timedelta
+from decimal import Decimal
+from itertools import groupby
+
+from common import report
+from common import setup_django
+from common import timed
+
+setup_django()
+
+from api.report.provider_map import ProviderMap  # noqa: E402
+from api.report.queries import ReportQueryHandler  # noqa: E402
+
+GROUP_BY = ["account", "service", "region"]
+
+
+class BenchmarkMapper:
+    """The parts of a provider map used while grouping."""
+
+    PACK_DEFINITIONS = ProviderMap.PACK_DEFINITIONS
+    tag_column = "tags"
+    provider_map = {}
+
+
+class BenchmarkQueryHandler(ReportQueryHandler):
+    """A report query handler that only carries the state used while grouping."""
+
+    def __init__(self, days):
+        self._mapper = BenchmarkMapper()
+        self._limit = None
+        self.date_to_string = lambda dt: dt.strftime("%Y-%m-%d")
+        start = datetime(2023, 1, 1)
+        self.time_interval = [start + timedelta(days=day) for day in range(days)]
+
+
+def group_data_by_list(group_by_list, group_index, data):
+    """The previous ReportQueryHandler._group_data_by_list."""
+    if group_index >= len(group_by_list):
+        return data
+    out_data = OrderedDict()
+    curr_group = group_by_list[group_index]
+    for key, group in groupby(data, lambda by: by.get(curr_group)):
+        grouped = group_data_by_list(group_by_list, (group_index + 1), list(group))
+        if datapoint := out_data.get(key, []):
+            try:
+                out_data[key] = grouped + datapoint
+            except TypeError:
+                for inter_key in set(datapoint).intersection(grouped):
+                    data_to_update = grouped[inter_key]
+                    try:
+                        data_to_update.update(datapoint[inter_key])
+                    except AttributeError:
+                        data_to_update.extend(datapoint[inter_key])
+                out_data[key].update(grouped)
+        else:
+            out_data[key] = grouped
+    return out_data
+
+
+def transform_data(handler, groups, group_index, data):
+    """The previous ReportQueryHandler._transform_data."""
+    if not groups or group_index >= len(groups):
+        for item in data:
+            handler._pack_data_object(item, **handler._mapper.PACK_DEFINITIONS)
+        return data
+    out_data = []
+    label = "values"
+    group_type = groups[group_index]
+    next_group_index = group_index + 1
+    if next_group_index < len(groups):
+        label = handler._clean_prefix_grouping_labels(groups[next_group_index] + "s")
+    for group, group_value in data.items():
+        group_title = handler._clean_prefix_grouping_labels(group_type)
+        group_label = group if group is not None else f"No-{group_title}"
+        values = transform_data(handler, groups, next_group_index, group_value)
+        out_data.append({group_title: group_label, label: values})
+    return out_data
+
+
+def legacy_group_by(handler, query_data, group_by):
+    """The previous _apply_group_by followed by _transform_data."""
+    bucket_by_date = OrderedDict((handler.date_to_string(item), []) for item in handler.time_interval)
+    for result in query_data:
+        handler._apply_group_null_label(result, group_by)
+        date_bucket = bucket_by_date.get(result.get("date"))
+        if date_bucket is not None:
+            date_bucket.append(result)
+    for date, data_list in bucket_by_date.items():
+        bucket_by_date[date] = group_data_by_list(group_by, 0, data_list)
+    return transform_data(handler, ["date"] + group_by, 0, bucket_by_date)
+
+
+def generate_rows(rows, days):
+    """Query results ordered by date and cost, so groups interleave like they do in the API."""
+    data = []
+    for i in range(rows):
+        data.append(
+            {
+                "date": f"2023-01-{i % days + 1:02d}",
+                "account": f"account-{random.randrange(50)}",
+                "service": f"service-{random.randrange(40)}",
+                "region": f"region-{random.randrange(20)}",
+                "cost_total": Decimal(random.random() * 100).quantize(Decimal("0.0001")),
+                "cost_units": "USD",
+                "usage": Decimal(random.random() * 10).quantize(Decimal("0.0001")),
+                "usage_units": "Hrs",
+            }
+        )
+    data.sort(key=lambda row: (row["date"], -row["cost_total"]))
+    return data
+
+
+def count_leaves(data):
+    """Count the data points in a grouped response."""
+    if isinstance(data, list):
+        return sum(count_leaves(item) for item in data)
+    for key, value in data.items():
+        if key == "values":
+            return len(value)
+        if isinstance(value, list):
+            return count_leaves(value)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    handler = BenchmarkQueryHandler(args.days)
+    rows = generate_rows(args.rows, args.days)
+
+    legacy_seconds, legacy = timed(lambda: legacy_group_by(handler, copy.deepcopy(rows), GROUP_BY), repeat=args.repeat)
+    seconds, grouped = timed(lambda: handler._apply_group_by(copy.deepcopy(rows), GROUP_BY), repeat=args.repeat)
+    copy_seconds, _ = timed(copy.deepcopy, rows, repeat=args.repeat)
+    results = [
+        ("groupby + merge + transform", legacy_seconds - copy_seconds, f"{count_leaves(legacy):,} data points"),
+        ("single-pass tree", seconds - copy_seconds, f"{count_leaves(grouped):,} data points"),
+    ]
+    report(f"_apply_group_by: {args.rows:,} rows, group by {', '.join(GROUP_BY)}", results)
+
+
+if __name__ == "__main__":
+    main()
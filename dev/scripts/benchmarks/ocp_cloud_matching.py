@@ -0,0 +1,169 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare the regex/endswith and the hash-indexed OCP on cloud matchers on synthetic cost reports."""
+import argparse
+import json
+import re
+import uuid
+from itertools import chain
+
+from common import report
+from common import setup_django
+from common import timed
+
+setup_django()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from masu.util.aws.common import match_openshift_resources_and_labels  # noqa: E402
+from masu.util.ocp.common import contains_any  # noqa: E402
+
+
+def legacy_match_openshift_labels(tag_dict, matched_tags):
+    """The previous label matcher: a linear scan of matched_tags per tag."""
+    tag_dict = json.loads(tag_dict)
+    tag_matches = []
+    for key, value in tag_dict.items():
+        if not value:
+            continue
+        lower_tag = {key.lower(): value.lower()}
+        if lower_tag in matched_tags:
+            tag = json.dumps(lower_tag).replace("{", "").replace("}", "")
+            tag_matches.append(tag)
+    return ",".join(tag_matches)
+
+
+def legacy_match(data_frame, cluster_topologies, matched_tags):
+    """The previous implementation of masu.util.aws.common.match_openshift_resources_and_labels."""
+    resource_ids = tuple(
+        chain.from_iterable(cluster_topology.get("resource_ids", []) for cluster_topology in cluster_topologies)
+    )
+    data_frame["resource_id_matched"] = data_frame["lineitem_resourceid"].str.endswith(resource_ids)
+    tags = data_frame["resourcetags"].str.lower()
+    data_frame["special_case_tag_matched"] = tags.str.contains("openshift_cluster|openshift_project|openshift_node")
+    tag_keys = [key for tag in matched_tags for key in tag]
+    tag_values = [value for tag in matched_tags for value in tag.values()]
+    tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
+    data_frame["tag_matched"] = tag_matched
+    data_frame["matched_tag"] = tags[tag_matched].apply(legacy_match_openshift_labels, args=(matched_tags,))
+    data_frame["matched_tag"].fillna(value="", inplace=True)
+    matched = data_frame[
+        data_frame["resource_id_matched"] | data_frame["special_case_tag_matched"] | (data_frame["matched_tag"] != "")
+    ]
+    matched["uuid"] = matched.apply(lambda _: str(uuid.uuid4()), axis=1)
+    return matched.drop(columns=["special_case_tag_matched", "tag_matched"])
+
+
+def generate(rows, clusters, resources_per_cluster, other_resources, tag_pool, matched_tag_count):
+    """Build a CUR with OpenShift node/volume line items mixed into unrelated resources."""
+    rng = np.random.default_rng(42)
+    topologies = [
+        {"resource_ids": [f"i-{c:04d}{n:08x}" for n in range(resources_per_cluster // 2)]} for c in range(clusters)
+    ]
+    for c, topology in enumerate(topologies):
+        topology["resource_ids"] += [f"vol-{c:04d}{n:012x}" for n in range(resources_per_cluster // 2)]
+    ocp_ids = [resource_id for topology in topologies for resource_id in topology["resource_ids"]]
+    ids = np.array(
+        [f"arn:aws:ec2:us-east-1:123456789012:instance/{resource_id}" for resource_id in ocp_ids[::2]]
+        + ocp_ids[1::2]
+        + [f"arn:aws:s3:::bucket-{n}" for n in range(other_resources)],
+        dtype=object,
+    )
+
+    matched_tags = [{f"app{n}": f"team{n % 97}"} for n in range(matched_tag_count)]
+    tags = []
+    for n in range(tag_pool):
+        tag = {"Environment": f"env{n % 5}", f"App{n % (2 * matched_tag_count)}": f"Team{n % 97}"}
+        if n % 50 == 0:
+            tag["openshift_project"] = f"project{n}"
+        tags.append(json.dumps(tag))
+    tags = np.array(tags + [""], dtype=object)
+
+    data_frame = pd.DataFrame(
+        {
+            "lineitem_resourceid": ids[rng.integers(0, len(ids), rows)],
+            "lineitem_unblendedcost": rng.random(rows),
+            "resourcetags": tags[rng.integers(0, len(tags), rows)],
+        }
+    )
+    return data_frame, topologies, matched_tags
+
+
+def generate_node_resources(rows, clusters, nodes_per_cluster, other_resources):
+    """Build GCP resource names holding the OpenShift node names of each cluster, e.g. ip-10-0-1-2.ec2.internal."""
+    rng = np.random.default_rng(42)
+    nodes = [f"ip-10-{c}-{n // 256}-{n % 256}.ec2.internal" for c in range(clusters) for n in range(nodes_per_cluster)]
+    names = np.array(
+        [f"projects/p/zones/us-east1-b/instances/{node}" for node in nodes]
+        + [f"projects/p/zones/us-east1-b/disks/disk-{n}" for n in range(other_resources)],
+        dtype=object,
+    )
+    return pd.Series(names[rng.integers(0, len(names), rows)]), nodes
+
+
+def bench_contains_any(args):
+    """Compare contains_any with a regex alternation of the escaped node names."""
+    values, nodes = generate_node_resources(
+        args.rows, args.clusters, args.resources_per_cluster // 2, args.other_resources
+    )
+    sample = values.head(args.legacy_rows)
+    pattern = "|".join(re.escape(node) for node in nodes)
+
+    old_seconds, old_result = timed(lambda: sample.str.contains(pattern), repeat=args.repeat)
+    new_seconds, new_result = timed(lambda: contains_any(sample, nodes), repeat=args.repeat)
+    full_seconds, full_result = timed(lambda: contains_any(values, nodes), repeat=args.repeat)
+    report(
+        f"OCP on GCP/Azure resource matching: {len(nodes):,} dotted node names",
+        [
+            (f"regex alternation, {len(sample):,} rows", old_seconds, ""),
+            (f"contains_any, {len(sample):,} rows", new_seconds, f"{old_seconds / new_seconds:.1f}x faster"),
+            (f"contains_any, {args.rows:,} rows", full_seconds, f"{int(full_result.sum()):,} rows matched"),
+        ],
+    )
+    print(f"identical output: {old_result.equals(new_result)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000000)
+    parser.add_argument("--legacy-rows", type=int, default=20000, help="rows also run through the old matcher")
+    parser.add_argument("--clusters", type=int, default=20)
+    parser.add_argument("--resources-per-cluster", type=int, default=2500, help="nodes + volumes per cluster")
+    parser.add_argument("--other-resources", type=int, default=150000)
+    parser.add_argument("--tags", type=int, default=20000, help="distinct resourcetags values")
+    parser.add_argument("--matched-tags", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    data_frame, topologies, matched_tags = generate(
+        args.rows, args.clusters, args.resources_per_cluster, args.other_resources, args.tags, args.matched_tags
+    )
+    sample = data_frame.head(args.legacy_rows)
+
+    old_seconds, old_result = timed(lambda: legacy_match(sample.copy(), topologies, matched_tags), repeat=args.repeat)
+    new_seconds, new_result = timed(
+        lambda: match_openshift_resources_and_labels(sample.copy(), topologies, matched_tags), repeat=args.repeat
+    )
+    full_seconds, full_result = timed(
+        lambda: match_openshift_resources_and_labels(data_frame.copy(), topologies, matched_tags), repeat=args.repeat
+    )
+    resource_ids = args.clusters * args.resources_per_cluster
+    report(
+        f"OCP on AWS matching: {resource_ids:,} OpenShift resource ids, {args.matched_tags:,} matched tags",
+        [
+            (f"endswith + regex, {len(sample):,} rows", old_seconds, ""),
+            (f"hash indexes, {len(sample):,} rows", new_seconds, f"{old_seconds / new_seconds:.1f}x faster"),
+            (f"hash indexes, {args.rows:,} rows", full_seconds, f"{len(full_result):,} rows matched"),
+        ],
+    )
+    identical = old_result.drop(columns=["uuid"]).equals(new_result.drop(columns=["uuid"]))
+    print(f"identical output: {identical}, unique uuids: {new_result['uuid'].is_unique}")
+
+    bench_contains_any(args)
+
+
+if __name__ == "__main__":
+    main()
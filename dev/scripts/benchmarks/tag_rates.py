@@ -0,0 +1,113 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Compare applying OCP tag rates one statement per tag value with the set-based tag rate statement.
+
+Needs a running database with summarized OCP data, e.g. after `make load-test-customer-data`.
+Every run is rolled back, so the daily summary table is left untouched.
+"""
+import argparse
+import random
+from datetime import date
+
+from common import report
+from common import setup_django
+from common import timed
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django_tenants.utils import schema_context  # noqa: E402
+
+from masu.database.ocp_report_db_accessor import OCPReportDBAccessor  # noqa: E402
+from masu.database.ocp_report_db_accessor import TAG_RATE_INFRASTRUCTURE  # noqa: E402
+from masu.database.ocp_report_db_accessor import TAG_RATE_USAGE_TYPES  # noqa: E402
+from masu.database.ocp_report_db_accessor import TAG_RATES_SQL  # noqa: E402
+
+
+class StatementCounter:
+    """Django execute wrapper counting the statements sent to the database."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def label_pairs(schema, cluster_id, start_date, end_date):
+    """Return the distinct pod label key/value pairs of a cluster."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT DISTINCT labels.key, labels.value
+            FROM {schema}.reporting_ocpusagelineitem_daily_summary AS lids,
+                jsonb_each_text(lids.pod_labels) AS labels
+            WHERE lids.cluster_id = %s AND lids.usage_start >= %s AND lids.usage_start <= %s
+            """,
+            [cluster_id, start_date, end_date],
+        )
+        return cursor.fetchall()
+
+
+def build_tag_rates(pairs, count):
+    """Spread `count` tag value rates over the pod metrics, padding with values that match nothing."""
+    pairs = list(pairs) + [("benchmark", f"value-{i}") for i in range(max(count - len(pairs), 0))]
+    metrics = [metric for metric, usage_type in TAG_RATE_USAGE_TYPES.items() if usage_type != "storage"]
+    return [
+        {
+            "metric": metrics[i % len(metrics)],
+            "usage_type": TAG_RATE_USAGE_TYPES[metrics[i % len(metrics)]],
+            "labels_field": "pod_labels",
+            "tag_key": key,
+            "tag_value": value,
+            "rate": round(random.uniform(0.01, 10), 4),
+        }
+        for i, (key, value) in enumerate(pairs[:count])
+    ]
+
+
+def apply(accessor, tag_rates, start_date, end_date, cluster_id, per_rate):
+    """Apply the rates inside a rolled back transaction and return the statement count."""
+    counter = StatementCounter()
+    with transaction.atomic(), connection.execute_wrapper(counter):
+        batches = [[tag_rate] for tag_rate in tag_rates] if per_rate else [tag_rates]
+        for batch in batches:
+            accessor._populate_tag_rates(
+                TAG_RATES_SQL, batch, TAG_RATE_INFRASTRUCTURE, start_date, end_date, cluster_id
+            )
+        transaction.set_rollback(True)
+    return counter.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schema", default="org1234567")
+    parser.add_argument("--cluster-id", default="my-ocp-cluster-1")
+    parser.add_argument("--start-date", type=date.fromisoformat, default=date.today().replace(day=1))
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--rates", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    accessor = OCPReportDBAccessor(args.schema)
+    with schema_context(args.schema):
+        pairs = label_pairs(args.schema, args.cluster_id, args.start_date, args.end_date)
+        tag_rates = build_tag_rates(pairs, args.rates)
+        call_args = (accessor, tag_rates, args.start_date, args.end_date, args.cluster_id)
+        per_rate_seconds, per_rate_statements = timed(apply, *call_args, True, repeat=args.repeat)
+        set_seconds, set_statements = timed(apply, *call_args, False, repeat=args.repeat)
+
+    results = [
+        ("one statement per tag value", per_rate_seconds, f"{per_rate_statements:,} statements"),
+        ("set-based tag rates", set_seconds, f"{set_statements:,} statements"),
+    ]
+    matching = min(len(pairs), args.rates)
+    report(f"tag rates: {args.rates:,} rates ({matching:,} matching cluster labels)", results)
+
+
+if __name__ == "__main__":
+    main()
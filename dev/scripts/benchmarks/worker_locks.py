@@ -0,0 +1,165 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Load test the Redis worker task locks with many simulated workers.
+
+Needs a running Redis, e.g. the one from `docker-compose up -d redis`.
+Each simulated worker is a thread with its own hostname that repeatedly checks the per-customer
+rate limit and the single task lock, takes the lock, "works" for a moment and releases it, exactly
+like update_summary_tables does. Workers flagged as dead stop heart-beating and never release their
+locks, so the live workers have to take them over.
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+
+from common import report
+from common import setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+
+from masu.processor.worker_cache import get_worker_redis  # noqa: E402
+from masu.processor.worker_cache import RedisWorkerCache  # noqa: E402
+from masu.processor.worker_cache import WORKER_HEARTBEAT_KEY  # noqa: E402
+from masu.processor.worker_cache import WORKER_HOSTS_KEY  # noqa: E402
+from masu.processor.worker_cache import WORKER_LOCK_KEY  # noqa: E402
+from masu.processor.worker_cache import WORKER_RUNNING_KEY  # noqa: E402
+from masu.processor.worker_cache import WORKER_TASKS_KEY  # noqa: E402
+
+
+class Holders:
+    """Shared record of who holds which task, to detect two workers running the same task."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.holders = {}
+        self.per_schema = Counter()
+        self.max_per_schema = 0
+        self.violations = 0
+
+    def enter(self, host, task_args):
+        with self.lock:
+            key = tuple(task_args)
+            if self.holders.get(key) not in (None, host):
+                self.violations += 1
+            self.holders[key] = host
+            self.per_schema[task_args[0]] += 1
+            self.max_per_schema = max(self.max_per_schema, self.per_schema[task_args[0]])
+
+    def leave(self, task_args):
+        with self.lock:
+            self.holders.pop(tuple(task_args), None)
+            self.per_schema[task_args[0]] -= 1
+
+
+def worker(host, task_name, task_args_list, args, holders, stats, deadline, dead):
+    """Run the lock cycle of one simulated worker until the deadline."""
+    cache = RedisWorkerCache()
+    cache._hostname = host
+    cache.heartbeat()
+    latencies = []
+    counts = Counter()
+    last_beat = time.monotonic()
+    while time.monotonic() < deadline:
+        if not dead and time.monotonic() - last_beat > settings.WORKER_HEARTBEAT_TIMEOUT / 3:
+            cache.heartbeat()
+            last_beat = time.monotonic()
+        task_args = random.choice(task_args_list)
+        start = time.perf_counter()
+        limited = cache.count_running_tasks(task_name, task_args[0]) >= args.concurrency
+        running = limited or cache.single_task_is_running(task_name, task_args)
+        locked = not running and cache.lock_single_task(task_name, task_args, timeout=args.lock_timeout)
+        latencies.append(time.perf_counter() - start)
+        if not locked:
+            counts["requeued"] += 1
+            time.sleep(args.work / 2)
+            continue
+        counts["locked"] += 1
+        if dead:
+            # a dead worker keeps its lock until a live worker takes it over
+            counts["abandoned"] += 1
+            break
+        holders.enter(host, task_args)
+        time.sleep(args.work)
+        holders.leave(task_args)
+        cache.release_single_task(task_name, task_args)
+    stats.append((latencies, counts))
+
+
+def cleanup(hosts, task_name, task_args_list):
+    """Remove every key written by the load test."""
+    client = get_worker_redis()
+    keys = [f"{WORKER_RUNNING_KEY}{task_name}"]
+    keys += [f"{WORKER_LOCK_KEY}{task_name}:{':'.join(task_args)}" for task_args in task_args_list]
+    keys += [f"{prefix}{host}" for host in hosts for prefix in (WORKER_HEARTBEAT_KEY, WORKER_TASKS_KEY)]
+    client.delete(*keys)
+    client.srem(WORKER_HOSTS_KEY, *hosts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--dead-workers", type=int, default=5)
+    parser.add_argument("--schemas", type=int, default=10)
+    parser.add_argument("--tasks-per-schema", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=2, help="concurrent tasks allowed per schema")
+    parser.add_argument("--work", type=float, default=0.01, help="seconds a task holds its lock")
+    parser.add_argument("--lock-timeout", type=int, default=3600)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--heartbeat-timeout", type=int, default=3)
+    args = parser.parse_args()
+
+    settings.WORKER_HEARTBEAT_TIMEOUT = args.heartbeat_timeout
+    run_id = uuid.uuid4().hex[:8]
+    task_name = f"benchmark_task_{run_id}"
+    task_args_list = [
+        [f"org{run_id}{schema}", "OCP", str(task)]
+        for schema in range(args.schemas)
+        for task in range(args.tasks_per_schema)
+    ]
+    hosts = [f"benchmark-worker-{run_id}-{i}" for i in range(args.workers)]
+
+    holders = Holders()
+    stats = []
+    deadline = time.monotonic() + args.duration
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(host, task_name, task_args_list, args, holders, stats, deadline, i < args.dead_workers),
+        )
+        for i, host in enumerate(hosts)
+    ]
+    start = time.perf_counter()
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        cleanup(hosts, task_name, task_args_list)
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for worker_latencies, _ in stats for latency in worker_latencies)
+    counts = sum((worker_counts for _, worker_counts in stats), Counter())
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    results = [
+        ("lock checks", elapsed, f"{len(latencies):,} checks, {len(latencies) / elapsed:,.0f}/s"),
+        ("acquire latency p50", statistics.median(latencies) if latencies else 0, ""),
+        ("acquire latency p99", p99, ""),
+        ("tasks run", elapsed, f"{counts['locked'] - counts['abandoned']:,} run, {counts['requeued']:,} requeued"),
+        ("locks abandoned by dead workers", elapsed, f"{counts['abandoned']:,}"),
+        ("max concurrent tasks per schema", elapsed, f"{holders.max_per_schema} (limit {args.concurrency})"),
+        ("double-held locks", elapsed, f"{holders.violations}"),
+    ]
+    report(f"worker locks: {args.workers} workers ({args.dead_workers} dead), {len(task_args_list)} tasks", results)
+
+
+if __name__ == "__main__":
+    main()
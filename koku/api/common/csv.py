@@ -3,6 +3,11 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """API views for CSV output."""
+from itertools import chain
+
+import unicodecsv
+from django.conf import settings
+from rest_framework_csv.misc import Echo
 from rest_framework_csv.renderers import CSVRenderer
 
 
@@ -20,3 +25,31 @@ class PaginatedCSVRenderer(CSVRenderer):
         if not isinstance(data, list):
             data = data.get(self.results_field, [])
         return super().render(data, *args, **kwargs)
+
+
+class CSVRowStream:
+    """
+    Report rows read lazily from the database, with the CSV header they render to.
+
+    The header has to be known up front because the rows are never held in memory at once.
+    """
+
+    def __init__(self, header, rows):
+        """Wrap an iterable of row dicts."""
+        self.header = header
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+def stream_csv(data):
+    """Yield the encoded CSV lines of a CSVRowStream, flattening one row at a time."""
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        # like PaginatedCSVRenderer, an empty report renders to an empty body
+        return
+    writer = unicodecsv.writer(Echo(), encoding=settings.DEFAULT_CHARSET)
+    for line in PaginatedCSVRenderer().tablize(chain([first], rows), header=data.header):
+        yield writer.writerow(line)
@@ -6,6 +6,7 @@
 import copy
 import logging
 import operator
+from collections import defaultdict
 from functools import reduce
 
 from django.db.models import F
@@ -164,15 +165,17 @@ class OrgQueryHandler(QueryHandler):
 
         return composed_filter
 
-    def _get_sub_ou_list(self, data, org_ids):
-        """Get a list of the sub org units for a org unit."""
-        level = data.get("level")
-        level = level + 1
-        unit_path = data.get("org_unit_path")
-        final_sub_ou_list = []
+    def _create_sub_ou_mapping(self, org_ids):
+        """Returns a mapping of (org unit path, level) to the ids of the direct sub org units.
+
+        All org units are read once per data source and grouped by the path of their parent,
+        instead of querying the children of every org unit separately.
+        """
+        sub_ou_mapping = defaultdict(list)
         with tenant_context(self.tenant):
             for source in self.data_sources:
                 # Grab columns for this query
+                org_id = source.get("org_id_column")
                 account_info = source.get("account_alias_column")
                 level_column = source.get("level_column")
                 org_path = source.get("org_path_column")
@@ -180,18 +183,19 @@ class OrgQueryHandler(QueryHandler):
                 filters = QueryFilterCollection()
                 no_accounts = QueryFilter(field=f"{account_info}", operation="isnull", parameter=True)
                 filters.add(no_accounts)
-                exact_parent_id = QueryFilter(field=f"{level_column}", operation="exact", parameter=level)
-                filters.add(exact_parent_id)
-                path_on_like = QueryFilter(field=f"{org_path}", operation="icontains", parameter=unit_path)
-                filters.add(path_on_like)
                 composed_filters = filters.compose()
                 # Start quering
                 sub_org_query = source.get("db_table").objects
                 sub_org_query = sub_org_query.filter(composed_filters)
                 sub_org_query = sub_org_query.filter(id__in=org_ids)
-                sub_ou_list = sub_org_query.values_list("org_unit_id", flat=True)
-                final_sub_ou_list.extend(sub_ou_list)
-        return final_sub_ou_list
+                sub_org_query = sub_org_query.order_by(f"{org_id}")
+                for sub_ou_id, sub_ou_path, sub_ou_level in sub_org_query.values_list(
+                    f"{org_id}", f"{org_path}", f"{level_column}"
+                ):
+                    # a sub org unit path is its parent path plus "&<org unit id>"
+                    parent_path = sub_ou_path.rpartition("&")[0]
+                    sub_ou_mapping[(parent_path.lower(), sub_ou_level - 1)].append(sub_ou_id)
+        return sub_ou_mapping
 
     def _create_accounts_mapping(self):
         """Returns a mapping of org ids to accounts."""
@@ -283,9 +287,11 @@ class OrgQueryHandler(QueryHandler):
         query_data, org_id_list = self.get_org_units()
         if not self.parameters.get("key_only"):
             accounts_mapping = self._create_accounts_mapping()
+            sub_ou_mapping = self._create_sub_ou_mapping(org_id_list)
             for data in query_data:
                 org_id = data.get("org_unit_id")
-                data["sub_orgs"] = self._get_sub_ou_list(data, org_id_list)
+                sub_ou_key = (data.get("org_unit_path").lower(), data.get("level"))
+                data["sub_orgs"] = sub_ou_mapping.get(sub_ou_key, [])
                 data["accounts"] = accounts_mapping.get(org_id, [])
 
         self.query_data = query_data
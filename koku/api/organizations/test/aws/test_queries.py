@@ -5,6 +5,8 @@
 """Test the AWS Report Queries."""
 import datetime
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_tenants.utils import tenant_context
 
 from api.iam.test.iam_test_case import IamTestCase
@@ -140,3 +142,39 @@ class AWSOrgQueryHandlerTest(IamTestCase):
         data = query_output.get("data")
         self.assertIsNotNone(data)
         self.assertEqual(data, [])
+
+    def create_org_tree(self, root_id, width):
+        """Create a 3 level org tree with width sub org units under the root and under every level 1 org unit."""
+        ous = [AWSOrganizationalUnit(org_unit_name=root_id, org_unit_id=root_id, org_unit_path=root_id, level=0)]
+        for i in range(width):
+            ou_id = f"{root_id}_OU_{i:02d}"
+            ou_path = f"{root_id}&{ou_id}"
+            ous.append(AWSOrganizationalUnit(org_unit_name=ou_id, org_unit_id=ou_id, org_unit_path=ou_path, level=1))
+            for j in range(width):
+                sub_ou_id = f"{ou_id}_{j:02d}"
+                ous.append(
+                    AWSOrganizationalUnit(
+                        org_unit_name=sub_ou_id, org_unit_id=sub_ou_id, org_unit_path=f"{ou_path}&{sub_ou_id}", level=2
+                    )
+                )
+        AWSOrganizationalUnit.objects.bulk_create(ous)
+
+    def test_execute_query_sub_orgs_constant_queries(self):
+        """Test that the sub org units are resolved without a query per org unit."""
+        query_counts = []
+        for root_id, width in (("R_SMALL", 2), ("R_LARGE", 12)):
+            query_params = self.mocked_query_params("?", AWSOrgView)
+            handler = AWSOrgQueryHandler(query_params)
+            with tenant_context(self.tenant):
+                self.create_org_tree(root_id, width)
+                with CaptureQueriesContext(connection) as captured:
+                    query_output = handler.execute_query()
+            query_counts.append(len(captured))
+
+            sub_orgs = {ou["org_unit_id"]: ou["sub_orgs"] for ou in query_output.get("data")}
+            level_1_ids = [f"{root_id}_OU_{i:02d}" for i in range(width)]
+            self.assertEqual(sub_orgs[root_id], level_1_ids)
+            for ou_id in level_1_ids:
+                self.assertEqual(sub_orgs[ou_id], [f"{ou_id}_{j:02d}" for j in range(width)])
+                self.assertEqual(sub_orgs[f"{ou_id}_00"], [])
+        self.assertEqual(query_counts[0], query_counts[1])
@@ -83,18 +83,21 @@ class OCPInfrastructureReportQueryHandlerBase(AWSReportQueryHandler):
                 query_data = self.add_deltas(query_data, query_sum)
 
             usage_units_value = self._mapper.report_type_map.get("usage_units_fallback")
-            if query_data and self._mapper.usage_units_key:
-                usage_units_value = query_data[0].get("usage_units")
-
-            query_data = self.order_by(query_data, query_order_by)
-
-            if self.is_csv_output:
-                data = list(query_data)
-            else:
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(list(query_data), groups)
-                data = self._transform_data(query_group_by, 0, data)
+            # slice rather than test the queryset, so a streamed report is not read into memory here
+            first_rows = query_data[:1]
+            if first_rows and self._mapper.usage_units_key:
+                usage_units_value = first_rows[0].get("usage_units")
+
+            data = self._stream_csv_data(query_data, query_order_by)
+            if data is None:
+                query_data = self.order_by(query_data, query_order_by)
+
+                if self.is_csv_output:
+                    data = list(query_data)
+                else:
+                    groups = copy.deepcopy(query_group_by)
+                    groups.remove("date")
+                    data = self._apply_group_by(list(query_data), groups)
         init_order_keys = []
         query_sum["cost_units"] = self.currency
         if self._mapper.usage_units_key and usage_units_value:
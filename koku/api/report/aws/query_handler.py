@@ -15,6 +15,7 @@ from django.db.models import Value
 from django.db.models.functions import Coalesce
 from django_tenants.utils import tenant_context
 
+from api.common.csv import CSVRowStream
 from api.models import Provider
 from api.report.aws.provider_map import AWSProviderMap
 from api.report.aws.provider_map import CSV_FIELD_MAP
@@ -175,14 +176,24 @@ class AWSReportQueryHandler(ReportQueryHandler):
         return query_data
 
     def _set_csv_output_fields(self, query_data):
+        if isinstance(query_data, CSVRowStream):
+            # rename the fields of a streamed report as its rows are read
+            header = sorted(CSV_FIELD_MAP.get(name, name) for name in query_data.header)
+            return CSVRowStream(header, map(self._set_csv_output_row_fields, query_data))
+
         for rec in query_data:
-            for target, mapped in CSV_FIELD_MAP.items():
-                if target in rec:
-                    rec[mapped] = rec[target]
-                    del rec[target]
+            self._set_csv_output_row_fields(rec)
 
         return query_data
 
+    @staticmethod
+    def _set_csv_output_row_fields(rec):
+        for target, mapped in CSV_FIELD_MAP.items():
+            if target in rec:
+                rec[mapped] = rec[target]
+                del rec[target]
+        return rec
+
     def execute_query(self):  # noqa: C901
         """Execute each query needed to return the results.
 
@@ -444,18 +455,22 @@ class AWSReportQueryHandler(ReportQueryHandler):
             if self._delta:
                 query_data = self.add_deltas(query_data, query_sum)
 
-            query_data = self.order_by(query_data, query_order_by)
+            data = None
+            if not org_unit_applied:
+                # org unit reports combine the rows of several queries and are built in memory
+                data = self._stream_csv_data(query_data, query_order_by)
+            if data is None:
+                query_data = self.order_by(query_data, query_order_by)
 
-            # Fetch the data (returning list(dict))
-            query_results = list(query_data)
+                # Fetch the data (returning list(dict))
+                query_results = list(query_data)
 
-            if not self.is_csv_output:
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(query_results, groups)
-                data = self._transform_data(query_group_by, 0, data)
-            else:
-                data = query_results
+                if not self.is_csv_output:
+                    groups = copy.deepcopy(query_group_by)
+                    groups.remove("date")
+                    data = self._apply_group_by(query_results, groups)
+                else:
+                    data = query_results
 
         key_order = list(["units"] + list(annotations.keys()))
         ordered_total = {total_key: query_sum[total_key] for total_key in key_order if total_key in query_sum}
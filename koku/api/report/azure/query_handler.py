@@ -160,15 +160,16 @@ class AzureReportQueryHandler(ReportQueryHandler):
             if self._delta:
                 query_data = self.add_deltas(query_data, query_sum)
 
-            query_data = self.order_by(query_data, query_order_by)
-
-            if self.is_csv_output:
-                data = list(query_data)
-            else:
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(list(query_data), groups)
-                data = self._transform_data(query_group_by, 0, data)
+            data = self._stream_csv_data(query_data, query_order_by)
+            if data is None:
+                query_data = self.order_by(query_data, query_order_by)
+
+                if self.is_csv_output:
+                    data = list(query_data)
+                else:
+                    groups = copy.deepcopy(query_group_by)
+                    groups.remove("date")
+                    data = self._apply_group_by(list(query_data), groups)
 
         key_order = list(["units"] + list(annotations.keys()))
         ordered_total = {total_key: query_sum[total_key] for total_key in key_order if total_key in query_sum}
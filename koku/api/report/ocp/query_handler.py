@@ -301,17 +301,19 @@ class OCPReportQueryHandler(ReportQueryHandler):
             if self._delta:
                 query_data = self.add_deltas(query_data, query_sum)
 
-            query_data = self.order_by(query_data, query_order_by)
+            # capacity rows have already been read into memory
+            data = None if total_capacity else self._stream_csv_data(query_data, query_order_by)
+            if data is None:
+                query_data = self.order_by(query_data, query_order_by)
 
-            if self.is_csv_output:
-                data = list(query_data)
-            else:
-                # Pass in a copy of the group by without the added
-                # tag column name prefix
-                groups = copy.deepcopy(query_group_by)
-                groups.remove("date")
-                data = self._apply_group_by(list(query_data), groups)
-                data = self._transform_data(query_group_by, 0, data)
+                if self.is_csv_output:
+                    data = list(query_data)
+                else:
+                    # Pass in a copy of the group by without the added
+                    # tag column name prefix
+                    groups = copy.deepcopy(query_group_by)
+                    groups.remove("date")
+                    data = self._apply_group_by(list(query_data), groups)
 
         sum_init = {"cost_units": self.currency}
         if self._mapper.usage_units_key:
@@ -14,29 +14,39 @@ from decimal import Decimal
 from decimal import DivisionByZero
 from decimal import InvalidOperation
 from functools import cached_property
-from itertools import groupby
 from json import dumps as json_dumps
 from urllib.parse import quote_from_bytes
 
 import ciso8601
 import numpy as np
 import pandas as pd
+from django.conf import settings
 from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import connections
 from django.db.models import Case
 from django.db.models import CharField
 from django.db.models import DecimalField
 from django.db.models import F
+from django.db.models import Func
+from django.db.models import IntegerField
+from django.db.models import Max
 from django.db.models import Q
 from django.db.models import Value
 from django.db.models import When
 from django.db.models import Window
+from django.db.models.query import QuerySet
 from django.db.models.expressions import OrderBy
 from django.db.models.expressions import RawSQL
 from django.db.models.functions import Coalesce
+from django.db.models.functions import Collate
 from django.db.models.functions import Concat
+from django.db.models.functions import Lower
+from django.db.models.functions import NullIf
 from django.db.models.functions import RowNumber
+from django_tenants.utils import tenant_context
 from pandas.api.types import CategoricalDtype
 
+from api.common.csv import CSVRowStream
 from api.currency.models import ExchangeRateDictionary
 from api.models import Provider
 from api.query_filter import QueryFilter
@@ -48,6 +58,24 @@ from api.report.constants import URL_ENCODED_SAFE
 
 LOG = logging.getLogger(__name__)
 
+# Fields ordered by value, all others are ordered as case-insensitive strings
+NUMERIC_ORDERING = (
+    "date",
+    "rank",
+    "delta",
+    "delta_percent",
+    "total",
+    "usage",
+    "request",
+    "limit",
+    "sup_total",
+    "infra_total",
+    "cost_total",
+    "cost_total_distributed",
+)
+# Rows fetched per round trip when streaming a CSV export
+CSV_STREAM_CHUNK_SIZE = 2000
+
 
 def strip_prefix(key, prefix):
     """Remove the query prefix from a key."""
@@ -95,6 +123,35 @@ def check_view_filter_and_group_by_criteria(filter_set, group_by_set):
     return True
 
 
+def get_values_names(query):
+    """Return the column names of a values() query in select order."""
+    return [*query.extra_select, *query.values_select, *query.annotation_select]
+
+
+def convert_value(value, converter, connection):
+    """Apply the Django converters returned by compile_values_query to a raw database value."""
+    if converter:
+        converter_functions, expression = converter
+        for function in converter_functions:
+            value = function(value, expression, connection)
+    return value
+
+
+def compile_values_query(queryset):
+    """Compile a values() queryset for use as a subquery.
+
+    Returns the SQL, its params, the column names in select order and a dict mapping
+    each column name to the Django converters that turn its raw database value into
+    what iterating the queryset would return.
+    """
+    query = queryset.query
+    compiler = query.get_compiler(using=queryset.db)
+    sql, params = compiler.as_sql()
+    names = get_values_names(query)
+    converters = compiler.get_converters([col for col, _, _ in compiler.select[: compiler.col_count]])
+    return sql, params, names, {names[position]: converter for position, converter in converters.items()}
+
+
 class ReportQueryHandler(QueryHandler):
     """Handles report queries and responses."""
 
@@ -123,6 +180,12 @@ class ReportQueryHandler(QueryHandler):
         LOG.debug(f"query_exclusions: {self.query_exclusions}")
 
         self.is_csv_output = self.parameters.accept_type and "text/csv" in self.parameters.accept_type
+        # unpaginated CSV exports may be streamed, see _stream_csv_data
+        self.is_csv_stream = bool(
+            settings.REPORT_CSV_STREAMING
+            and self.is_csv_output
+            and self.parameters.request.query_params.get("limit") == "0"
+        )
 
     @cached_property
     def query_table_access_keys(self):
@@ -734,55 +797,6 @@ class ReportQueryHandler(QueryHandler):
         """
         raise NotImplementedError("Annotations must be defined by sub-classes.")
 
-    @staticmethod
-    def _group_data_by_list(group_by_list, group_index, data):
-        """Group data by list.
-
-        Args:
-            group_by_list (List): list of strings to group data by
-            group_index (Int): Position in group_by_list that contains group to group by
-            data    (List): list of query results
-        Returns:
-            (Dict): dictionary of grouped query results or the original data
-
-        """
-        group_by_list_len = len(group_by_list)
-        if group_index >= group_by_list_len:
-            return data
-
-        out_data = OrderedDict()
-        curr_group = group_by_list[group_index]
-
-        # FIXME: data needs to be sorted before passing to groupby because
-        #        groupby aggregates new groups every time it hits a new item while
-        #        iterating with no regard for what groups already exist.
-        for key, group in groupby(data, lambda by: by.get(curr_group)):
-            grouped = list(group)
-            grouped = ReportQueryHandler._group_data_by_list(group_by_list, (group_index + 1), grouped)
-
-            # Default to empty list for use in the set() constructor later on
-            if datapoint := out_data.get(key, []):
-                try:
-                    # If datapoint is a list, combine it with grouped
-                    out_data[key] = grouped + datapoint
-                except TypeError:
-                    # datapoint is a dictionary
-                    #
-                    # Update the data if any keys in the grouped dictionary exist in the datapoint.
-                    for inter_key in set(datapoint).intersection(grouped):
-                        data_to_update = grouped[inter_key]
-                        try:
-                            data_to_update.update(datapoint[inter_key])
-                        except AttributeError:
-                            # data_to_update is a list of dicts
-                            data_to_update.extend(datapoint[inter_key])
-
-                    out_data[key].update(grouped)
-            else:
-                out_data[key] = grouped
-
-        return out_data
-
     def _clean_prefix_grouping_labels(self, group, all_pack_keys=[]):
         """build grouping prefix"""
         check_pack_prefix = None
@@ -821,35 +835,52 @@ class ReportQueryHandler(QueryHandler):
     def _apply_group_by(self, query_data, group_by=None):
         """Group data by date for given time interval then group by list.
 
+        The nested response structure is built in a single pass. Each level keeps an index
+        of its groups by value, so a group is created the first time one of its rows is seen
+        and groups keep the order of the (already ordered) query data.
+
         Args:
             query_data  (List(Dict)): Queried data
             group_by (list): An optional list of groups
         Returns:
-            (Dict): Dictionary of grouped dictionaries
+            (List(Dict)): The response data, one entry per date with the nested groups
 
         """
-        bucket_by_date = OrderedDict()
-
         if group_by is None:
             group_by = self._get_group_by()
 
+        levels = ["date"] + group_by
+        titles = [self._clean_prefix_grouping_labels(group) for group in levels]
+        labels = [self._clean_prefix_grouping_labels(group + "s") for group in group_by] + ["values"]
+        pack = self._mapper.PACK_DEFINITIONS
+
+        out_data = []
+        # date -> (response entry, index of its child groups by value)
+        date_index = {}
         for item in self.time_interval:
             date_string = self.date_to_string(item)
-            bucket_by_date[date_string] = []
+            entry = {"date": date_string, labels[0]: []}
+            out_data.append(entry)
+            date_index[date_string] = (entry, {})
 
         for result in query_data:
             if self._limit and result.get("rank"):
                 del result["rank"]
             self._apply_group_null_label(result, group_by)
-            date_string = result.get("date")
-            date_bucket = bucket_by_date.get(date_string)
-            if date_bucket is not None:
-                date_bucket.append(result)
-
-        for date, data_list in bucket_by_date.items():
-            grouped = ReportQueryHandler._group_data_by_list(group_by, 0, data_list)
-            bucket_by_date[date] = grouped
-        return bucket_by_date
+            node = date_index.get(result.get("date"))
+            if node is None:
+                continue
+            for level in range(1, len(levels)):
+                entry, index = node
+                key = result.get(levels[level])
+                node = index.get(key)
+                if node is None:
+                    title = titles[level]
+                    child = {title: f"No-{title}" if key is None else key, labels[level]: []}
+                    entry[labels[level - 1]].append(child)
+                    node = index[key] = (child, {})
+            node[0][labels[-1]].append(self._pack_data_object(result, **pack))
+        return out_data
 
     def _initialize_response_output(self, parameters):
         """Initialize output response object."""
@@ -915,34 +946,6 @@ class ReportQueryHandler(QueryHandler):
         data.update(new_data)
         return data
 
-    def _transform_data(self, groups, group_index, data):
-        """Transform dictionary data points to lists."""
-        groups_len = len(groups)
-        if not groups or group_index >= groups_len:
-            pack = self._mapper.PACK_DEFINITIONS
-            for item in data:
-                self._pack_data_object(item, **pack)
-            return data
-
-        out_data = []
-        label = "values"
-        group_type = groups[group_index]
-        next_group_index = group_index + 1
-
-        if next_group_index < groups_len:
-            label = groups[next_group_index] + "s"
-            label = self._clean_prefix_grouping_labels(label)
-
-        for group, group_value in data.items():
-            group_title = self._clean_prefix_grouping_labels(group_type)
-            group_label = group
-            if group is None:
-                group_label = f"No-{group_title}"
-            cur = {group_title: group_label, label: self._transform_data(groups, next_group_index, group_value)}
-            out_data.append(cur)
-
-        return out_data
-
     def order_by(self, query_data, query_order_by):
         """Order a list of dictionaries by dictionary keys.
 
@@ -987,20 +990,6 @@ class ReportQueryHandler(QueryHandler):
             (list): The sorted/ordered list
 
         """
-        numeric_ordering = [
-            "date",
-            "rank",
-            "delta",
-            "delta_percent",
-            "total",
-            "usage",
-            "request",
-            "limit",
-            "sup_total",
-            "infra_total",
-            "cost_total",
-            "cost_total_distributed",
-        ]
         db_tag_prefix = self._mapper.tag_column + "__"
         sorted_data = data
         for field in reversed(order_fields):
@@ -1009,7 +998,7 @@ class ReportQueryHandler(QueryHandler):
             if field.startswith("-"):
                 reverse = True
                 field = field[1:]
-            if field in numeric_ordering:
+            if field in NUMERIC_ORDERING:
                 sorted_data = sorted(
                     sorted_data, key=lambda entry: (entry[field] is None, entry[field]), reverse=reverse
                 )
@@ -1029,6 +1018,75 @@ class ReportQueryHandler(QueryHandler):
 
         return sorted_data
 
+    def _csv_stream_ordering(self, query_order_by):
+        """Return the SQL ordering equivalent to order_by(), or None if the ordering needs the rows in memory.
+
+        Numeric fields sort NULLs last ascending and first descending, which is the PostgreSQL default.
+        Group by fields sort case-insensitively by code point with "Others" last and empty values as "No-<field>".
+        """
+        if self.parameters.get("cost_explorer_order_by", {}).get("date"):
+            return None
+        group_by = self._get_group_by()
+        ordering = []
+        for field in query_order_by:
+            descending = field.startswith("-")
+            field = field.lstrip("-").replace("delta", "delta_percent")
+            if field in NUMERIC_ORDERING:
+                expressions = [F(field)]
+            elif field in group_by and "__" not in field:
+                others = Case(
+                    When(**{f"{field}__istartswith": "othe"}, then=Value(1)),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+                label = Coalesce(NullIf(F(field), Value("")), Value(f"No-{field}"))
+                expressions = [others, Collate(Lower(label), "C")]
+            else:
+                return None
+            ordering.extend(expression.desc() if descending else expression.asc() for expression in expressions)
+        return ordering
+
+    def _stream_csv_data(self, query_data, query_order_by):
+        """Return the rows of an unpaginated CSV export as a CSVRowStream, or None if they cannot be streamed.
+
+        Streaming needs the final rows and their order straight from SQL, so ranked (filter[limit]),
+        delta and date ordered queries are built in memory as before. The rows are read in chunks
+        from a server-side cursor while the response is written.
+        """
+        if not self.is_csv_stream or self._limit or self._delta:
+            return None
+        ordering = self._csv_stream_ordering(query_order_by)
+        if ordering is None:
+            return None
+
+        query = query_data.query
+        names = get_values_names(query)
+        # array columns render as one CSV column per element, so the header needs their longest length
+        array_names = [
+            name for name, annotation in query.annotation_select.items() if isinstance(annotation, ArrayAgg)
+        ]
+        lengths = {}
+        if array_names:
+            lengths = query_data.aggregate(
+                **{f"{name}_length": Max(Func(F(name), function="cardinality")) for name in array_names}
+            )
+        header = [name for name in names if name not in array_names]
+        for name in array_names:
+            header.extend(f"{name}.{index}" for index in range(lengths.get(f"{name}_length") or 0))
+
+        labelled = [field.lstrip("-") for field in query_order_by if field.lstrip("-") not in NUMERIC_ORDERING]
+        query_data = query_data.order_by(*ordering)
+
+        def rows():
+            with tenant_context(self.tenant):
+                for row in query_data.iterator(chunk_size=CSV_STREAM_CHUNK_SIZE):
+                    for field in labelled:
+                        if not row.get(field):
+                            row[field] = f"No-{field}"
+                    yield row
+
+        return CSVRowStream(sorted(header), rows())
+
     def get_tag_order_by(self, tag):
         """Generate an OrderBy clause forcing JSON column->key to be used.
 
@@ -1119,14 +1177,253 @@ class ReportQueryHandler(QueryHandler):
         if self.is_openshift:
             ranks = ranks.annotate(clusters=ArrayAgg(Coalesce("cluster_alias", "cluster_id"), distinct=True))
 
-        rankings = []
-        distinct_ranks = []
-        for rank in ranks:
-            rank_value = (rank.get(group) for group in group_by_value)
-            if rank_value not in rankings:
-                rankings.append(rank_value)
-                distinct_ranks.append(rank)
-        return self._ranked_list(data, distinct_ranks, set(rank_annotations))
+        if settings.REPORT_SQL_RANKING and group_by_value and isinstance(data, QuerySet):
+            return self._ranked_query(data, ranks, set(rank_annotations))
+        # values() + annotate() groups the ranks, so every group is already a single row.
+        return self._ranked_list(data, list(ranks), set(rank_annotations))
+
+    def _ranked_query(self, data, ranks, rank_fields):
+        """Get list of ranked items less than top, ranked and rolled up in the database.
+
+        Produces the same records as _ranked_list, but the zero-fill of every ranked group
+        per day, the limit/offset window and the "Others" rollup are a single SQL statement,
+        so only the groups inside the window and one "Others" record per date are fetched.
+
+        Args:
+            data (QuerySet): values() queryset of the data points grouped by date and group by
+            ranks (QuerySet): values() queryset of the groups and their rank
+            rank_fields (Set): the fields on which ranking is performed.
+        Returns:
+            List(Dict): List of data points meeting the rank criteria
+
+        """
+        group_by = self._get_group_by()
+        connection = connections[data.db]
+        quote = connection.ops.quote_name
+
+        data_query = compile_values_query(data)
+        rank_query = compile_values_query(ranks)
+        columns, rank_columns, unit_columns = self._ranked_query_columns(
+            quote, group_by, data_query, rank_query, rank_fields
+        )
+        sql, params = self._ranked_query_sql(
+            quote, group_by, data_query, rank_query, columns, rank_columns, unit_columns
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            if rows:
+                self.max_rank = rows[0][-1]
+            else:
+                rank_sql, rank_params, _, _ = rank_query
+                cursor.execute(f"SELECT COUNT(*) FROM ({rank_sql}) AS r", rank_params)
+                self.max_rank = cursor.fetchone()[0]
+
+        return self._ranked_query_records(rows, columns, rank_columns, group_by, rank_query[3], connection)
+
+    def _ranked_query_columns(self, quote, group_by, data_query, rank_query, rank_fields):
+        """Plan the columns _ranked_list keeps from the data and from the rank data frame.
+
+        Args:
+            quote (Callable): the connection's quote_name
+            group_by (List): the group by fields
+            data_query (Tuple): compile_values_query of the data
+            rank_query (Tuple): compile_values_query of the ranks
+            rank_fields (Set): the fields on which ranking is performed.
+        Returns:
+            (List, List, List): (output name, SQL expression, converters) of every column in the
+                column order of the pandas merge, the columns taken from the ranks and the unit
+                columns aggregated from the data for every ranked group
+
+        """
+        keys = group_by + ["date"]
+        _, _, data_names, data_converters = data_query
+        _, _, rank_names, rank_converters = rank_query
+
+        drop_columns = {"source_uuid"}
+        if self.is_openshift:
+            drop_columns.add("clusters")
+        rank_drop_columns = group_by + ["cost_total", "cost_total_distributed", "usage"]
+        rank_columns = [col for col in rank_names if col not in rank_drop_columns]
+        if self.is_aws and "account" in group_by:
+            drop_columns.add("account_alias")
+        if self.is_aws and "account" not in group_by and "account_alias" in rank_columns:
+            rank_columns.remove("account_alias")
+        unit_columns = [col for col in self.report_annotations if "units" in col]
+        drop_columns.update(unit_columns)
+        unit_columns = [col for col in unit_columns if col in data_names and col not in rank_columns]
+        ranked_columns = rank_columns + unit_columns
+        drop_columns.update(rank_fields.intersection(ranked_columns + keys).intersection(data_names))
+        data_columns = [col for col in data_names if col not in drop_columns and col not in keys]
+        duplicates = set(data_columns).intersection(ranked_columns)
+
+        columns = []
+        for col in data_names:
+            if col == "date":
+                columns.append((col, f"t.{quote(col)}", data_converters.get(col)))
+            elif col in group_by:
+                columns.append((col, f"k.{quote(col)}", rank_converters.get(col)))
+            elif col in data_columns:
+                name = f"{col}_x" if col in duplicates else col
+                columns.append((name, f"d.{quote(col)}", data_converters.get(col)))
+        for col in ranked_columns:
+            name = f"{col}_y" if col in duplicates else col
+            columns.append((name, f"k.{quote(col)}", rank_converters.get(col, data_converters.get(col))))
+        return columns, rank_columns, unit_columns
+
+    def _ranked_query_sql(self, quote, group_by, data_query, rank_query, columns, rank_columns, unit_columns):
+        """Build the statement that merges the ranks into the data and applies the limit/offset window.
+
+        Every row ends with the count of groups rolled up into it, the source_uuid and clusters
+        arrays of the "Others" row (NULL for the ranked groups) and the total count of ranks.
+
+        Returns:
+            (str, List): the SQL and its params
+
+        """
+        data_sql, data_params, data_names, _ = data_query
+        rank_sql, rank_params, rank_names, _ = rank_query
+        names = [name for name, _, _ in columns]
+
+        def match(left, right, cols):
+            return " AND ".join(f"{left}.{quote(col)} IS NOT DISTINCT FROM {right}.{quote(col)}" for col in cols)
+
+        group_columns = ", ".join(quote(col) for col in group_by)
+        unit_aggregates = "".join(f", MAX({quote(col)}) AS {quote(col)}" for col in unit_columns)
+        ranked_select = ", ".join(
+            [f"r.{quote(col)}" for col in group_by + rank_columns] + [f"u.{quote(col)}" for col in unit_columns]
+        )
+        merged_select = ", ".join(f"{expression} AS {quote(name)}" for name, expression, _ in columns)
+        params = [*data_params, *rank_params]
+        others_sql = ""
+        if "offset" in self.parameters.get("filter", {}):
+            window = f"{quote('rank')} > %s AND {quote('rank')} <= %s"
+            params += [self._offset, self._offset + self._limit]
+        else:
+            window = f"{quote('rank')} <= %s"
+            params.append(self._limit)
+            others_sql, others_params = self._ranked_query_others_sql(quote, names, rank_columns)
+            params += others_params
+
+        sql = f"""
+            WITH data AS (
+                SELECT * FROM ({data_sql}) AS d ({", ".join(quote(col) for col in data_names)})
+            ),
+            ranks AS (
+                SELECT * FROM ({rank_sql}) AS r ({", ".join(quote(col) for col in rank_names)})
+            ),
+            ranked AS (
+                SELECT {ranked_select}
+                FROM ranks AS r
+                JOIN (SELECT {group_columns}{unit_aggregates} FROM data GROUP BY {group_columns}) AS u
+                    ON {match("r", "u", group_by)}
+            ),
+            merged AS (
+                SELECT {merged_select}
+                FROM ranked AS k
+                CROSS JOIN (SELECT DISTINCT {quote("date")} FROM data) AS t
+                LEFT JOIN data AS d ON {match("k", "d", group_by)} AND {match("t", "d", ["date"])}
+            )
+            SELECT {", ".join(quote(name) for name in names)}, NULL, NULL, NULL, (SELECT COUNT(*) FROM ranks)
+            FROM merged
+            WHERE {window}
+            {others_sql}
+            ORDER BY {quote("rank")}, {quote("date")}
+        """
+        return sql, params
+
+    def _ranked_query_others_sql(self, quote, names, rank_columns):
+        """Build the UNION ALL that rolls every group ranked over the limit up into one row per date.
+
+        Returns:
+            (str, List): the SQL and its params
+
+        """
+        others_columns = ["NULL"] * len(names)
+        skip_columns = ["source_uuid", "gcp_project_alias", "clusters"]
+        for col in self.report_annotations:
+            if col in names and col not in skip_columns:
+                function = "MAX" if "units" in col else "SUM"
+                others_columns[names.index(col)] = f"{function}({quote(col)})"
+        others_columns[names.index("date")] = quote("date")
+        others_columns[names.index("rank")] = "%s"
+        params = [self._limit + 1, self._limit]
+        others_arrays = []
+        for col in ("source_uuid", "clusters"):
+            if col not in rank_columns:
+                others_arrays.append("NULL")
+                continue
+            # Distinct values in order of first appearance, like pandas explode().unique()
+            others_arrays.append(
+                f"""(SELECT array_agg(s.item ORDER BY s.item_rank, s.item_ordinal) FROM (
+                    SELECT DISTINCT ON (x.item) x.item, k.{quote("rank")} AS item_rank, x.item_ordinal
+                    FROM ranked AS k CROSS JOIN unnest(k.{quote(col)}) WITH ORDINALITY AS x(item, item_ordinal)
+                    WHERE k.{quote("rank")} > %s AND x.item IS NOT NULL
+                    ORDER BY x.item, k.{quote("rank")}, x.item_ordinal
+                ) AS s)"""
+            )
+            params.append(self._limit)
+        params.append(self._limit)
+        sql = f"""
+            UNION ALL
+            SELECT {", ".join(others_columns)},
+                (SELECT COUNT(*) FROM ranked WHERE {quote("rank")} > %s),
+                {", ".join(others_arrays)},
+                (SELECT COUNT(*) FROM ranks)
+            FROM merged
+            WHERE {quote("rank")} > %s
+            GROUP BY {quote("date")}
+        """
+        return sql, params
+
+    def _ranked_query_records(self, rows, columns, rank_columns, group_by, rank_converters, connection):
+        """Convert the rows of the ranking statement to the records _ranked_list returns."""
+        array_converters = [rank_converters.get("source_uuid"), rank_converters.get("clusters")]
+        records = []
+        others = []
+        for row in rows:
+            record = {
+                name: convert_value(value, converter, connection) for (name, _, converter), value in zip(columns, row)
+            }
+            other_count = row[len(columns)]
+            if other_count is None:
+                records.append(record)
+                continue
+            self._set_other_labels(record, other_count, group_by)
+            for col, value, converter in zip(("source_uuid", "clusters"), row[len(columns) + 1 :], array_converters):
+                if col in rank_columns:
+                    record[col] = convert_value(value, converter, connection) or []
+            others.append(record)
+
+        # Records and "Others" share the union of their columns, like the pandas concat.
+        all_columns = list(
+            dict.fromkeys([name for name, _, _ in columns] + [col for record in others for col in record])
+        )
+        fill_values = {col: 0 for col in self.report_annotations if "unit" not in col}
+        results = []
+        for record in records + others:
+            results.append(
+                {
+                    col: fill_values[col] if record.get(col) is None and col in fill_values else record.get(col)
+                    for col in all_columns
+                }
+            )
+        return results
+
+    def _set_other_labels(self, record, other_count, group_by):
+        """Add back the columns _aggregate_ranks_over_limit sets on the "Others" category."""
+        other_str = "Others" if other_count > 1 else "Other"
+        for group in group_by:
+            record[group] = other_str
+            if is_grouped_by_project(self.parameters):
+                if self._category:
+                    record["classification"] = "category"
+                else:
+                    record["default_project"] = "False"
+        if self.is_aws and "account" in group_by:
+            record["account_alias"] = other_str
+        elif "gcp_project" in group_by:
+            record["gcp_project_alias"] = other_str
 
     def _ranked_list(self, data_list, ranks, rank_fields=None):
         """Get list of ranked items less than top.
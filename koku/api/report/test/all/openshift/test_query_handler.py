@@ -13,6 +13,8 @@ from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.report.all.openshift.query_handler import OCPAllReportQueryHandler
 from api.report.all.openshift.serializers import OCPAllExcludeSerializer
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.tags.all.openshift.queries import OCPAllTagQueryHandler
 from api.tags.all.openshift.view import OCPAllTagView
 from api.urls import OCPAllCostView
@@ -287,3 +289,8 @@ class OCPAllQueryHandlerTest(IamTestCase):
                         self.assertIsNotNone(grouping_list)
                         for group_dict in grouping_list:
                             self.assertNotIn(group_dict.get(ex_opt), [exclude_one, exclude_two])
+
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        urls = sql_ranking_urls(["project", "account", "service"])
+        assert_sql_ranking_matches_pandas(self, OCPAllReportQueryHandler, OCPAllCostView, urls)
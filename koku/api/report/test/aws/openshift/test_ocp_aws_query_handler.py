@@ -19,6 +19,8 @@ from api.report.aws.openshift.view import OCPAWSInstanceTypeView
 from api.report.aws.openshift.view import OCPAWSStorageView
 from api.report.constants import AWS_CATEGORY_PREFIX
 from api.report.queries import check_view_filter_and_group_by_criteria
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.report.test.util.constants import AWS_CONSTANTS
 from api.tags.aws.openshift.queries import OCPAWSTagQueryHandler
 from api.tags.aws.openshift.view import OCPAWSTagView
@@ -742,3 +744,8 @@ class OCPAWSQueryHandlerTest(IamTestCase):
         self.assertIsNotNone(total_cost_total)
         self.assertIsNotNone(data)
         self.assertAlmostEqual(sum(expected_value), difference)
+
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        urls = sql_ranking_urls(["project", "cluster", "account", "service"])
+        assert_sql_ranking_matches_pandas(self, OCPAWSReportQueryHandler, OCPAWSCostView, urls)
@@ -35,6 +35,8 @@ from api.report.constants import AWS_CATEGORY_PREFIX
 from api.report.constants import TAG_PREFIX
 from api.report.queries import strip_prefix
 from api.report.test.aws.test_views import _calculate_accounts_and_subous
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.report.test.util.constants import AWS_CONSTANTS
 from api.tags.aws.queries import AWSTagQueryHandler
 from api.tags.aws.view import AWSTagView
@@ -187,49 +189,102 @@ class AWSReportQueryTest(IamTestCase):
         out_data = handler._apply_group_null_label(data, groups)
         self.assertEqual(expected, out_data)
 
-    def test_transform_null_group(self):
-        """Test transform data with null group value."""
+    def test_apply_group_by(self):
+        """Test that rows are grouped per date in the order their groups first appear."""
+        url = "?group_by[account]=*&group_by[service]=*"
+        query_params = self.mocked_query_params(url, AWSCostView)
+        handler = AWSReportQueryHandler(query_params)
+        date = handler.date_to_string(handler.time_interval[0])
+        data = [
+            {"date": date, "account": "a1", "service": "s1", "units": "USD", "total": 4},
+            {"date": date, "account": "a1", "service": "s2", "units": "USD", "total": 5},
+            {"date": date, "account": "a2", "service": "s1", "units": "USD", "total": 6},
+            {"date": date, "account": "a2", "service": "s2", "units": "USD", "total": 5},
+            {"date": date, "account": "a1", "service": "s1", "units": "USD", "total": 9},
+            {"date": date, "account": "a1", "service": "s2", "units": "USD", "total": 7},
+            {"date": date, "account": "a1", "service": "s3", "units": "USD", "total": 5},
+            {"date": "1970-01-01", "account": "a1", "service": "s1", "units": "USD", "total": 1},
+        ]
+        expected = {
+            "date": date,
+            "accounts": [
+                {
+                    "account": "a1",
+                    "services": [
+                        {"service": "s1", "values": [data[0], data[4]]},
+                        {"service": "s2", "values": [data[1], data[5]]},
+                        {"service": "s3", "values": [data[6]]},
+                    ],
+                },
+                {
+                    "account": "a2",
+                    "services": [
+                        {"service": "s1", "values": [data[2]]},
+                        {"service": "s2", "values": [data[3]]},
+                    ],
+                },
+            ],
+        }
+        out_data = handler._apply_group_by(data, ["account", "service"])
+        self.assertEqual(len(out_data), len(handler.time_interval))
+        self.assertEqual(out_data[0], expected)
+        for entry in out_data[1:]:
+            self.assertEqual(entry["accounts"], [])
+
+    def test_apply_group_by_three_levels(self):
+        """Test that interleaved rows of a deep group by end up in a single group."""
+        url = "?group_by[account]=*&group_by[service]=*&group_by[region]=*"
+        query_params = self.mocked_query_params(url, AWSCostView)
+        handler = AWSReportQueryHandler(query_params)
+        date = handler.date_to_string(handler.time_interval[0])
+        data = [
+            {"date": date, "account": "a1", "service": "s1", "region": "r1", "units": "USD"},
+            {"date": date, "account": "a2", "service": "s1", "region": "r1", "units": "USD"},
+            {"date": date, "account": "a1", "service": "s1", "region": "r2", "units": "USD"},
+            {"date": date, "account": "a1", "service": "s2", "region": "r1", "units": "USD"},
+        ]
+        out_data = handler._apply_group_by(data, ["account", "service", "region"])
+        accounts = out_data[0]["accounts"]
+        self.assertEqual([account["account"] for account in accounts], ["a1", "a2"])
+        services = accounts[0]["services"]
+        self.assertEqual([service["service"] for service in services], ["s1", "s2"])
+        self.assertEqual([region["region"] for region in services[0]["regions"]], ["r1", "r2"])
+        self.assertEqual(services[0]["regions"][1]["values"], [data[2]])
+
+    def test_apply_group_by_null_group(self):
+        """Test apply group by with null group value."""
         url = "?"
         query_params = self.mocked_query_params(url, AWSCostView)
         handler = AWSReportQueryHandler(query_params)
-        groups = ["region"]
-        group_index = 0
-        data = {None: [{"region": "No-region", "units": "USD"}]}
-        expected = [{"region": "No-region", "values": [{"region": "No-region", "units": "USD"}]}]
-        out_data = handler._transform_data(groups, group_index, data)
-        self.assertEqual(expected, out_data)
-
-        data = {"us-east": [{"region": "us-east", "units": "USD"}]}
-        expected = [{"region": "us-east", "values": [{"region": "us-east", "units": "USD"}]}]
-        out_data = handler._transform_data(groups, group_index, data)
-        self.assertEqual(expected, out_data)
-
-        data = {None: {"region": "No-region", "units": "USD"}}
-        expected = [{"region": "No-region", "values": {"region": "No-region", "units": "USD"}}]
-        out_data = handler._transform_data(groups, group_index, data)
-        self.assertEqual(expected, out_data)
+        date = handler.date_to_string(handler.time_interval[0])
+        data = [{"date": date, "region": None, "units": "USD"}, {"date": date, "region": "us-east", "units": "USD"}]
+        expected = [
+            {"region": "No-region", "values": [{"date": date, "region": "No-region", "units": "USD"}]},
+            {"region": "us-east", "values": [{"date": date, "region": "us-east", "units": "USD"}]},
+        ]
+        out_data = handler._apply_group_by(data, ["region"])
+        self.assertEqual(out_data[0]["regions"], expected)
 
-    def test_transform_null_group_with_limit(self):
-        """Test transform data with null group value."""
+    def test_apply_group_by_null_group_with_limit(self):
+        """Test apply group by with null group value and a rank."""
         url = "?filter[limit]=1&group_by[account]=*"
         query_params = self.mocked_query_params(url, AWSCostView)
         handler = AWSReportQueryHandler(query_params)
-        groups = ["region"]
-        group_index = 0
-        data = {None: [{"region": "No-region", "units": "USD"}]}
-        expected = [{"region": "No-region", "values": [{"region": "No-region", "units": "USD"}]}]
-        out_data = handler._transform_data(groups, group_index, data)
-        self.assertEqual(expected, out_data)
+        date = handler.date_to_string(handler.time_interval[0])
+        data = [{"date": date, "region": None, "units": "USD", "rank": 1}]
+        expected = [{"region": "No-region", "values": [{"date": date, "region": "No-region", "units": "USD"}]}]
+        out_data = handler._apply_group_by(data, ["region"])
+        self.assertEqual(out_data[0]["regions"], expected)
 
-        data = {"us-east": [{"region": "us-east", "units": "USD"}]}
-        expected = [{"region": "us-east", "values": [{"region": "us-east", "units": "USD"}]}]
-        out_data = handler._transform_data(groups, group_index, data)
-        self.assertEqual(expected, out_data)
-
-        data = {None: {"region": "No-region", "units": "USD"}}
-        expected = [{"region": "No-region", "values": {"region": "No-region", "units": "USD"}}]
-        out_data = handler._transform_data(groups, group_index, data)
-        self.assertEqual(expected, out_data)
+    def test_apply_group_by_without_group_by(self):
+        """Test that rows are listed as values per date without a group by."""
+        url = "?"
+        query_params = self.mocked_query_params(url, AWSCostView)
+        handler = AWSReportQueryHandler(query_params)
+        date = handler.date_to_string(handler.time_interval[0])
+        data = [{"date": date, "units": "USD"}]
+        out_data = handler._apply_group_by(data, [])
+        self.assertEqual(out_data[0], {"date": date, "values": [{"date": date, "units": "USD"}]})
 
     def test_get_group_by_with_group_by_and_limit_params(self):
         """Test the _get_group_by method with limit and group by params."""
@@ -2863,6 +2918,12 @@ class AWSReportQueryTest(IamTestCase):
         for acc in actual:
             self.assertTrue(acc in expected)
 
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        urls = sql_ranking_urls(["account", "service", "region"])
+        urls += sql_ranking_urls(["account"], ["order_by[account_alias]=asc"])
+        assert_sql_ranking_matches_pandas(self, AWSReportQueryHandler, AWSCostView, urls)
+
     def test_aws_date_order_by_cost_desc(self):
         """Test that order of every other date matches the order of the `order_by` date."""
         # execute query
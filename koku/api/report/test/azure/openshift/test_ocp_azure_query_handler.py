@@ -25,6 +25,8 @@ from api.report.azure.openshift.serializers import OCPAzureExcludeSerializer
 from api.report.azure.openshift.view import OCPAzureCostView
 from api.report.azure.openshift.view import OCPAzureInstanceTypeView
 from api.report.azure.openshift.view import OCPAzureStorageView
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.report.test.util.constants import AZURE_SERVICE_NAMES
 from api.tags.azure.openshift.queries import OCPAzureTagQueryHandler
 from api.tags.azure.openshift.view import OCPAzureTagView
@@ -1549,3 +1551,8 @@ class OCPAzureQueryHandlerTest(IamTestCase):
                         self.assertIsNotNone(grouping_list)
                         for group_dict in grouping_list:
                             self.assertNotIn(group_dict.get(ex_opt), [exclude_one, exclude_two])
+
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        urls = sql_ranking_urls(["project", "cluster", "subscription_guid", "service_name"])
+        assert_sql_ranking_matches_pandas(self, OCPAzureReportQueryHandler, OCPAzureCostView, urls)
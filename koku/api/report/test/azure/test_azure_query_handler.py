@@ -25,6 +25,8 @@ from api.report.azure.serializers import AzureExcludeSerializer
 from api.report.azure.view import AzureCostView
 from api.report.azure.view import AzureInstanceTypeView
 from api.report.azure.view import AzureStorageView
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.tags.azure.queries import AzureTagQueryHandler
 from api.tags.azure.view import AzureTagView
 from api.utils import DateHelper
@@ -1720,3 +1722,8 @@ class AzureReportQueryHandlerTest(IamTestCase):
                         self.assertIsNotNone(grouping_list)
                         for group_dict in grouping_list:
                             self.assertNotIn(group_dict.get(ex_opt), [exclude_one, exclude_two])
+
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        urls = sql_ranking_urls(["subscription_guid", "service_name", "resource_location"])
+        assert_sql_ranking_matches_pandas(self, AzureReportQueryHandler, AzureCostView, urls)
@@ -24,6 +24,8 @@ from api.report.gcp.openshift.serializers import OCPGCPExcludeSerializer
 from api.report.gcp.openshift.view import OCPGCPCostView
 from api.report.gcp.openshift.view import OCPGCPInstanceTypeView
 from api.report.gcp.openshift.view import OCPGCPStorageView
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.report.test.util.constants import GCP_SERVICE_ALIASES
 from api.tags.gcp.openshift.queries import OCPGCPTagQueryHandler
 from api.tags.gcp.openshift.view import OCPGCPTagView
@@ -1505,3 +1507,8 @@ class OCPGCPQueryHandlerTest(IamTestCase):
                         self.assertIsNotNone(grouping_list)
                         for group_dict in grouping_list:
                             self.assertNotIn(group_dict.get(ex_opt), [exclude_one, exclude_two])
+
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        urls = sql_ranking_urls(["project", "account", "gcp_project", "service"])
+        assert_sql_ranking_matches_pandas(self, OCPGCPReportQueryHandler, OCPGCPCostView, urls)
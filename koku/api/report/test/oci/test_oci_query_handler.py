@@ -23,6 +23,8 @@ from api.report.oci.serializers import OCIExcludeSerializer
 from api.report.oci.view import OCICostView
 from api.report.oci.view import OCIInstanceTypeView
 from api.report.oci.view import OCIStorageView
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.tags.oci.queries import OCITagQueryHandler
 from api.tags.oci.view import OCITagView
 from api.utils import DateHelper
@@ -1609,3 +1611,8 @@ class OCIReportQueryHandlerTest(IamTestCase):
                         self.assertIsNotNone(grouping_list)
                         for group_dict in grouping_list:
                             self.assertNotIn(group_dict.get(ex_opt), [exclude_one, exclude_two])
+
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        urls = sql_ranking_urls(["payer_tenant_id", "product_service", "region"])
+        assert_sql_ranking_matches_pandas(self, OCIReportQueryHandler, OCICostView, urls)
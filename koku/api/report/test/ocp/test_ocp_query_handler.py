@@ -29,6 +29,8 @@ from api.report.ocp.view import OCPCostView
 from api.report.ocp.view import OCPCpuView
 from api.report.ocp.view import OCPMemoryView
 from api.report.ocp.view import OCPVolumeView
+from api.report.test.util.common import assert_sql_ranking_matches_pandas
+from api.report.test.util.common import sql_ranking_urls
 from api.tags.ocp.queries import OCPTagQueryHandler
 from api.tags.ocp.view import OCPTagView
 from api.utils import DateHelper
@@ -937,6 +939,16 @@ class OCPReportQueryHandlerTest(IamTestCase):
                         self.assertTrue(len(cluster_value.get("clusters", [])) > 1)
                         self.assertTrue(len(cluster_value.get("source_uuid", [])) > 1)
 
+    def test_sql_ranking_matches_pandas_ranking(self):
+        """Test that ranking in SQL returns the same data as ranking with pandas."""
+        views = [
+            (OCPCostView, sql_ranking_urls(["cluster", "project", "node"])),
+            (OCPCpuView, sql_ranking_urls(["cluster", "project"], [None, "order_by[usage]=asc"])),
+            (OCPMemoryView, sql_ranking_urls(["node"], ["order_by[usage]=asc", "order_by[request]=desc"])),
+        ]
+        for view, urls in views:
+            assert_sql_ranking_matches_pandas(self, OCPReportQueryHandler, view, urls)
+
     @patch("api.report.queries.ReportQueryHandler.is_openshift", new_callable=PropertyMock)
     def test_subtotals_add_up_to_total(self, mock_is_openshift):
         """Test the apply_group_by handles different grouping scenerios."""
@@ -24,8 +24,11 @@ from api.report.gcp.openshift.query_handler import OCPGCPReportQueryHandler
 from api.report.gcp.query_handler import GCPReportQueryHandler
 from api.report.gcp.view import GCPCostView
 from api.report.ocp.query_handler import OCPReportQueryHandler
+from api.report.ocp.view import OCPCpuView
 from api.report.provider_map import ProviderMap
 from api.report.queries import ReportQueryHandler
+from api.report.queries import convert_value
+from api.report.queries import get_values_names
 from api.report.view import ReportView
 from api.utils import DateHelper
 
@@ -66,63 +69,20 @@ class ReportQueryUtilsTest(TestCase):
                 result = handler.has_wildcard([])
                 self.assertFalse(result)
 
-    def test_group_data_by_list(self):
-        """Test the _group_data_by_list method."""
-        for handler in self.HANDLERS:
-            with self.subTest(handler=handler):
-                # This test checks that the ReportQueryHandler is working. The following data
-                # is specific to AWS but should still work for all handlers.
-                group_by = ["account", "service"]
-                data = [
-                    {"account": "a1", "service": "s1", "units": "USD", "total": 4},
-                    {"account": "a1", "service": "s2", "units": "USD", "total": 5},
-                    {"account": "a2", "service": "s1", "units": "USD", "total": 6},
-                    {"account": "a2", "service": "s2", "units": "USD", "total": 5},
-                    {"account": "a1", "service": "s1", "units": "USD", "total": 9},
-                    {"account": "a1", "service": "s2", "units": "USD", "total": 7},
-                    {"account": "a1", "service": "s3", "units": "USD", "total": 5},
-                ]
-                out_data = handler._group_data_by_list(group_by, 0, data)
-                expected = {
-                    "a1": {
-                        "s1": [
-                            {"account": "a1", "service": "s1", "units": "USD", "total": 9},
-                            {"account": "a1", "service": "s1", "units": "USD", "total": 4},
-                        ],
-                        "s2": [
-                            {"account": "a1", "service": "s2", "units": "USD", "total": 7},
-                            {"account": "a1", "service": "s2", "units": "USD", "total": 5},
-                        ],
-                        "s3": [{"account": "a1", "service": "s3", "units": "USD", "total": 5}],
-                    },
-                    "a2": {
-                        "s1": [{"account": "a2", "service": "s1", "units": "USD", "total": 6}],
-                        "s2": [{"account": "a2", "service": "s2", "units": "USD", "total": 5}],
-                    },
-                }
-                self.assertEqual(expected, out_data)
-
-    def test_group_data_by_list_missing_units(self):
-        """Test the _group_data_by_list method when duplicates occur due to missing units."""
-        for handler in self.HANDLERS:
-            with self.subTest(handler=handler):
-                group_by = ["instance_type"]
-                data = [
-                    {"date": "2018-07-22", "units": "", "instance_type": "t2.micro", "total": 30.0, "count": 0},
-                    {"date": "2018-07-22", "units": "Hrs", "instance_type": "t2.small", "total": 17.0, "count": 0},
-                    {"date": "2018-07-22", "units": "Hrs", "instance_type": "t2.micro", "total": 1.0, "count": 0},
-                ]
-                out_data = handler._group_data_by_list(group_by, 0, data)
-                expected = {
-                    "t2.micro": [
-                        {"date": "2018-07-22", "units": "Hrs", "instance_type": "t2.micro", "total": 1.0, "count": 0},
-                        {"date": "2018-07-22", "units": "", "instance_type": "t2.micro", "total": 30.0, "count": 0},
-                    ],
-                    "t2.small": [
-                        {"date": "2018-07-22", "units": "Hrs", "instance_type": "t2.small", "total": 17.0, "count": 0}
-                    ],
-                }
-                self.assertEqual(expected, out_data)
+    def test_get_values_names(self):
+        """Test that the column names of a values() query are returned in select order."""
+        query = Mock(extra_select={"extra": None}, values_select=("date", "account"), annotation_select={"cost": None})
+        self.assertEqual(get_values_names(query), ["extra", "date", "account", "cost"])
+
+    def test_convert_value(self):
+        """Test that every converter of a column is applied in order."""
+        connection = Mock()
+        converter = (
+            [lambda value, expression, connection: value + 1, lambda value, expression, connection: value * 10],
+            Mock(),
+        )
+        self.assertEqual(convert_value(1, converter, connection), 20)
+        self.assertEqual(convert_value(1, None, connection), 1)
 
 
 def create_test_handler(params, mapper=None):
@@ -583,7 +543,18 @@ class ReportQueryHandlerTest(IamTestCase):
         out_data = handler._apply_group_null_label(data, groups)
         self.assertEqual(expected, out_data)
 
-    # FIXME: need test for _apply_group_by
+    def test_ranked_query_others_sql_params(self):
+        """Test that the params of the "Others" rollup follow its placeholders."""
+        url = "?filter[limit]=2&group_by[cluster]=*"
+        handler = OCPReportQueryHandler(self.mocked_query_params(url, OCPCpuView))
+        names = ["cluster", "date", "usage", "rank"]
+        cases = [(["rank"], [3, 2, 2]), (["rank", "source_uuid", "clusters"], [3, 2, 2, 2, 2])]
+        for rank_columns, expected in cases:
+            with self.subTest(rank_columns=rank_columns):
+                sql, params = handler._ranked_query_others_sql(lambda name: f'"{name}"', names, rank_columns)
+                self.assertEqual(sql.count("%s"), len(params))
+                self.assertEqual(params, expected)
+
     # FIXME: need test for _apply_group_null_label
     # FIXME: need test for _build_custom_filter_list  }
     # FIXME: need test for _create_previous_totals
@@ -591,14 +562,12 @@ class ReportQueryHandlerTest(IamTestCase):
     # FIXME: need test for _get_group_by
     # FIXME: need test for _get_previous_totals_filter
     # FIXME: need test for _get_tag_group_by
-    # FIXME: need test for _group_data_by_list
     # FIXME: need test for _pack_data_object
     # FIXME: need test for _percent_delta
     # FIXME: need test for _perform_rank_summation
     # FIXME: need test for _ranked_list
     # FIXME: need test for _set_or_filters
     # FIXME: need test for _set_tag_filters
-    # FIXME: need test for _transform_data
     # FIXME: need test for add_deltas
     # FIXME: need test for annotations
     # FIXME: need test for date_group_data
@@ -3,7 +3,10 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test the Report views."""
+from unittest.mock import patch
+
 from django.test import RequestFactory
+from django.test.utils import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -13,8 +16,11 @@ from api.common.pagination import ReportPagination
 from api.common.pagination import ReportRankedPagination
 from api.iam.test.iam_test_case import IamTestCase
 from api.iam.test.iam_test_case import RbacPermissions
+from api.provider.models import Provider
+from api.report.aws.query_handler import AWSReportQueryHandler
 from api.report.view import get_paginator
 from api.utils import DateHelper
+from koku.cache import invalidate_view_cache_for_tenant_and_source_type
 
 
 class ReportViewTest(IamTestCase):
@@ -106,6 +112,138 @@ class ReportViewTest(IamTestCase):
                 self.assertEqual(response.accepted_media_type, "text/csv")
                 self.assertIsInstance(response.accepted_renderer, CSVRenderer)
 
+    @override_settings(
+        REPORT_RESULT_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "report-result-cache",
+                "KEY_FUNCTION": "django_tenants.cache.make_key",
+                "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+            }
+        },
+    )
+    @patch("django.middleware.cache.UpdateCacheMiddleware.process_response", side_effect=lambda req, resp: resp)
+    @patch("django.middleware.cache.FetchFromCacheMiddleware.process_request", return_value=None)
+    def test_report_result_cache(self, *args):
+        """Test that reports are cached per data version and answered with 304 while unchanged."""
+        url = reverse("reports-aws-costs")
+        execute_query = AWSReportQueryHandler.execute_query
+        with patch.object(AWSReportQueryHandler, "execute_query", autospec=True, side_effect=execute_query) as mock:
+            response = self.client.get(f"{url}?group_by[service]=*&filter[resolution]=monthly", **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response["ETag"]
+
+            reordered = self.client.get(f"{url}?filter[resolution]=monthly&group_by[service]=*", **self.headers)
+            self.assertEqual(reordered.status_code, status.HTTP_200_OK)
+            self.assertEqual(reordered.json()["data"], response.json()["data"])
+            self.assertEqual(mock.call_count, 1)
+
+            not_modified = self.client.get(
+                f"{url}?group_by[service]=*&filter[resolution]=monthly", HTTP_IF_NONE_MATCH=etag, **self.headers
+            )
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(mock.call_count, 1)
+
+            invalidate_view_cache_for_tenant_and_source_type(self.schema_name, Provider.PROVIDER_AWS)
+            response = self.client.get(
+                f"{url}?group_by[service]=*&filter[resolution]=monthly", HTTP_IF_NONE_MATCH=etag, **self.headers
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+            self.assertEqual(mock.call_count, 2)
+
+    @override_settings(
+        REPORT_RESULT_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "report-result-cache-dates",
+                "KEY_FUNCTION": "django_tenants.cache.make_key",
+                "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+            }
+        },
+    )
+    @patch("django.middleware.cache.UpdateCacheMiddleware.process_response", side_effect=lambda req, resp: resp)
+    @patch("django.middleware.cache.FetchFromCacheMiddleware.process_request", return_value=None)
+    def test_report_result_cache_next_day(self, *args):
+        """Test that relative time windows are not answered from yesterday's ETag or result."""
+        url = f"{reverse('reports-aws-costs')}?filter[time_scope_value]=-10&filter[time_scope_units]=day"
+        execute_query = AWSReportQueryHandler.execute_query
+        with patch.object(AWSReportQueryHandler, "execute_query", autospec=True, side_effect=execute_query) as mock:
+            response = self.client.get(url, **self.headers)
+            etag = response["ETag"]
+
+            with patch("koku.cache.DateHelper") as mock_date_helper:
+                mock_date_helper.return_value.today = DateHelper().tomorrow
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+            self.assertEqual(mock.call_count, 2)
+
+    @override_settings(
+        REPORT_RESULT_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "report-result-cache-csv",
+                "KEY_FUNCTION": "django_tenants.cache.make_key",
+                "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+            }
+        },
+    )
+    @patch("django.middleware.cache.UpdateCacheMiddleware.process_response", side_effect=lambda req, resp: resp)
+    @patch("django.middleware.cache.FetchFromCacheMiddleware.process_request", return_value=None)
+    def test_report_result_cache_csv(self, *args):
+        """Test that CSV requests are not answered with the cached JSON result of the same parameters."""
+        url = f"{reverse('reports-aws-costs')}?group_by[service]=*&filter[resolution]=monthly"
+        execute_query = AWSReportQueryHandler.execute_query
+        with patch.object(AWSReportQueryHandler, "execute_query", autospec=True, side_effect=execute_query) as mock:
+            response = self.client.get(url, **self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            csv_response = APIClient(HTTP_ACCEPT="text/csv").get(url, **self.headers)
+            csv_response.render()
+            self.assertEqual(csv_response.status_code, status.HTTP_200_OK)
+            self.assertEqual(csv_response.accepted_media_type, "text/csv")
+            self.assertNotEqual(csv_response["ETag"], response["ETag"])
+            self.assertEqual(mock.call_count, 2)
+
+    @patch("django.middleware.cache.UpdateCacheMiddleware.process_response", side_effect=lambda req, resp: resp)
+    @patch("django.middleware.cache.FetchFromCacheMiddleware.process_request", return_value=None)
+    def test_endpoint_csv_streaming(self, *args):
+        """Test that unpaginated CSV exports stream the rows the in-memory renderer returns."""
+        self.client = APIClient(HTTP_ACCEPT="text/csv")
+        group_bys = {
+            "reports-openshift-costs": "project",
+            "reports-aws-costs": "account",
+            "reports-azure-costs": "service_name",
+            "reports-gcp-costs": "service",
+            "reports-oci-costs": "product_service",
+            "reports-openshift-all-costs": "project",
+            "reports-openshift-aws-costs": "project",
+            "reports-openshift-azure-costs": "project",
+            "reports-openshift-gcp-costs": "project",
+        }
+        for endpoint, group_by in group_bys.items():
+            with self.subTest(endpoint=endpoint):
+                url = f"{reverse(endpoint)}?group_by[{group_by}]=*&filter[resolution]=daily&limit=0"
+                expected = self.client.get(url, **self.headers)
+                with override_settings(REPORT_CSV_STREAMING=True):
+                    response = self.client.get(url, **self.headers)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    self.assertTrue(response.streaming)
+                    lines = b"".join(response.streaming_content).splitlines()
+
+                expected_lines = expected.content.splitlines()
+                self.assertFalse(expected.streaming)
+                self.assertEqual(lines[:1], expected_lines[:1])
+                self.assertEqual(sorted(lines), sorted(expected_lines))
+
+                with override_settings(REPORT_CSV_STREAMING=True):
+                    paginated = self.client.get(url.replace("limit=0", "limit=10"), **self.headers)
+                self.assertFalse(paginated.streaming)
+
     def test_get_paginator_default(self):
         """Test that the standard report paginator is returned."""
         params = {}
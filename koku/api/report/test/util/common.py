@@ -3,6 +3,9 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Common Test utilities."""
+from itertools import product
+
+from django.test.utils import override_settings
 from django_tenants.utils import schema_context
 
 from api.report.test.util.constants import OCP_PLATFORM_NAMESPACE
@@ -11,6 +14,10 @@ from reporting.provider.ocp.models import OCPNode
 from reporting.provider.ocp.models import OCPUsageLineItemDailySummary
 from reporting.provider.ocp.models import OpenshiftCostCategory
 
+# limit with an "Others" rollup, a limit/offset window and a limit over the number of groups
+SQL_RANKING_WINDOWS = ["filter[limit]=1", "filter[limit]=2&filter[offset]=1", "filter[limit]=100"]
+SQL_RANKING_ORDER_BYS = [None, "order_by[cost]=asc", "order_by[cost]=desc"]
+
 
 def populate_ocp_topology(schema, provider, cluster_id):
     """Populate essential OCP topology tables."""
@@ -40,3 +47,40 @@ def update_cost_category(schema):
             row.cost_category = cost_category_value
             update_list.append(row)
         OCPUsageLineItemDailySummary.objects.bulk_update(update_list, ["cost_category"])
+
+
+def sql_ranking_urls(group_bys, order_bys=SQL_RANKING_ORDER_BYS):
+    """Return a ranked report url for every group by, order by and limit/offset combination."""
+    urls = []
+    for group_by, order_by, window in product(group_bys, order_bys, SQL_RANKING_WINDOWS):
+        params = [window, f"group_by[{group_by}]=*"]
+        if order_by:
+            params.append(order_by)
+        urls.append("?" + "&".join(params))
+    return urls
+
+
+def normalize_ranked_data(value):
+    """Sort lists of ids, their order follows the database row order."""
+    if isinstance(value, dict):
+        return {key: normalize_ranked_data(val) for key, val in value.items()}
+    if isinstance(value, list):
+        if all(isinstance(val, dict) for val in value):
+            return [normalize_ranked_data(val) for val in value]
+        return sorted(str(val) for val in value)
+    return value
+
+
+def assert_sql_ranking_matches_pandas(test_case, handler_class, view, urls):
+    """Assert that ranking in SQL returns the same data as ranking with pandas for every url."""
+    for url in urls:
+        with test_case.subTest(url=url):
+            with override_settings(REPORT_SQL_RANKING=False):
+                handler = handler_class(test_case.mocked_query_params(url, view))
+                expected = handler.execute_query()
+                expected_max_rank = handler.max_rank
+            with override_settings(REPORT_SQL_RANKING=True):
+                handler = handler_class(test_case.mocked_query_params(url, view))
+                actual = handler.execute_query()
+            test_case.assertEqual(handler.max_rank, expected_max_rank)
+            test_case.assertEqual(normalize_ranked_data(actual["data"]), normalize_ranked_data(expected["data"]))
@@ -5,6 +5,10 @@
 """View for Reports."""
 import logging
 
+from django.conf import settings
+from django.core.cache import caches
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from django.views.decorators.vary import vary_on_headers
 from rest_framework import status
@@ -13,10 +17,20 @@ from rest_framework.serializers import ValidationError
 from rest_framework.views import APIView
 
 from api.common import CACHE_RH_IDENTITY_HEADER
+from api.common.csv import CSVRowStream
+from api.common.csv import PaginatedCSVRenderer
+from api.common.csv import stream_csv
 from api.common.pagination import OrgUnitPagination
 from api.common.pagination import ReportPagination
 from api.common.pagination import ReportRankedPagination
 from api.query_params import QueryParameters
+from koku.cache import get_data_version
+from koku.cache import get_report_etag
+from koku.cache import get_report_result_key
+from koku.cache import PROVIDER_CACHE_PREFIXES
+from koku.cache import REPORT_CACHE_HIT_COUNTER
+from koku.cache import REPORT_CACHE_MISS_COUNTER
+from koku.cache import REPORT_NOT_MODIFIED_COUNTER
 
 
 LOG = logging.getLogger(__name__)
@@ -63,22 +77,56 @@ class ReportView(APIView):
         """
         LOG.debug(f"API: {request.path} USER: {request.user.username}")
 
+        version = etag = None
+        cache_key_prefix = PROVIDER_CACHE_PREFIXES.get(self.provider)
+        if settings.REPORT_RESULT_CACHE and cache_key_prefix:
+            version = get_data_version(request.user.customer.schema_name, cache_key_prefix)
+        if version:
+            etag = get_report_etag(version, request)
+            if not_modified := get_conditional_response(request, etag=etag):
+                REPORT_NOT_MODIFIED_COUNTER.labels(provider=self.provider).inc()
+                return not_modified
+
         try:
             params = QueryParameters(request=request, caller=self, **kwargs)
         except ValidationError as exc:
             return Response(data=exc.detail, status=status.HTTP_400_BAD_REQUEST)
-        handler = self.query_handler(params)
-
-        output = handler.execute_query()
-
-        # reset the meta when order_by[date] is used
-        if output.get("cost_explorer_order_by"):
-            order_by_date = output.pop("cost_explorer_order_by")
-            output.get("order_by").update(order_by_date)
 
-        max_rank = handler.max_rank
+        result = None
+        if version and params.accept_type and "text/csv" in params.accept_type:
+            # CSV output is not shaped like the JSON output cached for the same parameters
+            version = None
+        if version:
+            result_key = get_report_result_key(version, request.path, params.parameters)
+            result = caches["default"].get(result_key)
+            counter = REPORT_CACHE_MISS_COUNTER if result is None else REPORT_CACHE_HIT_COUNTER
+            counter.labels(provider=self.provider).inc()
+        if result is None:
+            handler = self.query_handler(params)
+
+            output = handler.execute_query()
+
+            if isinstance(output.get("data"), CSVRowStream):
+                content_type = f"{PaginatedCSVRenderer.media_type}; charset={settings.DEFAULT_CHARSET}"
+                response = StreamingHttpResponse(stream_csv(output["data"]), content_type=content_type)
+                if etag:
+                    response["ETag"] = etag
+                return response
+
+            # reset the meta when order_by[date] is used
+            if output.get("cost_explorer_order_by"):
+                order_by_date = output.pop("cost_explorer_order_by")
+                output.get("order_by").update(order_by_date)
+
+            result = (output, handler.max_rank)
+            if version:
+                caches["default"].set(result_key, result, settings.CACHE_MIDDLEWARE_SECONDS)
+        output, max_rank = result
 
         paginator = get_paginator(params.parameters.get("filter", {}), max_rank, request.query_params)
         paginated_result = paginator.paginate_queryset(output, request)
 
-        return paginator.get_paginated_response(paginated_result)
+        response = paginator.get_paginated_response(paginated_result)
+        if etag:
+            response["ETag"] = etag
+        return response
@@ -8,13 +8,12 @@ import operator
 from collections import defaultdict
 from datetime import datetime
 from datetime import timedelta
-from decimal import Decimal
 from functools import cached_property
 from functools import reduce
 
 import numpy as np
-import statsmodels.api as sm
 from django.conf import settings
+from django.core.cache import caches
 from django.db.models import Case
 from django.db.models import CharField
 from django.db.models import DecimalField
@@ -25,8 +24,7 @@ from django.db.models import Value
 from django.db.models import When
 from django.db.models.functions import Coalesce
 from django_tenants.utils import tenant_context
-from statsmodels.sandbox.regression.predstd import wls_prediction_std
-from statsmodels.tools.sm_exceptions import ValueWarning
+from scipy import stats
 
 from api.currency.models import ExchangeRateDictionary
 from api.models import Provider
@@ -45,6 +43,9 @@ from api.utils import DateHelper
 from api.utils import get_cost_type
 from cost_models.models import CostModel
 from cost_models.models import CostModelMap
+from koku.cache import get_data_version
+from koku.cache import get_report_result_key
+from koku.cache import PROVIDER_CACHE_PREFIXES
 from reporting.provider.aws.models import AWSOrganizationalUnit
 
 
@@ -180,111 +181,134 @@ class Forecast:
         )
 
     def predict(self):
-        """Define ORM query to run forecast and return prediction."""
-        cost_predictions = {}
-        with tenant_context(self.params.tenant):
-            data = self.get_data()
+        """Define ORM query to run forecast and return prediction.
+
+        When FORECAST_RESULT_CACHE is enabled the prediction is memoized until the tenant's data version changes.
+        """
+        result_key = None
+        cache_key_prefix = PROVIDER_CACHE_PREFIXES.get(self.provider)
+        if settings.FORECAST_RESULT_CACHE and cache_key_prefix:
+            version = get_data_version(self.params.tenant.schema_name, cache_key_prefix)
+            if version:
+                # the prediction also depends on the current day and on settings resolved outside of the parameters
+                forecast_path = f"forecast:{self.provider}:{self.dh.today.date()}:{self.currency}"
+                if hasattr(self, "cost_type"):
+                    forecast_path = f"{forecast_path}:{self.cost_type}"
+                result_key = get_report_result_key(version, forecast_path, self.params.parameters)
+                result = caches["default"].get(result_key)
+                if result is not None:
+                    return result
 
-            for fieldname in COST_FIELD_NAMES:
-                uniq_data = self._uniquify_qset(data.values("usage_start", fieldname), field=fieldname)
-                cost_predictions[fieldname] = self._predict(uniq_data)
+        with tenant_context(self.params.tenant):
+            rows = list(self.get_data().values("usage_start", *COST_FIELD_NAMES))
 
-            cost_predictions = self._key_results_by_date(cost_predictions)
-            return self.format_result(cost_predictions)
+        dates, costs = self._uniquify_qset(rows)
+        cost_predictions = self._key_results_by_date(self._predict(dates, costs))
+        result = self.format_result(cost_predictions)
+        if result_key:
+            caches["default"].set(result_key, result, settings.CACHE_MIDDLEWARE_SECONDS)
+        return result
 
-    def _predict(self, data):
+    def _predict(self, dates, costs):
         """Handle pre and post prediction work.
 
-        This function handles arranging incoming data to conform with statsmodels requirements.
-        Then after receiving the forecast output, this function handles formatting to conform to
-        API reponse requirements.
+        This function handles arranging incoming data to conform with the regression requirements.
+        Every cost term is fitted in the same pass. Then after receiving the forecast output, this function
+        handles formatting to conform to API reponse requirements.
 
         Args:
-            data (list) a list of (datetime, float) tuples
+            dates (list) the days of the series, in ascending order
+            costs (numpy.ndarray) one row per day holding the cost of each term in COST_FIELD_NAMES
 
         Returns:
-            (LinearForecastResult) linear forecast results object
+            (dict) {cost term: (prediction dict, R-squared value, P-values)}
         """
-        LOG.debug("Forecast input data: %s", data)
-
-        if len(data) < self.MINIMUM:
-            LOG.warning(
-                "Number of data elements (%s) is fewer than the minimum (%s). Unable to generate forecast.",
-                len(data),
-                self.MINIMUM,
-            )
-            return ZERO_RESULT
-
-        dates, costs = zip(*data)
+        LOG.debug("Forecast input data: %s %s", dates, costs)
+
+        predictions = dict.fromkeys(COST_FIELD_NAMES, ZERO_RESULT)
+        if not dates:
+            return predictions
+
+        mask = self._remove_outliers(costs)
+        counts = mask.sum(axis=0)
+        for fieldname, count in zip(COST_FIELD_NAMES, counts):
+            if count < self.MINIMUM:
+                LOG.warning(
+                    "Number of %s data elements (%s) is fewer than the minimum (%s). Unable to generate forecast.",
+                    fieldname,
+                    count,
+                    self.MINIMUM,
+                )
+        fitted = [i for i, count in enumerate(counts) if count >= self.MINIMUM]
+        if not fitted:
+            return predictions
 
         X = self._enumerate_dates(dates)
-        Y = [float(c) for c in costs]
 
-        # difference in days between the first day to be predicted and the last day of data after outlier removal
+        # difference in days between the first day to be predicted and the first day of data
         day_gap = (
-            datetime.combine(self.dh.today.date(), self.dh.midnight) - datetime.combine(dates[-1], self.dh.midnight)
+            datetime.combine(self.dh.today.date(), self.dh.midnight) - datetime.combine(dates[0], self.dh.midnight)
         ).days
         # calculate x-values for the prediction range
-        pred_x = [i for i in range(X[-1] + day_gap, X[-1] + day_gap + self.forecast_days_required)]
+        pred_x = np.arange(day_gap, day_gap + self.forecast_days_required)
 
         # run the forecast
-        results = self._run_forecast(X, Y, to_predict=pred_x)
-
-        result_dict = {}
-        for i, value in enumerate(results.prediction):
-            # extrapolate confidence intervals to align with prediction.
-            # this reduces the confidence interval below 95th percentile, but is a better UX.
-            if i < len(results.confidence_lower):
-                lower = results.confidence_lower[i]
-            else:
-                lower = results.confidence_lower[-1] + results.slope * (i - len(results.confidence_lower))
-
-            if i < len(results.confidence_upper):
-                upper = results.confidence_upper[i]
-            else:
-                upper = results.confidence_upper[-1] + results.slope * (i - len(results.confidence_upper))
-
-            # ensure that there are no negative numbers.
-            result_dict[self.dh.today.date() + timedelta(days=i)] = {
-                "total_cost": max((value, 0)),
-                "confidence_min": max((lower, 0)),
-                "confidence_max": max((upper, 0)),
-            }
-
-        return (result_dict, results.rsquared, results.pvalues)
+        all_results = self._run_forecast(X, costs[:, fitted].T, to_predict=pred_x, mask=mask[:, fitted].T)
+
+        for i, results in zip(fitted, all_results):
+            result_dict = {}
+            for j, value in enumerate(results.prediction):
+                # extrapolate confidence intervals to align with prediction.
+                # this reduces the confidence interval below 95th percentile, but is a better UX.
+                if j < len(results.confidence_lower):
+                    lower = results.confidence_lower[j]
+                else:
+                    lower = results.confidence_lower[-1] + results.slope * (j - len(results.confidence_lower))
+
+                if j < len(results.confidence_upper):
+                    upper = results.confidence_upper[j]
+                else:
+                    upper = results.confidence_upper[-1] + results.slope * (j - len(results.confidence_upper))
+
+                # ensure that there are no negative numbers.
+                result_dict[self.dh.today.date() + timedelta(days=j)] = {
+                    "total_cost": max((value, 0)),
+                    "confidence_min": max((lower, 0)),
+                    "confidence_max": max((upper, 0)),
+                }
+
+            predictions[COST_FIELD_NAMES[i]] = (result_dict, results.rsquared, results.pvalues)
+
+        return predictions
 
     def _enumerate_dates(self, date_list):
         """Given a list of dates, return a list of integers.
 
-        This method works in conjunction with _remove_outliers(). This method works to preserve any gaps
-        in the data created by _remove_outliers() so that the integers used for the X-axis are aligned
-        appropriately.
+        The integers are the day offsets from the first date, so that gaps in the data (e.g. days removed by
+        _remove_outliers() or days without cost) keep the integers used for the X-axis aligned appropriately.
 
         Example:
-            If _remove_outliers() returns {"2000-01-01": 1.0, "2000-01-03": 1.5}
+            If the dates are ["2000-01-01", "2000-01-03"]
             then _enumerate_dates() returns [0, 2]
         """
-        days = self.dh.list_days(
-            datetime.combine(date_list[0], self.dh.midnight), datetime.combine(date_list[-1], self.dh.midnight)
-        )
-        out = [i for i, day in enumerate(days) if day.date() in date_list]
-        return out
+        first = date_list[0]
+        return [(day - first).days for day in date_list]
 
-    def _remove_outliers(self, data):
-        """Remove outliers from our dateset before predicting.
+    def _remove_outliers(self, costs):
+        """Flag the outliers of every cost term before predicting.
 
         We use a box plot method without plotting the box.
+
+        Returns:
+            (numpy.ndarray) a boolean array shaped like costs; False marks an outlier
         """
-        values = list(data.values())
-        if values:
-            third_quartile, first_quartile = np.percentile(values, [Decimal(75), Decimal(25)])
-            interquartile_range = third_quartile - first_quartile
+        third_quartile, first_quartile = np.percentile(costs, [75, 25], axis=0)
+        interquartile_range = third_quartile - first_quartile
 
-            upper_boundary = third_quartile + (Decimal(1.5) * interquartile_range)
-            lower_boundary = first_quartile - (Decimal(1.5) * interquartile_range)
+        upper_boundary = third_quartile + (1.5 * interquartile_range)
+        lower_boundary = first_quartile - (1.5 * interquartile_range)
 
-            return {key: value for key, value in data.items() if (value >= lower_boundary and value <= upper_boundary)}
-        return data
+        return (costs >= lower_boundary) & (costs <= upper_boundary)
 
     def _key_results_by_date(self, results):
         """Take results formatted by cost type, and return results keyed by date."""
@@ -376,49 +400,75 @@ class Forecast:
             response.append(dikt)
         return response
 
-    def _run_forecast(self, x, y, to_predict=None):
+    def _run_forecast(self, x, y, to_predict, mask=None):
         """Apply the forecast model.
 
+        Every row of y is fitted with an ordinary least-squares line in one vectorized pass, using the closed-form
+        estimates of a simple linear regression.
+
         Args:
             x (list) a list of exogenous variables
-            y (list) a list of endogenous variables
+            y (array-like) one row of endogenous variables per series
             to_predict (list) a list of exogenous variables used in the forecast results
+            mask (array-like) booleans shaped like y; False excludes a value from its fit
 
         Note:
-            both x and y MUST be the same number of elements
+            every row of y MUST have the same number of elements as x
 
         Returns:
-            (tuple)
-                (numpy.ndarray) prediction values
-                (numpy.ndarray) confidence interval lower bound
-                (numpy.ndarray) confidence interval upper bound
-                (float) R-squared value
-                (list) P-values
+            [LinearForecastResult] one linear forecast results object per row of y
         """
-        x = sm.add_constant(x)
-        to_predict = sm.add_constant(to_predict)
-        model = sm.OLS(y, x)
-        results = model.fit()
-        return LinearForecastResult(results, exog=to_predict)
+        x = np.asarray(x, dtype=float)
+        to_predict = np.asarray(to_predict, dtype=float)
+        y = np.asarray(y, dtype=float)
+        weights = np.ones_like(y) if mask is None else np.asarray(mask, dtype=float)
+
+        nobs = weights.sum(axis=1)
+        dof = nobs - 2
+        x_mean = (weights * x).sum(axis=1) / nobs
+        y_mean = (weights * y).sum(axis=1) / nobs
+        # deviations are zeroed where the mask excludes a value
+        x_dev = weights * (x - x_mean[:, None])
+        y_dev = weights * (y - y_mean[:, None])
+        x_ss = (x_dev**2).sum(axis=1)
+
+        slope = (x_dev * y_dev).sum(axis=1) / x_ss
+        intercept = y_mean - slope * x_mean
+        resid_ss = ((y_dev - slope[:, None] * x_dev) ** 2).sum(axis=1)
+        mse_resid = resid_ss / dof
+
+        prediction = intercept[:, None] + slope[:, None] * to_predict
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsquared = 1 - resid_ss / (y_dev**2).sum(axis=1)
+            params = np.column_stack((intercept, slope))
+            bse = np.sqrt(np.column_stack((mse_resid * (1 / nobs + x_mean**2 / x_ss), mse_resid / x_ss)))
+            pvalues = 2 * stats.t.sf(np.abs(params / bse), dof[:, None])
+        # standard error of a new observation, as wls_prediction_std() computes it for a 95% interval
+        predvar = mse_resid[:, None] * (1 + 1 / nobs[:, None] + (to_predict - x_mean[:, None]) ** 2 / x_ss[:, None])
+        interval = stats.t.isf(0.025, dof)[:, None] * np.sqrt(predvar)
+
+        return [
+            LinearForecastResult(*values)
+            for values in zip(params, pvalues, rsquared, prediction, prediction - interval, prediction + interval)
+        ]
 
-    def _uniquify_qset(self, qset, field="total_cost"):
-        """Take a QuerySet list, sum costs within the same day, and arrange it into a list of tuples.
+    def _uniquify_qset(self, qset):
+        """Take a QuerySet list and sum costs within the same day.
 
         Args:
-            qset (QuerySet)
-            field (str) - field name in the QuerySet to be summed
+            qset (QuerySet) rows holding usage_start and every field in COST_FIELD_NAMES
 
         Returns:
-            [(date, cost), ...]
+            (list, numpy.ndarray) the sorted days, and one row of summed costs per day
         """
-        # FIXME: this QuerySet->dict->list conversion probably isn't ideal.
-        # FIXME: there's probably a way to aggregate multiple sources by date using just the ORM.
-        result = defaultdict(Decimal)
-        for item in qset:
-            result[item.get("usage_start")] += Decimal(item.get(field, 0.0))
-        result = self._remove_outliers(result)
-        out = [(k, v) for k, v in result.items()]
-        return out
+        dates = sorted({item.get("usage_start") for item in qset})
+        costs = np.zeros((len(dates), len(COST_FIELD_NAMES)))
+        if dates:
+            index = {day: i for i, day in enumerate(dates)}
+            rows = [index[item.get("usage_start")] for item in qset]
+            values = [[float(item.get(field) or 0) for field in COST_FIELD_NAMES] for item in qset]
+            np.add.at(costs, rows, values)
+        return dates, costs
 
     def set_access_filters(self, access, filt, filters):
         """Set access filters to ensure RBAC restrictions adhere to user's access and filters.
@@ -447,22 +497,25 @@ class LinearForecastResult:
     Note: this class should be considered read-only
     """
 
-    def __init__(self, regression_result, exog=None):
+    def __init__(self, params, pvalues, rsquared, prediction, confidence_lower, confidence_upper):
         """Class constructor.
 
         Args:
-            regression_result (RegressionResult) the results of a statsmodels regression
-            exog (array-like) future exogenous variables; points to predict
+            params (array-like) the Y-intercept and slope estimates
+            pvalues (array-like) the P-values of params
+            rsquared (float) the R-squared value of the fit
+            prediction (array-like) the predicted values
+            confidence_lower (array-like) confidence interval lower-bound of the predicted values
+            confidence_upper (array-like) confidence interval upper-bound of the predicted values
         """
-        self._exog = exog
-        self._regression_result = regression_result
-        self._std_err, self._conf_lower, self._conf_upper = wls_prediction_std(regression_result, exog=exog)
-
-        try:
-            LOG.debug(regression_result.summary())
-        except (ValueWarning, UserWarning) as exc:
-            LOG.warning(exc)
-
+        self._params = params
+        self._pvalues = pvalues
+        self._rsquared = rsquared
+        self._prediction = prediction
+        self._conf_lower = confidence_lower
+        self._conf_upper = confidence_upper
+
+        LOG.debug("Forecast prediction: %s", self.prediction)
         LOG.debug("Forecast interval lower-bound: %s", self.confidence_lower)
         LOG.debug("Forecast interval upper-bound: %s", self.confidence_upper)
 
@@ -470,23 +523,10 @@ class LinearForecastResult:
     def prediction(self):
         """Forecast prediction.
 
-        Args:
-            to_predict (array-like) - values to predict; uses model training values if not set.
-
         Returns:
-            (array-like) - an nparray of prediction values or empty list
+            (array-like) - an nparray of prediction values
         """
-        # predict() returns the same number of elements as the number of input observations
-        prediction = []
-        try:
-            if self._exog is not None:
-                prediction = self._regression_result.predict(sm.add_constant(self._exog))
-            else:
-                prediction = self._regression_result.predict()
-        except ValueError as exc:
-            LOG.error(exc)
-        LOG.debug("Forecast prediction: %s", prediction)
-        return prediction
+        return self._prediction
 
     @property
     def confidence_lower(self):
@@ -501,7 +541,7 @@ class LinearForecastResult:
     @property
     def rsquared(self):
         """Forecast R-squared value."""
-        return self._regression_result.rsquared
+        return self._rsquared
 
     @property
     def pvalues(self):
@@ -513,34 +553,33 @@ class LinearForecastResult:
             (str) or [(str), (str)]
         """
         f_format = f"%.{Forecast.PRECISION}f"  # avoid converting floats to e-notation
-        if len(self._regression_result.pvalues.tolist()) == 1:
-            return f_format % self._regression_result.pvalues.tolist()[0]
+        pvalues = list(self._pvalues)
+        if len(pvalues) == 1:
+            return f_format % pvalues[0]
         else:
-            return [f_format % item for item in self._regression_result.pvalues.tolist()]
+            return [f_format % item for item in pvalues]
 
     @property
     def slope(self):
         """Slope estimate of linear regression.
 
         For a basic linear regression, params is always a list of two values - the slope and the Y-intercept.
-        This assumption is not true for more advanced cases using other types of least-squares regressions.
 
         Returns:
             (float) the estimated slope param
         """
-        return self._regression_result.params[1]
+        return self._params[1]
 
     @property
     def intercept(self):
         """Y-intercept estimate of linear regression.
 
         For a basic linear regression, params is always a list of two values - the slope and the Y-intercept.
-        This assumption is not true for more advanced cases using other types of least-squares regressions.
 
         Returns:
             (float) the estimated Y-intercept param
         """
-        return self._regression_result.params[0]
+        return self._params[0]
 
 
 class AWSForecast(Forecast):
@@ -8,12 +8,15 @@ import random
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
-from decimal import Decimal
 from unittest.mock import Mock
 from unittest.mock import patch
 from uuid import uuid4
 
-from statsmodels.tools.sm_exceptions import ValueWarning
+import numpy as np
+import statsmodels.api as sm
+from django.core.cache import caches
+from django.test.utils import override_settings
+from statsmodels.sandbox.regression.predstd import wls_prediction_std
 
 from api.forecast.views import AWSCostForecastView
 from api.forecast.views import AzureCostForecastView
@@ -24,6 +27,7 @@ from api.forecast.views import OCPAWSCostForecastView
 from api.forecast.views import OCPAzureCostForecastView
 from api.forecast.views import OCPCostForecastView
 from api.iam.test.iam_test_case import IamTestCase
+from api.models import Provider
 from api.query_filter import QueryFilter
 from api.query_filter import QueryFilterCollection
 from api.report.test.test_queries import assertSameQ
@@ -36,8 +40,10 @@ from forecast import OCPAllForecast
 from forecast import OCPAWSForecast
 from forecast import OCPAzureForecast
 from forecast import OCPForecast
+from forecast.forecast import COST_FIELD_NAMES
 from forecast.forecast import LinearForecastResult
 from forecast.forecast import ZERO_RESULT
+from koku.cache import invalidate_view_cache_for_tenant_and_source_type
 from reporting.provider.aws.models import AWSCostSummaryByAccountP
 from reporting.provider.gcp.models import GCPCostSummaryByAccountP
 from reporting.provider.gcp.models import GCPCostSummaryByProjectP
@@ -167,17 +173,28 @@ class AWSForecastTest(IamTestCase):
         params = self.mocked_query_params("?", AWSCostForecastView)
         dh = DateHelper()
         days_in_month = dh.this_month_end.day
-        data = {}
-        for i in range(days_in_month):
-            data[dh.this_month_start + timedelta(days=i)] = Decimal(20)
-
-        outlier = Decimal(100)
-        data[dh.this_month_start] = outlier
+        costs = np.full((days_in_month, 3), 20.0)
+        costs[0, 0] = 100.0
         forecast = AWSForecast(params)
-        result = forecast._remove_outliers(data)
+        result = forecast._remove_outliers(costs)
+
+        self.assertFalse(result[0, 0])
+        self.assertTrue(result[0, 1:].all())
+        self.assertTrue(result[1:].all())
+
+    def test_uniquify_qset(self):
+        """Test that costs of the same day are summed for every cost term."""
+        rows = [
+            {"usage_start": date(2000, 1, 2), "total_cost": 1, "infrastructure_cost": 2, "supplementary_cost": None},
+            {"usage_start": date(2000, 1, 1), "total_cost": 3, "infrastructure_cost": 4, "supplementary_cost": 5},
+            {"usage_start": date(2000, 1, 2), "total_cost": 6, "infrastructure_cost": 7, "supplementary_cost": 8},
+        ]
+        params = self.mocked_query_params("?", AWSCostForecastView)
+        instance = AWSForecast(params)
 
-        self.assertNotIn(dh.this_month_start, result.keys())
-        self.assertNotIn(outlier, result.values())
+        dates, costs = instance._uniquify_qset(rows)
+        self.assertEqual(dates, [date(2000, 1, 1), date(2000, 1, 2)])
+        self.assertEqual(costs.tolist(), [[3, 4, 5], [7, 9, 8]])
 
     def test_predict_flat(self):
         """Test that predict() returns expected values for flat costs."""
@@ -331,13 +348,13 @@ class AWSForecastTest(IamTestCase):
 
     def test_predict_end_of_month(self):
         """COST-1091: Test that predict() returns ZERO_RESULT on the last day of a month."""
-        scenario = [(date(2000, 1, 31), 1.5)]
+        scenario = [{"usage_start": date(2000, 1, 31), **dict.fromkeys(COST_FIELD_NAMES, 1.5)}]
 
         params = self.mocked_query_params("?", AWSCostForecastView)
         instance = AWSForecast(params)
 
-        out = instance._predict(scenario)
-        self.assertEqual(out, ZERO_RESULT)
+        out = instance._predict(*instance._uniquify_qset(scenario))
+        self.assertEqual(out, dict.fromkeys(COST_FIELD_NAMES, ZERO_RESULT))
 
     def test_set_access_filter_with_list(self):
         """
@@ -411,15 +428,22 @@ class AWSForecastTest(IamTestCase):
 
     @patch("forecast.forecast.Forecast.format_result", return_value="FAKE RESULTS")
     @patch("forecast.forecast.Forecast._run_forecast")
-    @patch("forecast.forecast.Forecast._enumerate_dates", return_value=[0, 1, 2, 3, 4])
-    def test_negative_values(self, mock_enumerate_dates, mock_run_forecast, mock_format_result):
+    def test_negative_values(self, mock_run_forecast, mock_format_result):
         """COST-1110: ensure that the forecast response does not include negative numbers."""
-        mock_run_forecast.return_value = Mock(
-            prediction=[1, 0, -1, -2, -3], confidence_lower=[2, 1, 0, -1, -2], confidence_upper=[3, 2, 1, 0, -1]
+        mock_run_forecast.return_value = [
+            Mock(prediction=[1, 0, -1, -2, -3], confidence_lower=[2, 1, 0, -1, -2], confidence_upper=[3, 2, 1, 0, -1])
+        ] * len(COST_FIELD_NAMES)
+        dh = DateHelper()
+        mock_qset = MockQuerySet(
+            [
+                {"usage_start": dh.n_days_ago(dh.today, 10 - n).date(), **dict.fromkeys(COST_FIELD_NAMES, 5 + n)}
+                for n in range(10)
+            ]
         )
         params = self.mocked_query_params("?", AWSCostForecastView)
         instance = AWSForecast(params)
-        instance.predict()
+        with patch("forecast.forecast.AWSForecast.get_data", return_value=mock_qset):
+            instance.predict()
 
         self.assertIsInstance(mock_format_result.call_args[0][0], dict)
         for key, val_dict in mock_format_result.call_args[0][0].items():
@@ -429,6 +453,37 @@ class AWSForecastTest(IamTestCase):
                     self.assertGreaterEqual(inner_val[0]["confidence_min"], 0)
                     self.assertGreaterEqual(inner_val[0]["confidence_max"], 0)
 
+    @override_settings(
+        FORECAST_RESULT_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "forecast-result-cache",
+                "KEY_FUNCTION": "django_tenants.cache.make_key",
+                "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+            }
+        },
+    )
+    def test_predict_result_cache(self):
+        """Test that predictions are memoized until the tenant's data version changes."""
+        dh = DateHelper()
+        mock_qset = MockQuerySet(
+            [
+                {"usage_start": dh.n_days_ago(dh.today, 10 - n).date(), **dict.fromkeys(COST_FIELD_NAMES, 5 + n)}
+                for n in range(10)
+            ]
+        )
+        params = self.mocked_query_params("?", AWSCostForecastView)
+        with patch("forecast.forecast.AWSForecast.get_data", return_value=mock_qset) as mock_get_data:
+            results = AWSForecast(params).predict()
+            self.assertEqual(AWSForecast(params).predict(), results)
+            self.assertEqual(mock_get_data.call_count, 1)
+
+            invalidate_view_cache_for_tenant_and_source_type(self.schema_name, Provider.PROVIDER_AWS)
+            self.assertEqual(AWSForecast(params).predict(), results)
+            self.assertEqual(mock_get_data.call_count, 2)
+        caches["default"].clear()
+
     def test__key_results_by_date(self):
         table = [
             {
@@ -950,25 +1005,43 @@ class OCPAzureForecastTest(IamTestCase):
 class LinearForecastResultTest(IamTestCase):
     """Tests the LinearForecastResult class."""
 
-    @patch("forecast.forecast.wls_prediction_std", return_value=(1, 2, 3))
-    def test_constructor_logging(self, _):
+    def test_constructor_logging(self):
         """Test that the constructor logs messages."""
-        fake_results = Mock(summary=Mock(side_effect=ValueWarning("test")))
+        with self.assertLogs(logger="forecast.forecast", level=logging.DEBUG):
+            LinearForecastResult([1, 2], [0.1, 0.2], 0.5, [3, 4], [2, 3], [4, 5])
 
-        with self.assertLogs(logger="forecast.forecast", level=logging.WARNING):
-            LinearForecastResult(fake_results)
-
-    @patch("forecast.forecast.wls_prediction_std", return_value=(1, 2, 3))
-    def test_pvalues_slope_intercept(self, _):
+    def test_pvalues_slope_intercept(self):
         """Test the slope, intercept, and pvalues properties."""
-        fake_results = Mock(
-            summary=Mock(return_value="this is a test summary"),
-            pvalues=Mock(tolist=Mock(return_value=[99999, 88888])),
-            params=[66666, 77777],
-        )
-
-        lfr = LinearForecastResult(fake_results)
+        lfr = LinearForecastResult([66666, 77777], np.array([99999, 88888]), 0.5, [], [], [])
 
         self.assertEqual(lfr.pvalues, ["99999.00000000", "88888.00000000"])
         self.assertEqual(lfr.slope, 77777)
         self.assertEqual(lfr.intercept, 66666)
+
+    def test_run_forecast_matches_ols(self):
+        """Test that the vectorized fit of every series matches a statsmodels OLS fit of each series."""
+        x = list(range(12))
+        y = np.array([[5 + random.random() + n for n in x], [3 + random.random() * n for n in x]])
+        mask = np.ones_like(y, dtype=bool)
+        mask[1, 4] = False
+        to_predict = list(range(12, 20))
+
+        params = self.mocked_query_params("?", AWSCostForecastView)
+        instance = AWSForecast(params)
+        results = instance._run_forecast(x, y, to_predict=to_predict, mask=mask)
+
+        self.assertEqual(len(results), 2)
+        for row, result in enumerate(results):
+            with self.subTest(row=row):
+                exog = sm.add_constant(np.array(x, dtype=float)[mask[row]])
+                expected = sm.OLS(y[row][mask[row]], exog).fit()
+                _, expected_lower, expected_upper = wls_prediction_std(
+                    expected, exog=sm.add_constant(np.array(to_predict, dtype=float))
+                )
+                np.testing.assert_allclose([result.intercept, result.slope], expected.params)
+                np.testing.assert_allclose(result.rsquared, expected.rsquared)
+                np.testing.assert_allclose(
+                    [float(pval) for pval in result.pvalues], expected.pvalues, rtol=1e-6, atol=1e-8
+                )
+                np.testing.assert_allclose(result.confidence_lower, expected_lower)
+                np.testing.assert_allclose(result.confidence_upper, expected_upper)
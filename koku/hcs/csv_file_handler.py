@@ -1,12 +1,60 @@
+import csv
+import io
 import logging
-import os
+from itertools import chain
 
-import pandas as pd
+from django.conf import settings
 
 from api.common import log_json
-from masu.util.aws.common import copy_local_hcs_report_file_to_s3_bucket
+from masu.util.aws.common import copy_hcs_data_to_s3_bucket
 
 LOG = logging.getLogger(__name__)
+CSV_ENCODE_CHUNK_SIZE = 64 * 1024
+
+
+class CSVRowReader(io.RawIOBase):
+    """
+    A read-only file object returning the rows of a query result encoded as CSV.
+
+    Rows are encoded only as the reader asks for bytes, so a multipart upload reading from it
+    holds a few parts in memory instead of the whole report.
+
+    Values are written with str(). Unlike the pandas written reports, integer columns that
+    contain nulls keep their integer format ("1", not "1.0"); HCS consumers must accept both.
+    """
+
+    def __init__(self, cols, rows):
+        """Wrap the column names and an iterable of rows."""
+        self._chunks = self._encode(cols, rows)
+        self._buffer = bytearray()
+
+    @staticmethod
+    def _encode(cols, rows):
+        text = io.StringIO()
+        # pandas wrote these files before, keep its line terminator
+        writer = csv.writer(text, lineterminator="\n")
+        for row in chain([cols], rows):
+            writer.writerow(row)
+            if text.tell() >= CSV_ENCODE_CHUNK_SIZE:
+                yield text.getvalue().encode("utf-8")
+                text.seek(0)
+                text.truncate()
+        yield text.getvalue().encode("utf-8")
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        size = len(b)
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        count = min(size, len(self._buffer))
+        b[:count] = self._buffer[:count]
+        del self._buffer[:count]
+        return count
 
 
 class CSVFileHandler:
@@ -20,16 +68,15 @@ class CSVFileHandler:
 
     def write_csv_to_s3(self, date, data, cols, finalize=False, tracing_id=None):
         """
-        Generates an HCS CSV from the specified schema and provider.
+        Streams an HCS CSV from the specified schema and provider to object storage.
         :param date
-        :param data
+        :param data    an iterable of rows, read once
         :param cols
         :param finalize
         :param tracing_id
 
         :return none
         """
-        my_df = pd.DataFrame(data)
         filename = f"hcs_{date}.csv"
         month = date.strftime("%m")
         year = date.strftime("%Y")
@@ -38,6 +85,7 @@ class CSVFileHandler:
         )
 
         LOG.info(log_json(tracing_id, msg="preparing to write file to object storage"))
-        my_df.to_csv(filename, header=cols, index=False)
-        copy_local_hcs_report_file_to_s3_bucket(tracing_id, s3_csv_path, filename, filename, finalize, date)
-        os.remove(filename)
+        if not settings.ENABLE_S3_ARCHIVING:
+            return
+        with CSVRowReader(cols, data) as csv_reader:
+            copy_hcs_data_to_s3_bucket(tracing_id, s3_csv_path, filename, csv_reader, finalize, date)
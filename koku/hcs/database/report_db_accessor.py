@@ -5,6 +5,8 @@
 """Database accessor for report data."""
 import logging
 import pkgutil
+from contextlib import closing
+from itertools import chain
 
 from api.common import log_json
 from api.iam.models import Customer
@@ -81,20 +83,22 @@ class HCSReportDBAccessor(ReportDBAccessorBase):
             # trino-python-client 0.321.0 released a breaking change to map results to python types by default
             # This altered the timestamp values present in generated CSVs, impacting consumers of these files
             # legacy_primitive_types restores previous functionality of using primitive types
-            data, description = self._execute_trino_raw_sql_query_with_description(
+            description, rows = self._execute_trino_raw_sql_query_stream(
                 sql, sql_params=sql_params, conn_params={"legacy_primitive_types": True}
             )
-            # The format for the description is:
-            # [(name, type_code, display_size, internal_size, precision, scale, null_ok)]
-            # col[0] grabs the column names from the query results
-            cols = [col[0] for col in description]
+            with closing(rows):
+                first_row = next(rows, None)
 
-            if len(data) > 0:
-                LOG.info(log_json(tracing_id, msg="data found", context=ctx))
-                csv_handler = CSVFileHandler(self.schema, provider, provider_uuid)
-                csv_handler.write_csv_to_s3(date, data, cols, finalize, tracing_id)
-            else:
-                LOG.info(log_json(tracing_id, msg="no data found", context=ctx))
+                if first_row is not None:
+                    # The format for the description is:
+                    # [(name, type_code, display_size, internal_size, precision, scale, null_ok)]
+                    # col[0] grabs the column names from the query results
+                    cols = [col[0] for col in description]
+                    LOG.info(log_json(tracing_id, msg="data found", context=ctx))
+                    csv_handler = CSVFileHandler(self.schema, provider, provider_uuid)
+                    csv_handler.write_csv_to_s3(date, chain([first_row], rows), cols, finalize, tracing_id)
+                else:
+                    LOG.info(log_json(tracing_id, msg="no data found", context=ctx))
 
         except FileNotFoundError:
             LOG.error(log_json(tracing_id, msg=f"unable to locate SQL file: {sql_summary_file}"))
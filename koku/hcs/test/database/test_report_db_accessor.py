@@ -4,9 +4,10 @@
 #
 """Test HCSReportDBAccessor."""
 from datetime import timedelta
-from unittest.mock import MagicMock
 from unittest.mock import patch
 
+from django.test.utils import override_settings
+
 from api.models import Provider
 from api.utils import DateHelper
 from hcs.database.report_db_accessor import HCSReportDBAccessor
@@ -17,6 +18,14 @@ def mock_sql_query(self, schema, sql, bind_params=None):
     return "12345"
 
 
+def mock_row_stream(rows, closed):
+    """Mimic the generator returned by _execute_trino_raw_sql_query_stream."""
+    try:
+        yield from rows
+    finally:
+        closed.append(True)
+
+
 class TestHCSReportDBAccessor(HCSTestCase):
     """Test cases for HCS DB Accessor."""
 
@@ -51,10 +60,11 @@ class TestHCSReportDBAccessor(HCSTestCase):
             self.assertRaises(FileNotFoundError)
 
     @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase")
-    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_trino_raw_sql_query_with_description")
-    def test_no_data_hcs_customer(self, mock_dba_query, mock_dba):
+    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_trino_raw_sql_query_stream")
+    def test_no_data_hcs_customer(self, mock_dba_stream, mock_dba):
         """Test no data found for specified date"""
-        mock_dba_query.return_value = (MagicMock(), MagicMock())
+        closed = []
+        mock_dba_stream.return_value = ([("x",)], mock_row_stream([], closed))
 
         with self.assertLogs("hcs.database", "INFO") as _logs:
             hcs_accessor = HCSReportDBAccessor(self.schema)
@@ -67,13 +77,17 @@ class TestHCSReportDBAccessor(HCSTestCase):
             )
             self.assertIn("acquiring marketplace data", _logs.output[0])
             self.assertIn("no data found", _logs.output[1])
+        self.assertTrue(closed)
 
     @patch("hcs.csv_file_handler.CSVFileHandler")
     @patch("hcs.csv_file_handler.CSVFileHandler.write_csv_to_s3")
-    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_trino_raw_sql_query_with_description")
-    def test_data_hcs_customer(self, mock_dba_query, mock_fh_writer, mock_fh):
+    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_trino_raw_sql_query_stream")
+    def test_data_hcs_customer(self, mock_dba_stream, mock_fh_writer, mock_fh):
         """Test data found for specified date"""
-        mock_dba_query.return_value = (MagicMock(), MagicMock())
+        closed = []
+        mock_dba_stream.return_value = ([("x",), ("y",)], mock_row_stream([(1, 2), (3, 4)], closed))
+        written = []
+        mock_fh_writer.side_effect = lambda date, rows, cols, *args: written.extend(rows)
 
         with self.assertLogs("hcs.database", "INFO") as _logs:
             hcs_accessor = HCSReportDBAccessor(self.schema)
@@ -86,3 +100,50 @@ class TestHCSReportDBAccessor(HCSTestCase):
             )
             self.assertIn("acquiring marketplace data", _logs.output[0])
             self.assertIn("data found", _logs.output[1])
+            self.assertNotIn("no data found", _logs.output[1])
+            cols = mock_fh_writer.call_args.args[2]
+            self.assertEqual(written, [(1, 2), (3, 4)])
+            self.assertEqual(cols, ["x", "y"])
+        self.assertTrue(closed)
+
+    @patch("hcs.csv_file_handler.CSVFileHandler")
+    @patch("hcs.csv_file_handler.CSVFileHandler.write_csv_to_s3")
+    @patch("masu.database.report_db_accessor_base.ReportDBAccessorBase._execute_trino_raw_sql_query_stream")
+    def test_data_hcs_customer_unread_rows_closed(self, mock_dba_stream, mock_fh_writer, mock_fh):
+        """Test the row stream is closed when the writer does not read it."""
+        closed = []
+        mock_dba_stream.return_value = ([("x",), ("y",)], mock_row_stream([(1, 2), (3, 4)], closed))
+
+        hcs_accessor = HCSReportDBAccessor(self.schema)
+        hcs_accessor.get_hcs_daily_summary(
+            self.today,
+            self.provider,
+            self.provider_uuid,
+            "sql/reporting_aws_hcs_daily_summary.sql",
+            "1234-1234-1234",
+        )
+        mock_fh_writer.assert_called_once()
+        self.assertTrue(closed)
+
+    @override_settings(TRINO_CONNECTION_REUSE=False)
+    @patch("koku.trino_database.connect")
+    def test_row_stream_releases_cursor(self, mock_connect):
+        """Test the row stream cancels the query and closes the connection when closed or exhausted."""
+        trino_cur = mock_connect.return_value.cursor.return_value
+        trino_cur.description = [("x",)]
+        hcs_accessor = HCSReportDBAccessor(self.schema)
+
+        trino_cur.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        description, rows = hcs_accessor._execute_trino_raw_sql_query_stream("SELECT 1", batch_size=2)
+        self.assertEqual(description, [("x",)])
+        self.assertEqual(list(rows), [(1,), (2,), (3,)])
+        mock_connect.return_value.close.assert_called_once()
+
+        mock_connect.reset_mock()
+        trino_cur.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        _, rows = hcs_accessor._execute_trino_raw_sql_query_stream("SELECT 1", batch_size=2)
+        mock_connect.return_value.close.assert_not_called()
+        rows.close()
+        trino_cur.cancel.assert_called_once()
+        mock_connect.return_value.close.assert_called_once()
+        self.assertEqual(trino_cur.fetchmany.call_count, 1)
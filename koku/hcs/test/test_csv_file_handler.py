@@ -3,16 +3,39 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test HCS csv_file_handler."""
+import tracemalloc
 from unittest.mock import patch
 
 from dateutil import parser
+from django.test import override_settings
 
 from api.models import Provider
 from api.utils import DateHelper
 from hcs.csv_file_handler import CSVFileHandler
+from hcs.csv_file_handler import CSVRowReader
 from hcs.test import HCSTestCase
 
 
+class FakeS3Object:
+    """A stand-in for a boto3 S3 Object that reads an upload in parts and keeps only its summary."""
+
+    def __init__(self, bucket_name, key):
+        self.key = key
+        self.parts = 0
+        self.size = 0
+        self.lines = 0
+        self.head = b""
+        self.extra_args = None
+
+    def upload_fileobj(self, data, ExtraArgs, Config):
+        self.extra_args = ExtraArgs
+        while part := data.read(Config.multipart_chunksize):
+            self.parts += 1
+            self.size += len(part)
+            self.lines += part.count(b"\n")
+            self.head = self.head or part[:200]
+
+
 class TestHCSCSVFileHandler(HCSTestCase):
     """Test cases for HCS CSV File Handler"""
 
@@ -39,3 +62,53 @@ class TestHCSCSVFileHandler(HCSTestCase):
             fh.write_csv_to_s3(parser.parse("2022-04-04"), data.items(), "1234-1234-1234")
 
             self.assertIn("preparing to write file to object storage", _logs.output[0])
+
+    def test_csv_row_reader(self):
+        """Test that the rows are encoded like the pandas written CSV."""
+        reader = CSVRowReader(["x", "y", "z"], [("1", None, 2.5), ("a,b", 3, "")])
+        self.assertEqual(reader.read(), b'x,y,z\n1,,2.5\n"a,b",3,\n')
+        self.assertEqual(reader.read(), b"")
+
+    def test_csv_row_reader_integers_with_nulls(self):
+        """Test that integer columns containing nulls are written as integers, not upcast to floats."""
+        reader = CSVRowReader(["usage", "count"], [(1, None), (None, 2), (3, 4)])
+        self.assertEqual(reader.read(), b"usage,count\n1,\n,2\n3,4\n")
+
+    @override_settings(ENABLE_S3_ARCHIVING=True, S3_MULTIPART_CHUNKSIZE=5 * 1024 * 1024)
+    def test_write_csv_to_s3_streams_rows(self):
+        """Test that a large report is uploaded in parts without holding it in memory."""
+        row_count = 400000
+        cols = ["lineitem_usagestartdate", "bill_billingentity", "lineitem_lineitemdescription", "id", "cost", "tag"]
+        rows = (
+            ("2022-04-04 00:00:00.000", "AWS Marketplace", "Red Hat Enterprise Linux", i, i * 0.01, None)
+            for i in range(row_count)
+        )
+        uploads = []
+
+        def fake_object(bucket_name, key):
+            uploads.append(FakeS3Object(bucket_name, key))
+            return uploads[-1]
+
+        with patch("masu.util.aws.common.get_s3_resource") as mock_resource:
+            mock_resource.return_value.Object.side_effect = fake_object
+            fh = CSVFileHandler(self.schema, self.provider, self.provider_uuid)
+            tracemalloc.start()
+            try:
+                fh.write_csv_to_s3(parser.parse("2022-04-04").date(), rows, cols, True, "1234-1234-1234")
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        self.assertEqual(len(uploads), 1)
+        upload = uploads[0]
+        self.assertEqual(
+            upload.key,
+            f"hcs/csv/org1234567/AWS/source={self.provider_uuid}/year=2022/month=04/hcs_2022-04-04.csv",
+        )
+        self.assertEqual(upload.extra_args, {"Metadata": {"finalized": "True"}})
+        self.assertTrue(upload.head.startswith(b",".join(col.encode() for col in cols) + b"\n"))
+        self.assertEqual(upload.lines, row_count + 1)
+        self.assertGreater(upload.parts, 5)
+        # the report is about 31MB, the memory allocated while streaming it stays at a few 5MB parts
+        self.assertGreater(upload.size, 28 * 1024 * 1024)
+        self.assertLess(peak_memory, 26 * 1024 * 1024)
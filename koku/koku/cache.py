@@ -3,16 +3,27 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Cache functions."""
+import hashlib
+import json
 import logging
+from uuid import uuid4
 
-from django.conf import settings
 from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.core.cache.backends.dummy import DummyCache
 from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django_redis import get_redis_connection
+from django_redis.cache import omit_exception
 from django_redis.cache import RedisCache
-from redis import Redis
+from django_redis.client import DefaultClient
+from django_redis.exceptions import ConnectionInterrupted
+from django_tenants.utils import schema_context
+from prometheus_client import Counter
+from redis.exceptions import RedisError
 
 from api.provider.models import Provider
+from api.utils import DateHelper
 
 
 class KokuCacheError(Exception):
@@ -33,6 +44,102 @@ OPENSHIFT_AZURE_CACHE_PREFIX = "openshift-azure-view"
 OPENSHIFT_GCP_CACHE_PREFIX = "openshift-gcp-view"
 OPENSHIFT_ALL_CACHE_PREFIX = "openshift-all-view"
 SOURCES_CACHE_PREFIX = "sources"
+OCP_ON_CLOUD_CACHE_PREFIX = "ocp-on-cloud"
+
+# Keys written by django's cache_page are views.decorators.cache.cache_(page|header).<key_prefix>.<hashes>
+VIEW_CACHE_KEY_PREFIX = "views.decorators.cache."
+TENANT_CACHE_INDEX = "cache-index"
+TENANT_CACHE_DELETE_BATCH_SIZE = 1000
+
+DATA_VERSION_KEY = "data-version"
+REPORT_RESULT_KEY = "report-result"
+# query parameters whose order changes the shape of a report
+ORDERED_REPORT_PARAMETERS = ("group_by", "order_by")
+PROVIDER_CACHE_PREFIXES = {
+    Provider.PROVIDER_AWS: AWS_CACHE_PREFIX,
+    Provider.PROVIDER_AZURE: AZURE_CACHE_PREFIX,
+    Provider.PROVIDER_GCP: GCP_CACHE_PREFIX,
+    Provider.PROVIDER_OCI: OCI_CACHE_PREFIX,
+    Provider.PROVIDER_OCP: OPENSHIFT_CACHE_PREFIX,
+    Provider.OCP_AWS: OPENSHIFT_AWS_CACHE_PREFIX,
+    Provider.OCP_AZURE: OPENSHIFT_AZURE_CACHE_PREFIX,
+    Provider.OCP_GCP: OPENSHIFT_GCP_CACHE_PREFIX,
+    Provider.OCP_ALL: OPENSHIFT_ALL_CACHE_PREFIX,
+}
+
+REPORT_CACHE_HIT_COUNTER = Counter("hccm_report_cache_hit", "Reports served from the result cache", ["provider"])
+REPORT_CACHE_MISS_COUNTER = Counter("hccm_report_cache_miss", "Reports missing from the result cache", ["provider"])
+REPORT_NOT_MODIFIED_COUNTER = Counter(
+    "hccm_report_not_modified", "Reports answered with 304 Not Modified", ["provider"]
+)
+
+
+def tenant_cache_index_key(schema_name, cache_key_prefix=None):
+    """Return the Redis set indexing a tenant's cache keys for a prefix, or the tenant's prefixes."""
+    if cache_key_prefix is None:
+        return f"{schema_name}:{TENANT_CACHE_INDEX}"
+    return f"{schema_name}:{TENANT_CACHE_INDEX}:{cache_key_prefix}"
+
+
+class TenantCacheIndexClient(DefaultClient):
+    """django-redis client that indexes cached views by tenant and cache key prefix.
+
+    Every view cached through cache_page is added to a Redis set per tenant and key prefix,
+    so a tenant's views can be invalidated without scanning the whole keyspace.
+    """
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False, xx=False):
+        """Set the value and index view cache keys."""
+        result = super().set(key, value, timeout=timeout, version=version, client=client, nx=nx, xx=xx)
+        if result and isinstance(key, str) and key.startswith(VIEW_CACHE_KEY_PREFIX):
+            cache_key_prefix = key[len(VIEW_CACHE_KEY_PREFIX) :].split(".")[1]
+            if cache_key_prefix:
+                self.index_key(connection.schema_name, cache_key_prefix, key, timeout, version, client)
+        return result
+
+    def index_key(self, schema_name, cache_key_prefix, key, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        """Add a key to the tenant index of cache_key_prefix."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self._backend.default_timeout
+        if client is None:
+            client = self.get_client(write=True)
+        index_key = tenant_cache_index_key(schema_name, cache_key_prefix)
+        prefixes_key = tenant_cache_index_key(schema_name)
+        pipeline = client.pipeline(transaction=False)
+        pipeline.sadd(index_key, self.make_key(key, version=version))
+        pipeline.sadd(prefixes_key, cache_key_prefix)
+        if timeout:
+            # the index lives as long as the keys it points to
+            pipeline.expire(index_key, int(timeout))
+            pipeline.expire(prefixes_key, int(timeout))
+        try:
+            pipeline.execute()
+        except RedisError as err:
+            # raised like the client's own commands so omit_exception honours IGNORE_EXCEPTIONS
+            raise ConnectionInterrupted(connection=client) from err
+
+
+def _invalidate_indexed_cache(client, schema_name, cache_key_prefix=None):
+    """Delete the keys indexed for a tenant and prefix, or for all of the tenant's prefixes."""
+    if cache_key_prefix:
+        cache_key_prefixes = [cache_key_prefix]
+    else:
+        cache_key_prefixes = [
+            prefix.decode("utf-8") for prefix in client.smembers(tenant_cache_index_key(schema_name))
+        ]
+
+    for prefix in cache_key_prefixes:
+        index_key = tenant_cache_index_key(schema_name, prefix)
+        # read and drop the index atomically so keys indexed meanwhile are not lost
+        pipeline = client.pipeline(transaction=True)
+        pipeline.smembers(index_key)
+        pipeline.delete(index_key)
+        keys, _ = pipeline.execute()
+        keys = list(keys)
+        pipeline = client.pipeline(transaction=False)
+        for i in range(0, len(keys), TENANT_CACHE_DELETE_BATCH_SIZE):
+            pipeline.delete(*keys[i : i + TENANT_CACHE_DELETE_BATCH_SIZE])
+        pipeline.execute()
 
 
 def invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix=None):
@@ -41,20 +148,23 @@ def invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix
     If cache_key_prefix is None, all views will be invalidated.
     """
     cache = caches["default"]
-    if isinstance(cache, RedisCache):  # pragma: no cover
-        cache = Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            **settings.REDIS_CONNECTION_POOL_KWARGS,
-        )
-        all_keys = cache.keys("*")
-        all_keys = [key.decode("utf-8") for key in all_keys]
+    if isinstance(cache, RedisCache):
+        # views are indexed per tenant and prefix by TenantCacheIndexClient
+        _invalidate_indexed_cache(get_redis_connection("default"), schema_name, cache_key_prefix)
     elif isinstance(cache, LocMemCache):
         all_keys = cache._cache.keys()
         all_keys = list(all_keys)
         all_keys = [key.split(":") for key in all_keys]
         all_keys = [":".join(splits[-2:]) for splits in all_keys]
+
+        if cache_key_prefix:
+            keys_to_invalidate = [key for key in all_keys if (schema_name in key and cache_key_prefix in key)]
+        else:
+            # Invalidate all cached views for the tenant
+            keys_to_invalidate = [key for key in all_keys if schema_name in key]
+
+        for key in keys_to_invalidate:
+            cache.delete(key)
     elif isinstance(cache, DummyCache):
         LOG.info("Skipping cache invalidation because views caching is disabled.")
         return
@@ -62,21 +172,77 @@ def invalidate_view_cache_for_tenant_and_cache_key(schema_name, cache_key_prefix
         msg = "Using an unsupported caching backend!"
         raise KokuCacheError(msg)
 
-    all_keys = all_keys if all_keys is not None else []
-
     if cache_key_prefix:
-        keys_to_invalidate = [key for key in all_keys if (schema_name in key and cache_key_prefix in key)]
+        bump_data_version(schema_name, cache_key_prefix)
     else:
-        # Invalidate all cached views for the tenant
-        keys_to_invalidate = [key for key in all_keys if schema_name in key]
-
-    for key in keys_to_invalidate:
-        cache.delete(key)
+        for prefix in PROVIDER_CACHE_PREFIXES.values():
+            bump_data_version(schema_name, prefix)
 
     msg = f"Invalidated request cache for\n\ttenant: {schema_name}\n\tcache_key_prefix: {cache_key_prefix}"
     LOG.info(msg)
 
 
+def get_data_version(schema_name, cache_key_prefix):
+    """Return the version of a tenant's data behind the views of cache_key_prefix.
+
+    None is returned when the cache cannot hold the version, e.g. when views caching is disabled.
+    """
+    cache = caches["default"]
+    key = f"{DATA_VERSION_KEY}:{cache_key_prefix}"
+    with schema_context(schema_name):
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid4().hex, None)
+            version = cache.get(key)
+    return version
+
+
+def bump_data_version(schema_name, cache_key_prefix):
+    """Give a tenant's data behind the views of cache_key_prefix a new version."""
+    cache = caches["default"]
+    with schema_context(schema_name):
+        cache.set(f"{DATA_VERSION_KEY}:{cache_key_prefix}", uuid4().hex, None)
+
+
+def get_report_etag(version, request):
+    """Return the ETag of a report request at a data version.
+
+    Only the request and the current date are hashed, so a matching If-None-Match is answered before
+    any query runs, and relative time windows (e.g. time_scope_value=-10) get a new ETag at midnight.
+    """
+    request_data = [
+        request.path,
+        sorted(request.GET.lists()),
+        request.META.get("HTTP_ACCEPT"),
+        request.user.access,
+        DateHelper().today.date(),
+    ]
+    digest = hashlib.sha256(json.dumps(request_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f'"{version}-{digest[:32]}"'
+
+
+def get_report_result_key(version, path, parameters):
+    """Return the result cache key of validated report parameters at a data version.
+
+    Parameters are normalized so that queries listing them in a different order share an entry.
+    The current date is part of the key because the parameters may describe a relative time window.
+    """
+
+    def normalize(value):
+        if isinstance(value, dict):
+            return {key: normalize(val) for key, val in sorted(value.items())}
+        return value
+
+    normalized = {
+        key: value if key in ORDERED_REPORT_PARAMETERS else normalize(value)
+        for key, value in sorted(parameters.items())
+    }
+    digest = hashlib.sha256(
+        json.dumps([path, normalized, DateHelper().today.date()], default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{REPORT_RESULT_KEY}:{version}:{digest}"
+
+
 def invalidate_view_cache_for_tenant_and_source_type(schema_name, source_type):
     """ "Invalidate our view cache for a specific tenant and source type."""
     cache_key_prefixes = ()
@@ -130,6 +296,7 @@ def set_cached_matching_tags(schema_name, provider_type, matched_tags):
     cache = caches["default"]
     cache_key = f"OCP-on-{provider_type}:{schema_name}:matching-tags"
     cache.set(cache_key, matched_tags)
+    _index_tenant_cache_key(cache, schema_name, cache_key)
 
 
 def get_cached_infra_map(schema_name, provider_type, provider_uuid):
@@ -144,3 +311,16 @@ def set_cached_infra_map(schema_name, provider_type, provider_uuid, infra_map):
     cache = caches["default"]
     cache_key = f"OCP-on-{provider_type}:{schema_name}:{provider_uuid}:infra-map"
     cache.set(cache_key, infra_map)
+    _index_tenant_cache_key(cache, schema_name, cache_key)
+
+
+def _index_tenant_cache_key(cache, schema_name, cache_key):
+    """Index a tenant key that is not a view so invalidating all of the tenant's cache removes it."""
+    if isinstance(cache, RedisCache) and isinstance(cache.client, TenantCacheIndexClient):
+        _index_redis_cache_key(cache, schema_name, cache_key)
+
+
+@omit_exception
+def _index_redis_cache_key(cache, schema_name, cache_key):
+    """Index the key like a RedisCache method, so a Redis outage is ignored like the cache write before it."""
+    cache.client.index_key(schema_name, OCP_ON_CLOUD_CACHE_PREFIX, cache_key)
@@ -277,6 +277,11 @@ def init_worker(**kwargs):
     LOG.debug("Initializing UNLEASH_CLIENT for celery worker.")
     UNLEASH_CLIENT.initialize_client()
 
+    if settings.WORKER_CACHE_REDIS:
+        from masu.processor.worker_cache import start_worker_heartbeat
+
+        start_worker_heartbeat()
+
 
 @worker_process_shutdown.connect
 def shutdown_worker(**kwargs):
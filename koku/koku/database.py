@@ -299,6 +299,51 @@ def fast_table_exists(table_name):
         return rec is not None and rec[0] is not None and rec[0] > 0
 
 
+def get_active_partitions(model):
+    """Returns the names of the attached partitions of a partitioned model in the current schema."""
+    if not hasattr(model, "PartitionInfo"):
+        return []
+    PartitionedTable = get_model("PartitionedTable")
+    return list(
+        PartitionedTable.objects.filter(
+            schema_name=transaction.get_connection().schema_name,
+            partition_of_table_name=model._meta.db_table,
+            active=True,
+        )
+        .order_by("table_name")
+        .values_list("table_name", flat=True)
+    )
+
+
+def partitioned_delete(model, fk_column, instance_pk_query, partitions, level=0):
+    """
+    Deletes the records of a partitioned model that reference instance_pk_query, one partition at a time.
+    Each DELETE names its partition directly, so only that partition is scanned and locked, and runs in
+    its own transaction so the locks are released before the next partition is touched.
+    Parameters:
+        model (models.Model) : The partitioned model class
+        fk_column (str) : The column of model that references the records of instance_pk_query
+        instance_pk_query (QuerySet) : A values_list("pk") query for the referenced records
+        partitions (list of str) : The partition table names of model
+        level (int) : Recursion depth. This is used in logging only.
+    """
+    schema_name = transaction.get_connection().schema_name
+    pk_sql, pk_params = instance_pk_query.query.sql_with_params()
+    total_count = 0
+    for partition_num, partition in enumerate(partitions, start=1):
+        sql = f'DELETE FROM "{schema_name}"."{partition}" WHERE "{fk_column}" IN ({pk_sql})'
+        with transaction.atomic():
+            set_constraints_immediate()
+            rec_count = execute_compiled_sql(sql, params=pk_params)
+        total_count += rec_count
+        LOG.info(
+            f"Level {level}: deleted {rec_count} records from partition {partition} "
+            f"({partition_num} of {len(partitions)})"
+        )
+    LOG.debug(f"Deleted {total_count} records from {model.__name__}")
+    return total_count
+
+
 def cascade_delete(from_model, instance_pk_query, skip_relations=None, base_model=None, level=0):
     """
     Performs a cascading delete by walking the Django model relations and executing compiled SQL
@@ -340,6 +385,13 @@ def cascade_delete(from_model, instance_pk_query, skip_relations=None, base_mode
                 rec_count = execute_update_sql(related_model.objects.filter(**filterspec), **updatespec)
                 LOG.debug(f"    Updated {rec_count} records in {related_model.__name__}")
         elif model_relation.on_delete.__name__ == "CASCADE":
+            partitions = get_active_partitions(related_model)
+            if partitions and not related_model._meta.related_objects:
+                LOG.debug(f"    Deleting from {len(partitions)} partitions of {related_model.__name__}")
+                partitioned_delete(
+                    related_model, model_relation.remote_field.column, instance_pk_query, partitions, level=level + 1
+                )
+                continue
             filterspec = {f"{model_relation.remote_field.column}__in": models.Subquery(instance_pk_query)}
             related_pk_values = related_model.objects.filter(**filterspec).values_list(related_model._meta.pk.name)
             LOG.debug(f"    Cascading delete to relations of {related_model.__name__}")
@@ -9,15 +9,20 @@ import os
 import random
 import re
 import string
+import threading
 import time
 import uuid
 
 import ciso8601
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
 from django.db import connection as conn
 from django.db import transaction
 from django_tenants.utils import schema_context
+from prometheus_client import Counter
 
+from koku.cache import bump_data_version
+from koku.cache import get_data_version
 from koku.database import get_model
 
 
@@ -1632,6 +1637,8 @@ SELECT * FROM __mv_recs_{self.tx_id} ;
                     self.tracking_rec["partition_parameters"]["to"] = p_to
                     self._attach_partition()
 
+            PARTITION_CATALOG.invalidate(self.schema_name)
+
 
 def get_partitioned_tables_with_default(schema_name=None, partitioned_table_name=None):
     default_partition_sql = """
@@ -1875,6 +1882,132 @@ def get_or_create_partition(part_rec, _default_partition=None):
     return partition, created
 
 
+def get_partition_start(partition):
+    """Return the start date of a RANGE partition tracking record or None for a default partition."""
+    if partition.partition_parameters.get("default"):
+        return None
+    return ciso8601.parse_datetime(str(partition.partition_parameters["from"])).date()
+
+
+# defined here rather than in masu so koku does not import masu; the worker's multiprocess collector exports them
+PARTITION_CATALOG_HIT_COUNTER = Counter(
+    "partition_catalog_hit_count", "Number of partitions found in the partition catalog"
+)
+PARTITION_CATALOG_CREATE_COUNTER = Counter(
+    "partition_catalog_create_count", "Number of partitions created by the partition handler"
+)
+# the data version of a schema's partitions in the default cache, shared by the catalogs of all processes
+PARTITION_CATALOG_VERSION_KEY = "partition-catalog"
+
+
+class PartitionCatalog:
+    """
+    In-process catalog of the RANGE partition tracking records of each schema.
+
+    All of a schema's partitions are loaded with one query and trusted for PARTITION_CATALOG_TTL seconds,
+    so checking every month of every table no longer costs a round trip to the tracking table.
+    Partitions created through the catalog are added to it; code that drops or detaches partitions
+    must call invalidate() for the schema. A TTL of 0 disables the catalog.
+
+    invalidate() also bumps the schema's partition data version in the default cache. Every lookup
+    compares it with the version the schema was loaded at, so partitions dropped by another process
+    are reloaded instead of being reported until the TTL expires. When the default cache is disabled
+    (CACHED_VIEWS_DISABLED) the TTL must stay below the interval of the report data cleaners.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+
+    @property
+    def enabled(self):
+        return settings.PARTITION_CATALOG_TTL > 0
+
+    def _load(self, schema_name):
+        tables = {}
+        with schema_context(schema_name):
+            for partition in PartitionedTable.objects.filter(
+                schema_name=schema_name, partition_type=PartitionedTable.RANGE
+            ):
+                tables.setdefault(partition.partition_of_table_name, []).append(partition)
+        return tables
+
+    def get_partitions(self, schema_name, table_name):
+        """Return the RANGE partition tracking records of a table, including its default partition."""
+        if not self.enabled:
+            with schema_context(schema_name):
+                return list(
+                    PartitionedTable.objects.filter(
+                        schema_name=schema_name,
+                        partition_of_table_name=table_name,
+                        partition_type=PartitionedTable.RANGE,
+                    )
+                )
+
+        now = time.monotonic()
+        # read before loading, so a drop committed during the load makes the next lookup reload
+        version = get_data_version(schema_name, PARTITION_CATALOG_VERSION_KEY)
+        with self._lock:
+            expires, loaded_version, tables = self._schemas.get(schema_name, (0, None, None))
+            if expires > now and loaded_version == version:
+                return list(tables.get(table_name, []))
+
+        tables = self._load(schema_name)
+        with self._lock:
+            self._schemas[schema_name] = (now + settings.PARTITION_CATALOG_TTL, version, tables)
+            return list(tables.get(table_name, []))
+
+    def get_default_partition(self, schema_name, table_name):
+        """Return the default partition tracking record of a table or None if it is not partitioned."""
+        for partition in self.get_partitions(schema_name, table_name):
+            if partition.partition_parameters.get("default"):
+                return partition
+        return None
+
+    def has_partition(self, schema_name, table_name, partition_start):
+        """Return True if the catalog knows a partition of the table starting at partition_start."""
+        if not self.enabled:
+            return False
+        if isinstance(partition_start, datetime.datetime):
+            partition_start = partition_start.date()
+        found = any(
+            get_partition_start(partition) == partition_start
+            for partition in self.get_partitions(schema_name, table_name)
+        )
+        if found:
+            PARTITION_CATALOG_HIT_COUNTER.inc()
+        return found
+
+    def add(self, partition, created=False):
+        """Record a partition tracking record that was found or created outside of the catalog."""
+        if created:
+            PARTITION_CATALOG_CREATE_COUNTER.inc()
+        with self._lock:
+            _, _, tables = self._schemas.get(partition.schema_name, (0, None, None))
+            if tables is None:
+                return
+            partitions = tables.setdefault(partition.partition_of_table_name, [])
+            if all(p.table_name != partition.table_name for p in partitions):
+                partitions.append(partition)
+
+    def invalidate(self, schema_name=None):
+        """
+        Forget the partitions of a schema, or of every schema if no schema is given.
+
+        A schema's partition data version is bumped so the catalogs of other processes reload it too.
+        """
+        with self._lock:
+            if schema_name is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(schema_name, None)
+        if schema_name is not None:
+            bump_data_version(schema_name, PARTITION_CATALOG_VERSION_KEY)
+
+
+PARTITION_CATALOG = PartitionCatalog()
+
+
 class PartitionHandlerMixin:
     def _handle_partitions(self, schema_name, table_names, start_date, end_date):  # noqas: C901
         if isinstance(start_date, datetime.datetime):
@@ -1889,12 +2022,7 @@ class PartitionHandlerMixin:
             table_names = [table_names]
 
         for table_name in table_names:
-            default_part = PartitionedTable.objects.filter(
-                schema_name=schema_name,
-                partition_of_table_name=table_name,
-                partition_type=PartitionedTable.RANGE,
-                partition_parameters__default=True,
-            ).first()
+            default_part = PARTITION_CATALOG.get_default_partition(schema_name, table_name)
             if default_part:
                 partition_start = start_date.replace(day=1)
                 month_interval = relativedelta(months=1)
@@ -1915,12 +2043,20 @@ class PartitionHandlerMixin:
                     else:
                         needed_partition = needed_partition + month_interval
 
+                    if PARTITION_CATALOG.has_partition(schema_name, table_name, needed_partition):
+                        continue
+
                     partition_name = f"{table_name}_{needed_partition.strftime('%Y_%m')}"
                     newpart_vals["table_name"] = partition_name
-                    newpart_vals["partition_parameters"]["from"] = str(needed_partition)
-                    newpart_vals["partition_parameters"]["to"] = str(needed_partition + month_interval)
+                    # a fresh dict per partition so records kept by the catalog are not changed on the next month
+                    newpart_vals["partition_parameters"] = {
+                        "default": False,
+                        "from": str(needed_partition),
+                        "to": str(needed_partition + month_interval),
+                    }
                     # Successfully creating a new record will also create the partition
                     newpart, created = get_or_create_partition(newpart_vals, _default_partition=default_part)
+                    PARTITION_CATALOG.add(newpart, created)
                     LOG.debug(f"partition = {newpart}")
                     LOG.debug(f"created = {created}")
                     if created:
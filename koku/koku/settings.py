@@ -203,7 +203,21 @@ WORKER_CACHE_LARGE_CUSTOMER_TIMEOUT = ENVIRONMENT.get_value("WORKER_CACHE_LARGE_
 WORKER_CACHE_LARGE_CUSTOMER_CONCURRENT_TASKS = ENVIRONMENT.get_value(
     "WORKER_CACHE_LARGE_CUSTOMER_CONCURRENT_TASKS", default=2
 )
+# Keep worker task locks and concurrency limits in Redis instead of the worker database cache
+WORKER_CACHE_REDIS = ENVIRONMENT.bool("WORKER_CACHE_REDIS", default=False)
+# Seconds a worker is considered alive after its last heartbeat
+WORKER_HEARTBEAT_TIMEOUT = ENVIRONMENT.int("WORKER_HEARTBEAT_TIMEOUT", default=60)
 CACHE_MIDDLEWARE_SECONDS = ENVIRONMENT.get_value("CACHE_TIMEOUT", default=3600)
+# Cache report results per tenant data version and answer unchanged reports with 304 Not Modified
+REPORT_RESULT_CACHE = ENVIRONMENT.bool("REPORT_RESULT_CACHE", default=False)
+# Memoize forecast predictions per tenant data version
+FORECAST_RESULT_CACHE = ENVIRONMENT.bool("FORECAST_RESULT_CACHE", default=False)
+# Stream unpaginated (limit=0) CSV report exports from a server-side cursor instead of building them in memory
+REPORT_CSV_STREAMING = ENVIRONMENT.bool("REPORT_CSV_STREAMING", default=False)
+# Seconds a worker trusts its in-process catalog of table partitions (0 disables the catalog).
+# Partition drops reach other workers through the default cache; with CACHED_VIEWS_DISABLED they do not,
+# so keep the TTL below the interval of the report data cleaners.
+PARTITION_CATALOG_TTL = ENVIRONMENT.int("PARTITION_CATALOG_TTL", default=0)
 
 HOSTNAME = ENVIRONMENT.get_value("HOSTNAME", default="localhost")
 
@@ -241,7 +255,7 @@ else:
             "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
             "TIMEOUT": 3600,  # 1 hour default
             "OPTIONS": {
-                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+                "CLIENT_CLASS": "koku.cache.TenantCacheIndexClient",
                 "IGNORE_EXCEPTIONS": True,
                 "MAX_ENTRIES": 1000,
                 "CONNECTION_POOL_CLASS_KWARGS": REDIS_CONNECTION_POOL_KWARGS,
@@ -344,6 +358,10 @@ REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": DEFAULT_EXCEPTION_HANDLER,
 }
 
+# Rank limit/offset report queries and build their "Others" rows in a single SQL statement instead of pandas.
+# Keep this off until the SQL/pandas ranking parity tests cover every provider report query handler.
+REPORT_SQL_RANKING = ENVIRONMENT.bool("REPORT_SQL_RANKING", default=False)
+
 CW_AWS_ACCESS_KEY_ID = CONFIGURATOR.get_cloudwatch_access_id()
 CW_AWS_SECRET_ACCESS_KEY = CONFIGURATOR.get_cloudwatch_access_key()
 CW_AWS_REGION = CONFIGURATOR.get_cloudwatch_region()
@@ -475,6 +493,13 @@ REQUESTED_ROS_BUCKET = ENVIRONMENT.get_value("REQUESTED_ROS_BUCKET", default="ro
 S3_TIMEOUT = ENVIRONMENT.int("S3_CONNECTION_TIMEOUT", default=60)
 S3_ENDPOINT = CONFIGURATOR.get_object_store_endpoint()
 S3_REGION = ENVIRONMENT.get_value("S3_REGION", default="us-east-1")
+# Background threads uploading parquet and CSV archives, 0 uploads in the calling thread
+S3_UPLOAD_THREADS = ENVIRONMENT.int("S3_UPLOAD_THREADS", default=2)
+S3_MULTIPART_THRESHOLD = ENVIRONMENT.int("S3_MULTIPART_THRESHOLD", default=8 * 1024 * 1024)
+S3_MULTIPART_CHUNKSIZE = ENVIRONMENT.int("S3_MULTIPART_CHUNKSIZE", default=8 * 1024 * 1024)
+S3_MULTIPART_CONCURRENCY = ENVIRONMENT.int("S3_MULTIPART_CONCURRENCY", default=10)
+# Threads issuing delete_objects requests while an archive prefix is listed
+S3_DELETE_THREADS = ENVIRONMENT.int("S3_DELETE_THREADS", default=4)
 S3_BUCKET_PATH = ENVIRONMENT.get_value("S3_BUCKET_PATH", default="data_archive")
 S3_BUCKET_NAME = CONFIGURATOR.get_object_store_bucket(REQUESTED_BUCKET)
 S3_ACCESS_KEY = CONFIGURATOR.get_object_store_access_key(REQUESTED_BUCKET)
@@ -487,6 +512,14 @@ SKIP_MINIO_DATA_DELETION = ENVIRONMENT.bool("SKIP_MINIO_DATA_DELETION", default=
 
 ENABLE_S3_ARCHIVING = ENVIRONMENT.bool("ENABLE_S3_ARCHIVING", default=False)
 PARQUET_PROCESSING_BATCH_SIZE = ENVIRONMENT.int("PARQUET_PROCESSING_BATCH_SIZE", default=200000)
+# Provider types (e.g. "AWS,OCP") whose CSV files are parsed with pyarrow instead of pandas
+PARQUET_ARROW_CSV_PROVIDERS = [
+    provider for provider in ENVIRONMENT.get_value("PARQUET_ARROW_CSV_PROVIDERS", default="").split(",") if provider
+]
+# Number of processes converting the split files of one report to parquet in parallel, 1 converts them serially
+PARQUET_CONVERSION_WORKERS = ENVIRONMENT.int("PARQUET_CONVERSION_WORKERS", default=1)
+# Rebuild OCP UI summary tables in a staging table and only write the rows that changed
+OCP_UI_SUMMARY_INCREMENTAL = ENVIRONMENT.bool("OCP_UI_SUMMARY_INCREMENTAL", default=False)
 
 OCI_CONFIG = {
     "user": ENVIRONMENT.get_value("OCI_CLI_USER", default="OCI_USER"),
@@ -499,6 +532,10 @@ OCI_CONFIG = {
 TRINO_HOST = ENVIRONMENT.get_value("TRINO_HOST", default=None)
 TRINO_PORT = ENVIRONMENT.get_value("TRINO_PORT", default=None)
 TRINO_DATE_STEP = ENVIRONMENT.int("TRINO_DATE_STEP", default=5)
+# Reuse trino connections per worker process and thread
+TRINO_CONNECTION_REUSE = ENVIRONMENT.bool("TRINO_CONNECTION_REUSE", default=False)
+# Seconds to remember that a trino schema or table exists; 0 disables the cache
+TRINO_METADATA_CACHE_TTL = ENVIRONMENT.int("TRINO_METADATA_CACHE_TTL", default=0)
 
 # IBM Settings
 IBM_SERVICE_URL = ENVIRONMENT.get_value("IBM_SERVICE_URL", default="https://enterprise.cloud.ibm.com")
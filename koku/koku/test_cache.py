@@ -4,9 +4,13 @@
 #
 """Test view caching functions."""
 import random
+from unittest.mock import MagicMock
+from unittest.mock import patch
 
 from django.core.cache import caches
+from django.db import connection
 from django.test.utils import override_settings
+from redis.exceptions import ConnectionError as RedisConnectionError
 
 from api.iam.test.iam_test_case import IamTestCase
 from api.provider.models import Provider
@@ -25,6 +29,8 @@ from koku.cache import OPENSHIFT_AZURE_CACHE_PREFIX
 from koku.cache import OPENSHIFT_CACHE_PREFIX
 from koku.cache import set_cached_infra_map
 from koku.cache import set_cached_matching_tags
+from koku.cache import TENANT_CACHE_DELETE_BATCH_SIZE
+from koku.cache import tenant_cache_index_key
 
 
 CACHE_PREFIXES = (
@@ -252,3 +258,95 @@ class KokuCacheTest(IamTestCase):
         self.assertIsNone(initial)
         cached = get_cached_infra_map(schema, provider_type, p_uuid)
         self.assertEqual(cached, infra_map)
+
+
+REDIS_CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://localhost:6379/0",
+        "KEY_FUNCTION": "django_tenants.cache.make_key",
+        "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+        "TIMEOUT": 3600,
+        "OPTIONS": {"CLIENT_CLASS": "koku.cache.TenantCacheIndexClient"},
+    }
+}
+
+REDIS_CACHES_IGNORING_EXCEPTIONS = {
+    "default": {
+        **REDIS_CACHES["default"],
+        "OPTIONS": {**REDIS_CACHES["default"]["OPTIONS"], "IGNORE_EXCEPTIONS": True},
+    }
+}
+
+
+@override_settings(CACHES=REDIS_CACHES)
+class TenantCacheIndexTest(IamTestCase):
+    """Test the Redis tenant cache index."""
+
+    def setUp(self):
+        """Set up a cache with a mocked Redis client."""
+        super().setUp()
+        self.cache = caches["default"]
+        self.redis = MagicMock()
+        self.pipeline = self.redis.pipeline.return_value
+
+    @patch("django_redis.client.DefaultClient.set", return_value=True)
+    def test_set_indexes_view_keys(self, _):
+        """Test that cache_page keys are indexed by tenant and cache key prefix."""
+        key = f"views.decorators.cache.cache_page.{AWS_CACHE_PREFIX}.GET.abc.def.en-us.UTC"
+        with patch.object(self.cache.client, "get_client", return_value=self.redis):
+            self.cache.set(key, "response", 30)
+            self.cache.set("not-a-view", "value", 30)
+
+        index_key = tenant_cache_index_key(connection.schema_name, AWS_CACHE_PREFIX)
+        self.pipeline.sadd.assert_any_call(index_key, self.cache.client.make_key(key))
+        self.pipeline.sadd.assert_any_call(tenant_cache_index_key(connection.schema_name), AWS_CACHE_PREFIX)
+        self.pipeline.expire.assert_any_call(index_key, 30)
+        self.assertEqual(self.pipeline.execute.call_count, 1)
+
+    @patch("django_redis.client.DefaultClient.set", return_value=True)
+    def test_index_tenant_cache_key_redis_outage(self, _):
+        """Test that a Redis outage while indexing a tenant key degrades to a cache miss."""
+        self.pipeline.execute.side_effect = RedisConnectionError("Connection refused")
+        with override_settings(CACHES=REDIS_CACHES_IGNORING_EXCEPTIONS):
+            with patch.object(caches["default"].client, "get_client", return_value=self.redis):
+                set_cached_matching_tags(self.schema_name, Provider.PROVIDER_AWS, [{"key": "value"}])
+                set_cached_infra_map(self.schema_name, Provider.PROVIDER_AWS, "uuid", {"key": "value"})
+        self.assertEqual(self.pipeline.execute.call_count, 2)
+
+        with patch.object(caches["default"].client, "get_client", return_value=self.redis):
+            with self.assertRaises(RedisConnectionError):
+                set_cached_matching_tags(self.schema_name, Provider.PROVIDER_AWS, [{"key": "value"}])
+
+    @patch("koku.cache.get_redis_connection")
+    def test_invalidate_view_cache_for_tenant_and_cache_key(self, mock_connection):
+        """Test that only the indexed keys of a tenant prefix are deleted, in batches."""
+        mock_connection.return_value = self.redis
+        keys = {f"key-{i}".encode() for i in range(TENANT_CACHE_DELETE_BATCH_SIZE + 1)}
+        self.pipeline.execute.side_effect = [[keys, 1], [TENANT_CACHE_DELETE_BATCH_SIZE, 1]]
+
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name, AWS_CACHE_PREFIX)
+
+        self.redis.keys.assert_not_called()
+        self.pipeline.smembers.assert_called_once_with(tenant_cache_index_key(self.schema_name, AWS_CACHE_PREFIX))
+        deleted = [key for call in self.pipeline.delete.call_args_list[1:] for key in call.args]
+        self.assertEqual(set(deleted), keys)
+        self.assertEqual(self.pipeline.delete.call_count, 3)
+
+    @patch("koku.cache.get_redis_connection")
+    def test_invalidate_view_cache_for_tenant(self, mock_connection):
+        """Test that every indexed prefix of a tenant is invalidated when no prefix is given."""
+        mock_connection.return_value = self.redis
+        self.redis.smembers.return_value = {AWS_CACHE_PREFIX.encode(), OPENSHIFT_CACHE_PREFIX.encode()}
+        self.pipeline.execute.return_value = [set(), 0]
+
+        invalidate_view_cache_for_tenant_and_cache_key(self.schema_name)
+
+        self.redis.smembers.assert_called_once_with(tenant_cache_index_key(self.schema_name))
+        self.assertCountEqual(
+            [call.args[0] for call in self.pipeline.smembers.call_args_list],
+            [
+                tenant_cache_index_key(self.schema_name, AWS_CACHE_PREFIX),
+                tenant_cache_index_key(self.schema_name, OPENSHIFT_CACHE_PREFIX),
+            ],
+        )
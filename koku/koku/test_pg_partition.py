@@ -5,8 +5,10 @@
 import datetime
 import json
 import uuid
+from unittest.mock import patch
 
 from django.db import connection as conn
+from django.test.utils import override_settings
 from django_tenants.utils import schema_context
 
 from . import pg_partition as ppart
@@ -425,6 +427,137 @@ select count(*) from {self.SCHEMA_NAME}.{DEFAULT_PART_NAME} ;
             p02.delete()
             ppart._get_or_create_default_partition(part_rec)[0].delete()
 
+    def _create_catalog_test_partition(self):
+        part_rec = {
+            "schema_name": self.SCHEMA_NAME,
+            "table_name": self.PARTITIONED_TABLE_NAME + "_2021_01",
+            "partition_of_table_name": self.PARTITIONED_TABLE_NAME,
+            "partition_type": PartitionedTable.RANGE,
+            "partition_col": "utilization_date",
+            "partition_parameters": {"default": False, "from": "2021-01-01", "to": "2021-02-01"},
+            "active": True,
+        }
+        return ppart.get_or_create_partition(part_rec)[0]
+
+    @override_settings(PARTITION_CATALOG_TTL=60)
+    def test_partition_catalog_loads_schema_once(self):
+        """Test that the partition catalog answers repeated lookups from one load of the schema"""
+        with schema_context(self.SCHEMA_NAME):
+            self.drop_all_partitions()
+            self._create_catalog_test_partition()
+            catalog = ppart.PartitionCatalog()
+            with patch.object(catalog, "_load", wraps=catalog._load) as mock_load:
+                self.assertTrue(
+                    catalog.has_partition(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, datetime.date(2021, 1, 1))
+                )
+                self.assertTrue(
+                    catalog.has_partition(
+                        self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, datetime.datetime(2021, 1, 1, 0, 0)
+                    )
+                )
+                self.assertFalse(
+                    catalog.has_partition(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, datetime.date(2021, 2, 1))
+                )
+                default = catalog.get_default_partition(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME)
+                self.assertEqual(default.table_name, f"{self.PARTITIONED_TABLE_NAME}_default")
+                mock_load.assert_called_once_with(self.SCHEMA_NAME)
+
+                catalog.invalidate(self.SCHEMA_NAME)
+                catalog.get_partitions(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME)
+                self.assertEqual(mock_load.call_count, 2)
+
+            self.drop_all_partitions()
+
+    @override_settings(
+        PARTITION_CATALOG_TTL=60,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "partition-catalog",
+                "KEY_FUNCTION": "django_tenants.cache.make_key",
+                "REVERSE_KEY_FUNCTION": "django_tenants.cache.reverse_key",
+            }
+        },
+    )
+    def test_partition_catalog_invalidated_by_other_process(self):
+        """Test that partitions dropped through another process's catalog are reloaded"""
+        with schema_context(self.SCHEMA_NAME):
+            self.drop_all_partitions()
+            self._create_catalog_test_partition()
+            catalog = ppart.PartitionCatalog()
+            other_catalog = ppart.PartitionCatalog()
+            self.assertTrue(
+                catalog.has_partition(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, datetime.date(2021, 1, 1))
+            )
+
+            self.drop_all_partitions()
+            other_catalog.invalidate(self.SCHEMA_NAME)
+            with patch.object(catalog, "_load", wraps=catalog._load) as mock_load:
+                self.assertFalse(
+                    catalog.has_partition(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, datetime.date(2021, 1, 1))
+                )
+                catalog.get_partitions(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME)
+                mock_load.assert_called_once_with(self.SCHEMA_NAME)
+
+    @override_settings(PARTITION_CATALOG_TTL=60)
+    def test_partition_catalog_add(self):
+        """Test that partitions created after the catalog was loaded are added to it"""
+        with schema_context(self.SCHEMA_NAME):
+            self.drop_all_partitions()
+            catalog = ppart.PartitionCatalog()
+            self.assertEqual(catalog.get_partitions(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME), [])
+
+            p = self._create_catalog_test_partition()
+            catalog.add(p, True)
+            catalog.add(p, False)
+            self.assertEqual(catalog.get_partitions(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME), [p])
+            self.assertTrue(
+                catalog.has_partition(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, datetime.date(2021, 1, 1))
+            )
+
+            self.drop_all_partitions()
+
+    @override_settings(PARTITION_CATALOG_TTL=0)
+    def test_partition_catalog_disabled(self):
+        """Test that a disabled partition catalog always reads the tracking table"""
+        with schema_context(self.SCHEMA_NAME):
+            self.drop_all_partitions()
+            self._create_catalog_test_partition()
+            catalog = ppart.PartitionCatalog()
+            with patch.object(catalog, "_load") as mock_load:
+                self.assertFalse(
+                    catalog.has_partition(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, datetime.date(2021, 1, 1))
+                )
+                partitions = catalog.get_partitions(self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME)
+                self.assertEqual(len(partitions), 2)
+                mock_load.assert_not_called()
+
+            self.drop_all_partitions()
+
+    @override_settings(PARTITION_CATALOG_TTL=60)
+    def test_handle_partitions_skips_known_partitions(self):
+        """Test that the partition handler only creates the partitions missing from the catalog"""
+        with schema_context(self.SCHEMA_NAME):
+            self.drop_all_partitions()
+            self._create_catalog_test_partition()
+            ppart.PARTITION_CATALOG.invalidate(self.SCHEMA_NAME)
+            with patch(
+                "koku.pg_partition.get_or_create_partition", wraps=ppart.get_or_create_partition
+            ) as mock_create:
+                ppart.PartitionHandlerMixin()._handle_partitions(
+                    self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, "2021-01-15", "2021-02-15"
+                )
+                self.assertEqual(mock_create.call_count, 1)
+                self.assertEqual(mock_create.call_args[0][0]["table_name"], f"{self.PARTITIONED_TABLE_NAME}_2021_02")
+
+                ppart.PartitionHandlerMixin()._handle_partitions(
+                    self.SCHEMA_NAME, self.PARTITIONED_TABLE_NAME, "2021-01-15", "2021-02-15"
+                )
+                self.assertEqual(mock_create.call_count, 1)
+
+            ppart.PARTITION_CATALOG.invalidate(self.SCHEMA_NAME)
+            self.drop_all_partitions()
+
 
 class TestPGPartition(IamTestCase):
     @classmethod
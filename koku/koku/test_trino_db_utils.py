@@ -1,5 +1,8 @@
 import uuid
+from unittest.mock import Mock
+from unittest.mock import patch
 
+from django.test.utils import override_settings
 from jinjasql import JinjaSql
 from trino.dbapi import Connection
 
@@ -108,3 +111,61 @@ select a from b;
         with self.assertRaises(trino_db.TrinoStatementExecError):
             conn = FakerFakeTrinoConn()
             trino_db.executescript(conn, sqlscript)
+
+    @override_settings(TRINO_CONNECTION_REUSE=True)
+    @patch("koku.trino_database.connect", side_effect=lambda **kwargs: Mock())
+    def test_get_connection_reuse(self, mock_connect):
+        """Test that connections are reused per set of connect args."""
+        schema = str(uuid.uuid4())
+        conn = trino_db.get_connection(schema=schema)
+        self.assertIs(trino_db.get_connection(schema=schema), conn)
+        self.assertIsNot(trino_db.get_connection(schema=schema, catalog="postgres"), conn)
+        self.assertEqual(mock_connect.call_count, 2)
+
+    @patch("koku.trino_database.connect", side_effect=lambda **kwargs: Mock())
+    def test_get_connection_no_reuse(self, mock_connect):
+        """Test that a new connection is made for every call when reuse is disabled."""
+        conn = trino_db.get_connection(schema=self.schema_name)
+        self.assertIsNot(trino_db.get_connection(schema=self.schema_name), conn)
+        self.assertEqual(mock_connect.call_count, 2)
+
+    @patch("koku.trino_database.connect", side_effect=lambda **kwargs: Mock())
+    def test_connection_closes_unpooled(self, mock_connect):
+        """Test that the connection context closes connections unless they are reused."""
+        with trino_db.connection(schema=self.schema_name) as conn:
+            conn.close.assert_not_called()
+        conn.close.assert_called_once()
+
+        with override_settings(TRINO_CONNECTION_REUSE=True):
+            with trino_db.connection(schema=str(uuid.uuid4())) as conn:
+                pass
+            conn.close.assert_not_called()
+
+    @override_settings(TRINO_METADATA_CACHE_TTL=300)
+    def test_cached_exists(self):
+        """Test that only existing objects are cached until a drop statement runs."""
+        table = f"__test_{uuid.uuid4().hex}"
+        check = Mock(return_value=[])
+        self.assertFalse(trino_db.cached_exists(check, self.schema_name, table))
+        self.assertFalse(trino_db.cached_exists(check, self.schema_name, table))
+        self.assertEqual(check.call_count, 2)
+
+        check.return_value = [[table]]
+        self.assertTrue(trino_db.cached_exists(check, self.schema_name, table))
+        self.assertTrue(trino_db.cached_exists(check, self.schema_name, table))
+        self.assertEqual(check.call_count, 3)
+
+        trino_db.invalidate_metadata(f"select * from {table}")
+        self.assertTrue(trino_db.cached_exists(check, self.schema_name, table))
+        self.assertEqual(check.call_count, 3)
+
+        trino_db.invalidate_metadata(f"DROP TABLE IF EXISTS hive.{self.schema_name}.{table}")
+        self.assertTrue(trino_db.cached_exists(check, self.schema_name, table))
+        self.assertEqual(check.call_count, 4)
+
+    def test_cached_exists_disabled(self):
+        """Test that nothing is cached when the cache TTL is 0."""
+        check = Mock(return_value=[["eek"]])
+        self.assertTrue(trino_db.cached_exists(check, self.schema_name))
+        self.assertTrue(trino_db.cached_exists(check, self.schema_name))
+        self.assertEqual(check.call_count, 2)
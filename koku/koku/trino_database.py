@@ -1,9 +1,13 @@
 import logging
 import os
 import re
+import threading
+import time
+from contextlib import contextmanager
 
 import sqlparse
 import trino
+from django.conf import settings
 from trino.transaction import IsolationLevel
 
 
@@ -12,6 +16,10 @@ LOG = logging.getLogger(__name__)
 POSITIONAL_VARS = re.compile("%s")
 NAMED_VARS = re.compile(r"%(.+)s")
 EOT = re.compile(r",\s*\)$")  # pylint: disable=anomalous-backslash-in-string
+DROP_STMT = re.compile(r"^\s*drop\s+(table|schema)\b", re.IGNORECASE)
+
+_connections = threading.local()
+_metadata_cache = {}
 
 
 class PreprocessStatementError(Exception):
@@ -50,6 +58,80 @@ def connect(**connect_args):
     return trino.dbapi.connect(**trino_connect_args)
 
 
+def get_connection(**connect_args):
+    """
+    Return a trino connection, reused per process and thread when settings.TRINO_CONNECTION_REUSE is set.
+    Reused connections must not be closed by the caller.
+    Keyword Params:
+        same as connect()
+    Returns:
+        trino.dbapi.Connection : connection to trino if successful
+    """
+    if not settings.TRINO_CONNECTION_REUSE:
+        return connect(**connect_args)
+    # a forked worker must not share the HTTP sessions of its parent
+    if getattr(_connections, "pid", None) != os.getpid():
+        _connections.pid = os.getpid()
+        _connections.pool = {}
+    key = tuple(sorted((arg, str(value)) for arg, value in connect_args.items()))
+    conn = _connections.pool.get(key)
+    if conn is None:
+        conn = _connections.pool[key] = connect(**connect_args)
+    return conn
+
+
+@contextmanager
+def connection(**connect_args):
+    """
+    Yield a trino connection from get_connection() and close it on exit unless it is reused.
+    Keyword Params:
+        same as connect()
+    Yields:
+        trino.dbapi.Connection : connection to trino if successful
+    """
+    reused = settings.TRINO_CONNECTION_REUSE
+    conn = get_connection(**connect_args)
+    try:
+        yield conn
+    finally:
+        if not reused:
+            conn.close()
+
+
+def cached_exists(check, schema_name, table_name=None):
+    """
+    Return whether a trino schema, or a table of it, exists.
+    Only existence is remembered, for settings.TRINO_METADATA_CACHE_TTL seconds, so an object
+    created by another worker is never reported missing because of the cache.
+    Parameters:
+        check (Callable) : Callable taking no args and returning whether the object exists
+        schema_name (str) : trino schema
+        table_name (str, None) : trino table or None to check the schema
+    Returns:
+        bool : True if the object exists
+    """
+    key = (schema_name, table_name)
+    expires = _metadata_cache.get(key)
+    if expires and expires > time.monotonic():
+        return True
+    exists = bool(check())
+    if exists and settings.TRINO_METADATA_CACHE_TTL > 0:
+        _metadata_cache[key] = time.monotonic() + settings.TRINO_METADATA_CACHE_TTL
+    else:
+        _metadata_cache.pop(key, None)
+    return exists
+
+
+def invalidate_metadata(sql):
+    """
+    Forget the cached existence of trino objects when sql drops a table or schema.
+    Parameters:
+        sql (str) : SQL statement about to be executed
+    """
+    if _metadata_cache and DROP_STMT.match(sql):
+        _metadata_cache.clear()
+
+
 def executescript(trino_conn, sqlscript, *, params=None, preprocessor=None):
     """
     Pass in a buffer of one or more semicolon-terminated trino SQL statements and it
@@ -90,6 +172,7 @@ def executescript(trino_conn, sqlscript, *, params=None, preprocessor=None):
             else:
                 stmt, s_params = p_stmt, params
 
+            invalidate_metadata(stmt)
             try:
                 cur = trino_conn.cursor()
                 cur.execute(stmt, params=s_params)
@@ -4,7 +4,9 @@
 #
 """Asynchronous tasks."""
 import logging
-import math
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 
 import requests
 from botocore.exceptions import ClientError
@@ -46,6 +48,7 @@ from sources.tasks import delete_source
 
 LOG = logging.getLogger(__name__)
 _DB_FETCH_BATCH_SIZE = 2000
+S3_DELETE_BATCH_SIZE = 1000  # AWS S3 delete API limits to 1000 objects per request.
 
 PROVIDER_REPORT_TYPE_MAP = {
     Provider.PROVIDER_OCP: OCP_REPORT_TYPES,
@@ -140,31 +143,57 @@ def purge_manifest_records(schema_name, provider_uuid, dates):
     LOG.info(f"Provider ({provider_uuid}) setup_complete set to to False")
 
 
+def _delete_archived_objects(s3_bucket_name, object_keys):
+    """Delete one page of objects and return the keys S3 could not delete."""
+    s3_bucket = get_s3_resource().Bucket(s3_bucket_name)
+    response = s3_bucket.delete_objects(Delete={"Objects": object_keys, "Quiet": True})
+    errors = response.get("Errors", [])
+    for error in errors:
+        LOG.debug(f"Unable to delete {error.get('Key')}: {error.get('Code')} {error.get('Message')}")
+    return [error.get("Key") for error in errors]
+
+
 def deleted_archived_with_prefix(s3_bucket_name, prefix):
     """
     Delete data from archive with given prefix.
 
+    The prefix is listed one page at a time and every page is deleted by a pool of
+    S3_DELETE_THREADS threads while the next pages are listed, so at most one page
+    per thread is held in memory.
+
     Args:
         s3_bucket_name (str): The s3 bucket name
         prefix (str): The prefix for deletion
+
+    Returns:
+        (list) The keys that could not be deleted
     """
-    s3_resource = get_s3_resource()
-    s3_bucket = s3_resource.Bucket(s3_bucket_name)
-    object_keys = [{"Key": s3_object.key} for s3_object in s3_bucket.objects.filter(Prefix=prefix)]
-    LOG.info(f"Starting objects: {len(object_keys)}")
-    batch_size = 1000  # AWS S3 delete API limits to 1000 objects per request.
-    for batch_number in range(math.ceil(len(object_keys) / batch_size)):
-        batch_start = batch_size * batch_number
-        batch_end = batch_start + batch_size
-        object_keys_batch = object_keys[batch_start:batch_end]
-        s3_bucket.delete_objects(Delete={"Objects": object_keys_batch})
-
-    remaining_objects = list(s3_bucket.objects.filter(Prefix=prefix))
-    if remaining_objects:
-        LOG.warning(
-            "Found %s objects after attempting to delete all objects with prefix %s", len(remaining_objects), prefix
-        )
-    return remaining_objects
+    s3_client = get_s3_resource().meta.client
+    pages = s3_client.get_paginator("list_objects_v2").paginate(
+        Bucket=s3_bucket_name, Prefix=prefix, PaginationConfig={"PageSize": S3_DELETE_BATCH_SIZE}
+    )
+    max_workers = settings.S3_DELETE_THREADS
+    failed_keys = []
+    object_count = 0
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-delete") as executor:
+        pending = set()
+        for page in pages:
+            object_keys = [{"Key": s3_object["Key"]} for s3_object in page.get("Contents", [])]
+            if not object_keys:
+                continue
+            object_count += len(object_keys)
+            if len(pending) >= max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    failed_keys.extend(future.result())
+            pending.add(executor.submit(_delete_archived_objects, s3_bucket_name, object_keys))
+        for future in pending:
+            failed_keys.extend(future.result())
+
+    LOG.info(f"Deleted {object_count - len(failed_keys)} of {object_count} objects with prefix {prefix}")
+    if failed_keys:
+        LOG.warning("Failed to delete %s objects with prefix %s", len(failed_keys), prefix)
+    return failed_keys
 
 
 @celery_app.task(  # noqa: C901
@@ -4,7 +4,6 @@
 #
 """Database accessor for OCP report data."""
 import datetime
-import json
 import logging
 import os
 import pkgutil
@@ -46,6 +45,25 @@ from reporting.provider.ocp.models import UI_SUMMARY_TABLES
 
 LOG = logging.getLogger(__name__)
 
+# defines the usage type for each metric that can be priced by tag
+TAG_RATE_USAGE_TYPES = {
+    "cpu_core_usage_per_hour": "cpu",
+    "cpu_core_request_per_hour": "cpu",
+    "cpu_core_effective_usage_per_hour": "cpu",
+    "memory_gb_usage_per_hour": "memory",
+    "memory_gb_request_per_hour": "memory",
+    "memory_gb_effective_usage_per_hour": "memory",
+    "storage_gb_usage_per_month": "storage",
+    "storage_gb_request_per_month": "storage",
+}
+# the rate type labels written for tag based costs
+TAG_RATE_INFRASTRUCTURE = "Infastructure"
+TAG_RATE_SUPPLEMENTARY = "Supplementary"
+TAG_RATES_SQL = pkgutil.get_data("masu.database", "sql/openshift/cost_model/tag_rates.sql").decode("utf-8")
+DEFAULT_TAG_RATES_SQL = pkgutil.get_data("masu.database", "sql/openshift/cost_model/default_tag_rates.sql").decode(
+    "utf-8"
+)
+
 
 def create_filter(data_source, start_date, end_date, cluster_id):
     """Create filter with data source, start and end dates."""
@@ -116,16 +134,30 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
             return report_periods
 
     def populate_ui_summary_tables(self, start_date, end_date, source_uuid, tables=UI_SUMMARY_TABLES):
-        """Populate our UI summary tables (formerly materialized views)."""
+        """Populate our UI summary tables (formerly materialized views).
+
+        With OCP_UI_SUMMARY_INCREMENTAL the summary is built in a temporary staging table
+        and only the rows that differ from the current contents of the table are written.
+        """
+        incremental = settings.OCP_UI_SUMMARY_INCREMENTAL
+        if incremental:
+            staging_sql = pkgutil.get_data("masu.database", "sql/openshift/reporting_ocp_ui_summary_staging.sql")
+            merge_sql = pkgutil.get_data("masu.database", "sql/openshift/reporting_ocp_ui_summary_merge.sql")
         for table_name in tables:
             summary_sql = pkgutil.get_data("masu.database", f"sql/openshift/{table_name}.sql")
-            summary_sql = summary_sql.decode("utf-8")
             summary_sql_params = {
                 "start_date": start_date,
                 "end_date": end_date,
                 "schema": self.schema,
                 "source_uuid": source_uuid,
             }
+            operation = "DELETE/INSERT"
+            if incremental:
+                summary_sql = staging_sql + summary_sql + merge_sql
+                summary_sql_params["table_name"] = table_name
+                summary_sql_params["staging_table"] = f"{table_name}_staging"
+                operation = "MERGE"
+            summary_sql = summary_sql.decode("utf-8")
             sql, sql_params = self.jinja_sql.prepare_query(summary_sql, summary_sql_params)
             self._execute_raw_sql_query(
                 table_name,
@@ -133,7 +165,7 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
                 start_date,
                 end_date,
                 bind_params=sql_params,
-                operation="DELETE/INSERT",
+                operation=operation,
             )
 
     def update_line_item_daily_summary_with_enabled_tags(self, start_date, end_date, report_period_ids):
@@ -812,14 +844,49 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
             operation="INSERT",
         )
 
-    def populate_tag_usage_costs(  # noqa: C901
-        self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id
-    ):
+    def _tag_rate_dates(self, start_date, end_date):
+        """Cast start_date and end_date to date objects, if they aren't already."""
+        if isinstance(start_date, str):
+            start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
+            end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
+        if isinstance(start_date, datetime.datetime):
+            start_date = start_date.date()
+            end_date = end_date.date()
+        return start_date, end_date
+
+    def _populate_tag_rates(self, tag_rates_sql, tag_rates, cost_model_rate_type, start_date, end_date, cluster_id):
+        """Apply every tag rate of one cost model rate type in a single statement."""
+        if not tag_rates:
+            return
+        table_name = self._table_map["line_item_daily_summary"]
+        tag_rates_sql_params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "cluster_id": cluster_id,
+            "schema": self.schema,
+            "cost_model_rate_type": cost_model_rate_type,
+            "tag_rates": tag_rates,
+        }
+        sql, sql_params = self.jinja_sql.prepare_query(tag_rates_sql, tag_rates_sql_params)
+        LOG.info(
+            log_json(
+                msg="applying tag rates",
+                cost_model_rate_type=cost_model_rate_type,
+                tag_rate_count=len(tag_rates),
+                cluster_id=cluster_id,
+                start_date=start_date,
+                end_date=end_date,
+                schema=self.schema,
+            )
+        )
+        self._execute_raw_sql_query(table_name, sql, start_date, end_date, bind_params=sql_params, operation="INSERT")
+
+    def populate_tag_usage_costs(self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id):
         """
         Update the reporting_ocpusagelineitem_daily_summary table with
         usage costs based on tag rates.
-        Due to the way the tag_keys are stored it loops through all of
-        the tag keys to filter and update costs.
+        All tag values of a rate type are loaded into a VALUES list and
+        matched against the labels of each line item in a single join.
 
         The data structure for infrastructure and supplementary rates are
         a dictionary that include the metric name, the tag key,
@@ -831,68 +898,29 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
                 }
             }
         """
-        # defines the usage type for each metric
-        metric_usage_type_map = {
-            "cpu_core_usage_per_hour": "cpu",
-            "cpu_core_request_per_hour": "cpu",
-            "cpu_core_effective_usage_per_hour": "cpu",
-            "memory_gb_usage_per_hour": "memory",
-            "memory_gb_request_per_hour": "memory",
-            "memory_gb_effective_usage_per_hour": "memory",
-            "storage_gb_usage_per_month": "storage",
-            "storage_gb_request_per_month": "storage",
-        }
-        # Remove monthly rates
-        infrastructure_rates = filter_dictionary(infrastructure_rates, metric_usage_type_map.keys())
-        supplementary_rates = filter_dictionary(supplementary_rates, metric_usage_type_map.keys())
-        # define the rates so the loop can operate on both rate types
-        rate_types = [
-            {"rates": infrastructure_rates, "sql_file": "sql/openshift/cost_model/infrastructure_tag_rates.sql"},
-            {"rates": supplementary_rates, "sql_file": "sql/openshift/cost_model/supplementary_tag_rates.sql"},
-        ]
-        # Cast start_date and end_date to date object, if they aren't already
-        if isinstance(start_date, str):
-            start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-            end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-        if isinstance(start_date, datetime.datetime):
-            start_date = start_date.date()
-            end_date = end_date.date()
-        # updates costs from tags
-        for rate_type in rate_types:
-            rate = rate_type.get("rates")
-            sql_file = rate_type.get("sql_file")
-            for metric in rate:
-                tags = rate.get(metric, {})
-                usage_type = metric_usage_type_map.get(metric)
-                if usage_type == "storage":
-                    labels_field = "volume_labels"
-                else:
-                    labels_field = "pod_labels"
-                table_name = self._table_map["line_item_daily_summary"]
-                for tag_key in tags:
-                    tag_vals = tags.get(tag_key, {})
-                    value_names = list(tag_vals.keys())
-                    for val_name in value_names:
-                        rate_value = tag_vals[val_name]
-                        key_value_pair = json.dumps({tag_key: val_name})
-                        tag_rates_sql = pkgutil.get_data("masu.database", sql_file)
-                        tag_rates_sql = tag_rates_sql.decode("utf-8")
-                        tag_rates_sql_params = {
-                            "start_date": start_date,
-                            "end_date": end_date,
-                            "rate": rate_value,
-                            "cluster_id": cluster_id,
-                            "schema": self.schema,
-                            "usage_type": usage_type,
-                            "metric": metric,
-                            "k_v_pair": key_value_pair,
-                            "labels_field": labels_field,
-                        }
-                        sql, sql_params = self.jinja_sql.prepare_query(tag_rates_sql, tag_rates_sql_params)
-                        LOG.info(log_json(msg="running populate_tag_usage_costs SQL", **tag_rates_sql_params))
-                        self._execute_raw_sql_query(table_name, sql, start_date, end_date, bind_params=sql_params)
-
-    def populate_tag_usage_default_costs(  # noqa: C901
+        start_date, end_date = self._tag_rate_dates(start_date, end_date)
+        for cost_model_rate_type, rates in (
+            (TAG_RATE_INFRASTRUCTURE, infrastructure_rates),
+            (TAG_RATE_SUPPLEMENTARY, supplementary_rates),
+        ):
+            # Remove monthly rates
+            rates = filter_dictionary(rates, TAG_RATE_USAGE_TYPES.keys())
+            tag_rates = [
+                {
+                    "metric": metric,
+                    "usage_type": TAG_RATE_USAGE_TYPES[metric],
+                    "labels_field": "volume_labels" if TAG_RATE_USAGE_TYPES[metric] == "storage" else "pod_labels",
+                    "tag_key": tag_key,
+                    "tag_value": tag_value,
+                    "rate": rate_value,
+                }
+                for metric, tags in rates.items()
+                for tag_key, tag_values in tags.items()
+                for tag_value, rate_value in tag_values.items()
+            ]
+            self._populate_tag_rates(TAG_RATES_SQL, tag_rates, cost_model_rate_type, start_date, end_date, cluster_id)
+
+    def populate_tag_usage_default_costs(
         self, infrastructure_rates, supplementary_rates, start_date, end_date, cluster_id
     ):
         """
@@ -912,75 +940,29 @@ class OCPReportDBAccessor(SQLScriptAtomicExecutorMixin, ReportDBAccessorBase):
                 }
             }
         """
-        # defines the usage type for each metric
-        metric_usage_type_map = {
-            "cpu_core_usage_per_hour": "cpu",
-            "cpu_core_request_per_hour": "cpu",
-            "cpu_core_effective_usage_per_hour": "cpu",
-            "memory_gb_usage_per_hour": "memory",
-            "memory_gb_request_per_hour": "memory",
-            "memory_gb_effective_usage_per_hour": "memory",
-            "storage_gb_usage_per_month": "storage",
-            "storage_gb_request_per_month": "storage",
-        }
-        # Remove monthly rates
-        infrastructure_rates = filter_dictionary(infrastructure_rates, metric_usage_type_map.keys())
-        supplementary_rates = filter_dictionary(supplementary_rates, metric_usage_type_map.keys())
-        # define the rates so the loop can operate on both rate types
-        rate_types = [
-            {
-                "rates": infrastructure_rates,
-                "sql_file": "sql/openshift/cost_model/default_infrastructure_tag_rates.sql",
-            },
-            {"rates": supplementary_rates, "sql_file": "sql/openshift/cost_model/default_supplementary_tag_rates.sql"},
-        ]
-        # Cast start_date and end_date to date object, if they aren't already
-        if isinstance(start_date, str):
-            start_date = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-            end_date = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-        if isinstance(start_date, datetime.datetime):
-            start_date = start_date.date()
-            end_date = end_date.date()
-
-        # updates costs from tags
-        for rate_type in rate_types:
-            rate = rate_type.get("rates")
-            sql_file = rate_type.get("sql_file")
-            for metric in rate:
-                tags = rate.get(metric, {})
-                usage_type = metric_usage_type_map.get(metric)
-                if usage_type == "storage":
-                    labels_field = "volume_labels"
-                else:
-                    labels_field = "pod_labels"
-                table_name = self._table_map["line_item_daily_summary"]
-                for tag_key in tags:
-                    key_value_pair = []
-                    tag_vals = tags.get(tag_key)
-                    rate_value = tag_vals.get("default_value", 0)
-                    if rate_value == 0:
-                        continue
-                    value_names = tag_vals.get("defined_keys", [])
-                    for value_to_skip in value_names:
-                        key_value_pair.append(json.dumps({tag_key: value_to_skip}))
-                    json.dumps(key_value_pair)
-                    tag_rates_sql = pkgutil.get_data("masu.database", sql_file)
-                    tag_rates_sql = tag_rates_sql.decode("utf-8")
-                    tag_rates_sql_params = {
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "rate": rate_value,
-                        "cluster_id": cluster_id,
-                        "schema": self.schema,
-                        "usage_type": usage_type,
-                        "metric": metric,
-                        "tag_key": tag_key,
-                        "k_v_pair": key_value_pair,
-                        "labels_field": labels_field,
-                    }
-                    sql, sql_params = self.jinja_sql.prepare_query(tag_rates_sql, tag_rates_sql_params)
-                    LOG.info(log_json(msg="running populate_tag_usage_default_costs SQL", **tag_rates_sql_params))
-                    self._execute_raw_sql_query(table_name, sql, start_date, end_date, bind_params=sql_params)
+        start_date, end_date = self._tag_rate_dates(start_date, end_date)
+        for cost_model_rate_type, rates in (
+            (TAG_RATE_INFRASTRUCTURE, infrastructure_rates),
+            (TAG_RATE_SUPPLEMENTARY, supplementary_rates),
+        ):
+            # Remove monthly rates
+            rates = filter_dictionary(rates, TAG_RATE_USAGE_TYPES.keys())
+            tag_rates = [
+                {
+                    "metric": metric,
+                    "usage_type": TAG_RATE_USAGE_TYPES[metric],
+                    "labels_field": "volume_labels" if TAG_RATE_USAGE_TYPES[metric] == "storage" else "pod_labels",
+                    "tag_key": tag_key,
+                    "defined_values": list(tag_values.get("defined_keys", [])),
+                    "rate": tag_values.get("default_value", 0),
+                }
+                for metric, tags in rates.items()
+                for tag_key, tag_values in tags.items()
+                if tag_values.get("default_value", 0) != 0
+            ]
+            self._populate_tag_rates(
+                DEFAULT_TAG_RATES_SQL, tag_rates, cost_model_rate_type, start_date, end_date, cluster_id
+            )
 
     def populate_openshift_cluster_information_tables(self, provider, cluster_id, cluster_alias, start_date, end_date):
         """Populate the cluster, node, PVC, and project tables for the cluster."""
@@ -6,8 +6,8 @@
 import logging
 import os
 import time
+from contextlib import ExitStack
 
-import ciso8601
 import django.apps
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
@@ -23,6 +23,8 @@ from api.common import log_json
 from api.utils import DateHelper
 from koku.database import execute_delete_sql as exec_del_sql
 from koku.database_exc import get_extended_exception_by_type
+from koku.pg_partition import get_partition_start
+from koku.pg_partition import PARTITION_CATALOG
 from masu.config import Config
 from masu.database.koku_database_access import KokuDBAccess
 from masu.database.koku_database_access import mini_transaction_delete
@@ -170,13 +172,14 @@ class ReportDBAccessorBase(KokuDBAccess):
         ctx = self.extract_context_from_sql_params(sql_params)
         sql, bind_params = self.trino_prepare_query(sql, sql_params)
         t1 = time.time()
-        trino_conn = trino_db.connect(schema=self.schema, **conn_params)
+        trino_db.invalidate_metadata(sql)
         LOG.info(log_json(msg="executing trino sql", log_ref=log_ref, context=ctx))
         try:
-            trino_cur = trino_conn.cursor()
-            trino_cur.execute(sql, bind_params)
-            results = trino_cur.fetchall()
-            description = trino_cur.description
+            with trino_db.connection(schema=self.schema, **conn_params) as trino_conn:
+                trino_cur = trino_conn.cursor()
+                trino_cur.execute(sql, bind_params)
+                results = trino_cur.fetchall()
+                description = trino_cur.description
         except Exception as ex:
             if attempts_left == 0:
                 LOG.error(log_json(msg="failed trino sql execution", log_ref=log_ref, context=ctx), exc_info=ex)
@@ -185,10 +188,55 @@ class ReportDBAccessorBase(KokuDBAccess):
         LOG.info(log_json(msg="executed trino sql", log_ref=log_ref, running_time=running_time, context=ctx))
         return results, description
 
+    def _execute_trino_raw_sql_query_stream(
+        self, sql, *, sql_params=None, log_ref="Trino query", conn_params=None, batch_size=10000
+    ):
+        """Execute a single trino query and return cur.description and a generator fetching the rows in batches.
+
+        Close the generator if it is not exhausted, this cancels the query and releases the connection.
+        """
+        if sql_params is None:
+            sql_params = {}
+        if conn_params is None:
+            conn_params = {}
+        ctx = self.extract_context_from_sql_params(sql_params)
+        sql, bind_params = self.trino_prepare_query(sql, sql_params)
+        t1 = time.time()
+        trino_db.invalidate_metadata(sql)
+        LOG.info(log_json(msg="executing trino sql", log_ref=log_ref, context=ctx))
+        with ExitStack() as stack:
+            try:
+                trino_conn = stack.enter_context(trino_db.connection(schema=self.schema, **conn_params))
+                trino_cur = trino_conn.cursor()
+                trino_cur.execute(sql, bind_params)
+                # cancels the query if the rows are not all read, a no-op once they are
+                stack.callback(trino_cur.cancel)
+                # the columns are only known once the first results are in
+                first_rows = trino_cur.fetchmany(batch_size)
+                description = trino_cur.description
+            except Exception as ex:
+                LOG.error(log_json(msg="failed trino sql execution", log_ref=log_ref, context=ctx), exc_info=ex)
+                raise ex
+            cleanup = stack.pop_all()
+        running_time = time.time() - t1
+        LOG.info(log_json(msg="executed trino sql", log_ref=log_ref, running_time=running_time, context=ctx))
+
+        def fetch_rows(rows):
+            with cleanup:
+                yield
+                while rows:
+                    yield from rows
+                    rows = trino_cur.fetchmany(batch_size)
+
+        rows = fetch_rows(first_rows)
+        # start the generator so that closing it before the first row still runs the cleanup
+        next(rows)
+        return description, rows
+
     def _execute_trino_multipart_sql_query(self, sql, *, bind_params=None):
         """Execute multiple related SQL queries in Trino."""
-        trino_conn = trino_db.connect(schema=self.schema)
-        return trino_db.executescript(trino_conn, sql, params=bind_params, preprocessor=self.trino_prepare_query)
+        with trino_db.connection(schema=self.schema) as trino_conn:
+            return trino_db.executescript(trino_conn, sql, params=bind_params, preprocessor=self.trino_prepare_query)
 
     def get_existing_partitions(self, table):
         if isinstance(table, str):
@@ -199,18 +247,12 @@ class ReportDBAccessorBase(KokuDBAccess):
 
         with transaction.atomic():  # Make sure this does *not* open a lingering transaction at the driver
             connection.set_schema(self.schema)
-            existing_partitions = PartitionedTable.objects.filter(
-                schema_name=self.schema, partition_of_table_name=table_name, partition_type=PartitionedTable.RANGE
-            ).all()
+            existing_partitions = PARTITION_CATALOG.get_partitions(self.schema, table_name)
 
         return existing_partitions
 
     def get_partition_start_dates(self, partitions):
-        exist_partition_start_dates = {
-            ciso8601.parse_datetime(p.partition_parameters["from"]).date()
-            for p in partitions
-            if not p.partition_parameters["default"]
-        }
+        exist_partition_start_dates = {get_partition_start(p) for p in partitions} - {None}
 
         return exist_partition_start_dates
 
@@ -245,6 +287,7 @@ class ReportDBAccessorBase(KokuDBAccess):
                     schema_name=partition_record["schema_name"],
                     table_name=partition_record["table_name"],
                 )
+        PARTITION_CATALOG.add(newpart, created)
         if created:
             LOG.info(f"Created a new partition for {newpart.partition_of_table_name} : {newpart.table_name}")
 
@@ -325,18 +368,18 @@ class ReportDBAccessorBase(KokuDBAccess):
     def table_exists_trino(self, table_name):
         """Check if table exists."""
         table_check_sql = f"SHOW TABLES LIKE '{table_name}'"
-        table = self._execute_trino_raw_sql_query(table_check_sql, log_ref="table_exists_trino")
-        if table:
-            return True
-        return False
+        return trino_db.cached_exists(
+            lambda: self._execute_trino_raw_sql_query(table_check_sql, log_ref="table_exists_trino"),
+            self.schema,
+            table_name,
+        )
 
     def schema_exists_trino(self):
         """Check if table exists."""
         check_sql = f"SHOW SCHEMAS LIKE '{self.schema}'"
-        schema_exists = self._execute_trino_raw_sql_query(check_sql, log_ref="schema_exists_trino")
-        if schema_exists:
-            return True
-        return False
+        return trino_db.cached_exists(
+            lambda: self._execute_trino_raw_sql_query(check_sql, log_ref="schema_exists_trino"), self.schema
+        )
 
     def execute_delete_sql(self, query):
         """
@@ -0,0 +1,142 @@
+WITH cte_tag_rates (metric, usage_type, labels_field, tag_key, tag_value, rate) AS (
+    VALUES
+    {%- for tag_rate in tag_rates %}
+        (
+            {{tag_rate.metric}},
+            {{tag_rate.usage_type}},
+            {{tag_rate.labels_field}},
+            {{tag_rate.tag_key}},
+            {{tag_rate.tag_value}},
+            {{tag_rate.rate}}::numeric
+        ){% if not loop.last %},{% endif %}
+    {%- endfor %}
+)
+INSERT INTO {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary (
+    uuid,
+    report_period_id,
+    cluster_id,
+    cluster_alias,
+    data_source,
+    usage_start,
+    usage_end,
+    namespace,
+    node,
+    resource_id,
+    persistentvolumeclaim,
+    persistentvolume,
+    storageclass,
+    source_uuid,
+    cost_model_cpu_cost,
+    cost_model_memory_cost,
+    cost_model_volume_cost,
+    cost_model_rate_type,
+    pod_labels,
+    volume_labels,
+    monthly_cost_type,
+    cost_category_id
+)
+SELECT uuid_generate_v4() as uuid,
+    report_period_id,
+    cluster_id,
+    cluster_alias,
+    data_source,
+    usage_start,
+    usage_start as usage_end,
+    namespace,
+    node,
+    resource_id,
+    persistentvolumeclaim,
+    persistentvolume,
+    storageclass,
+    source_uuid,
+    CASE
+        WHEN usage_type = 'cpu'
+            THEN coalesce((rate * usage), 0.0)
+        ELSE 0.0
+    END as cost_model_cpu_cost,
+    CASE
+        WHEN usage_type = 'memory'
+            THEN coalesce((rate * usage), 0.0)
+        ELSE 0.0
+    END as cost_model_memory_cost,
+    CASE
+        WHEN usage_type = 'storage'
+            THEN coalesce((rate * usage), 0.0)
+        ELSE 0.0
+    END as cost_model_volume_cost,
+    {{cost_model_rate_type}} as cost_model_rate_type,
+    CASE
+        WHEN labels_field = 'pod_labels'
+            THEN jsonb_build_object(tag_key, tag_value)
+    END as pod_labels,
+    CASE
+        WHEN labels_field = 'volume_labels'
+            THEN jsonb_build_object(tag_key, tag_value)
+    END as volume_labels,
+    'Tag' as monthly_cost_type, -- We are borrowing the monthly field here, although this is a daily usage cost
+    cost_category_id
+FROM (
+    SELECT r.usage_type,
+        r.labels_field,
+        r.tag_key,
+        r.tag_value,
+        r.rate,
+        lids.report_period_id,
+        lids.cluster_id,
+        lids.cluster_alias,
+        lids.data_source,
+        lids.usage_start,
+        lids.namespace,
+        lids.node,
+        lids.resource_id,
+        lids.persistentvolumeclaim,
+        lids.persistentvolume,
+        lids.storageclass,
+        lids.source_uuid,
+        CASE
+            WHEN r.metric='cpu_core_usage_per_hour' THEN sum(lids.pod_usage_cpu_core_hours)
+            WHEN r.metric='cpu_core_request_per_hour' THEN sum(lids.pod_request_cpu_core_hours)
+            WHEN r.metric='cpu_core_effective_usage_per_hour' THEN sum(lids.pod_effective_usage_cpu_core_hours)
+            WHEN r.metric='memory_gb_usage_per_hour' THEN sum(lids.pod_usage_memory_gigabyte_hours)
+            WHEN r.metric='memory_gb_request_per_hour' THEN sum(lids.pod_request_memory_gigabyte_hours)
+            WHEN r.metric='memory_gb_effective_usage_per_hour' THEN sum(lids.pod_effective_usage_memory_gigabyte_hours)
+            WHEN r.metric='storage_gb_usage_per_month' THEN sum(lids.persistentvolumeclaim_usage_gigabyte_months)
+            WHEN r.metric='storage_gb_request_per_month' THEN sum(lids.volume_request_storage_gigabyte_months)
+        END as usage,
+        lids.cost_category_id
+    FROM {{schema | sqlsafe}}.reporting_ocpusagelineitem_daily_summary AS lids
+    CROSS JOIN LATERAL (
+        SELECT 'pod_labels' as labels_field, key, value
+        FROM jsonb_each_text(lids.pod_labels)
+        UNION ALL
+        SELECT 'volume_labels' as labels_field, key, value
+        FROM jsonb_each_text(lids.volume_labels)
+    ) AS lids_labels
+    JOIN cte_tag_rates AS r
+        ON r.labels_field = lids_labels.labels_field
+            AND r.tag_key = lids_labels.key
+            AND r.tag_value = lids_labels.value
+    WHERE lids.cluster_id = {{cluster_id}}
+        AND lids.usage_start >= {{start_date}}
+        AND lids.usage_start <= {{end_date}}
+    GROUP BY r.metric,
+        r.usage_type,
+        r.labels_field,
+        r.tag_key,
+        r.tag_value,
+        r.rate,
+        lids.report_period_id,
+        lids.cluster_id,
+        lids.cluster_alias,
+        lids.data_source,
+        lids.usage_start,
+        lids.namespace,
+        lids.node,
+        lids.resource_id,
+        lids.persistentvolumeclaim,
+        lids.persistentvolume,
+        lids.storageclass,
+        lids.source_uuid,
+        lids.cost_category_id
+) AS sub
+;
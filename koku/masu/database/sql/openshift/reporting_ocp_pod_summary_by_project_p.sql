@@ -1,10 +1,12 @@
+{% if not staging_table %}
 DELETE FROM {{schema | sqlsafe}}.reporting_ocp_pod_summary_by_project_p
 WHERE usage_start >= {{start_date}}::date
     AND usage_start <= {{end_date}}::date
     AND source_uuid = {{source_uuid}}
 ;
+{% endif %}
 
-INSERT INTO {{schema | sqlsafe}}.reporting_ocp_pod_summary_by_project_p (
+INSERT INTO {% if staging_table %}{{staging_table | sqlsafe}}{% else %}{{schema | sqlsafe}}.reporting_ocp_pod_summary_by_project_p{% endif %} (
     id,
     cluster_id,
     cluster_alias,
@@ -0,0 +1,28 @@
+-- Rows are compared on every column except the generated id, so unchanged
+-- summary rows are left alone instead of being deleted and re-inserted.
+DELETE FROM {{schema | sqlsafe}}.{{table_name | sqlsafe}} AS t
+WHERE t.usage_start >= {{start_date}}::date
+    AND t.usage_start <= {{end_date}}::date
+    AND t.source_uuid = {{source_uuid}}
+    AND NOT EXISTS (
+        SELECT 1
+        FROM {{staging_table | sqlsafe}} AS s
+        WHERE s.usage_start = t.usage_start
+            AND md5((to_jsonb(s) - 'id')::text) = md5((to_jsonb(t) - 'id')::text)
+    )
+;
+
+INSERT INTO {{schema | sqlsafe}}.{{table_name | sqlsafe}}
+    SELECT s.*
+    FROM {{staging_table | sqlsafe}} AS s
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM {{schema | sqlsafe}}.{{table_name | sqlsafe}} AS t
+        WHERE t.usage_start = s.usage_start
+            AND t.source_uuid = s.source_uuid
+            AND md5((to_jsonb(t) - 'id')::text) = md5((to_jsonb(s) - 'id')::text)
+    )
+;
+
+DROP TABLE {{staging_table | sqlsafe}}
+;
@@ -0,0 +1,6 @@
+DROP TABLE IF EXISTS {{staging_table | sqlsafe}}
+;
+CREATE TEMPORARY TABLE {{staging_table | sqlsafe}} (
+    LIKE {{schema | sqlsafe}}.{{table_name | sqlsafe}} INCLUDING DEFAULTS
+)
+;
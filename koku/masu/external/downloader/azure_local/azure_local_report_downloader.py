@@ -17,6 +17,7 @@ from masu.external import UNCOMPRESSED
 from masu.external.downloader.azure.azure_report_downloader import AzureReportDownloader
 from masu.external.downloader.azure.azure_report_downloader import AzureReportDownloaderError
 from masu.util.aws.common import copy_local_report_file_to_s3_bucket
+from masu.util.aws.common import get_manifest_object_name
 from masu.util.aws.common import remove_files_not_in_set_from_s3_bucket
 from masu.util.azure import common as utils
 from masu.util.common import extract_uuids_from_string
@@ -124,7 +125,13 @@ class AzureLocalReportDownloader(AzureReportDownloader):
                 self.account, Provider.PROVIDER_AZURE, self._provider_uuid, start_date, Config.CSV_DATA_TYPE
             )
             copy_local_report_file_to_s3_bucket(
-                self.request_id, s3_csv_path, full_file_path, local_filename, manifest_id, start_date, self.context
+                self.request_id,
+                s3_csv_path,
+                full_file_path,
+                get_manifest_object_name(local_filename, manifest_id),
+                manifest_id,
+                start_date,
+                self.context,
             )
 
             manifest_accessor = ReportManifestDBAccessor()
@@ -5,6 +5,7 @@
 """GCP Report Downloader."""
 import csv
 import datetime
+import io
 import logging
 import os
 import uuid
@@ -29,6 +30,7 @@ from masu.external import UNCOMPRESSED
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
 from masu.util.aws.common import copy_local_report_file_to_s3_bucket
+from masu.util.aws.common import S3UploadPipeline
 from masu.util.common import get_path_prefix
 from masu.util.gcp.common import add_label_columns
 from providers.gcp.provider import GCPProvider
@@ -62,6 +64,64 @@ def pd_read_csv(local_file_path):
         raise GCPReportDownloaderError(error)
 
 
+def _write_daily_archives(
+    tracing_id,
+    account,
+    provider_uuid,
+    data_frame,
+    directory,
+    file_name,
+    manifest_id,
+    start_date,
+    context,
+    ingress_reports,
+    uploads,
+):
+    """Split the rows of one report file by invoice month and partition date and archive them to S3."""
+    daily_file_names = []
+    date_range = {}
+    dh = DateHelper()
+    data_frame = add_label_columns(data_frame)
+    # putting it in for loop handles crossover data, when we have distinct invoice_month
+    for invoice_month in data_frame["invoice.month"].unique():
+        invoice_filter = data_frame["invoice.month"] == invoice_month
+        invoice_month_data = data_frame[invoice_filter]
+        unique_usage_days = pd.to_datetime(invoice_month_data["usage_start_time"]).dt.date.unique()
+        days = list({day.strftime("%Y-%m-%d") for day in unique_usage_days})
+        date_range = {"start": min(days), "end": max(days), "invoice_month": str(invoice_month)}
+        partition_dates = invoice_month_data.partition_date.unique()
+        for partition_date in partition_dates:
+            partition_date_filter = invoice_month_data["partition_date"] == partition_date
+            invoice_partition_data = invoice_month_data[partition_date_filter]
+            start_of_invoice = dh.invoice_month_start(invoice_month)
+            s3_csv_path = get_path_prefix(
+                account, Provider.PROVIDER_GCP, provider_uuid, start_of_invoice, Config.CSV_DATA_TYPE
+            )
+            day_file = f"{invoice_month}_{partition_date}_{file_name}"
+            if ingress_reports:
+                manifest = get_ingress_manifest(manifest_id)
+                if not manifest.report_tracker.get(partition_date):
+                    manifest.report_tracker[partition_date] = 0
+                counter = manifest.report_tracker[partition_date]
+                day_file = f"{invoice_month}_{partition_date}_{counter}.csv"
+                manifest.report_tracker[partition_date] = counter + 1
+                manifest.save()
+            day_filepath = f"{directory}/{day_file}"
+            invoice_partition_data.to_csv(day_filepath, index=False, header=True)
+            copy_local_report_file_to_s3_bucket(
+                tracing_id,
+                s3_csv_path,
+                day_filepath,
+                day_file,
+                manifest_id,
+                start_date,
+                context,
+                uploads=uploads,
+            )
+            daily_file_names.append(day_filepath)
+    return daily_file_names, date_range
+
+
 def create_daily_archives(
     tracing_id,
     account,
@@ -86,42 +146,74 @@ def create_daily_archives(
     """
     daily_file_names = []
     date_range = {}
-    for local_file_path in local_file_paths:
-        file_name = os.path.basename(local_file_path).split("/")[-1]
-        dh = DateHelper()
-        directory = os.path.dirname(local_file_path)
-        data_frame = pd_read_csv(local_file_path)
-        data_frame = add_label_columns(data_frame)
-        # putting it in for loop handles crossover data, when we have distinct invoice_month
-        for invoice_month in data_frame["invoice.month"].unique():
-            invoice_filter = data_frame["invoice.month"] == invoice_month
-            invoice_month_data = data_frame[invoice_filter]
-            unique_usage_days = pd.to_datetime(invoice_month_data["usage_start_time"]).dt.date.unique()
-            days = list({day.strftime("%Y-%m-%d") for day in unique_usage_days})
-            date_range = {"start": min(days), "end": max(days), "invoice_month": str(invoice_month)}
-            partition_dates = invoice_month_data.partition_date.unique()
-            for partition_date in partition_dates:
-                partition_date_filter = invoice_month_data["partition_date"] == partition_date
-                invoice_partition_data = invoice_month_data[partition_date_filter]
-                start_of_invoice = dh.invoice_month_start(invoice_month)
-                s3_csv_path = get_path_prefix(
-                    account, Provider.PROVIDER_GCP, provider_uuid, start_of_invoice, Config.CSV_DATA_TYPE
-                )
-                day_file = f"{invoice_month}_{partition_date}_{file_name}"
-                if ingress_reports:
-                    manifest = get_ingress_manifest(manifest_id)
-                    if not manifest.report_tracker.get(partition_date):
-                        manifest.report_tracker[partition_date] = 0
-                    counter = manifest.report_tracker[partition_date]
-                    day_file = f"{invoice_month}_{partition_date}_{counter}.csv"
-                    manifest.report_tracker[partition_date] = counter + 1
-                    manifest.save()
-                day_filepath = f"{directory}/{day_file}"
-                invoice_partition_data.to_csv(day_filepath, index=False, header=True)
-                copy_local_report_file_to_s3_bucket(
-                    tracing_id, s3_csv_path, day_filepath, day_file, manifest_id, start_date, context
-                )
-                daily_file_names.append(day_filepath)
+    with S3UploadPipeline(tracing_id, context) as uploads:
+        for local_file_path in local_file_paths:
+            file_name = os.path.basename(local_file_path).split("/")[-1]
+            directory = os.path.dirname(local_file_path)
+            data_frame = pd_read_csv(local_file_path)
+            file_daily_names, file_date_range = _write_daily_archives(
+                tracing_id,
+                account,
+                provider_uuid,
+                data_frame,
+                directory,
+                file_name,
+                manifest_id,
+                start_date,
+                context,
+                ingress_reports,
+                uploads,
+            )
+            daily_file_names.extend(file_daily_names)
+            date_range = file_date_range or date_range
+    return daily_file_names, date_range
+
+
+def create_daily_archives_from_rows(
+    tracing_id, account, provider_uuid, row_batches, column_list, manifest_id, start_date, context={}
+):
+    """
+    Create daily CSVs from batches of BigQuery rows and archive to S3.
+
+    Every batch is formatted and parsed exactly like a downloaded report CSV, but in memory,
+    so the daily files are the same without writing and re-reading the whole report on disk.
+
+    Args:
+        tracing_id (str): The tracing id
+        account (str): The account number
+        provider_uuid (str): The uuid of a provider
+        row_batches (Iterable): (local file path, rows) pairs, the path names the batch's daily files
+        column_list (list): The column names of the rows
+        manifest_id (int): The manifest identifier
+        start_date (Datetime): The start datetime of incoming report
+        context (Dict): Logging context dictionary
+    """
+    daily_file_names = []
+    date_range = {}
+    with S3UploadPipeline(tracing_id, context) as uploads:
+        for local_file_path, rows in row_batches:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(column_list)
+            writer.writerows(rows)
+            buffer.seek(0)
+            data_frame = pd_read_csv(buffer)
+            buffer.close()
+            file_daily_names, file_date_range = _write_daily_archives(
+                tracing_id,
+                account,
+                provider_uuid,
+                data_frame,
+                os.path.dirname(local_file_path),
+                os.path.basename(local_file_path),
+                manifest_id,
+                start_date,
+                context,
+                None,
+                uploads,
+            )
+            daily_file_names.extend(file_daily_names)
+            date_range = file_date_range or date_range
     return daily_file_names, date_range
 
 
@@ -489,6 +581,16 @@ class GCPReportDownloader(ReportDownloaderBase, DownloaderInterface):
                 LOG.warning(log_json(self.tracing_id, msg=msg, context=self.context, **extra_context), exc_info=err)
                 raise GCPReportDownloaderError(msg) from err
             paths_list.append(full_local_path)
+            file_names, date_range = create_daily_archives(
+                self.tracing_id,
+                self.account,
+                self._provider_uuid,
+                paths_list,
+                manifest_id,
+                start_date,
+                self.context,
+                self.ingress_reports,
+            )
         else:
             try:
                 filename = os.path.splitext(key)[0]
@@ -511,15 +613,16 @@ class GCPReportDownloader(ReportDownloaderBase, DownloaderInterface):
             try:
                 column_list = self.gcp_big_query_columns.copy()
                 column_list.append("partition_date")
-                for i, rows in enumerate(batch(query_job, settings.PARQUET_PROCESSING_BATCH_SIZE)):
-                    full_local_path = self._get_local_file_path(directory_path, partition_date, i)
-                    msg = f"downloading subset of {partition_date} to {full_local_path}"
-                    LOG.info(log_json(self.tracing_id, msg=msg, context=self.context))
-                    with open(full_local_path, "w") as f:
-                        writer = csv.writer(f)
-                        writer.writerow(column_list)
-                        writer.writerows(rows)
-                    paths_list.append(full_local_path)
+                file_names, date_range = create_daily_archives_from_rows(
+                    self.tracing_id,
+                    self.account,
+                    self._provider_uuid,
+                    self._batch_query_rows(query_job, directory_path, partition_date),
+                    column_list,
+                    manifest_id,
+                    start_date,
+                    self.context,
+                )
             except OSError as exc:
                 msg = (
                     "Could not create GCP billing data csv file."
@@ -529,19 +632,16 @@ class GCPReportDownloader(ReportDownloaderBase, DownloaderInterface):
                 )
                 raise GCPReportDownloaderError(msg) from exc
 
-        file_names, date_range = create_daily_archives(
-            self.tracing_id,
-            self.account,
-            self._provider_uuid,
-            paths_list,
-            manifest_id,
-            start_date,
-            self.context,
-            self.ingress_reports,
-        )
-
         return key, None, DateHelper().today, file_names, date_range
 
+    def _batch_query_rows(self, query_job, directory_path, partition_date):
+        """Yield the query result rows in batches, with the local file path naming each batch."""
+        for i, rows in enumerate(batch(query_job, settings.PARQUET_PROCESSING_BATCH_SIZE)):
+            full_local_path = self._get_local_file_path(directory_path, partition_date, i)
+            msg = f"downloading subset of {partition_date} to {full_local_path}"
+            LOG.info(log_json(self.tracing_id, msg=msg, context=self.context))
+            yield full_local_path, rows
+
     def _get_local_directory_path(self):
         """
         Get the local directory path destination for downloading files.
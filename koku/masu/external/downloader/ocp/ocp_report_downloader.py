@@ -10,6 +10,7 @@ import os
 import shutil
 
 import pandas as pd
+from django.conf import settings
 
 from api.common import log_json
 from api.provider.models import Provider
@@ -19,6 +20,7 @@ from masu.external import UNCOMPRESSED
 from masu.external.downloader.downloader_interface import DownloaderInterface
 from masu.external.downloader.report_downloader_base import ReportDownloaderBase
 from masu.util.aws.common import copy_local_report_file_to_s3_bucket
+from masu.util.aws.common import S3UploadPipeline
 from masu.util.common import get_path_prefix
 from masu.util.ocp import common as utils
 
@@ -28,35 +30,55 @@ REPORTS_DIR = Config.INSIGHTS_LOCAL_REPORT_DIR
 LOG = logging.getLogger(__name__)
 
 
+class _DailyCSVWriter:
+    """Append daily slices of a report to a CSV file."""
+
+    def __init__(self, filepath):
+        self._file = open(filepath, "w", newline="")
+        self._header = True
+
+    def write(self, data_frame):
+        data_frame.to_csv(self._file, index=False, header=self._header)
+        self._header = False
+
+    def close(self):
+        self._file.close()
+
+
 def divide_csv_daily(file_path, filename):
     """
     Split local file into daily content.
+
+    The file is read once in chunks of PARQUET_PROCESSING_BATCH_SIZE rows and every chunk is routed
+    to per-day writers by the date prefix of interval_start, so memory use does not grow with the
+    size of the report. Values are kept as the text of the source file.
     """
-    daily_files = []
+    daily_files = {}
+    writers = {}
     directory = os.path.dirname(file_path)
 
     try:
-        data_frame = pd.read_csv(file_path)
+        report_type, _ = utils.detect_type(file_path)
+        reader = pd.read_csv(
+            file_path, dtype=str, keep_default_na=False, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE
+        )
+        with reader:
+            for data_frame in reader:
+                for day, df in data_frame.groupby(data_frame.interval_start.str[:10], sort=False):
+                    if day not in writers:
+                        day_file = f"{report_type}.{day}.csv"
+                        day_filepath = f"{directory}/{day_file}"
+                        writers[day] = _DailyCSVWriter(day_filepath)
+                        daily_files[day] = {"filename": day_file, "filepath": day_filepath}
+                    writers[day].write(df)
     except Exception as error:
         LOG.error(f"File {file_path} could not be parsed. Reason: {str(error)}")
         raise error
+    finally:
+        for writer in writers.values():
+            writer.close()
 
-    report_type, _ = utils.detect_type(file_path)
-    unique_times = data_frame.interval_start.unique()
-    days = list({cur_dt[:10] for cur_dt in unique_times})
-    daily_data_frames = [
-        {"data_frame": data_frame[data_frame.interval_start.str.contains(cur_day)], "date": cur_day}
-        for cur_day in days
-    ]
-
-    for daily_data in daily_data_frames:
-        day = daily_data.get("date")
-        df = daily_data.get("data_frame")
-        day_file = f"{report_type}.{day}.csv"
-        day_filepath = f"{directory}/{day_file}"
-        df.to_csv(day_filepath, index=False, header=True)
-        daily_files.append({"filename": day_file, "filepath": day_filepath})
-    return daily_files
+    return list(daily_files.values())
 
 
 def create_daily_archives(tracing_id, account, provider_uuid, filename, filepath, manifest_id, start_date, context={}):
@@ -78,19 +100,23 @@ def create_daily_archives(tracing_id, account, provider_uuid, filename, filepath
         daily_files = [{"filepath": filepath, "filename": filename}]
     else:
         daily_files = divide_csv_daily(filepath, filename)
-    for daily_file in daily_files:
-        # Push to S3
-        s3_csv_path = get_path_prefix(account, Provider.PROVIDER_OCP, provider_uuid, start_date, Config.CSV_DATA_TYPE)
-        copy_local_report_file_to_s3_bucket(
-            tracing_id,
-            s3_csv_path,
-            daily_file.get("filepath"),
-            daily_file.get("filename"),
-            manifest_id,
-            start_date,
-            context,
-        )
-        daily_file_names.append(daily_file.get("filepath"))
+    with S3UploadPipeline(tracing_id, context) as uploads:
+        for daily_file in daily_files:
+            # Push to S3
+            s3_csv_path = get_path_prefix(
+                account, Provider.PROVIDER_OCP, provider_uuid, start_date, Config.CSV_DATA_TYPE
+            )
+            copy_local_report_file_to_s3_bucket(
+                tracing_id,
+                s3_csv_path,
+                daily_file.get("filepath"),
+                daily_file.get("filename"),
+                manifest_id,
+                start_date,
+                context,
+                uploads=uploads,
+            )
+            daily_file_names.append(daily_file.get("filepath"))
     return daily_file_names
 
 
@@ -53,6 +53,8 @@ from masu.util.ocp import common as utils
 LOG = logging.getLogger(__name__)
 SUCCESS_CONFIRM_STATUS = "success"
 FAILURE_CONFIRM_STATUS = "failure"
+# Bytes read at a time while downloading and extracting payloads.
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
 
 class KafkaMsgHandlerError(Exception):
@@ -144,23 +146,24 @@ def download_payload(request_id, url, context={}):
     os.makedirs(Config.DATA_DIR, exist_ok=True)
     temp_dir = tempfile.mkdtemp(dir=Config.DATA_DIR)
 
-    # Download file from quarantine bucket as tar.gz
+    sanitized_request_id = re.sub("[^A-Za-z0-9]+", "", request_id)
+    gzip_filename = f"{sanitized_request_id}.tar.gz"
+    temp_file = f"{temp_dir}/{gzip_filename}"
+
+    # Download file from quarantine bucket as tar.gz, streaming it to disk chunk by chunk
+    # so the payload is never held in memory.
     try:
-        download_response = requests.get(url)
-        download_response.raise_for_status()
-    except requests.exceptions.HTTPError as err:
+        with requests.get(url, stream=True) as download_response:
+            download_response.raise_for_status()
+            with open(temp_file, "wb") as temp_file_hdl:
+                for chunk in download_response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    temp_file_hdl.write(chunk)
+    except requests.exceptions.RequestException as err:
+        # RequestException subclasses OSError, connection and streaming failures must not look like write errors.
         shutil.rmtree(temp_dir)
         msg = f"Unable to download file. Error: {str(err)}"
         LOG.warning(log_json(request_id, msg=msg), exc_info=err)
         raise KafkaMsgHandlerError(msg)
-
-    sanitized_request_id = re.sub("[^A-Za-z0-9]+", "", request_id)
-    gzip_filename = f"{sanitized_request_id}.tar.gz"
-    temp_file = f"{temp_dir}/{gzip_filename}"
-    try:
-        temp_file_hdl = open(temp_file, "wb")
-        temp_file_hdl.write(download_response.content)
-        temp_file_hdl.close()
     except OSError as error:
         shutil.rmtree(temp_dir)
         msg = f"Unable to write file. Error: {str(error)}"
@@ -191,11 +194,16 @@ def extract_payload_contents(request_id, out_dir, tarball_path, tarball, context
         LOG.warning(log_json(request_id, msg=msg, context=context))
         raise KafkaMsgHandlerError("Extraction failure, file not found.")
 
+    # Only the manifest is extracted here, the report files are streamed to their
+    # destination by extract_payload_files once the manifest has been read.
+    manifest_path = []
     try:
-        mytar = TarFile.open(tarball_path, mode="r:gz")
-        mytar.extractall(path=out_dir)
-        files = mytar.getnames()
-        manifest_path = [manifest for manifest in files if "manifest.json" in manifest]
+        with TarFile.open(tarball_path, mode="r|gz") as mytar:
+            for member in mytar:
+                if member.isfile() and "manifest.json" in member.name:
+                    _write_tar_member(mytar, member, f"{out_dir}/{member.name}")
+                    manifest_path.append(member.name)
+                    break
     except (ReadError, EOFError, OSError) as error:
         msg = f"Unable to untar file {tarball_path}. Reason: {str(error)}"
         LOG.warning(log_json(request_id, msg=msg, context=context))
@@ -210,6 +218,47 @@ def extract_payload_contents(request_id, out_dir, tarball_path, tarball, context
     return manifest_path
 
 
+def _write_tar_member(tar, member, destination_path):
+    """Stream a single tar member to destination_path."""
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    with tar.extractfile(member) as source, open(destination_path, "wb") as destination:
+        shutil.copyfileobj(source, destination, DOWNLOAD_CHUNK_SIZE)
+
+
+def extract_payload_files(request_id, out_dir, tarball_path, destinations, context={}):
+    """
+    Stream the requested payload members directly to their destination.
+
+    The tarball is decompressed in a single pass and members are written once, without
+    extracting the whole payload to a staging directory first.
+
+        Args:
+        request_id (String): Identifier associated with the payload
+        out_dir (String): temporary directory removed on failure
+        tarball_path (String): the path to the payload file to extract
+        destinations (Dict): tar member name to local destination path
+        context (Dict): Context for logging (account, etc)
+
+        Returns:
+            (set): local paths of the members found in the payload
+    """
+    extracted = set()
+    try:
+        with TarFile.open(tarball_path, mode="r|gz") as mytar:
+            for member in mytar:
+                destination_path = destinations.get(member.name)
+                if destination_path and member.isfile():
+                    _write_tar_member(mytar, member, destination_path)
+                    extracted.add(destination_path)
+    except (ReadError, EOFError, OSError) as error:
+        msg = f"Unable to untar file {tarball_path}. Reason: {str(error)}"
+        LOG.warning(log_json(request_id, msg=msg, context=context))
+        shutil.rmtree(out_dir)
+        raise KafkaMsgHandlerError("Extraction failure.")
+
+    return extracted
+
+
 def construct_parquet_reports(request_id, context, report_meta, payload_destination_path, report_file):
     """Build, upload and convert parquet reports."""
     daily_parquet_files = create_daily_archives(
@@ -328,14 +377,18 @@ def extract_payload(url, request_id, b64_identity, context={}):  # noqa: C901
     # Save Manifest
     report_meta["manifest_id"] = create_manifest_entries(report_meta, request_id, context)
 
-    # Copy report payload
+    # Stream report payload members to their destination
     report_metas = []
     ros_reports = []
     subdirectory = os.path.dirname(full_manifest_path)
+    member_directory = os.path.dirname(manifest_path[0])
     manifest_ros_files = report_meta.get("resource_optimization_files") or []
     manifest_files = report_meta.get("files") or []
+    destinations = {os.path.join(member_directory, name): f"{subdirectory}/{name}" for name in manifest_ros_files}
+    destinations |= {os.path.join(member_directory, name): f"{destination_dir}/{name}" for name in manifest_files}
+    extracted = extract_payload_files(request_id, temp_dir, temp_file_path, destinations, context)
     for ros_file in manifest_ros_files:
-        if os.path.exists(f"{subdirectory}/{ros_file}"):
+        if f"{subdirectory}/{ros_file}" in extracted:
             ros_reports.append((ros_file, f"{subdirectory}/{ros_file}"))
     ros_processor = ROSReportShipper(
         report_meta,
@@ -350,10 +403,10 @@ def extract_payload(url, request_id, b64_identity, context={}):  # noqa: C901
         LOG.warning(log_json(manifest_uuid, msg=msg, context=context))
     for report_file in manifest_files:
         current_meta = report_meta.copy()
-        payload_source_path = f"{subdirectory}/{report_file}"
         payload_destination_path = f"{destination_dir}/{report_file}"
         try:
-            shutil.copy(payload_source_path, payload_destination_path)
+            if payload_destination_path not in extracted:
+                raise FileNotFoundError(payload_destination_path)
             current_meta["current_file"] = payload_destination_path
             record_all_manifest_files(report_meta["manifest_id"], report_meta.get("files"), manifest_uuid)
             if record_report_status(report_meta["manifest_id"], report_file, manifest_uuid, context):
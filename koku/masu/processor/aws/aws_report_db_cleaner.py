@@ -10,6 +10,7 @@ from django_tenants.utils import schema_context
 
 from koku.database import cascade_delete
 from koku.database import execute_delete_sql
+from koku.pg_partition import PARTITION_CATALOG
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from reporting.models import PartitionedTable
 from reporting.provider.aws.models import UI_SUMMARY_TABLES
@@ -124,6 +125,7 @@ class AWSReportDBCleaner:
                     )
                 )
                 LOG.info(f"Deleted {del_count} table partitions")
+                PARTITION_CATALOG.invalidate(self._schema)
 
             LOG.info(
                 f"Deleting data related to billing account ids {all_account_ids} "
@@ -10,6 +10,7 @@ from django_tenants.utils import schema_context
 
 from koku.database import cascade_delete
 from koku.database import execute_delete_sql
+from koku.pg_partition import PARTITION_CATALOG
 from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 from reporting.models import PartitionedTable
 from reporting.provider.azure.models import UI_SUMMARY_TABLES
@@ -121,5 +122,6 @@ class AzureReportDBCleaner:
                     )
                 )
                 LOG.info(f"Deleted {del_count} table partitions")
+                PARTITION_CATALOG.invalidate(self._schema)
 
         return removed_items
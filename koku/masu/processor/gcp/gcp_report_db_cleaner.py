@@ -10,6 +10,7 @@ from django_tenants.utils import schema_context
 
 from koku.database import cascade_delete
 from koku.database import execute_delete_sql
+from koku.pg_partition import PARTITION_CATALOG
 from masu.database.gcp_report_db_accessor import GCPReportDBAccessor
 from reporting.models import PartitionedTable
 from reporting.provider.gcp.models import UI_SUMMARY_TABLES
@@ -109,6 +110,7 @@ class GCPReportDBCleaner:
                     )
                 )
                 LOG.info(f"Deleted {del_count} table partitions")
+                PARTITION_CATALOG.invalidate(self._schema)
 
                 # Iterate over the remainder as they could involve much larger amounts of data
             for bill in all_bill_objects:
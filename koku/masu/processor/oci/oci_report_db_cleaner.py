@@ -10,6 +10,7 @@ from django_tenants.utils import schema_context
 
 from koku.database import cascade_delete
 from koku.database import execute_delete_sql
+from koku.pg_partition import PARTITION_CATALOG
 from masu.database.oci_report_db_accessor import OCIReportDBAccessor
 from reporting.models import PartitionedTable
 from reporting.provider.oci.models import UI_SUMMARY_TABLES
@@ -107,6 +108,7 @@ class OCIReportDBCleaner:
                     )
                 )
                 LOG.info(f"Deleted {del_count} table partitions")
+                PARTITION_CATALOG.invalidate(self._schema)
 
                 # Iterate over the remainder as they could involve much larger amounts of data
             for bill in all_bill_objects:
@@ -33,7 +33,7 @@ from masu.processor.tasks import remove_expired_data
 from masu.processor.tasks import summarize_reports
 from masu.processor.tasks import SUMMARIZE_REPORTS_QUEUE
 from masu.processor.tasks import SUMMARIZE_REPORTS_QUEUE_XL
-from masu.processor.worker_cache import WorkerCache
+from masu.processor.worker_cache import get_worker_cache
 
 LOG = logging.getLogger(__name__)
 
@@ -58,7 +58,7 @@ class Orchestrator:
             billing_source (String): Individual account to retrieve.
 
         """
-        self.worker_cache = WorkerCache()
+        self.worker_cache = get_worker_cache()
         self.billing_source = billing_source
         self.bill_date = bill_date
         self.provider_uuid = provider_uuid
@@ -0,0 +1,144 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Arrow based CSV reader used to feed the parquet conversion."""
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+
+from masu.util.common import safe_float
+
+LOG = logging.getLogger(__name__)
+
+# Arrow reads the file in blocks of this many bytes across its thread pool.
+ARROW_CSV_BLOCK_SIZE = 16 << 20
+
+
+def _convert_float_column(array):
+    """Cast a string column to float64 with safe_float semantics."""
+    try:
+        array = pc.if_else(pc.equal(array, ""), pa.scalar(None, pa.string()), array)
+        return pc.cast(array, pa.float64()).fill_null(0.0).to_pandas()
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # Values arrow can not parse (e.g. "n/a") fall back to python per unique value.
+        return _convert_unique_values(array.to_pandas(), safe_float)
+
+
+def _convert_unique_values(series, converter):
+    """Apply a python converter once per distinct value instead of once per cell."""
+    codes, uniques = pd.factorize(series)
+    converted = pd.Series([converter(value) for value in uniques])
+    return converted.take(codes).reset_index(drop=True)
+
+
+class ArrowCSVReader:
+    """Chunked CSV reader with the same contract as `pd.read_csv(..., chunksize=...)`.
+
+    The file is parsed with pyarrow's multithreaded streaming reader. Every column is
+    read as a string so the result matches the pandas `str` converter exactly, then
+    the post processor's converters are applied column-wise:
+        * `str` columns are passed through untouched
+        * `safe_float` columns are cast to float64 by arrow, empty values become 0.0
+        * any other converter runs once per distinct value and is mapped back
+
+    The resulting data frames are identical, including dtypes and index, to what the
+    pandas reader produces, so post processing and the parquet schema are unchanged.
+    Files arrow refuses to parse (e.g. ragged rows) continue through pandas from the
+    first row that has not been yielded yet.
+    """
+
+    def __init__(self, csv_filename, converters, chunksize, column_names, usecols=None, **kwargs):
+        """Initialize the reader."""
+        self._csv_filename = csv_filename
+        self._converters = converters
+        self._chunksize = chunksize
+        self._column_names = list(column_names)
+        self._usecols = list(usecols) if usecols is not None else self._column_names
+        self._pandas_kwargs = kwargs
+        self._reader = None
+
+    def __enter__(self):
+        """Open the arrow stream."""
+        try:
+            self._open()
+        except pa.ArrowInvalid as err:
+            LOG.info(f"Arrow could not open {self._csv_filename}, falling back to pandas. Reason: {err}")
+        return self
+
+    def _open(self):
+        """Open the arrow streaming reader."""
+        read_options = pa_csv.ReadOptions(
+            column_names=self._column_names, skip_rows=1, block_size=ARROW_CSV_BLOCK_SIZE, use_threads=True
+        )
+        convert_options = pa_csv.ConvertOptions(
+            column_types={col: pa.string() for col in self._usecols},
+            include_columns=self._usecols,
+            strings_can_be_null=False,
+        )
+        self._reader = pa_csv.open_csv(self._csv_filename, read_options=read_options, convert_options=convert_options)
+
+    def __exit__(self, *exc):
+        """Close the arrow stream."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def __iter__(self):
+        """Yield data frames of `chunksize` rows."""
+        buffered = []
+        buffered_rows = 0
+        row_offset = 0
+        if self._reader is None:
+            yield from self._iter_pandas(row_offset)
+            return
+        try:
+            for batch in self._reader:
+                buffered.append(batch)
+                buffered_rows += batch.num_rows
+                while buffered_rows >= self._chunksize:
+                    table = pa.Table.from_batches(buffered)
+                    yield self._to_data_frame(table.slice(0, self._chunksize), row_offset)
+                    row_offset += self._chunksize
+                    table = table.slice(self._chunksize)
+                    buffered = table.to_batches()
+                    buffered_rows = table.num_rows
+        except pa.ArrowInvalid as err:
+            LOG.info(f"Arrow could not parse {self._csv_filename}, falling back to pandas. Reason: {err}")
+            yield from self._iter_pandas(row_offset)
+            return
+        if buffered_rows:
+            yield self._to_data_frame(pa.Table.from_batches(buffered), row_offset)
+
+    def _iter_pandas(self, row_offset):
+        """Yield the remaining chunks, starting at data row `row_offset`, using pandas."""
+        with pd.read_csv(
+            self._csv_filename,
+            converters=self._converters,
+            chunksize=self._chunksize,
+            usecols=self._usecols,
+            skiprows=range(1, row_offset + 1),
+            **self._pandas_kwargs,
+        ) as reader:
+            for data_frame in reader:
+                data_frame.index = data_frame.index + row_offset
+                yield data_frame
+
+    def _to_data_frame(self, table, row_offset):
+        """Convert an arrow table of strings into a converted data frame."""
+        columns = {}
+        for name in table.column_names:
+            array = table.column(name).combine_chunks()
+            converter = self._converters.get(name, str)
+            if converter is str:
+                columns[name] = array.to_pandas()
+            elif converter is safe_float:
+                columns[name] = _convert_float_column(array)
+            else:
+                columns[name] = _convert_unique_values(array.to_pandas(), converter)
+        data_frame = pd.DataFrame(columns, columns=table.column_names)
+        data_frame.index = pd.RangeIndex(row_offset, row_offset + table.num_rows)
+        return data_frame
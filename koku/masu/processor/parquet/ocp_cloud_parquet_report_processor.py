@@ -140,6 +140,7 @@ class OCPCloudParquetReportProcessor(ParquetReportProcessor):
         file_name = f"{parquet_base_filename}_{file_number}_{PARQUET_EXT}"
         file_path = f"{self.local_path}/{file_name}"
         self._write_parquet_to_file(file_path, file_name, data_frame, file_type=self.report_type)
+        self.s3_uploads.flush()
         self.create_parquet_table(file_path, daily=True, partition_map=self.partition_map)
 
     def get_matched_tags(self, ocp_provider_uuids):
@@ -230,3 +231,4 @@ class OCPCloudParquetReportProcessor(ParquetReportProcessor):
                     )
                 else:
                     self.create_ocp_on_cloud_parquet(openshift_filtered_data_frame, parquet_base_filename, i)
+        self.s3_uploads.close()
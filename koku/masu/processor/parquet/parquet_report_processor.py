@@ -6,11 +6,14 @@
 import datetime
 import logging
 import os
+from functools import partial
 from pathlib import Path
 
 import pandas as pd
+from billiard.pool import Pool
 from dateutil import parser
 from django.conf import settings
+from django.db import connections
 from rest_framework.exceptions import ValidationError
 
 from api.common import log_json
@@ -24,9 +27,11 @@ from masu.processor.azure.azure_report_parquet_processor import AzureReportParqu
 from masu.processor.gcp.gcp_report_parquet_processor import GCPReportParquetProcessor
 from masu.processor.oci.oci_report_parquet_processor import OCIReportParquetProcessor
 from masu.processor.ocp.ocp_report_parquet_processor import OCPReportParquetProcessor
+from masu.processor.parquet.arrow_csv_reader import ArrowCSVReader
 from masu.util.aws.aws_post_processor import AWSPostProcessor
-from masu.util.aws.common import copy_data_to_s3_bucket
+from masu.util.aws.common import get_manifest_object_name
 from masu.util.aws.common import remove_files_not_in_set_from_s3_bucket
+from masu.util.aws.common import S3UploadPipeline
 from masu.util.azure.azure_post_processor import AzurePostProcessor
 from masu.util.common import get_hive_table_path
 from masu.util.common import get_path_prefix
@@ -50,6 +55,18 @@ class ParquetReportProcessorError(Exception):
     pass
 
 
+def _convert_csv_file_in_worker(processor, csv_filename):
+    """Convert one file in a pool worker and return what the parent process needs to finish the report."""
+    processor.files_to_remove = []
+    processor.set_file_start_date(csv_filename)
+    post_processor = processor.set_post_processor()
+    parquet_base_filename, daily_frames, success, parquet_file = processor._convert_csv_file(
+        csv_filename, post_processor
+    )
+    processor.s3_uploads.close()
+    return parquet_base_filename, daily_frames, success, parquet_file, post_processor, processor.files_to_remove
+
+
 class ParquetReportProcessor:
     """Parquet report processor."""
 
@@ -81,6 +98,7 @@ class ParquetReportProcessor:
             self.invoice_month_date = self.dh.invoice_month_start(invoice_month).date()
         self.trino_table_exists = {}
         self.files_to_remove = []
+        self._s3_uploads = None
         self.ingress_reports = ingress_reports
         self.ingress_reports_uuid = ingress_reports_uuid
 
@@ -130,6 +148,22 @@ class ParquetReportProcessor:
         """Context information for logging errors."""
         return {"account": self.account, "provider_uuid": self.provider_uuid, "provider_type": self.provider_type}
 
+    @property
+    def clears_s3_by_manifest(self):
+        """Whether parquet of previous manifests is removed from S3 before a new manifest is converted.
+
+        OCP, GCP and OCI data is daily chunked and overwritten file by file instead. Parquet of
+        the other providers is uploaded with the manifest in its object name.
+        """
+        return self.provider_type not in (Provider.PROVIDER_OCP, Provider.PROVIDER_GCP, Provider.PROVIDER_OCI)
+
+    @property
+    def s3_uploads(self):
+        """Background uploads of the parquet files written by this processor."""
+        if self._s3_uploads is None:
+            self._s3_uploads = S3UploadPipeline(self.tracing_id, self.error_context)
+        return self._s3_uploads
+
     @property
     def tracing_id(self):
         """The request ID passed in for this task chain."""
@@ -244,6 +278,11 @@ class ParquetReportProcessor:
             daily=True,
         )
 
+    @property
+    def use_arrow_csv_engine(self):
+        """Whether CSV files for this provider type are parsed with pyarrow."""
+        return self.provider_type in settings.PARQUET_ARROW_CSV_PROVIDERS
+
     @property
     def local_path(self):
         local_path = f"{Config.TMP_DIR}/{self.account}/{self.provider_uuid}"
@@ -323,13 +362,7 @@ class ParquetReportProcessor:
 
         # OCP data is daily chunked report files.
         # AWS and Azure are monthly reports. Previous reports should be removed so data isn't duplicated
-        if not manifest_accessor.get_s3_parquet_cleared(manifest) and self.provider_type not in (
-            Provider.PROVIDER_OCP,
-            Provider.PROVIDER_GCP,
-            Provider.PROVIDER_GCP_LOCAL,
-            Provider.PROVIDER_OCI,
-            Provider.PROVIDER_OCI_LOCAL,
-        ):
+        if not manifest_accessor.get_s3_parquet_cleared(manifest) and self.clears_s3_by_manifest:
             remove_files_not_in_set_from_s3_bucket(
                 self.tracing_id, self.parquet_path_s3, self.manifest_id, self.error_context
             )
@@ -343,22 +376,21 @@ class ParquetReportProcessor:
 
         failed_conversion = []
         daily_data_frames = []
+        csv_filenames = []
         for csv_filename in self.file_list:
             if self.provider_type == Provider.PROVIDER_OCP and self.report_type is None:
                 msg = f"Could not establish report type for {csv_filename}."
                 LOG.warn(log_json(self.tracing_id, msg=msg, context=self.error_context))
                 failed_conversion.append(csv_filename)
                 continue
-            if self.provider_type == Provider.PROVIDER_OCI:
-                file_specific_start_date = csv_filename.split(".")[1]
-                self.start_date = file_specific_start_date
-            parquet_base_filename, daily_frame, success = self.convert_csv_to_parquet(csv_filename)
-            daily_data_frames.extend(daily_frame)
-            if self.provider_type not in (Provider.PROVIDER_AZURE):
-                self.create_daily_parquet(parquet_base_filename, daily_frame)
-            if not success:
-                failed_conversion.append(csv_filename)
+            csv_filenames.append(csv_filename)
 
+        workers = min(settings.PARQUET_CONVERSION_WORKERS, len(csv_filenames))
+        parquet_base_filename, daily_data_frames, failed = self.convert_csv_files(csv_filenames, workers)
+        failed_conversion.extend(failed)
+
+        # Every upload has to be in S3 before the local files are removed and the manifest completes.
+        self.s3_uploads.close()
         if failed_conversion:
             msg = f"Failed to convert the following files to parquet:{','.join(failed_conversion)}."
             LOG.warn(log_json(self.tracing_id, msg=msg, context=self.error_context))
@@ -378,20 +410,124 @@ class ParquetReportProcessor:
         processor.sync_hive_partitions()
         self.trino_table_exists[self.report_type] = True
 
-    def convert_csv_to_parquet(self, csv_filename):  # noqa: C901
+    def set_file_start_date(self, csv_filename):
+        """OCI files are daily, so the partition date comes from each file name."""
+        if self.provider_type == Provider.PROVIDER_OCI:
+            file_specific_start_date = csv_filename.split(".")[1]
+            self.start_date = file_specific_start_date
+
+    def convert_csv_files(self, csv_filenames, workers):
+        """Convert the CSV files serially or in a bounded pool of worker processes.
+
+        Workers only parse, convert and upload their file. Everything that needs the
+        database or Trino (daily parquet tables, the raw table, enabled keys) runs here,
+        in file order, and the enabled keys are finalized once after the last file.
+        """
+        if not csv_filenames:
+            return "", [], []
+        post_processor = self.set_post_processor()
+        if not post_processor:
+            self._log_unrecognized_provider()
+            return None, [], list(csv_filenames)
+
+        if workers > 1:
+            msg = f"Converting {len(csv_filenames)} files to parquet with {workers} worker processes."
+            LOG.info(log_json(self.tracing_id, msg=msg, context=self.error_context))
+
+            # Forked workers must not share the parent's database sockets.
+            connections.close_all()
+            with Pool(processes=workers) as pool:
+                results = pool.map(partial(_convert_csv_file_in_worker, self), csv_filenames)
+        else:
+            results = self._convert_csv_files_serially(csv_filenames, post_processor)
+
+        parquet_base_filename = None
+        daily_data_frames = []
+        failed_conversion = []
+        for csv_filename, result in zip(csv_filenames, results):
+            parquet_base_filename, daily_frame, success, parquet_file, worker_post_processor, files_to_remove = result
+            self.files_to_remove.extend(files_to_remove)
+            if worker_post_processor is not post_processor:
+                post_processor.merge_enabled_keys(worker_post_processor)
+            daily_data_frames.extend(daily_frame)
+            self.set_file_start_date(csv_filename)
+            if success:
+                success = self._create_raw_parquet_table(csv_filename, parquet_file)
+            if self.provider_type not in (Provider.PROVIDER_AZURE):
+                self.create_daily_parquet(parquet_base_filename, daily_frame)
+            if not success:
+                failed_conversion.append(csv_filename)
+
+        try:
+            post_processor.finalize_post_processing()
+        except Exception as err:
+            msg = f"Failed to finalize post processing of {','.join(csv_filenames)}. Reason: {str(err)}"
+            LOG.warn(log_json(self.tracing_id, msg=msg, context=self.error_context))
+            failed_conversion = list(csv_filenames)
+
+        return parquet_base_filename, daily_data_frames, failed_conversion
+
+    def _convert_csv_files_serially(self, csv_filenames, post_processor):
+        """Convert the CSV files one at a time in this process, collecting keys in one post processor."""
+        for csv_filename in csv_filenames:
+            self.set_file_start_date(csv_filename)
+            parquet_base_filename, daily_frames, success, parquet_file = self._convert_csv_file(
+                csv_filename, post_processor
+            )
+            yield parquet_base_filename, daily_frames, success, parquet_file, post_processor, []
+
+    def _log_unrecognized_provider(self):
+        msg = "Unrecongized provider type can't convert csv."
+        context = {
+            "schema": self._schema_name,
+            "provider_type": self.provider_type,
+            "provider_uuid": self.provider_uuid,
+        }
+        LOG.warn(log_json(self.tracing_id, msg=msg, context=context))
+
+    def _create_raw_parquet_table(self, csv_filename, parquet_file):
+        """Create the Trino table for the first converted file."""
+        try:
+            if self.create_table and not self.trino_table_exists.get(self.report_type):
+                self.create_parquet_table(parquet_file)
+        except Exception as err:
+            msg = f"Could not create table for {csv_filename} from {parquet_file}. Reason: {str(err)}"
+            LOG.warn(log_json(self.tracing_id, msg=msg, context=self.error_context))
+            return False
+        return True
+
+    def convert_csv_to_parquet(self, csv_filename):
         """Convert CSV file to parquet and send to S3."""
         post_processor = self.set_post_processor()
         if not post_processor:
-            msg = "Unrecongized provider type can't convert csv."
-            context = {
-                "schema": self._schema_name,
-                "provider_type": self.provider_type,
-                "provider_uuid": self.provider_uuid,
-            }
-            LOG.warn(log_json(self.tracing_id, msg=msg, context=context))
+            self._log_unrecognized_provider()
             return None, None, False
 
-        daily_data_frames = []
+        parquet_base_filename, daily_data_frames, success, parquet_file = self._convert_csv_file(
+            csv_filename, post_processor
+        )
+        if not success:
+            return parquet_base_filename, daily_data_frames, False
+        try:
+            post_processor.finalize_post_processing()
+            if self.create_table and not self.trino_table_exists.get(self.report_type):
+                self.create_parquet_table(parquet_file)
+        except Exception as err:
+            msg = (
+                f"File {csv_filename} could not be written as parquet to temp file {parquet_file}. Reason: {str(err)}"
+            )
+            LOG.warn(log_json(self.tracing_id, msg=msg, context=self.error_context))
+            return parquet_base_filename, daily_data_frames, False
+
+        return parquet_base_filename, daily_data_frames, True
+
+    def _convert_csv_file(self, csv_filename, post_processor):  # noqa: C901
+        """Convert one CSV file to parquet files in S3.
+
+        Returns:
+            (str, list, bool, str): base file name, daily frames, success, last parquet file written
+        """
+        daily_aggregator = post_processor.get_daily_aggregator()
         _, csv_name = os.path.split(csv_filename)
         parquet_file = None
         parquet_base_filename = csv_name.replace(self.file_extension, "")
@@ -413,31 +549,35 @@ class ParquetReportProcessor:
                             ingressreport_accessor.update_ingress_report_status(self.ingress_reports_uuid, message)
                     raise ValidationError(message, code="Missing_columns")
             csv_converters, kwargs = post_processor.get_column_converters(col_names, kwargs)
-            with pd.read_csv(
-                csv_filename, converters=csv_converters, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, **kwargs
-            ) as reader:
+            if self.use_arrow_csv_engine:
+                reader = ArrowCSVReader(
+                    csv_filename, csv_converters, settings.PARQUET_PROCESSING_BATCH_SIZE, col_names, **kwargs
+                )
+            else:
+                reader = pd.read_csv(
+                    csv_filename, converters=csv_converters, chunksize=settings.PARQUET_PROCESSING_BATCH_SIZE, **kwargs
+                )
+            with reader:
                 for i, data_frame in enumerate(reader):
                     if data_frame.empty:
                         continue
                     parquet_filename = f"{parquet_base_filename}_{i}{PARQUET_EXT}"
                     parquet_file = f"{self.local_path}/{parquet_filename}"
-                    data_frame, daily_frames = post_processor.process_dataframe(data_frame)
-                    daily_data_frames.append(daily_frames)
-                    success = self._write_parquet_to_file(parquet_file, parquet_filename, data_frame)
-                    if not success:
-                        return parquet_base_filename, daily_data_frames, False
-                post_processor.finalize_post_processing()
-            if self.create_table and not self.trino_table_exists.get(self.report_type):
-                self.create_parquet_table(parquet_file)
+                    data_frame, daily_frame = post_processor.process_dataframe(data_frame)
+                    daily_aggregator.add(daily_frame)
+                    # The upload runs in the background while the next chunk is parsed.
+                    self._write_parquet_to_file(parquet_file, parquet_filename, data_frame)
 
         except Exception as err:
             msg = (
                 f"File {csv_filename} could not be written as parquet to temp file {parquet_file}. Reason: {str(err)}"
             )
             LOG.warn(log_json(self.tracing_id, msg=msg, context=self.error_context))
-            return parquet_base_filename, daily_data_frames, False
+            self.s3_uploads.flush()
+            return parquet_base_filename, daily_aggregator.get_data_frames(), False, parquet_file
 
-        return parquet_base_filename, daily_data_frames, True
+        success = self.s3_uploads.flush()
+        return parquet_base_filename, daily_aggregator.get_data_frames(), success, parquet_file
 
     def create_daily_parquet(self, parquet_base_filename, data_frames):
         """Create a parquet file for daily aggregated data."""
@@ -446,6 +586,7 @@ class ParquetReportProcessor:
             file_name = f"{parquet_base_filename}_{DAILY_FILE_TYPE}_{i}{PARQUET_EXT}"
             file_path = f"{self.local_path}/{file_name}"
             self._write_parquet_to_file(file_path, file_name, data_frame, file_type=DAILY_FILE_TYPE)
+        self.s3_uploads.flush()
         if file_path:
             self.create_parquet_table(file_path, daily=True)
 
@@ -493,7 +634,7 @@ class ParquetReportProcessor:
                 )
 
     def _write_parquet_to_file(self, file_path, file_name, data_frame, file_type=None):
-        """Write Parquet file and send to S3."""
+        """Write Parquet file and queue it for upload to S3."""
         if self._provider_type in {Provider.PROVIDER_GCP, Provider.PROVIDER_GCP_LOCAL}:
             # We need to determine the parquet file path based off
             # of the start of the invoice month and usage start for GCP.
@@ -501,22 +642,11 @@ class ParquetReportProcessor:
         else:
             s3_path = self._determin_s3_path(file_type)
         data_frame.to_parquet(file_path, allow_truncated_timestamps=True, coerce_timestamps="ms", index=False)
-        try:
-            with open(file_path, "rb") as fin:
-                copy_data_to_s3_bucket(
-                    self.tracing_id, s3_path, file_name, fin, manifest_id=self.manifest_id, context=self.error_context
-                )
-                msg = f"{file_path} sent to S3."
-                LOG.info(log_json(self.tracing_id, msg=msg, context=self.error_context))
-        except Exception as err:
-            s3_key = f"{self.parquet_path_s3}/{file_path}"
-            msg = f"File {file_name} could not be written as parquet to S3 {s3_key}. Reason: {str(err)}"
-            LOG.warn(log_json(self.tracing_id, msg=msg, context=self.error_context))
-            return False
-        finally:
-            self.files_to_remove.append(file_path)
-
-        return True
+        self.files_to_remove.append(file_path)
+        s3_file_name = file_name
+        if self.clears_s3_by_manifest:
+            s3_file_name = get_manifest_object_name(file_name, self.manifest_id)
+        self.s3_uploads.upload_file(s3_path, file_path, s3_file_name, manifest_id=self.manifest_id)
 
     def process(self):
         """Convert to parquet."""
@@ -6,7 +6,6 @@
 import logging
 
 import pyarrow.parquet as pq
-import trino
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django_tenants.utils import schema_context
@@ -14,9 +13,11 @@ from trino.exceptions import TrinoExternalError
 from trino.exceptions import TrinoQueryError
 from trino.exceptions import TrinoUserError
 
+import koku.trino_database as trino_db
 from api.common import log_json
 from api.models import Provider
 from koku.pg_partition import get_or_create_partition
+from koku.pg_partition import PARTITION_CATALOG
 from masu.util.common import strip_characters_from_column_name
 from reporting.models import PartitionedTable
 from reporting.models import TenantAPIProvider
@@ -53,9 +54,10 @@ class ReportParquetProcessorBase:
         """Execute Trino SQL."""
         rows = []
         try:
-            with trino.dbapi.connect(
+            with trino_db.connection(
                 host=settings.TRINO_HOST, port=settings.TRINO_PORT, user="admin", catalog="hive", schema=schema_name
             ) as conn:
+                trino_db.invalidate_metadata(sql)
                 cur = conn.cursor()
                 cur.execute(sql)
                 rows = cur.fetchall()
@@ -85,19 +87,15 @@ class ReportParquetProcessorBase:
         """Check if schema exists."""
         LOG.info(log_json(msg="checking for schema", schema=self._schema_name))
         schema_check_sql = f"SHOW SCHEMAS LIKE '{self._schema_name}'"
-        schema = self._execute_sql(schema_check_sql, "default")
-        if schema:
-            return True
-        return False
+        return trino_db.cached_exists(lambda: self._execute_sql(schema_check_sql, "default"), self._schema_name)
 
     def table_exists(self):
         """Check if table exists."""
         LOG.info(log_json(msg="checking for table", table=self._table_name, schema=self._schema_name))
         table_check_sql = f"SHOW TABLES LIKE '{self._table_name}'"
-        table = self._execute_sql(table_check_sql, self._schema_name)
-        if table:
-            return True
-        return False
+        return trino_db.cached_exists(
+            lambda: self._execute_sql(table_check_sql, self._schema_name), self._schema_name, self._table_name
+        )
 
     def create_schema(self):
         """Create Trino schema."""
@@ -187,14 +185,18 @@ class ReportParquetProcessorBase:
 
         created = False  # used for actual bill_date partition
         for _from, _to in partition_ranges:
+            if partition_type == PartitionedTable.RANGE and PARTITION_CATALOG.has_partition(
+                self._schema_name, table_name, _from
+            ):
+                continue
             part_rec["table_name"] = f'{table_name}_{_from.strftime("%Y_%m")}'
-            part_rec["partition_parameters"]["from"] = str(_from)
-            part_rec["partition_parameters"]["to"] = str(_to)
+            part_rec["partition_parameters"] = {"default": False, "from": str(_from), "to": str(_to)}
             # This func will to the get_or_create on the tracking table
             # which, if needed, will fire the trigger to create a partition
             # BUT it will also check the default partition for overlapping data
             # AND move it to the new partition.
             record, _created = get_or_create_partition(part_rec)
+            PARTITION_CATALOG.add(record, _created)
             if _from == _bill_date:
                 created = _created
             if _created:
@@ -56,8 +56,8 @@ from masu.processor.report_processor import ReportProcessorError
 from masu.processor.report_summary_updater import ReportSummaryUpdater
 from masu.processor.report_summary_updater import ReportSummaryUpdaterCloudError
 from masu.processor.report_summary_updater import ReportSummaryUpdaterProviderNotFoundError
+from masu.processor.worker_cache import get_worker_cache
 from masu.processor.worker_cache import rate_limit_tasks
-from masu.processor.worker_cache import WorkerCache
 from masu.util.aws.common import remove_files_not_in_set_from_s3_bucket
 from masu.util.common import execute_trino_query
 from masu.util.common import get_path_prefix
@@ -204,7 +204,7 @@ def get_report_files(  # noqa: C901
             month = parser.parse(report_month)
         report_file = report_context.get("key")
         cache_key = f"{provider_uuid}:{report_file}"
-        WorkerCache().add_task_to_cache(cache_key)
+        get_worker_cache().add_task_to_cache(cache_key)
 
         try:
             report_dict = _get_report_files(
@@ -220,7 +220,7 @@ def get_report_files(  # noqa: C901
             )
         except (MasuProcessingError, MasuProviderError, ReportDownloaderError) as err:
             worker_stats.REPORT_FILE_DOWNLOAD_ERROR_COUNTER.labels(provider_type=provider_type).inc()
-            WorkerCache().remove_task_from_cache(cache_key)
+            get_worker_cache().remove_task_from_cache(cache_key)
             LOG.warning(log_json(tracing_id, msg=str(err), context=context), exc_info=err)
             return
 
@@ -229,7 +229,7 @@ def get_report_files(  # noqa: C901
             context["invoice_month"] = report_dict.get("invoice_month")
             LOG.info(log_json(tracing_id, msg="reports to be processed", context=context))
         else:
-            WorkerCache().remove_task_from_cache(cache_key)
+            get_worker_cache().remove_task_from_cache(cache_key)
             LOG.info(log_json(tracing_id, msg="no report to be processed", context=context))
             return
 
@@ -258,13 +258,13 @@ def get_report_files(  # noqa: C901
         except (ReportProcessorError, ReportProcessorDBError) as processing_error:
             worker_stats.PROCESS_REPORT_ERROR_COUNTER.labels(provider_type=provider_type).inc()
             LOG.error(log_json(tracing_id, msg=f"Report processing error: {processing_error}", context=context))
-            WorkerCache().remove_task_from_cache(cache_key)
+            get_worker_cache().remove_task_from_cache(cache_key)
             raise processing_error
         except NotImplementedError as err:
             LOG.info(log_json(tracing_id, msg=f"Not implemented error: {err}", context=context))
-            WorkerCache().remove_task_from_cache(cache_key)
+            get_worker_cache().remove_task_from_cache(cache_key)
 
-        WorkerCache().remove_task_from_cache(cache_key)
+        get_worker_cache().remove_task_from_cache(cache_key)
         if not result:
             LOG.info(log_json(tracing_id, msg="no report files processed, skipping summary", context=context))
             return None
@@ -272,11 +272,11 @@ def get_report_files(  # noqa: C901
         return report_meta
     except ReportDownloaderWarning as err:
         LOG.warning(log_json(tracing_id, msg=f"Report downloader Warning: {err}", context=context), exc_info=err)
-        WorkerCache().remove_task_from_cache(cache_key)
+        get_worker_cache().remove_task_from_cache(cache_key)
     except Exception as err:
         worker_stats.PROCESS_REPORT_ERROR_COUNTER.labels(provider_type=provider_type).inc()
         LOG.error(log_json(tracing_id, msg=f"Unknown downloader exception: {err}", context=context), exc_info=err)
-        WorkerCache().remove_task_from_cache(cache_key)
+        get_worker_cache().remove_task_from_cache(cache_key)
 
 
 @celery_app.task(name="masu.processor.tasks.remove_expired_data", queue=DEFAULT)
@@ -454,7 +454,7 @@ def update_summary_tables(  # noqa: C901
         fallback_mark_manifest_complete_queue = MARK_MANIFEST_COMPLETE_QUEUE_XL
 
     if not synchronous:
-        worker_cache = WorkerCache()
+        worker_cache = get_worker_cache()
         timeout = settings.WORKER_CACHE_TIMEOUT
         rate_limited = False
         if is_large_customer:
@@ -663,7 +663,7 @@ def update_openshift_on_cloud(
         cache_arg_date = start_date.strftime("%Y-%m")
     cache_args = [schema_name, infrastructure_provider_uuid, openshift_provider_uuid, cache_arg_date]
     if not synchronous:
-        worker_cache = WorkerCache()
+        worker_cache = get_worker_cache()
         timeout = settings.WORKER_CACHE_TIMEOUT
         rate_limited = False
         fallback_queue = UPDATE_SUMMARY_TABLES_QUEUE
@@ -793,7 +793,7 @@ def update_cost_model_costs(
     task_name = "masu.processor.tasks.update_cost_model_costs"
     cache_args = [schema_name, provider_uuid, start_date, end_date]
     if not synchronous:
-        worker_cache = WorkerCache()
+        worker_cache = get_worker_cache()
         fallback_queue = UPDATE_COST_MODEL_COSTS_QUEUE
         if is_customer_large(schema_name):
             fallback_queue = UPDATE_COST_MODEL_COSTS_QUEUE_XL
@@ -3,17 +3,67 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Cache of worker tasks currently running."""
+import functools
 import logging
+import threading
+import time
 
+import redis
 from django.conf import settings
 from django.core.cache import caches
 from django.db import connection
+from redis.exceptions import RedisError
 
 from koku import CELERY_INSPECT
 
 TASK_CACHE_EXPIRE = 30
 LOG = logging.getLogger(__name__)
 
+WORKER_HOSTS_KEY = "worker:hosts"
+WORKER_HEARTBEAT_KEY = "worker:heartbeat:"
+WORKER_TASKS_KEY = "worker:tasks:"
+WORKER_LOCK_KEY = "worker:lock:"
+WORKER_RUNNING_KEY = "worker:running:"
+
+# Take a single task lock unless it is held by a worker that is still alive.
+# KEYS: lock, running tasks of the task name; ARGV: host, timeout, lock member, lock expiry, heartbeat key prefix
+LOCK_SINGLE_TASK_SCRIPT = """
+local owner = redis.call("GET", KEYS[1])
+if owner and redis.call("EXISTS", ARGV[5] .. owner) == 1 then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[2])
+redis.call("ZADD", KEYS[2], ARGV[4], ARGV[3])
+if redis.call("TTL", KEYS[2]) < tonumber(ARGV[2]) then
+    redis.call("EXPIRE", KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+_redis_client = None
+_heartbeat_thread = None
+
+
+def get_worker_redis():
+    """Return the Redis client holding the worker locks."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=True,
+            **settings.REDIS_CONNECTION_POOL_KWARGS,
+        )
+    return _redis_client
+
+
+def get_worker_cache():
+    """Return the worker cache selected by settings.WORKER_CACHE_REDIS."""
+    if settings.WORKER_CACHE_REDIS:
+        return RedisWorkerCache()
+    return WorkerCache()
+
 
 def create_single_task_cache_key(task_name, task_args=None):
     """Create the cache key for a single task with optional task args."""
@@ -26,6 +76,14 @@ def create_single_task_cache_key(task_name, task_args=None):
 
 def rate_limit_tasks(task_name, schema_name):
     """Limit the number of concurrent tasks for a customer."""
+    if settings.WORKER_CACHE_REDIS:
+        try:
+            return RedisWorkerCache().count_running_tasks(task_name, schema_name) >= int(
+                settings.WORKER_CACHE_LARGE_CUSTOMER_CONCURRENT_TASKS
+            )
+        except RedisError as err:
+            LOG.warning(f"Unable to count running tasks in Redis, using the worker cache table: {err}")
+
     with connection.cursor() as cursor:
         cursor.execute(
             "SELECT count(*) FROM public.worker_cache_table WHERE cache_key LIKE %s and cache_key LIKE %s",
@@ -169,3 +227,180 @@ class WorkerCache:
         """Delete the cache entry for a single task."""
         cache_str = create_single_task_cache_key(task_name, task_args)
         self.cache.delete(cache_str)
+
+
+def _fall_back_to_worker_cache(method):
+    """Run the WorkerCache method of the same name when Redis cannot be reached."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except RedisError as err:
+            LOG.warning(f"Unable to reach the Redis worker cache, using WorkerCache.{method.__name__}: {err}")
+            return getattr(self.fallback, method.__name__)(*args, **kwargs)
+
+    return wrapper
+
+
+class RedisWorkerCache:
+    """Track celery tasks across container/pod with atomic Redis primitives.
+
+    This offers the WorkerCache API without broadcasting to the workers. A worker is alive while
+    its heartbeat key exists; locks, task lists and running counts of dead workers are ignored and
+    cleaned up lazily. Heartbeats are sent by start_worker_heartbeat(). While Redis cannot be reached,
+    the calls fall back to the database backed WorkerCache.
+
+    Example:
+
+        key                                        |  type   |  value
+        worker:hosts                               |  set    |  {"koku-worker-0", "koku-worker-1"}
+        worker:heartbeat:koku-worker-0             |  string |  1 (expires after WORKER_HEARTBEAT_TIMEOUT)
+        worker:tasks:koku-worker-0                 |  set    |  {"10c0fb01-9d65-4605-bbf1-6089107ec5e5:..."}
+        worker:lock:update_summary_tables:org1:OCP |  string |  "koku-worker-1" (expires with the lock)
+        worker:running:update_summary_tables       |  zset   |  {"update_summary_tables:org1:OCP": expiry}
+
+    """
+
+    def __init__(self):
+        self._hostname = settings.HOSTNAME
+        self.redis = get_worker_redis()
+        self._fallback = None
+
+    @property
+    def fallback(self):
+        """Return the database backed WorkerCache used while Redis cannot be reached."""
+        if self._fallback is None:
+            self._fallback = WorkerCache()
+        return self._fallback
+
+    def heartbeat(self):
+        """Mark this worker as alive."""
+        with self.redis.pipeline() as pipe:
+            pipe.set(f"{WORKER_HEARTBEAT_KEY}{self._hostname}", 1, ex=settings.WORKER_HEARTBEAT_TIMEOUT)
+            pipe.sadd(WORKER_HOSTS_KEY, self._hostname)
+            pipe.execute()
+
+    def _alive(self, hosts):
+        """Return the set of hosts with a live heartbeat."""
+        hosts = list(hosts)
+        with self.redis.pipeline(transaction=False) as pipe:
+            for host in hosts:
+                pipe.exists(f"{WORKER_HEARTBEAT_KEY}{host}")
+            return {host for host, alive in zip(hosts, pipe.execute()) if alive}
+
+    @property
+    def worker_cache(self):
+        """Return the tasks of this worker."""
+        return list(self.redis.smembers(f"{WORKER_TASKS_KEY}{self._hostname}"))
+
+    @_fall_back_to_worker_cache
+    def invalidate_host(self, host=None):
+        """Invalidate the cache for a particular host."""
+        self.redis.delete(f"{WORKER_TASKS_KEY}{host or self._hostname}")
+
+    @_fall_back_to_worker_cache
+    def add_task_to_cache(self, task_key):
+        """Add an entry to the cache for a task."""
+        self.redis.sadd(f"{WORKER_TASKS_KEY}{self._hostname}", task_key)
+        LOG.debug(f"Added task key {task_key} to cache.")
+
+    @_fall_back_to_worker_cache
+    def remove_task_from_cache(self, task_key):
+        """Remove an entry from the cache for a task."""
+        if self.redis.srem(f"{WORKER_TASKS_KEY}{self._hostname}", task_key):
+            LOG.debug(f"Removed task key {task_key} from cache.")
+
+    def remove_offline_worker_keys(self):
+        """Remove the hosts and task lists of workers without a heartbeat and return the live hosts."""
+        hosts = self.redis.smembers(WORKER_HOSTS_KEY)
+        alive = self._alive(hosts)
+        if offline := hosts - alive:
+            LOG.info(f"Removing old workers: {offline}")
+            with self.redis.pipeline() as pipe:
+                pipe.srem(WORKER_HOSTS_KEY, *offline)
+                pipe.delete(*(f"{WORKER_TASKS_KEY}{host}" for host in offline))
+                pipe.execute()
+        return alive
+
+    @_fall_back_to_worker_cache
+    def get_all_running_tasks(self):
+        """Combine each live host's running tasks into a single list."""
+        alive = self.remove_offline_worker_keys()
+        if not alive:
+            return []
+        return list(self.redis.sunion(*(f"{WORKER_TASKS_KEY}{host}" for host in alive)))
+
+    def task_is_running(self, task_key):
+        """Check if a task is in the cache."""
+        return task_key in self.get_all_running_tasks()
+
+    @_fall_back_to_worker_cache
+    def single_task_is_running(self, task_name, task_args=None):
+        """Check for a single task lock held by a live worker."""
+        cache_str = create_single_task_cache_key(task_name, task_args)
+        host = self.redis.get(f"{WORKER_LOCK_KEY}{cache_str}")
+        return bool(host) and bool(self._alive([host]))
+
+    @_fall_back_to_worker_cache
+    def lock_single_task(self, task_name, task_args=None, timeout=TASK_CACHE_EXPIRE):
+        """Lock a specific task unless a live worker holds the lock.
+
+        Returns:
+            (bool) True when this worker took the lock
+        """
+        cache_str = create_single_task_cache_key(task_name, task_args)
+        timeout = int(timeout)
+        locked = self.redis.eval(
+            LOCK_SINGLE_TASK_SCRIPT,
+            2,
+            f"{WORKER_LOCK_KEY}{cache_str}",
+            f"{WORKER_RUNNING_KEY}{task_name}",
+            self._hostname,
+            timeout,
+            cache_str,
+            time.time() + timeout,
+            WORKER_HEARTBEAT_KEY,
+        )
+        return bool(locked)
+
+    @_fall_back_to_worker_cache
+    def release_single_task(self, task_name, task_args=None):
+        """Delete the lock for a single task."""
+        cache_str = create_single_task_cache_key(task_name, task_args)
+        with self.redis.pipeline() as pipe:
+            pipe.delete(f"{WORKER_LOCK_KEY}{cache_str}")
+            pipe.zrem(f"{WORKER_RUNNING_KEY}{task_name}", cache_str)
+            pipe.execute()
+
+    def count_running_tasks(self, task_name, schema_name):
+        """Count the locks of task_name for a customer that are held by live workers."""
+        running_key = f"{WORKER_RUNNING_KEY}{task_name}"
+        with self.redis.pipeline() as pipe:
+            pipe.zremrangebyscore(running_key, "-inf", time.time())
+            pipe.zrange(running_key, 0, -1)
+            _, locks = pipe.execute()
+        locks = [lock for lock in locks if schema_name in lock]
+        if not locks:
+            return 0
+        owners = self.redis.mget([f"{WORKER_LOCK_KEY}{lock}" for lock in locks])
+        alive = self._alive({owner for owner in owners if owner})
+        return sum(1 for owner in owners if owner in alive)
+
+
+def start_worker_heartbeat():
+    """Keep the heartbeat of this worker alive from a daemon thread, also while long tasks run."""
+    global _heartbeat_thread
+    if _heartbeat_thread and _heartbeat_thread.is_alive():
+        return
+
+    def beat():
+        while True:
+            try:
+                RedisWorkerCache().heartbeat()
+            except RedisError as err:
+                LOG.warning(f"Unable to send worker heartbeat: {err}")
+            time.sleep(settings.WORKER_HEARTBEAT_TIMEOUT / 3)
+
+    _heartbeat_thread = threading.Thread(target=beat, name="worker-heartbeat", daemon=True)
+    _heartbeat_thread.start()
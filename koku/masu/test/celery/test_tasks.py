@@ -1,5 +1,5 @@
 """Tests for celery tasks."""
-from collections import namedtuple
+import threading
 from datetime import datetime
 from unittest.mock import call
 from unittest.mock import Mock
@@ -22,7 +22,6 @@ from masu.test import MasuTestCase
 from reporting.models import TRINO_MANAGED_TABLES
 
 fake = faker.Faker()
-DummyS3Object = namedtuple("DummyS3Object", "key")
 
 
 class FakeManifest:
@@ -52,6 +51,49 @@ class FakeManifest:
         return True
 
 
+class FakeS3:
+    """An in-memory stand-in for the boto3 S3 resource listing and deleting objects."""
+
+    def __init__(self, keys, failing_keys=None):
+        self.keys = sorted(keys)
+        self.failing_keys = failing_keys or set()
+        self.lock = threading.Lock()
+        self.list_count = 0
+        self.delete_count = 0
+        self.undeleted = 0
+        self.max_undeleted = 0
+        self.meta = Mock()
+        self.meta.client.get_paginator.return_value.paginate.side_effect = self.paginate
+
+    def paginate(self, Bucket, Prefix, PaginationConfig):
+        self.list_count += 1
+        page_size = PaginationConfig["PageSize"]
+        start_after = ""
+        while True:
+            with self.lock:
+                page = [key for key in self.keys if key > start_after and key.startswith(Prefix)][:page_size]
+                self.undeleted += len(page)
+                self.max_undeleted = max(self.max_undeleted, self.undeleted)
+            if not page:
+                return
+            yield {"Contents": [{"Key": key} for key in page]}
+            start_after = page[-1]
+
+    def Bucket(self, name):
+        return self
+
+    def delete_objects(self, Delete):
+        keys = [obj["Key"] for obj in Delete["Objects"]]
+        errors = [{"Key": key, "Code": "AccessDenied", "Message": "Access Denied"} for key in keys]
+        errors = [error for error in errors if error["Key"] in self.failing_keys]
+        with self.lock:
+            self.delete_count += 1
+            self.undeleted -= len(keys)
+            deleted = set(keys) - self.failing_keys
+            self.keys = [key for key in self.keys if key not in deleted]
+        return {"Errors": errors} if errors else {}
+
+
 class TestCeleryTasks(MasuTestCase):
     """Test cases for Celery tasks."""
 
@@ -190,27 +232,36 @@ class TestCeleryTasks(MasuTestCase):
         self.assertIn("provider_type", str(e.exception))
         self.assertIn("provider_uuid", str(e.exception))
 
-    @patch("masu.celery.tasks.get_s3_resource")
-    def test_deleted_archived_with_prefix_success(self, mock_resource):
-        """Test that delete_archived_data correctly interacts with AWS S3."""
+    def test_deleted_archived_with_prefix_success(self):
+        """Test that delete_archived_data deletes the listed pages without listing them twice."""
         expected_prefix = "data/csv/10001/00000000-0000-0000-0000-000000000001/"
+        fake_s3 = FakeS3([f"{expected_prefix}{i:05d}.csv" for i in range(50000)] + ["data/other/file.csv"])
 
-        # Generate enough fake objects to expect calling the S3 delete api twice.
-        mock_bucket = mock_resource.return_value.Bucket.return_value
-        bucket_objects = [DummyS3Object(key=fake.file_path()) for _ in range(1234)]
-        expected_keys = [{"Key": bucket_object.key} for bucket_object in bucket_objects]
+        with patch("masu.celery.tasks.get_s3_resource", return_value=fake_s3):
+            with override_settings(S3_DELETE_THREADS=4):
+                failed_keys = tasks.deleted_archived_with_prefix("bucket", expected_prefix)
 
-        # Leave one object mysteriously not deleted to cover the LOG.warning use case.
-        mock_bucket.objects.filter.side_effect = [bucket_objects, bucket_objects[:1]]
+        self.assertEqual(failed_keys, [])
+        self.assertEqual(fake_s3.keys, ["data/other/file.csv"])
+        self.assertEqual(fake_s3.list_count, 1)
+        self.assertEqual(fake_s3.delete_count, 50)
+        # pages are deleted while the prefix is listed, never more than one page per thread plus the next one
+        self.assertLessEqual(fake_s3.max_undeleted, 5 * tasks.S3_DELETE_BATCH_SIZE)
 
-        with self.assertLogs("masu.celery.tasks", "WARNING") as captured_logs:
-            tasks.deleted_archived_with_prefix(mock_bucket, expected_prefix)
-        mock_resource.assert_called()
-        mock_bucket.delete_objects.assert_has_calls(
-            [call(Delete={"Objects": expected_keys[:1000]}), call(Delete={"Objects": expected_keys[1000:]})]
-        )
-        mock_bucket.objects.filter.assert_has_calls([call(Prefix=expected_prefix), call(Prefix=expected_prefix)])
-        self.assertIn("Found 1 objects after attempting", captured_logs.output[-1])
+    def test_deleted_archived_with_prefix_errors(self):
+        """Test that delete_archived_data returns the keys S3 reported as not deleted."""
+        expected_prefix = "data/csv/10001/00000000-0000-0000-0000-000000000001/"
+        keys = [f"{expected_prefix}{i:05d}.csv" for i in range(1234)]
+        fake_s3 = FakeS3(keys, failing_keys={keys[0], keys[1100]})
+
+        with patch("masu.celery.tasks.get_s3_resource", return_value=fake_s3):
+            with self.assertLogs("masu.celery.tasks", "WARNING") as captured_logs:
+                failed_keys = tasks.deleted_archived_with_prefix("bucket", expected_prefix)
+
+        self.assertEqual(sorted(failed_keys), [keys[0], keys[1100]])
+        self.assertEqual(fake_s3.keys, [keys[0], keys[1100]])
+        self.assertEqual(fake_s3.list_count, 1)
+        self.assertIn("Failed to delete 2 objects", captured_logs.output[-1])
 
     @patch("masu.celery.tasks.deleted_archived_with_prefix")
     def test_delete_archived_data_success(self, mock_delete):
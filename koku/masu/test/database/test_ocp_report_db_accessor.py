@@ -8,16 +8,22 @@ import random
 import uuid
 from collections import defaultdict
 from datetime import datetime
+from decimal import Decimal
 from unittest.mock import call
 from unittest.mock import Mock
 from unittest.mock import patch
 
 from dateutil import relativedelta
 from django.conf import settings
+from django.db.models import F
 from django.db.models import Max
+from django.db.models import Min
 from django.db.models import Q
 from django.db.models import Sum
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
+from django.test.utils import override_settings
 from django_tenants.utils import schema_context
 from trino.exceptions import TrinoExternalError
 
@@ -31,6 +37,7 @@ from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.external.date_accessor import DateAccessor
 from masu.test import MasuTestCase
 from masu.test.database.helpers import ReportObjectCreator
+from reporting.models import OCPCostSummaryByProjectP
 from reporting.models import OCPEnabledTagKeys
 from reporting.models import OCPStorageVolumeLabelSummary
 from reporting.models import OCPUsageLineItemDailySummary
@@ -344,6 +351,30 @@ select * from eek where val1 in {{report_period_id}} ;
                                     actual_diff = float(post_record[1] - vals[1])
                                 self.assertAlmostEqual(actual_diff, expected_diff)
 
+    @patch("masu.database.ocp_report_db_accessor.OCPReportDBAccessor._execute_raw_sql_query")
+    def test_populate_tag_usage_costs_single_statement_per_rate_type(self, mock_execute):
+        """Test that all tag rates of a rate type are applied in one statement."""
+        dh = DateHelper()
+        rates = {
+            "cpu_core_usage_per_hour": {"app": {f"value-{i}": i for i in range(250)}},
+            "storage_gb_usage_per_month": {"storage": {"gold": 1, "silver": 2}},
+            "node_cost_per_month": {"app": {"banking": 1}},
+        }
+        defaults = {"memory_gb_usage_per_hour": {"app": {"default_value": 5, "defined_keys": ["banking"]}}}
+
+        self.accessor.populate_tag_usage_costs(rates, rates, dh.this_month_start, dh.this_month_end, self.cluster_id)
+        self.assertEqual(mock_execute.call_count, 2)
+        sql = mock_execute.call_args.args[1]
+        self.assertIn("cte_tag_rates", sql)
+        # six parameters for each of the 252 usage tag rates plus the rate type, cluster and dates
+        self.assertEqual(len(mock_execute.call_args.kwargs["bind_params"]), 252 * 6 + 4)
+
+        mock_execute.reset_mock()
+        self.accessor.populate_tag_usage_default_costs(
+            defaults, {}, dh.this_month_start, dh.this_month_end, self.cluster_id
+        )
+        self.assertEqual(mock_execute.call_count, 1)
+
     def test_populate_tag_based_default_usage_costs(self):  # noqa: C901
         """Test that the usage costs are updated correctly when default tag values are passed in."""
         # set up the key value pairs to test and the map for cost type and the fields it needs
@@ -576,6 +607,48 @@ select * from eek where val1 in {{report_period_id}} ;
         with schema_context(self.schema):
             self.assertEqual(table_query.count(), 0)
 
+    def test_populate_ui_summary_tables_incremental(self):
+        """Test that the incremental refresh only rewrites the summary rows that changed."""
+        with schema_context(self.schema):
+            start_date = OCPUsageLineItemDailySummary.objects.aggregate(Min("usage_start")).get("usage_start__min")
+            end_date = OCPUsageLineItemDailySummary.objects.aggregate(Max("usage_start")).get("usage_start__max")
+        tables = ["reporting_ocp_cost_summary_by_project_p"]
+        summary = OCPCostSummaryByProjectP.objects.filter(source_uuid=self.ocp_provider_uuid)
+
+        self.accessor.populate_ui_summary_tables(start_date, end_date, self.ocp_provider_uuid, tables)
+        with schema_context(self.schema):
+            expected_ids = set(summary.values_list("id", flat=True))
+            self.assertNotEqual(expected_ids, set())
+
+        with override_settings(OCP_UI_SUMMARY_INCREMENTAL=True):
+            self.accessor.populate_ui_summary_tables(start_date, end_date, self.ocp_provider_uuid, tables)
+        with schema_context(self.schema):
+            self.assertEqual(set(summary.values_list("id", flat=True)), expected_ids)
+
+            changed = summary.filter(namespace__isnull=False).first()
+            slice_filter = {
+                "usage_start": changed.usage_start,
+                "namespace": changed.namespace,
+                "cluster_id": changed.cluster_id,
+                "cost_model_rate_type": changed.cost_model_rate_type,
+            }
+            OCPUsageLineItemDailySummary.objects.filter(source_uuid=self.ocp_provider_uuid, **slice_filter).update(
+                cost_model_cpu_cost=Coalesce(F("cost_model_cpu_cost"), Value(Decimal(0))) + Decimal(1)
+            )
+
+        with override_settings(OCP_UI_SUMMARY_INCREMENTAL=True):
+            self.accessor.populate_ui_summary_tables(start_date, end_date, self.ocp_provider_uuid, tables)
+        with schema_context(self.schema):
+            incremental_ids = set(summary.values_list("id", flat=True))
+            self.assertNotIn(changed.id, incremental_ids)
+            self.assertEqual(incremental_ids - expected_ids, {summary.get(**slice_filter).id})
+            incremental = sorted(summary.values_list("usage_start", "namespace", "cost_model_cpu_cost"), key=str)
+
+        self.accessor.populate_ui_summary_tables(start_date, end_date, self.ocp_provider_uuid, tables)
+        with schema_context(self.schema):
+            rebuilt = sorted(summary.values_list("usage_start", "namespace", "cost_model_cpu_cost"), key=str)
+        self.assertEqual(incremental, rebuilt)
+
     def test_table_properties(self):
         self.assertEqual(self.accessor.line_item_daily_summary_table, OCPUsageLineItemDailySummary)
 
@@ -126,7 +126,7 @@ class AWSLocalReportDownloaderTest(MasuTestCase):
         with patch("masu.processor.parquet.parquet_report_processor.Path"):
             with patch("masu.processor.parquet.parquet_report_processor.pd"):
                 with patch("masu.processor.parquet.parquet_report_processor.open"):
-                    with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+                    with patch("masu.util.aws.common.copy_data_to_s3_bucket"):
                         with patch(
                             "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor."
                             "create_parquet_table"
@@ -1,14 +1,17 @@
 """Test the GCPReportDownloader class."""
+import csv
 import datetime
 import os
 import shutil
 import tempfile
+from itertools import chain
 from unittest.mock import patch
 from unittest.mock import PropertyMock
 from uuid import uuid4
 
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
+from django.test import override_settings
 from faker import Faker
 from google.cloud.exceptions import GoogleCloudError
 from rest_framework.exceptions import ValidationError
@@ -91,13 +94,15 @@ class GCPReportDownloaderTest(MasuTestCase):
         mock_bigquery.Client.return_value.query.return_value.result.return_value = ["a", "b", "c", "d"]
         key = "202011_1234_2020-12-05:2020-12-08.csv"
         downloader = self.downloader
-        with patch("masu.external.downloader.gcp.gcp_report_downloader.open") as mock_open:
+        with patch(
+            "masu.external.downloader.gcp.gcp_report_downloader.create_daily_archives_from_rows"
+        ) as mock_create:
             err_msg = "bad open"
-            mock_open.side_effect = IOError(err_msg)
+            mock_create.side_effect = IOError(err_msg)
             with self.assertRaisesRegex(GCPReportDownloaderError, err_msg):
                 downloader.download_file(key)
                 mock_bigquery.assert_called()
-                mock_open.assert_called()
+                mock_create.assert_called()
 
     def test_get_local_file_for_report(self):
         """Assert that get_local_file_for_report is a simple pass-through."""
@@ -113,15 +118,14 @@ class GCPReportDownloaderTest(MasuTestCase):
         mock_bigquery.client.return_value.query.return_value = ["This", "test"]
         key = "202011_1234_2020-12-05:2020-12-08.csv"
         downloader = self.downloader
-        with patch("masu.external.downloader.gcp.gcp_report_downloader.open"):
-            with patch(
-                "masu.external.downloader.gcp.gcp_report_downloader.create_daily_archives",
-                return_value=[["file_one", "file_two"], {"start": "", "end": ""}],
-            ):
-                full_path, _, date, _, __ = downloader.download_file(key)
-                mock_makedirs.assert_called()
-                self.assertEqual(date, self.today)
-                self.assertEqual(full_path, key)
+        with patch(
+            "masu.external.downloader.gcp.gcp_report_downloader.create_daily_archives_from_rows",
+            return_value=[["file_one", "file_two"], {"start": "", "end": ""}],
+        ):
+            full_path, _, date, _, __ = downloader.download_file(key)
+            mock_makedirs.assert_called()
+            self.assertEqual(date, self.today)
+            self.assertEqual(full_path, key)
 
     @patch("masu.external.downloader.gcp.gcp_report_downloader.os.makedirs")
     @patch("masu.external.downloader.gcp.gcp_report_downloader.bigquery")
@@ -132,15 +136,14 @@ class GCPReportDownloaderTest(MasuTestCase):
         export_time = self.today
         key = f"202011_{partition_date}_{export_time}.csv"
         downloader = self.downloader
-        with patch("masu.external.downloader.gcp.gcp_report_downloader.open"):
-            with patch(
-                "masu.external.downloader.gcp.gcp_report_downloader.create_daily_archives",
-                return_value=[["file_one", "file_two"], {"start": "", "end": ""}],
-            ):
-                full_path, _, date, _, __ = downloader.download_file(key)
-                mock_makedirs.assert_called()
-                self.assertEqual(date, self.today)
-                self.assertEqual(full_path, key)
+        with patch(
+            "masu.external.downloader.gcp.gcp_report_downloader.create_daily_archives_from_rows",
+            return_value=[["file_one", "file_two"], {"start": "", "end": ""}],
+        ):
+            full_path, _, date, _, __ = downloader.download_file(key)
+            mock_makedirs.assert_called()
+            self.assertEqual(date, self.today)
+            self.assertEqual(full_path, key)
 
     @patch("masu.external.downloader.gcp.gcp_report_downloader.open")
     def test_download_file_query_client_error(self, mock_open):
@@ -230,6 +233,55 @@ class GCPReportDownloaderTest(MasuTestCase):
             os.remove(daily_file)
         os.remove(temp_path)
 
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.copy_local_report_file_to_s3_bucket")
+    @patch("masu.external.downloader.gcp.gcp_report_downloader.bigquery")
+    def test_download_file_daily_archives_match_csv_download(self, mock_bigquery, mock_s3):
+        """Test that the daily files written from the query rows are the ones the downloaded csv produced."""
+        with open("./koku/masu/test/data/gcp/2022-08-01_5.csv") as f:
+            reader = csv.reader(f)
+            column_list = next(reader)
+            rows = []
+            for row in reader:
+                # BigQuery returns typed values, which csv.writer formats with str()
+                row[5] = datetime.datetime.fromisoformat(row[5])
+                row[18] = float(row[18])
+                row[-1] = datetime.date.fromisoformat(row[-1])
+                rows.append(tuple(row))
+        # the query result is read page by page
+        pages = [rows[:4], rows[4:]]
+        mock_bigquery.Client.return_value.query.return_value.result.return_value = chain.from_iterable(pages)
+        key = "202208_2022-08-01"
+        start_date = DateHelper().this_month_start
+
+        with override_settings(PARQUET_PROCESSING_BATCH_SIZE=5):
+            _, _, _, daily_file_names, date_range = self.downloader.download_file(key, start_date=start_date)
+
+        expected_dir = tempfile.mkdtemp()
+        csv_file_paths = []
+        for i in range(2):
+            csv_file_path = os.path.join(expected_dir, f"2022-08-01_{i}.csv")
+            with open(csv_file_path, "w") as f:
+                writer = csv.writer(f)
+                writer.writerow(column_list)
+                writer.writerows(rows[i * 5 : (i + 1) * 5])
+            csv_file_paths.append(csv_file_path)
+        expected_file_names, expected_date_range = create_daily_archives(
+            "request_id", "account", self.gcp_provider_uuid, csv_file_paths, None, start_date, None
+        )
+
+        self.assertEqual(date_range, expected_date_range)
+        self.assertEqual(len(daily_file_names), 2)
+        self.assertEqual(
+            [os.path.basename(name) for name in daily_file_names],
+            [os.path.basename(name) for name in expected_file_names],
+        )
+        for daily_file_name, expected_file_name in zip(daily_file_names, expected_file_names):
+            with open(daily_file_name, "rb") as daily_file, open(expected_file_name, "rb") as expected_file:
+                self.assertEqual(daily_file.read(), expected_file.read())
+        # no intermediate csv of the query result is written
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(daily_file_names[0]), "2022-08-01_0.csv")))
+        shutil.rmtree(expected_dir)
+
     @patch("masu.external.downloader.gcp.gcp_report_downloader.copy_local_report_file_to_s3_bucket")
     def test_create_daily_archives_error_opening_file(self, mock_s3):
         """
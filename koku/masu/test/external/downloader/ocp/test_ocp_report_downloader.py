@@ -167,24 +167,56 @@ class OCPReportDownloaderTest(MasuTestCase):
         with tempfile.TemporaryDirectory() as td:
             filename = "storage_data.csv"
             file_path = f"{td}/{filename}"
-            with patch("masu.external.downloader.ocp.ocp_report_downloader.pd") as mock_pd:
-                with patch(
-                    "masu.external.downloader.ocp.ocp_report_downloader.utils.detect_type",
-                    return_value=("storage_usage", None),
-                ):
-                    mock_report = {
-                        "interval_start": ["2020-01-01 00:00:00 +UTC", "2020-01-02 00:00:00 +UTC"],
-                        "persistentvolumeclaim_labels": ["label1", "label2"],
-                    }
-                    df = pd.DataFrame(data=mock_report)
-                    mock_pd.read_csv.return_value = df
-                    daily_files = divide_csv_daily(file_path, filename)
-                    self.assertNotEqual([], daily_files)
-                    self.assertEqual(len(daily_files), 2)
-                    gen_files = ["storage_usage.2020-01-01.csv", "storage_usage.2020-01-02.csv"]
-                    expected = [{"filename": gen_file, "filepath": f"{td}/{gen_file}"} for gen_file in gen_files]
-                    for expected_item in expected:
-                        self.assertIn(expected_item, daily_files)
+            with patch(
+                "masu.external.downloader.ocp.ocp_report_downloader.utils.detect_type",
+                return_value=("storage_usage", None),
+            ):
+                mock_report = {
+                    "interval_start": ["2020-01-01 00:00:00 +UTC", "2020-01-02 00:00:00 +UTC"],
+                    "persistentvolumeclaim_labels": ["label1", "label2"],
+                }
+                df = pd.DataFrame(data=mock_report)
+                df.to_csv(file_path, index=False)
+                daily_files = divide_csv_daily(file_path, filename)
+                self.assertNotEqual([], daily_files)
+                self.assertEqual(len(daily_files), 2)
+                gen_files = ["storage_usage.2020-01-01.csv", "storage_usage.2020-01-02.csv"]
+                expected = [{"filename": gen_file, "filepath": f"{td}/{gen_file}"} for gen_file in gen_files]
+                for expected_item in expected:
+                    self.assertIn(expected_item, daily_files)
+
+    @patch("masu.external.downloader.ocp.ocp_report_downloader.settings.PARQUET_PROCESSING_BATCH_SIZE", 2)
+    def test_divide_csv_daily_across_chunks(self):
+        """Test that days spanning several chunks are written to a single file per day."""
+        with tempfile.TemporaryDirectory() as td:
+            filename = "pod_data.csv"
+            file_path = f"{td}/{filename}"
+            mock_report = {
+                "interval_start": [
+                    "2020-01-01 00:00:00 +0000 UTC",
+                    "2020-01-02 00:00:00 +0000 UTC",
+                    "2020-01-01 01:00:00 +0000 UTC",
+                    "2020-01-02 01:00:00 +0000 UTC",
+                    "2020-01-01 02:00:00 +0000 UTC",
+                ],
+                "pod_usage_cpu_core_seconds": ["1172.8799999999999", "", "3", "4.0", "5"],
+                "pod_labels": ["label_a:1", "", "label_a:1", "label_b:2", "label_b:2"],
+            }
+            pd.DataFrame(data=mock_report).to_csv(file_path, index=False)
+            with patch(
+                "masu.external.downloader.ocp.ocp_report_downloader.utils.detect_type",
+                return_value=("pod_usage", None),
+            ):
+                daily_files = divide_csv_daily(file_path, filename)
+
+            self.assertEqual(
+                [daily_file["filename"] for daily_file in daily_files],
+                ["pod_usage.2020-01-01.csv", "pod_usage.2020-01-02.csv"],
+            )
+            first_day = pd.read_csv(daily_files[0]["filepath"], dtype=str, keep_default_na=False)
+            self.assertEqual(list(first_day.pod_usage_cpu_core_seconds), ["1172.8799999999999", "3", "5"])
+            second_day = pd.read_csv(daily_files[1]["filepath"], dtype=str, keep_default_na=False)
+            self.assertEqual(list(second_day.pod_labels), ["", "label_b:2"])
 
     def test_divide_csv_daily_failure(self):
         """Test the divide_csv_daily method throw error on reading CSV."""
@@ -16,6 +16,7 @@ import requests_mock
 from confluent_kafka import KafkaError
 from django.db import InterfaceError
 from django.db import OperationalError
+from requests.exceptions import ConnectionError
 from requests.exceptions import HTTPError
 
 import masu.external.kafka_msg_handler as msg_handler
@@ -729,7 +730,7 @@ class KafkaMsgHandlerTest(MasuTestCase):
                                 shutil.rmtree(fake_dir)
                                 shutil.rmtree(fake_data_dir)
 
-    @patch("masu.external.kafka_msg_handler.TarFile.extractall", side_effect=raise_OSError)
+    @patch("masu.external.kafka_msg_handler.TarFile.extractfile", side_effect=raise_OSError)
     def test_extract_bad_payload_not_tar(self, mock_extractall):
         """Test to verify extracting payload missing report files is not successful."""
         fake_account = {"provider_uuid": uuid.uuid4(), "provider_type": "OCP", "schema_name": "testschema"}
@@ -761,6 +762,19 @@ class KafkaMsgHandlerTest(MasuTestCase):
             with self.assertRaises(msg_handler.KafkaMsgHandlerError):
                 msg_handler.extract_payload(payload_url, "test_request_id", "fake_identity")
 
+    def test_extract_payload_connection_error(self):
+        """Test that a dropped connection is reported as a download failure, not a write failure."""
+        payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
+
+        with requests_mock.mock() as m:
+            m.get(payload_url, exc=ConnectionError)
+
+            with self.assertLogs("masu.external.kafka_msg_handler", level="WARNING") as logger:
+                with self.assertRaises(msg_handler.KafkaMsgHandlerError):
+                    msg_handler.extract_payload(payload_url, "test_request_id", "fake_identity")
+            self.assertIn("Unable to download file", " ".join(logger.output))
+            self.assertNotIn("Unable to write file", " ".join(logger.output))
+
     def test_extract_payload_unable_to_open(self):
         """Test to verify extracting payload exceptions are handled."""
         payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
@@ -772,6 +786,23 @@ class KafkaMsgHandlerTest(MasuTestCase):
                 with self.assertRaises(msg_handler.KafkaMsgHandlerError):
                     msg_handler.extract_payload(payload_url, "test_request_id", "fake_identity")
 
+    def test_extract_payload_files(self):
+        """Test that only the requested payload members are streamed to their destination."""
+        report_file = "e6b3701e-1e91-433b-b238-a31e49937558_storage.csv"
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with tempfile.TemporaryDirectory() as destination_dir:
+                tarball_path = f"{temp_dir}/payload.tar.gz"
+                with open(tarball_path, "wb") as tarball:
+                    tarball.write(self.tarball_file)
+                destinations = {
+                    report_file: f"{destination_dir}/{report_file}",
+                    "missing.csv": f"{destination_dir}/missing.csv",
+                }
+                extracted = msg_handler.extract_payload_files("test_request_id", temp_dir, tarball_path, destinations)
+                self.assertEqual(extracted, {f"{destination_dir}/{report_file}"})
+                self.assertEqual(os.listdir(destination_dir), [report_file])
+                self.assertEqual(os.listdir(temp_dir), ["payload.tar.gz"])
+
     def test_extract_payload_wrong_file_type(self):
         """Test to verify extracting payload is successful."""
         payload_url = "http://insights-upload.com/quarnantine/file_to_validate"
@@ -5,6 +5,7 @@
 """Test the AWSReportDBCleaner utility object."""
 import datetime
 import uuid
+from unittest.mock import patch
 
 import django
 from django.conf import settings
@@ -12,12 +13,16 @@ from django.db import transaction
 from django_tenants.utils import schema_context
 
 from api.provider.models import Provider
+from koku.database import execute_compiled_sql
 from masu.database import AWS_CUR_TABLE_MAP
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.processor.aws.aws_report_db_cleaner import AWSReportDBCleaner
 from masu.processor.aws.aws_report_db_cleaner import AWSReportDBCleanerError
 from masu.test import MasuTestCase
 from reporting.models import PartitionedTable
+from reporting.models import TenantAPIProvider
+from reporting.provider.aws.models import AWSCostEntryBill
+from reporting.provider.aws.models import AWSCostEntryLineItemDailySummary
 
 
 def table_exists(schema_name, table_name):
@@ -124,3 +129,71 @@ class AWSReportDBCleanerTest(MasuTestCase):
 
             self.assertEqual(len(removed_data), 1)
             self.assertFalse(table_exists(self.schema, test_part.table_name))
+
+    def test_purge_report_data_by_provider_per_partition(self):
+        """Test that purging a provider deletes its daily summary rows one partition at a time."""
+        table_name = AWSCostEntryLineItemDailySummary._meta.db_table
+        months = [datetime.date(2016, month, 1) for month in (1, 2, 3)]
+        with schema_context(self.schema):
+            partitions = []
+            for month in months:
+                partition = PartitionedTable(
+                    schema_name=self.schema,
+                    table_name=f"{table_name}_{month.strftime('%Y_%m')}",
+                    partition_of_table_name=table_name,
+                    partition_type=PartitionedTable.RANGE,
+                    partition_col="usage_start",
+                    partition_parameters={
+                        "default": False,
+                        "from": str(month),
+                        "to": str(month.replace(month=month.month + 1)),
+                    },
+                    active=True,
+                )
+                partition.save()
+                partitions.append(partition.table_name)
+            partition_count = PartitionedTable.objects.filter(
+                schema_name=self.schema, partition_of_table_name=table_name, active=True
+            ).count()
+
+            sources = [
+                TenantAPIProvider.objects.create(name=f"purge source {i}", type=Provider.PROVIDER_AWS_LOCAL)
+                for i in range(2)
+            ]
+            for source in sources:
+                for month in months:
+                    bill = AWSCostEntryBill.objects.create(
+                        billing_resource=f"purge-{source.uuid}",
+                        billing_period_start=datetime.datetime(month.year, month.month, 1, tzinfo=settings.UTC),
+                        billing_period_end=datetime.datetime(month.year, month.month, 28, tzinfo=settings.UTC),
+                        provider=source,
+                    )
+                    AWSCostEntryLineItemDailySummary.objects.create(
+                        uuid=uuid.uuid4(),
+                        cost_entry_bill=bill,
+                        usage_start=month,
+                        usage_end=month,
+                        usage_account_id="purge",
+                        product_code="AmazonEC2",
+                        currency_code="USD",
+                        source_uuid=source.uuid,
+                    )
+            target, other = sources
+
+        cleaner = AWSReportDBCleaner(self.schema)
+        with patch("koku.database.execute_compiled_sql", wraps=execute_compiled_sql) as mock_execute:
+            removed_data = cleaner.purge_expired_report_data(provider_uuid=target.uuid)
+        self.assertEqual(len(removed_data), len(months))
+
+        partition_deletes = [call.args[0] for call in mock_execute.call_args_list if f'"{table_name}_' in call.args[0]]
+        self.assertEqual(len(partition_deletes), partition_count)
+        for partition in partitions:
+            self.assertEqual(sum(f'"{partition}"' in sql for sql in partition_deletes), 1)
+
+        with schema_context(self.schema):
+            self.assertFalse(AWSCostEntryBill.objects.filter(provider=target).exists())
+            self.assertFalse(AWSCostEntryLineItemDailySummary.objects.filter(source_uuid=target.uuid).exists())
+            self.assertEqual(AWSCostEntryBill.objects.filter(provider=other).count(), len(months))
+            self.assertEqual(
+                AWSCostEntryLineItemDailySummary.objects.filter(source_uuid=other.uuid).count(), len(months)
+            )
@@ -0,0 +1,98 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the ArrowCSVReader."""
+import os
+import tempfile
+from unittest.mock import patch
+
+import ciso8601
+import pandas as pd
+
+from masu.processor.parquet.arrow_csv_reader import ArrowCSVReader
+from masu.test import MasuTestCase
+from masu.util.aws.aws_post_processor import AWSPostProcessor
+from masu.util.azure.azure_post_processor import AzurePostProcessor
+from masu.util.common import safe_float
+from masu.util.ocp.ocp_post_processor import OCPPostProcessor
+
+
+class ArrowCSVReaderTest(MasuTestCase):
+    """Test cases for the arrow CSV reader."""
+
+    def setUp(self):
+        """Set up shared test variables."""
+        super().setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove temporary files."""
+        super().tearDown()
+        for file_name in os.listdir(self.tmp_dir):
+            os.remove(os.path.join(self.tmp_dir, file_name))
+        os.rmdir(self.tmp_dir)
+
+    def assert_matches_pandas(self, csv_filename, post_processor, chunksize=5, **kwargs):
+        """Assert both readers return identical chunks."""
+        col_names = pd.read_csv(csv_filename, nrows=0, **kwargs).columns
+        converters, kwargs = post_processor.get_column_converters(col_names, kwargs)
+        with pd.read_csv(csv_filename, converters=converters, chunksize=chunksize, **kwargs) as reader:
+            expected = list(reader)
+        with ArrowCSVReader(csv_filename, converters, chunksize, col_names, **kwargs) as reader:
+            result = list(reader)
+        self.assertEqual(len(result), len(expected))
+        for result_frame, expected_frame in zip(result, expected):
+            pd.testing.assert_frame_equal(result_frame, expected_frame)
+
+    def test_matches_pandas_aws(self):
+        """Test that AWS CUR chunks are identical to the pandas reader."""
+        self.assert_matches_pandas(
+            "./koku/masu/test/data/test_cur.csv.gz", AWSPostProcessor(self.schema), compression="gzip"
+        )
+
+    def test_matches_pandas_ocp(self):
+        """Test that OCP chunks are identical to the pandas reader."""
+        self.assert_matches_pandas(
+            "./koku/masu/test/data/ocp/e6b3701e-1e91-433b-b238-a31e49937558_storage.csv",
+            OCPPostProcessor(self.schema, "storage_usage"),
+        )
+
+    def test_matches_pandas_azure(self):
+        """Test that Azure chunks are identical to the pandas reader."""
+        self.assert_matches_pandas(
+            "./koku/masu/test/data/azure/azure_version_2.csv", AzurePostProcessor(self.schema), chunksize=1
+        )
+
+    def test_float_and_datetime_conversion(self):
+        """Test that empty and invalid floats follow safe_float and datetimes are parsed."""
+        csv_filename = os.path.join(self.tmp_dir, "floats.csv")
+        with open(csv_filename, "w") as f:
+            f.write("name,cost,start\n")
+            f.write("a,1.5,2023-01-01T00:00:00Z\n")
+            f.write("b,,2023-01-01T00:00:00Z\n")
+            f.write("c,n/a,2023-01-02T00:00:00Z\n")
+        converters = {"name": str, "cost": safe_float, "start": ciso8601.parse_datetime}
+        with ArrowCSVReader(csv_filename, converters, 10, ["name", "cost", "start"]) as reader:
+            (data_frame,) = list(reader)
+        self.assertEqual(data_frame["cost"].tolist(), [1.5, 0.0, 0.0])
+        self.assertEqual(str(data_frame["start"].dtype), "datetime64[ns, UTC]")
+        self.assertEqual(data_frame["start"].nunique(), 2)
+
+    def test_falls_back_to_pandas_mid_file(self):
+        """Test that rows arrow can not parse are read by pandas from the first unread chunk."""
+        csv_filename = os.path.join(self.tmp_dir, "ragged.csv")
+        rows = ["name,cost,extra"]
+        rows.extend(f"row{i},{i},x" for i in range(50))
+        rows[40] = "row39,39"
+        with open(csv_filename, "w") as f:
+            f.write("\n".join(rows) + "\n")
+        converters = {"name": str, "cost": safe_float, "extra": str}
+        with pd.read_csv(csv_filename, converters=converters, chunksize=8) as reader:
+            expected = list(reader)
+        with patch("masu.processor.parquet.arrow_csv_reader.ARROW_CSV_BLOCK_SIZE", 128):
+            with ArrowCSVReader(csv_filename, converters, 8, ["name", "cost", "extra"]) as reader:
+                result = list(reader)
+        self.assertEqual(len(result), len(expected))
+        for result_frame, expected_frame in zip(result, expected):
+            pd.testing.assert_frame_equal(result_frame, expected_frame)
@@ -13,6 +13,7 @@ from unittest.mock import PropertyMock
 
 import faker
 import pandas as pd
+from django.test.utils import override_settings
 from django_tenants.utils import schema_context
 
 from api.models import Provider
@@ -24,6 +25,7 @@ from masu.processor.azure.azure_report_parquet_processor import AzureReportParqu
 from masu.processor.gcp.gcp_report_parquet_processor import GCPReportParquetProcessor
 from masu.processor.oci.oci_report_parquet_processor import OCIReportParquetProcessor
 from masu.processor.ocp.ocp_report_parquet_processor import OCPReportParquetProcessor
+from masu.processor.parquet.arrow_csv_reader import ArrowCSVReader
 from masu.processor.parquet.parquet_report_processor import CSV_EXT
 from masu.processor.parquet.parquet_report_processor import CSV_GZIP_EXT
 from masu.processor.parquet.parquet_report_processor import ParquetReportProcessor
@@ -254,9 +256,7 @@ class TestParquetReportProcessor(MasuTestCase):
             with patch(
                 "masu.processor.parquet.parquet_report_processor.remove_files_not_in_set_from_s3_bucket"
             ) as mock_remove:
-                with patch(
-                    "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor." "convert_csv_to_parquet"
-                ) as mock_convert:
+                with patch.object(ParquetReportProcessor, "_convert_csv_file") as mock_convert:
                     with patch(
                         "masu.processor.parquet.parquet_report_processor."
                         "ReportManifestDBAccessor.get_s3_parquet_cleared",
@@ -266,8 +266,10 @@ class TestParquetReportProcessor(MasuTestCase):
                             "masu.processor.parquet.parquet_report_processor."
                             "ReportManifestDBAccessor.mark_s3_parquet_cleared"
                         ) as mock_mark_cleared:
-                            with patch.object(ParquetReportProcessor, "create_daily_parquet"):
-                                mock_convert.return_value = "", pd.DataFrame(), True
+                            with patch.object(ParquetReportProcessor, "create_daily_parquet"), patch.object(
+                                ParquetReportProcessor, "create_parquet_table"
+                            ), patch.object(AWSPostProcessor, "finalize_post_processing"):
+                                mock_convert.return_value = "", pd.DataFrame(), True, None
                                 self.report_processor.convert_to_parquet()
                                 mock_get_cleared.assert_called()
                                 mock_remove.assert_called()
@@ -275,36 +277,36 @@ class TestParquetReportProcessor(MasuTestCase):
 
         expected = "Failed to convert the following files to parquet"
         with patch("masu.processor.parquet.parquet_report_processor.get_path_prefix", return_value=""):
-            with patch(
-                "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.convert_csv_to_parquet",
-                return_value=("", pd.DataFrame(), False),
-            ):
+            with patch.object(
+                ParquetReportProcessor, "_convert_csv_file", return_value=("", pd.DataFrame(), False, None)
+            ), patch.object(AWSPostProcessor, "finalize_post_processing"):
                 with patch.object(ParquetReportProcessor, "create_daily_parquet"):
                     with self.assertLogs("masu.processor.parquet.parquet_report_processor", level="INFO") as logger:
                         self.report_processor.convert_to_parquet()
                         self.assertIn(expected, " ".join(logger.output))
 
         with patch("masu.processor.parquet.parquet_report_processor.get_path_prefix", return_value=""):
-            with patch(
-                "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.convert_csv_to_parquet",
-                return_value=("", pd.DataFrame(), False),
-            ):
+            with patch.object(
+                ParquetReportProcessor, "_convert_csv_file", return_value=("", pd.DataFrame(), False, None)
+            ), patch.object(AWSPostProcessor, "finalize_post_processing"):
                 with patch.object(ParquetReportProcessor, "create_daily_parquet"):
                     self.report_processor.convert_to_parquet()
 
         with patch("masu.processor.parquet.parquet_report_processor.get_path_prefix", return_value=""):
-            with patch(
-                "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.convert_csv_to_parquet",
-                return_value=("", pd.DataFrame(), False),
-            ):
+            with patch.object(
+                ParquetReportProcessor, "_convert_csv_file", return_value=("", pd.DataFrame(), False, None)
+            ), patch.object(AWSPostProcessor, "finalize_post_processing"):
                 with patch.object(ParquetReportProcessor, "create_daily_parquet"):
                     self.report_processor.convert_to_parquet()
 
         # Daily data exists
         with patch("masu.processor.parquet.parquet_report_processor.get_path_prefix", return_value=""):
-            with patch(
-                "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.convert_csv_to_parquet",
-                return_value=("", pd.DataFrame([{"key": "value"}]), True),
+            with patch.object(
+                ParquetReportProcessor,
+                "_convert_csv_file",
+                return_value=("", pd.DataFrame([{"key": "value"}]), True, None),
+            ), patch.object(ParquetReportProcessor, "create_parquet_table"), patch.object(
+                AWSPostProcessor, "finalize_post_processing"
             ):
                 with patch.object(ParquetReportProcessor, "create_daily_parquet") as mock_create_daily:
                     file_name, data_frame = self.report_processor.convert_to_parquet()
@@ -337,7 +339,7 @@ class TestParquetReportProcessor(MasuTestCase):
         with patch("masu.processor.parquet.parquet_report_processor.Path"):
             with patch("masu.processor.parquet.parquet_report_processor.pd") as mock_pd:
                 with patch("masu.processor.parquet.parquet_report_processor.open", side_effect=Exception):
-                    with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+                    with patch("masu.util.aws.common.copy_data_to_s3_bucket"):
                         with patch(
                             "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor."
                             "create_parquet_table"
@@ -352,7 +354,7 @@ class TestParquetReportProcessor(MasuTestCase):
         with patch("masu.processor.parquet.parquet_report_processor.Path"):
             with patch("masu.processor.parquet.parquet_report_processor.pd"):
                 with patch("masu.processor.parquet.parquet_report_processor.open"):
-                    with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+                    with patch("masu.util.aws.common.copy_data_to_s3_bucket"):
                         with patch(
                             "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor."
                             "create_parquet_table"
@@ -363,7 +365,7 @@ class TestParquetReportProcessor(MasuTestCase):
                                 self.assertTrue(result)
 
         with patch("masu.processor.parquet.parquet_report_processor.Path"):
-            with patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"):
+            with patch("masu.util.aws.common.copy_data_to_s3_bucket"):
                 with patch(
                     "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor." "create_parquet_table"
                 ):
@@ -391,12 +393,124 @@ class TestParquetReportProcessor(MasuTestCase):
                         self.assertTrue(result)
                         shutil.rmtree(local_path, ignore_errors=True)
 
+    @override_settings(PARQUET_ARROW_CSV_PROVIDERS=[Provider.PROVIDER_AWS])
+    def test_convert_csv_to_parquet_arrow_engine(self):
+        """Test that providers configured for the arrow engine are read with the ArrowCSVReader."""
+        self.assertTrue(self.report_processor.use_arrow_csv_engine)
+        test_report_test_path = "./koku/masu/test/data/test_cur.csv.gz"
+        local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.aws_provider_uuid}"
+        Path(local_path).mkdir(parents=True, exist_ok=True)
+        test_report = f"{local_path}/test_cur.csv.gz"
+        shutil.copy2(test_report_test_path, test_report)
+        with patch("masu.util.aws.common.copy_data_to_s3_bucket"), patch.object(
+            ParquetReportProcessor, "create_parquet_table"
+        ), patch(
+            "masu.processor.parquet.parquet_report_processor.ArrowCSVReader", wraps=ArrowCSVReader
+        ) as mock_reader:
+            _, daily_data_frames, result = self.report_processor.convert_csv_to_parquet(test_report)
+            self.assertTrue(result)
+            self.assertTrue(daily_data_frames)
+            mock_reader.assert_called_once()
+        shutil.rmtree(local_path, ignore_errors=True)
+
+    @override_settings(PARQUET_ARROW_CSV_PROVIDERS=[Provider.PROVIDER_OCP])
+    def test_use_arrow_csv_engine_by_provider_type(self):
+        """Test that the arrow engine is only selected for the configured provider types."""
+        self.assertFalse(self.report_processor.use_arrow_csv_engine)
+
+    def test_convert_to_parquet_in_parallel(self):
+        """Test that converting split files in worker processes matches the serial conversion."""
+        test_report_test_path = "./koku/masu/test/data/ocp/e6b3701e-1e91-433b-b238-a31e49937558_storage.csv"
+        local_path = f"{Config.TMP_DIR}/{self.account_id}/{self.ocp_provider_uuid}"
+        Path(local_path).mkdir(parents=True, exist_ok=True)
+        split_files = []
+        for i in range(3):
+            split_file = f"{local_path}/storage_{i}.csv"
+            shutil.copy2(test_report_test_path, split_file)
+            split_files.append(split_file)
+
+        results = {}
+        for workers in (1, 2):
+            report_processor = ParquetReportProcessor(
+                schema_name=self.schema,
+                report_path=split_files[0],
+                provider_uuid=self.ocp_provider_uuid,
+                provider_type=Provider.PROVIDER_OCP,
+                manifest_id=self.manifest_id,
+                context={
+                    "tracing_id": self.tracing_id,
+                    "start_date": DateHelper().today,
+                    "create_table": True,
+                    "split_files": split_files,
+                },
+            )
+            with override_settings(PARQUET_CONVERSION_WORKERS=workers), patch(
+                "masu.processor.parquet.parquet_report_processor.ReportManifestDBAccessor"
+            ), patch("masu.util.aws.common.copy_data_to_s3_bucket"), patch(
+                "masu.processor.parquet.parquet_report_processor.connections"
+            ), patch.object(
+                ParquetReportProcessor,
+                "create_parquet_table",
+                side_effect=lambda *args, **kwargs: report_processor.trino_table_exists.update(
+                    {"storage_usage": True}
+                ),
+            ) as mock_create_table, patch.object(
+                ParquetReportProcessor, "create_daily_parquet"
+            ) as mock_create_daily, patch.object(
+                OCPPostProcessor, "finalize_post_processing", autospec=True
+            ) as mock_finalize:
+                file_name, daily_data_frames = report_processor.convert_to_parquet()
+                mock_finalize.assert_called_once()
+                mock_create_table.assert_called_once()
+                self.assertEqual(mock_create_daily.call_count, len(split_files))
+                results[workers] = (
+                    file_name,
+                    daily_data_frames,
+                    mock_finalize.call_args[0][0].enabled_tag_keys,
+                    sorted(report_processor.files_to_remove),
+                )
+
+        serial, parallel = results[1], results[2]
+        self.assertEqual(parallel[0], serial[0])
+        self.assertEqual(len(parallel[1]), len(split_files))
+        for parallel_frame, serial_frame in zip(parallel[1], serial[1]):
+            pd.testing.assert_frame_equal(parallel_frame, serial_frame)
+        self.assertEqual(parallel[2], serial[2])
+        self.assertEqual(parallel[3], serial[3])
+        shutil.rmtree(local_path, ignore_errors=True)
+
+    def test_write_parquet_to_file_manifest_object_name(self):
+        """Test that providers cleared by manifest upload parquet with the manifest in the object name."""
+        data_frame = pd.DataFrame({"a": [1]})
+        with patch.object(pd.DataFrame, "to_parquet"), patch(
+            "masu.util.aws.common.S3UploadPipeline.upload_file"
+        ) as mock_upload:
+            self.report_processor._write_parquet_to_file("/tmp/file.parquet", "file.parquet", data_frame)
+            mock_upload.assert_called_with(
+                self.report_processor.parquet_path_s3,
+                "/tmp/file.parquet",
+                f"manifest-{self.manifest_id}_file.parquet",
+                manifest_id=self.manifest_id,
+            )
+
+            report_processor = ParquetReportProcessor(
+                schema_name=self.schema,
+                report_path="./koku/masu/test/data/ocp/e6b3701e-1e91-433b-b238-a31e49937558_storage.csv",
+                provider_uuid=self.ocp_provider_uuid,
+                provider_type=Provider.PROVIDER_OCP,
+                manifest_id=self.manifest_id,
+                context={"tracing_id": self.tracing_id, "start_date": DateHelper().today},
+            )
+            self.assertFalse(report_processor.clears_s3_by_manifest)
+            report_processor._write_parquet_to_file("/tmp/file.parquet", "file.parquet", data_frame)
+            self.assertEqual(mock_upload.call_args[0][2], "file.parquet")
+
     def test_convert_csv_to_parquet_report_type_already_processed(self):
         """Test that we don't re-create a table when we already have created this run."""
         with patch("masu.processor.parquet.parquet_report_processor.Path"), patch(
             "masu.processor.parquet.parquet_report_processor.pd"
         ), patch("masu.processor.parquet.parquet_report_processor.open"), patch(
-            "masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket"
+            "masu.util.aws.common.copy_data_to_s3_bucket"
         ), patch(
             "masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.set_post_processor",
             return_value=OCPPostProcessor(self.schema, "pod_usage"),
@@ -590,7 +704,7 @@ class TestParquetReportProcessor(MasuTestCase):
         ocp_processor.process()
         mock_convert.assert_called()
 
-    @patch("masu.processor.parquet.parquet_report_processor.copy_data_to_s3_bucket")
+    @patch("masu.util.aws.common.copy_data_to_s3_bucket")
     @patch("masu.processor.parquet.parquet_report_processor.ParquetReportProcessor.create_parquet_table")
     def test_process_gcp(self, mock_create_table, mock_s3_copy):
         """Test the processor for GCP."""
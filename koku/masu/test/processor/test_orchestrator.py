@@ -337,7 +337,7 @@ class OrchestratorTest(MasuTestCase):
         mock_chord.assert_called()
 
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
-    @patch("masu.processor.orchestrator.WorkerCache.task_is_running", return_value=True)
+    @patch("masu.processor.worker_cache.WorkerCache.task_is_running", return_value=True)
     @patch("masu.processor.orchestrator.chord")
     @patch("masu.processor.orchestrator.ReportDownloader.download_manifest")
     def test_start_manifest_processing_in_progress(self, mock_download, mock_chord, mock_worker_cache, mock_inspect):
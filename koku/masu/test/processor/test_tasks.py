@@ -482,7 +482,7 @@ class TestProcessorTasks(MasuTestCase):
             "tracing_id": "my-totally-made-up-id",
         }
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._process_report_file")
     def test_get_report_files_exception(self, mock_process_files, mock_inspect, mock_cache_remove):
@@ -498,7 +498,7 @@ class TestProcessorTasks(MasuTestCase):
                     mock_cache_remove.assert_called()
                     mock_process_files.assert_not_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._process_report_file")
     def test_get_report_files_report_dict_none(self, mock_process_files, mock_inspect, mock_cache_remove):
@@ -512,7 +512,7 @@ class TestProcessorTasks(MasuTestCase):
                 mock_process_files.assert_not_called()
                 self.assertIn(expected_log.lower(), logger.output[0].lower())
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._get_report_files")
     @patch("masu.processor.tasks._process_report_file")
@@ -526,7 +526,7 @@ class TestProcessorTasks(MasuTestCase):
             get_report_files(**self.get_report_args_gcp)
             self.assertIn(expected_log, logger.output[0])
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._get_report_files")
     @patch("masu.processor.tasks._process_report_file", side_effect=ReportProcessorError("Mocked process error!"))
@@ -537,7 +537,7 @@ class TestProcessorTasks(MasuTestCase):
         get_report_files(**self.get_report_args)
         mock_cache_remove.assert_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._get_report_files")
     @patch("masu.processor.tasks._process_report_file", side_effect=NotImplementedError)
@@ -550,7 +550,7 @@ class TestProcessorTasks(MasuTestCase):
         get_report_files(**self.get_report_args)
         mock_cache_remove.assert_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._get_report_files")
     @patch("masu.processor.tasks._process_report_file", return_value=False)
@@ -562,7 +562,7 @@ class TestProcessorTasks(MasuTestCase):
         mock_cache_remove.assert_called()
         self.assertFalse(result)
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._get_report_files", side_effect=Exception("Mocked download error!"))
     def test_get_report_broad_exception(self, mock_get_files, mock_inspect, mock_cache_remove):
@@ -572,7 +572,7 @@ class TestProcessorTasks(MasuTestCase):
         get_report_files(**self.get_report_args)
         mock_cache_remove.assert_called()
 
-    @patch("masu.processor.tasks.WorkerCache.remove_task_from_cache")
+    @patch("masu.processor.worker_cache.WorkerCache.remove_task_from_cache")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     @patch("masu.processor.tasks._get_report_files", side_effect=ReportDownloaderWarning("Mocked download warning!"))
     def test_get_report_download_warning(self, mock_get_files, mock_inspect, mock_cache_remove):
@@ -1338,8 +1338,8 @@ class TestWorkerCacheThrottling(MasuTestCase):
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.mark_manifest_complete")
     @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.release_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.lock_single_task")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_summary_tables_worker_throttled(
         self,
@@ -1389,8 +1389,8 @@ class TestWorkerCacheThrottling(MasuTestCase):
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.mark_manifest_complete")
     @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.release_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.lock_single_task")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_summary_tables_worker_error(
         self,
@@ -1421,8 +1421,8 @@ class TestWorkerCacheThrottling(MasuTestCase):
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.mark_manifest_complete")
     @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.release_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.lock_single_task")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_summary_tables_cloud_summary_error(
         self,
@@ -1451,8 +1451,8 @@ class TestWorkerCacheThrottling(MasuTestCase):
     @patch("masu.processor.tasks.chain")
     @patch("masu.processor.tasks.mark_manifest_complete")
     @patch("masu.processor.tasks.update_cost_model_costs")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.release_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.lock_single_task")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_summary_tables_provider_not_found_error(
         self,
@@ -1478,8 +1478,8 @@ class TestWorkerCacheThrottling(MasuTestCase):
 
     @skip("cost model calcs are taking longer with the conversion to partables. This test needs a rethink.")
     @patch("masu.processor.tasks.update_cost_model_costs.s")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.release_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.lock_single_task")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_cost_model_costs_throttled(self, mock_inspect, mock_lock, mock_release, mock_delay):
         """Test that refresh materialized views runs with cache lock."""
@@ -1514,8 +1514,8 @@ class TestWorkerCacheThrottling(MasuTestCase):
         self.assertFalse(self.single_task_is_running(task_name, cache_args))
 
     @patch("masu.processor.tasks.CostModelCostUpdater")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.release_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.lock_single_task")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_cost_model_costs_error(self, mock_inspect, mock_lock, mock_release, mock_updater):
         """Test that refresh materialized views runs with cache lock."""
@@ -1534,8 +1534,8 @@ class TestWorkerCacheThrottling(MasuTestCase):
 
     @patch("masu.processor.tasks.ReportSummaryUpdater.update_openshift_on_cloud_summary_tables")
     @patch("masu.processor.tasks.update_openshift_on_cloud.s")
-    @patch("masu.processor.tasks.WorkerCache.release_single_task")
-    @patch("masu.processor.tasks.WorkerCache.lock_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.release_single_task")
+    @patch("masu.processor.worker_cache.WorkerCache.lock_single_task")
     @patch("masu.processor.worker_cache.CELERY_INSPECT")
     def test_update_openshift_on_cloud_throttled(self, mock_inspect, mock_lock, mock_release, mock_delay, mock_update):
         """Test that refresh materialized views runs with cache lock."""
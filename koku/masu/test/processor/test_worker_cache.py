@@ -3,12 +3,22 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 """Test Cache of worker tasks currently running."""
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
+import fakeredis
 from django.core.cache import cache
 from django.test.utils import override_settings
+from redis.exceptions import ConnectionError as RedisConnectionError
 
+from masu.processor.worker_cache import get_worker_cache
 from masu.processor.worker_cache import rate_limit_tasks
+from masu.processor.worker_cache import RedisWorkerCache
+from masu.processor.worker_cache import WORKER_HEARTBEAT_KEY
+from masu.processor.worker_cache import WORKER_HOSTS_KEY
+from masu.processor.worker_cache import WORKER_LOCK_KEY
+from masu.processor.worker_cache import WORKER_RUNNING_KEY
+from masu.processor.worker_cache import WORKER_TASKS_KEY
 from masu.processor.worker_cache import WorkerCache
 from masu.test import MasuTestCase
 
@@ -220,3 +230,155 @@ class WorkerCacheTest(MasuTestCase):
         with patch("masu.processor.worker_cache.connection") as mock_conn:
             mock_conn.cursor.return_value.__enter__.return_value.fetchone.return_value = (2,)
             self.assertTrue(rate_limit_tasks(task_name, self.schema))
+
+
+@override_settings(HOSTNAME="kokuworker", WORKER_CACHE_REDIS=True)
+class RedisWorkerCacheTest(MasuTestCase):
+    """Test class for the Redis worker cache."""
+
+    def setUp(self):
+        """Set up a mocked Redis client."""
+        super().setUp()
+        self.redis = MagicMock()
+        self.pipeline = self.redis.pipeline.return_value.__enter__.return_value
+        patcher = patch("masu.processor.worker_cache.get_worker_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_worker_cache(self):
+        """Test that the worker cache is selected by settings."""
+        self.assertIsInstance(get_worker_cache(), RedisWorkerCache)
+        with override_settings(WORKER_CACHE_REDIS=False), patch("masu.processor.worker_cache.CELERY_INSPECT"):
+            self.assertIsInstance(get_worker_cache(), WorkerCache)
+
+    @override_settings(WORKER_HEARTBEAT_TIMEOUT=60)
+    def test_heartbeat(self):
+        """Test that the heartbeat marks the worker as alive and creating the cache does not write it."""
+        cache = RedisWorkerCache()
+        self.redis.pipeline.assert_not_called()
+        cache.heartbeat()
+        self.pipeline.set.assert_called_once_with(f"{WORKER_HEARTBEAT_KEY}kokuworker", 1, ex=60)
+        self.pipeline.sadd.assert_called_once_with(WORKER_HOSTS_KEY, "kokuworker")
+
+    @patch("masu.processor.worker_cache.WorkerCache")
+    def test_redis_error_falls_back_to_worker_cache(self, mock_worker_cache):
+        """Test that the database worker cache is used when Redis cannot be reached."""
+        self.redis.eval.side_effect = RedisConnectionError("down")
+        self.redis.get.side_effect = RedisConnectionError("down")
+        self.redis.pipeline.side_effect = RedisConnectionError("down")
+        fallback = mock_worker_cache.return_value
+        cache = RedisWorkerCache()
+
+        cache.lock_single_task("test_task", ["schema1"], timeout=30)
+        fallback.lock_single_task.assert_called_once_with("test_task", ["schema1"], timeout=30)
+        self.assertEqual(
+            cache.single_task_is_running("test_task", ["schema1"]), fallback.single_task_is_running.return_value
+        )
+        cache.release_single_task("test_task", ["schema1"])
+        fallback.release_single_task.assert_called_once_with("test_task", ["schema1"])
+        mock_worker_cache.assert_called_once()
+
+        with patch("masu.processor.worker_cache.connection") as mock_conn:
+            mock_conn.cursor.return_value.__enter__.return_value.fetchone.return_value = (0,)
+            self.assertFalse(rate_limit_tasks("test_task", "schema1"))
+
+    def test_get_all_running_tasks(self):
+        """Test that tasks of live workers are combined and offline workers are removed."""
+        self.redis.smembers.return_value = {"kokuworker", "kokuworker2"}
+        self.redis.sunion.return_value = {"1", "2"}
+
+        with patch.object(RedisWorkerCache, "_alive", return_value={"kokuworker"}):
+            self.assertEqual(sorted(RedisWorkerCache().get_all_running_tasks()), ["1", "2"])
+
+        self.redis.sunion.assert_called_once_with(f"{WORKER_TASKS_KEY}kokuworker")
+        self.pipeline.srem.assert_called_once_with(WORKER_HOSTS_KEY, "kokuworker2")
+        self.pipeline.delete.assert_called_once_with(f"{WORKER_TASKS_KEY}kokuworker2")
+
+    def test_single_task_caching(self):
+        """Test that single task locks are taken, checked against live workers, and released."""
+        task_name = "test_task"
+        task_args = ["schema1", "OCP"]
+        lock_key = f"{WORKER_LOCK_KEY}{task_name}:schema1:OCP"
+        cache = RedisWorkerCache()
+
+        self.redis.eval.return_value = 1
+        self.assertTrue(cache.lock_single_task(task_name, task_args, timeout=30))
+        self.assertEqual(
+            self.redis.eval.call_args.args[2:6], (lock_key, f"{WORKER_RUNNING_KEY}{task_name}", "kokuworker", 30)
+        )
+
+        self.redis.get.return_value = "kokuworker"
+        with patch.object(RedisWorkerCache, "_alive", return_value={"kokuworker"}):
+            self.assertTrue(cache.single_task_is_running(task_name, task_args))
+        with patch.object(RedisWorkerCache, "_alive", return_value=set()):
+            self.assertFalse(cache.single_task_is_running(task_name, task_args))
+
+        cache.release_single_task(task_name, task_args)
+        self.pipeline.delete.assert_called_once_with(lock_key)
+        self.pipeline.zrem.assert_called_once_with(f"{WORKER_RUNNING_KEY}{task_name}", f"{task_name}:schema1:OCP")
+
+        self.redis.get.return_value = None
+        self.assertFalse(cache.single_task_is_running(task_name, task_args))
+
+    @override_settings(WORKER_CACHE_LARGE_CUSTOMER_CONCURRENT_TASKS=2)
+    def test_rate_limit_tasks(self):
+        """Test that only locks of the customer held by live workers count towards the limit."""
+        task_name = "test_task"
+        locks = [f"{task_name}:{self.schema}:OCP:1", f"{task_name}:{self.schema}:OCP:2", f"{task_name}:other:OCP:3"]
+        self.pipeline.execute.return_value = [0, locks]
+
+        self.redis.mget.return_value = ["kokuworker", "kokuworker2"]
+        with patch.object(RedisWorkerCache, "_alive", return_value={"kokuworker"}):
+            self.assertFalse(rate_limit_tasks(task_name, self.schema))
+        self.redis.mget.assert_called_with([f"{WORKER_LOCK_KEY}{lock}" for lock in locks[:2]])
+
+        with patch.object(RedisWorkerCache, "_alive", return_value={"kokuworker", "kokuworker2"}):
+            self.assertTrue(rate_limit_tasks(task_name, self.schema))
+
+
+@override_settings(HOSTNAME="kokuworker", WORKER_CACHE_REDIS=True, WORKER_HEARTBEAT_TIMEOUT=60)
+class RedisWorkerCacheLockTest(MasuTestCase):
+    """Test the single task locks against a fake Redis server running the lock script."""
+
+    def setUp(self):
+        """Set up a fake Redis client."""
+        super().setUp()
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        patcher = patch("masu.processor.worker_cache.get_worker_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lock_single_task_takeover(self):
+        """Test that a lock is only taken over once the worker holding it stops sending heartbeats."""
+        task_name = "test_task"
+        task_args = [self.schema, "OCP"]
+        cache_str = f"{task_name}:{self.schema}:OCP"
+        lock_key = f"{WORKER_LOCK_KEY}{cache_str}"
+        running_key = f"{WORKER_RUNNING_KEY}{task_name}"
+        cache = RedisWorkerCache()
+        cache.heartbeat()
+        with override_settings(HOSTNAME="kokuworker2"):
+            other_cache = RedisWorkerCache()
+            other_cache.heartbeat()
+
+        self.assertTrue(cache.lock_single_task(task_name, task_args, timeout=30))
+        self.assertTrue(cache.single_task_is_running(task_name, task_args))
+        self.assertFalse(other_cache.lock_single_task(task_name, task_args, timeout=30))
+        self.assertEqual(self.redis.get(lock_key), "kokuworker")
+        with override_settings(WORKER_CACHE_LARGE_CUSTOMER_CONCURRENT_TASKS=1):
+            self.assertTrue(rate_limit_tasks(task_name, self.schema))
+
+        # the worker holding the lock dies
+        self.redis.delete(f"{WORKER_HEARTBEAT_KEY}kokuworker")
+        self.assertFalse(other_cache.single_task_is_running(task_name, task_args))
+        with override_settings(WORKER_CACHE_LARGE_CUSTOMER_CONCURRENT_TASKS=1):
+            self.assertFalse(rate_limit_tasks(task_name, self.schema))
+
+        self.assertTrue(other_cache.lock_single_task(task_name, task_args, timeout=30))
+        self.assertEqual(self.redis.get(lock_key), "kokuworker2")
+        self.assertEqual(self.redis.zrange(running_key, 0, -1), [cache_str])
+        self.assertTrue(0 < self.redis.ttl(lock_key) <= 30)
+
+        other_cache.release_single_task(task_name, task_args)
+        self.assertIsNone(self.redis.get(lock_key))
+        self.assertEqual(self.redis.zrange(running_key, 0, -1), [])
@@ -3,15 +3,18 @@
 # Copyright 2023 Red Hat Inc.
 # SPDX-License-Identifier: Apache-2.0
 #
+import json
 import random
 from datetime import datetime
 from unittest.mock import patch
 
+import pandas as pd
 from django_tenants.utils import schema_context
 from pandas import DataFrame
 
 from masu.test import MasuTestCase
 from masu.util.aws.aws_post_processor import AWSPostProcessor
+from masu.util.aws.aws_post_processor import handle_user_defined_json_columns
 from reporting.provider.aws.models import AWSEnabledCategoryKeys
 from reporting.provider.aws.models import AWSEnabledTagKeys
 from reporting.provider.aws.models import TRINO_REQUIRED_COLUMNS
@@ -208,6 +211,69 @@ class TestAWSPostProcessor(MasuTestCase):
             self.assertIsInstance(self.post_processor.enabled_tag_keys, set)
             self.assertFalse(processed_data_frame["resourcetags"].isna().values.any())
 
+    def test_handle_user_defined_json_columns_golden(self):
+        """Test that the packed tag and cost category JSON matches the golden file."""
+        data_frame = pd.read_csv("./koku/masu/test/data/aws/wide_tags.csv", dtype=str, keep_default_na=False)
+        with open("./koku/masu/test/data/aws/wide_tags_golden.json") as f:
+            golden = json.load(f)
+        columns = sorted(data_frame.columns)
+
+        tags, tag_keys = handle_user_defined_json_columns(
+            data_frame, columns, AWSPostProcessor.RESOURCE_TAG_USER_PREFIX
+        )
+        categories, category_keys = handle_user_defined_json_columns(
+            data_frame, columns, AWSPostProcessor.COST_CATEGORY_PREFIX
+        )
+        self.assertEqual(tags.tolist(), golden["resourceTags"])
+        self.assertEqual(categories.tolist(), golden["costCategory"])
+        self.assertIn("empty_everywhere", tag_keys)
+        self.assertNotIn("createdBy", tag_keys)
+        self.assertEqual(category_keys, {"Team", "Business Unit"})
+
+    def test_handle_user_defined_json_columns_matches_json_dumps(self):
+        """Test that the columnar encoder matches json.dumps of the populated values per row."""
+        prefix = AWSPostProcessor.RESOURCE_TAG_USER_PREFIX
+        data = {
+            "lineItem/ResourceId": ["i-1", "i-2", "i-3", "i-4"],
+            f"{prefix}b": ["", "x", "", 'q"uote'],
+            f"{prefix}a": ["1", "", "", "é"],
+        }
+        data_frame = DataFrame(data, index=[10, 11, 12, 13])
+        columns = sorted(data_frame.columns)
+        expected = [
+            json.dumps({column.replace(prefix, ""): data[column][i] for column in columns[1:] if data[column][i]})
+            for i in range(4)
+        ]
+
+        result, keys = handle_user_defined_json_columns(data_frame, columns, prefix)
+        self.assertEqual(result.tolist(), expected)
+        self.assertEqual(list(result.index), [10, 11, 12, 13])
+        self.assertEqual(keys, {"a", "b"})
+
+        result, keys = handle_user_defined_json_columns(data_frame[[]].iloc[:0], [], prefix)
+        self.assertTrue(result.empty)
+        self.assertEqual(keys, set())
+
+    def test_handle_user_defined_json_columns_colliding_keys(self):
+        """Test that columns scrubbed to the same key keep the first place and last value of a dict."""
+        prefix = AWSPostProcessor.RESOURCE_TAG_USER_PREFIX
+        data = {
+            f"{prefix}env": ["1", "", "1", ""],
+            f"{prefix}app": ["x", "x", "", ""],
+            f"{prefix}{prefix}env": ["2", "2", "", ""],
+        }
+        data_frame = DataFrame(data)
+        columns = list(data)
+        expected = [
+            json.dumps({column.replace(prefix, ""): data[column][i] for column in columns if data[column][i]})
+            for i in range(4)
+        ]
+        self.assertEqual(expected, ['{"env": "2", "app": "x"}', '{"app": "x", "env": "2"}', '{"env": "1"}', "{}"])
+
+        result, keys = handle_user_defined_json_columns(data_frame, columns, prefix)
+        self.assertEqual(result.tolist(), expected)
+        self.assertEqual(keys, {"env", "app"})
+
     def test_finalize_post_processing(self):
         """Test that the finalize post processing functionality works.
 
@@ -3,7 +3,10 @@
 # Copyright 2021 Red Hat Inc.
 # SPDX-License-Identifier: Apache-2.0
 #
+import os
+import pickle
 import random
+import tempfile
 from datetime import datetime
 from unittest import TestCase
 from unittest.mock import Mock
@@ -13,6 +16,7 @@ import boto3
 import pandas as pd
 from botocore.exceptions import ClientError
 from dateutil.relativedelta import relativedelta
+from django.test.utils import override_settings
 from django_tenants.utils import schema_context
 from faker import Faker
 
@@ -364,7 +368,7 @@ class TestAWSUtils(MasuTestCase):
         )
         expected_key = "removed_key"
         mock_object = Mock(metadata={}, key=expected_key)
-        mock_summary = Mock()
+        mock_summary = Mock(key=expected_key)
         mock_summary.Object.return_value = mock_object
         with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
             mock_s3.return_value.Bucket.return_value.objects.filter.return_value = [mock_summary]
@@ -376,6 +380,53 @@ class TestAWSUtils(MasuTestCase):
             removed = utils.remove_files_not_in_set_from_s3_bucket("request_id", s3_csv_path, "manifest_id")
             self.assertEqual(removed, [])
 
+    def test_remove_files_not_in_set_from_s3_bucket_manifest_keys(self):
+        """Test that manifests are read from object names and deletes are batched."""
+        current = [Mock(key=f"path/{utils.get_manifest_object_name(f'keep_{i}.parquet', 5)}") for i in range(3)]
+        previous = [Mock(key=f"path/{utils.get_manifest_object_name(f'old_{i}.parquet', 4)}") for i in range(2500)]
+        legacy_current = Mock(key="path/legacy_current.parquet")
+        legacy_current.Object.return_value.metadata = {"manifestid": "5"}
+        legacy_previous = Mock(key="path/legacy_previous.parquet")
+        legacy_previous.Object.return_value.metadata = {"manifestid": "4"}
+        summaries = current + previous + [legacy_current, legacy_previous]
+
+        with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
+            mock_bucket = mock_s3.return_value.Bucket.return_value
+            mock_bucket.objects.filter.return_value = summaries
+            mock_bucket.delete_objects.side_effect = [
+                {},
+                {"Errors": [{"Key": previous[1500].key, "Message": "Access Denied"}]},
+                {},
+            ]
+            removed = utils.remove_files_not_in_set_from_s3_bucket("request_id", "path", 5)
+
+        self.assertEqual(mock_bucket.delete_objects.call_count, 3)
+        batches = [call.kwargs["Delete"]["Objects"] for call in mock_bucket.delete_objects.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [1000, 1000, 501])
+        expected = [summary.key for summary in previous + [legacy_previous] if summary is not previous[1500]]
+        self.assertEqual(removed, expected)
+        for summary in current + previous:
+            summary.Object.assert_not_called()
+        legacy_current.Object.assert_called_once()
+
+    def test_remove_all_files_from_s3_bucket_without_metadata(self):
+        """Test that removing everything under a prefix does not request object metadata."""
+        legacy = Mock(key="path/legacy.parquet")
+        with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
+            mock_s3.return_value.Bucket.return_value.objects.filter.return_value = [legacy]
+            removed = utils.remove_files_not_in_set_from_s3_bucket("request_id", "path", 0)
+        self.assertEqual(removed, ["path/legacy.parquet"])
+        legacy.Object.assert_not_called()
+
+    def test_get_manifest_object_name(self):
+        """Test that the manifest id round trips through an S3 key."""
+        name = utils.get_manifest_object_name("20230101_file.csv.gz", 12)
+        self.assertEqual(name, "manifest-12_20230101_file.csv.gz")
+        self.assertEqual(utils.get_manifest_id_from_key(f"prefix/{name}"), "12")
+        self.assertEqual(utils.get_manifest_object_name("file.csv", None), "file.csv")
+        self.assertIsNone(utils.get_manifest_id_from_key("prefix/manifest-12/file.csv"))
+        self.assertIsNone(utils.get_manifest_id_from_key("prefix/file.csv"))
+
     def test_copy_data_to_s3_bucket(self):
         """Test copy_data_to_s3_bucket."""
         with patch("masu.util.aws.common.get_s3_resource") as mock_s3:
@@ -398,6 +449,88 @@ class TestAWSUtils(MasuTestCase):
             upload = utils.copy_hcs_data_to_s3_bucket("request_id", "path", "filename", "data")
             self.assertEqual(upload, None)
 
+    def test_s3_upload_pipeline(self):
+        """Test that queued uploads are complete and reported after a flush."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_paths = []
+            for i in range(5):
+                file_path = os.path.join(tmp_dir, f"file_{i}.parquet")
+                with open(file_path, "wb") as f:
+                    f.write(f"data {i}".encode())
+                file_paths.append(file_path)
+
+            uploaded = {}
+
+            def copy(request_id, path, filename, data, manifest_id=None, context={}):
+                uploaded[f"{path}/{filename}"] = (data.read(), manifest_id)
+
+            with patch("masu.util.aws.common.copy_data_to_s3_bucket", side_effect=copy):
+                with utils.S3UploadPipeline("request_id", max_workers=2) as uploads:
+                    for file_path in file_paths:
+                        uploads.upload_file("path", file_path, os.path.basename(file_path), manifest_id=1)
+                    self.assertTrue(uploads.flush())
+                    self.assertEqual(len(uploaded), len(file_paths))
+                    self.assertEqual(uploaded["path/file_3.parquet"], (b"data 3", 1))
+
+            with patch("masu.util.aws.common.copy_data_to_s3_bucket", side_effect=Exception("boom")):
+                uploads = utils.S3UploadPipeline("request_id", max_workers=2)
+                uploads.upload_file("path", file_paths[0], "file_0.parquet")
+                self.assertFalse(uploads.close())
+                self.assertTrue(uploads.flush())
+
+    def test_s3_upload_pipeline_synchronous(self):
+        """Test that without upload threads files are uploaded in the calling thread."""
+        with patch("masu.util.aws.common.copy_data_to_s3_bucket") as mock_copy:
+            uploads = utils.S3UploadPipeline("request_id", max_workers=0)
+            uploads.upload_file("path", __file__, "test_common.py")
+            mock_copy.assert_called_once()
+            self.assertIsNone(uploads._executor)
+            self.assertTrue(uploads.flush())
+
+            uploads.upload_file("path", "/does/not/exist", "missing.parquet")
+            self.assertFalse(uploads.flush())
+
+    def test_s3_upload_pipeline_pickle(self):
+        """Test that a pickled pipeline does not carry threads or pending uploads."""
+        with patch("masu.util.aws.common.copy_data_to_s3_bucket"):
+            uploads = utils.S3UploadPipeline("request_id", context={"account": "1"}, max_workers=1)
+            uploads.upload_file("path", __file__, "test_common.py")
+            copied = pickle.loads(pickle.dumps(uploads))
+            self.assertIsNone(copied._executor)
+            self.assertEqual(copied._pending, [])
+            self.assertEqual(copied.context, {"account": "1"})
+            self.assertTrue(uploads.close())
+
+    def test_copy_local_report_file_to_s3_bucket_with_pipeline(self):
+        """Test that local report files are queued on the pipeline when one is given."""
+        uploads = Mock()
+        with patch("masu.util.aws.common.copy_data_to_s3_bucket") as mock_copy:
+            utils.copy_local_report_file_to_s3_bucket(
+                "request_id", "path", "/tmp/file.csv", "file.csv", 1, None, uploads=uploads
+            )
+            mock_copy.assert_not_called()
+        uploads.upload_file.assert_called_with("path", "/tmp/file.csv", "file.csv", 1)
+
+    def test_get_s3_session_is_cached_per_process(self):
+        """Test that the boto3 session is reused in a process and rebuilt after a fork."""
+        with patch("masu.util.aws.common.boto3.Session") as mock_session:
+            utils._S3_SESSIONS.clear()
+            first = utils.get_s3_session()
+            self.assertIs(utils.get_s3_session(), first)
+            mock_session.assert_called_once()
+            with patch("masu.util.aws.common.os.getpid", return_value=-1):
+                utils.get_s3_session()
+            self.assertEqual(mock_session.call_count, 2)
+        utils._S3_SESSIONS.clear()
+
+    def test_get_s3_transfer_config(self):
+        """Test that multipart settings come from the settings."""
+        with override_settings(S3_MULTIPART_THRESHOLD=1, S3_MULTIPART_CHUNKSIZE=2, S3_MULTIPART_CONCURRENCY=3):
+            config = utils.get_s3_transfer_config()
+        self.assertEqual(config.multipart_threshold, 1)
+        self.assertEqual(config.multipart_chunksize, 2)
+        self.assertEqual(config.max_concurrency, 3)
+
     def test_match_openshift_resources_and_labels(self):
         """Test OCP on AWS data matching."""
         cluster_topology = [
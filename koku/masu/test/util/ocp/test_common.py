@@ -11,6 +11,8 @@ import tempfile
 from unittest.mock import patch
 from uuid import UUID
 
+import pandas as pd
+
 from api.provider.models import Provider
 from masu.config import Config
 from masu.database import OCP_REPORT_TABLE_MAP
@@ -122,6 +124,85 @@ class OCPUtilTests(MasuTestCase):
             result = utils.match_openshift_labels(td, matched_tags)
             self.assertEqual(result, expected)
 
+    def test_match_openshift_tags(self):
+        """Test that tag matching on a Series matches every row like match_openshift_labels."""
+        matched_tags = [{"key": "value"}, {"other_key": "other_value"}, {"two": "keys", "in": "one"}]
+        tags = pd.Series(
+            [
+                json.dumps({"key": "value", "other_key": "other_value"}),
+                json.dumps({"key": "value"}),
+                json.dumps({"two": "keys", "in": "one"}),
+                json.dumps({"key": None}),
+                "",
+                None,
+                json.dumps({"key": "value"}),
+                json.dumps({"key": 1, "other_key": "other_value", "list": ["value"]}),
+            ]
+        )
+        expected = [
+            '"key": "value","other_key": "other_value"',
+            '"key": "value"',
+            "",
+            "",
+            "",
+            "",
+            '"key": "value"',
+            '"other_key": "other_value"',
+        ]
+        self.assertEqual(utils.match_openshift_tags(tags, matched_tags).tolist(), expected)
+        self.assertEqual(utils.match_openshift_tags(tags, []).tolist(), [""] * len(expected))
+
+    def test_contains_any(self):
+        """Test that contains_any gives the same answers as a literal str.contains of each substring."""
+        values = pd.Series(
+            [
+                "node-1",
+                "/subscriptions/x/disks/pv-2",
+                "node-10",
+                "other",
+                None,
+                "node-1",
+                "projects/p/zones/z/instances/ip-10-0-1-2.ec2.internal",
+                "ip-10-0-1-2xec2-internal",
+                "(a|b)",
+            ]
+        )
+        for substrings in (
+            ["node-1", "pv-2"],
+            ["pv-2", "no.e-10"],
+            ["ip-10-0-1-2.ec2.internal"],
+            ["(a|b)"],
+            ["missing"],
+            [],
+            ["", "x"],
+        ):
+            with self.subTest(substrings=substrings):
+                expected = [
+                    isinstance(value, str) and (not substrings or any(sub in value for sub in substrings))
+                    for value in values
+                ]
+                self.assertEqual(utils.contains_any(values, substrings).fillna(False).tolist(), expected)
+        self.assertEqual(
+            utils.contains_any(values, ["ip-10-0-1-2.ec2.internal"]).fillna(False).tolist(),
+            [False] * 6 + [True, False, False],
+        )
+
+    def test_endswith_any(self):
+        """Test that endswith_any gives the same answers as str.endswith."""
+        values = pd.Series(["arn:aws:ec2:instance/i-123", "i-123", "vol-4", "i-1234", None])
+        for suffixes in (["i-123", "vol-4"], ["4"], [], [""]):
+            with self.subTest(suffixes=suffixes):
+                expected = values.str.endswith(tuple(suffixes)).fillna(False).tolist()
+                self.assertEqual(utils.endswith_any(values, suffixes).fillna(False).tolist(), expected)
+
+    def test_generate_uuids(self):
+        """Test that unique version 4 UUID strings are generated."""
+        uuids = utils.generate_uuids(1000)
+        self.assertEqual(len(set(uuids)), 1000)
+        for value in uuids[:10]:
+            self.assertEqual(str(UUID(value, version=4)), value)
+        self.assertEqual(utils.generate_uuids(0), [])
+
     def test_get_report_details(self):
         """Test that we handle manifest files properly."""
         with tempfile.TemporaryDirectory() as manifest_path:
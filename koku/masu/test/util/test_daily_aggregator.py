@@ -0,0 +1,156 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Test the daily data aggregators."""
+from datetime import datetime
+from datetime import timedelta
+from unittest.mock import patch
+
+import pandas as pd
+
+from masu.test import MasuTestCase
+from masu.util.aws.aws_post_processor import AWSPostProcessor
+from masu.util.azure.azure_post_processor import AzurePostProcessor
+from masu.util.daily_aggregator import DailyDataAggregator
+from masu.util.daily_aggregator import PassthroughDailyAggregator
+from masu.util.ocp.ocp_post_processor import OCPPostProcessor
+
+
+class DailyDataAggregatorTest(MasuTestCase):
+    """Test cases for the daily data aggregators."""
+
+    def aws_line_items(self, rows):
+        """Build an hourly AWS line item frame spread over several days and resources."""
+        start = datetime(2023, 6, 1)
+        return pd.DataFrame(
+            {
+                "lineitem_resourceid": [f"i-{i % 7}" for i in range(rows)],
+                "lineitem_usagestartdate": [start + timedelta(hours=i % 96) for i in range(rows)],
+                "bill_invoiceid": ["123"] * rows,
+                "bill_payeraccountid": ["1"] * rows,
+                "lineitem_usageaccountid": [str(i % 2) for i in range(rows)],
+                "lineitem_legalentity": ["Red Hat"] * rows,
+                "lineitem_lineitemdescription": ["Red Hat"] * rows,
+                "lineitem_productcode": ["ec2"] * rows,
+                "lineitem_availabilityzone": ["us-east-1a"] * rows,
+                "lineitem_lineitemtype": ["Usage"] * rows,
+                "bill_billingentity": ["AWS"] * rows,
+                "product_productfamily": ["compute"] * rows,
+                "product_productname": ["AmazonEC2"] * rows,
+                "product_instancetype": ["t2.micro"] * rows,
+                "product_region": ["us-east-1"] * rows,
+                "pricing_unit": ["hours"] * rows,
+                "resourcetags": ['{"key": "value"}'] * rows,
+                "costcategory": ["{}"] * rows,
+                "lineitem_usageamount": [float(i % 5) for i in range(rows)],
+                "lineitem_normalizationfactor": [1.0] * rows,
+                "lineitem_normalizedusageamount": [1.0] * rows,
+                "lineitem_currencycode": ["USD"] * rows,
+                "lineitem_unblendedrate": [float(i % 3) for i in range(rows)],
+                "lineitem_unblendedcost": [0.25 * (i % 4) for i in range(rows)],
+                "lineitem_blendedrate": [1.0] * rows,
+                "lineitem_blendedcost": [1.0] * rows,
+                "savingsplan_savingsplaneffectivecost": [0.5] * rows,
+                "pricing_publicondemandcost": [1.0] * rows,
+                "pricing_publicondemandrate": [1.0] * rows,
+            }
+        )
+
+    def test_chunked_aggregation_matches_single_pass_aws(self):
+        """Test that merging chunk results equals aggregating the whole frame at once."""
+        post_processor = AWSPostProcessor(self.schema)
+        line_items = self.aws_line_items(500)
+        expected = post_processor._generate_daily_data(line_items)
+
+        aggregator = post_processor.get_daily_aggregator()
+        aggregator.max_buffered_rows = 50
+        for start in range(0, len(line_items), 64):
+            aggregator.add(post_processor._generate_daily_data(line_items[start : start + 64]))
+        result = aggregator.get_data_frames()
+
+        self.assertEqual(len(result), 1)
+        pd.testing.assert_frame_equal(result[0], expected)
+
+    def test_chunked_aggregation_matches_single_pass_ocp(self):
+        """Test that OCP chunks merge with the combiners from OCP_REPORT_TYPES."""
+        post_processor = OCPPostProcessor(self.schema, "pod_usage")
+        start = datetime(2023, 6, 1)
+        rows = 300
+        line_items = pd.DataFrame(
+            {
+                "report_period_start": [start] * rows,
+                "report_period_end": [start + timedelta(days=30)] * rows,
+                "interval_start": [start + timedelta(hours=i % 72) for i in range(rows)],
+                "namespace": [f"ns{i % 3}" for i in range(rows)],
+                "node": [f"node{i % 2}" for i in range(rows)],
+                "pod": [f"pod{i % 5}" for i in range(rows)],
+                "pod_labels": ["{}"] * rows,
+                "resource_id": [f"i-{i % 2}" for i in range(rows)],
+                "pod_usage_cpu_core_seconds": [float(i % 11) for i in range(rows)],
+                "pod_request_cpu_core_seconds": [float(i % 7) for i in range(rows)],
+                "pod_limit_cpu_core_seconds": [10.0] * rows,
+                "pod_usage_memory_byte_seconds": [float(i % 13) for i in range(rows)],
+                "pod_request_memory_byte_seconds": [float(i % 9) for i in range(rows)],
+                "pod_limit_memory_byte_seconds": [20.0] * rows,
+                "node_capacity_cpu_cores": [float(4 + i % 2) for i in range(rows)],
+                "node_capacity_cpu_core_seconds": [14400.0] * rows,
+                "node_capacity_memory_bytes": [8.0] * rows,
+                "node_capacity_memory_byte_seconds": [28800.0] * rows,
+            }
+        )
+        expected = post_processor._generate_daily_data(line_items.copy())
+
+        aggregator = post_processor.get_daily_aggregator()
+        aggregator.max_buffered_rows = 10
+        for chunk_start in range(0, rows, 40):
+            aggregator.add(post_processor._generate_daily_data(line_items[chunk_start : chunk_start + 40].copy()))
+        (result,) = aggregator.get_data_frames()
+
+        self.assertTrue(result["node_role"].isna().all())
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_single_chunk_is_returned_unchanged(self):
+        """Test that a file with one chunk is not regrouped."""
+        post_processor = AWSPostProcessor(self.schema)
+        daily = post_processor._generate_daily_data(self.aws_line_items(10))
+        aggregator = post_processor.get_daily_aggregator()
+        aggregator.add(daily)
+        aggregator.add(pd.DataFrame())
+        (result,) = aggregator.get_data_frames()
+        self.assertIs(result, daily)
+
+    def test_no_data(self):
+        """Test that nothing is returned when no chunk had data."""
+        aggregator = DailyDataAggregator(["key", "day"], {"cost": ["sum"]})
+        self.assertEqual(aggregator.get_data_frames(), [])
+
+    def test_high_cardinality_compacts_once_per_threshold(self):
+        """Test that a merged frame larger than the threshold does not compact on every chunk."""
+        aggregator = DailyDataAggregator(["key", "day"], {"cost": ["sum"]}, max_buffered_rows=100)
+        chunks = [
+            pd.DataFrame({"key": [f"k{c}_{i}" for i in range(50)], "day": ["2023-06-01"] * 50, "cost": [1.0] * 50})
+            for c in range(20)
+        ]
+        with patch.object(aggregator, "_compact", wraps=aggregator._compact) as mock_compact:
+            for chunk in chunks:
+                aggregator.add(chunk)
+            # every 3 chunks of 50 rows go over 100, the growing compacted frame is not counted again
+            self.assertEqual(mock_compact.call_count, 6)
+            (result,) = aggregator.get_data_frames()
+        self.assertEqual(len(result), 1000)
+        self.assertEqual(result["cost"].sum(), 1000.0)
+
+    def test_unknown_aggregation(self):
+        """Test that aggregations without a combiner are rejected."""
+        with self.assertRaises(ValueError):
+            DailyDataAggregator(["key"], {"cost": ["mean"]})
+
+    def test_passthrough_for_azure(self):
+        """Test that Azure keeps one frame per chunk."""
+        aggregator = AzurePostProcessor(self.schema).get_daily_aggregator()
+        self.assertIsInstance(aggregator, PassthroughDailyAggregator)
+        frames = [pd.DataFrame({"a": [1]}), pd.DataFrame({"a": [2]})]
+        for frame in frames:
+            aggregator.add(frame)
+        self.assertEqual(aggregator.get_data_frames(), frames)
@@ -1,34 +1,100 @@
 import json
 
 import ciso8601
+import numpy as np
 import pandas as pd
 
 from masu.util.common import create_enabled_keys
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
+from masu.util.daily_aggregator import DailyDataAggregator
 from reporting.provider.aws.models import AWSEnabledCategoryKeys
 from reporting.provider.aws.models import AWSEnabledTagKeys
 from reporting.provider.aws.models import TRINO_REQUIRED_COLUMNS
 
 
+DAILY_DATE_COLUMN = "lineitem_usagestartdate"
+DAILY_GROUP_BY = [
+    "lineitem_resourceid",
+    DAILY_DATE_COLUMN,
+    "bill_payeraccountid",
+    "lineitem_usageaccountid",
+    "lineitem_legalentity",
+    "lineitem_lineitemdescription",
+    "bill_billingentity",
+    "lineitem_productcode",
+    "lineitem_availabilityzone",
+    "lineitem_lineitemtype",
+    "product_productfamily",
+    "product_instancetype",
+    "product_region",
+    "pricing_unit",
+    "resourcetags",
+    "costcategory",
+]
+DAILY_AGG = {
+    "lineitem_usageamount": ["sum"],
+    "lineitem_normalizationfactor": ["max"],
+    "lineitem_normalizedusageamount": ["sum"],
+    "lineitem_currencycode": ["max"],
+    "lineitem_unblendedrate": ["max"],
+    "lineitem_unblendedcost": ["sum"],
+    "lineitem_blendedrate": ["max"],
+    "lineitem_blendedcost": ["sum"],
+    "pricing_publicondemandcost": ["sum"],
+    "pricing_publicondemandrate": ["max"],
+    "savingsplan_savingsplaneffectivecost": ["sum"],
+    "product_productname": ["max"],
+    "bill_invoiceid": ["max"],
+}
+
+
 def scrub_resource_col_name(res_col_name, column_prefix):
     return res_col_name.replace(column_prefix, "")
 
 
 def handle_user_defined_json_columns(data_frame, columns, column_prefix):
-    """Given a prefix convert multiple dataframe columns into a single json column."""
+    """Given a prefix convert multiple dataframe columns into a single json column.
 
+    The output matches `json.dumps({key: value for key, value in row.items() if value})`
+    per row, but it is built from the column arrays. Only the populated cells of the
+    (usually very sparse) tag matrix are encoded, each distinct value is encoded once,
+    and the per row fragments are concatenated with a single `np.add.reduceat`.
+    """
     columns_of_interest = [column for column in columns if column_prefix in column]
-    unique_keys = {scrub_resource_col_name(column, column_prefix) for column in columns_of_interest}
+    keys = [scrub_resource_col_name(column, column_prefix) for column in columns_of_interest]
+    unique_keys = set(keys)
 
-    df = data_frame[columns_of_interest]
-    column_dict = df.apply(
-        lambda row: {scrub_resource_col_name(column, column_prefix): value for column, value in row.items() if value},
-        axis=1,
-    )
-    column_dict.where(column_dict.notna(), lambda _: [{}], inplace=True)
+    json_column = np.full(len(data_frame), "{}", dtype=object)
+    if columns_of_interest and len(data_frame):
+        values = data_frame[columns_of_interest].to_numpy(dtype=object)
+        # np.nonzero walks the matrix row-major, so fragments stay in column order within a row
+        rows, cols = np.nonzero(values.astype(bool))
+        value_cols = cols
+        if len(rows) and len(unique_keys) < len(keys):
+            # columns scrubbed to the same key: like the dict, a key keeps its first place in the row and its last value
+            key_codes, _ = pd.factorize(np.array(keys, dtype=object))
+            row_keys = pd.Series(rows * len(keys) + key_codes[cols])
+            last_cell = pd.Series(np.arange(len(rows))).groupby(row_keys).transform("max").to_numpy()
+            first_cell = ~row_keys.duplicated().to_numpy()
+            rows, cols, value_cols = rows[first_cell], cols[first_cell], cols[last_cell[first_cell]]
+        if len(rows):
+            cells = values[rows, value_cols]
+            uniques = pd.unique(cells)
+            encoded = np.array([json.dumps(value) for value in uniques], dtype=object)
+            encoded = encoded[pd.Index(uniques).get_indexer(cells)]
+
+            first_in_row = np.empty(len(rows), dtype=bool)
+            first_in_row[0] = True
+            np.not_equal(rows[1:], rows[:-1], out=first_in_row[1:])
+            first_keys = np.array([f"{{{json.dumps(key)}: " for key in keys], dtype=object)
+            next_keys = np.array([f", {json.dumps(key)}: " for key in keys], dtype=object)
+            fragments = np.where(first_in_row, first_keys[cols], next_keys[cols]) + encoded
+
+            starts = np.flatnonzero(first_in_row)
+            json_column[rows[starts]] = np.add.reduceat(fragments, starts) + "}"
 
-    return column_dict.apply(json.dumps), unique_keys
+    return pd.Series(json_column, index=data_frame.index), unique_keys
 
 
 class AWSPostProcessor:
@@ -266,48 +332,19 @@ class AWSPostProcessor:
         """
         Generate daily data.
         """
-        daily_data_frame = data_frame.groupby(
-            [
-                "lineitem_resourceid",
-                pd.Grouper(key="lineitem_usagestartdate", freq="D"),
-                "bill_payeraccountid",
-                "lineitem_usageaccountid",
-                "lineitem_legalentity",
-                "lineitem_lineitemdescription",
-                "bill_billingentity",
-                "lineitem_productcode",
-                "lineitem_availabilityzone",
-                "lineitem_lineitemtype",
-                "product_productfamily",
-                "product_instancetype",
-                "product_region",
-                "pricing_unit",
-                "resourcetags",
-                "costcategory",
-            ],
-            dropna=False,
-        ).agg(
-            {
-                "lineitem_usageamount": ["sum"],
-                "lineitem_normalizationfactor": ["max"],
-                "lineitem_normalizedusageamount": ["sum"],
-                "lineitem_currencycode": ["max"],
-                "lineitem_unblendedrate": ["max"],
-                "lineitem_unblendedcost": ["sum"],
-                "lineitem_blendedrate": ["max"],
-                "lineitem_blendedcost": ["sum"],
-                "pricing_publicondemandcost": ["sum"],
-                "pricing_publicondemandrate": ["max"],
-                "savingsplan_savingsplaneffectivecost": ["sum"],
-                "product_productname": ["max"],
-                "bill_invoiceid": ["max"],
-            }
-        )
+        group_by = [
+            pd.Grouper(key=column, freq="D") if column == DAILY_DATE_COLUMN else column for column in DAILY_GROUP_BY
+        ]
+        daily_data_frame = data_frame.groupby(group_by, dropna=False).agg(DAILY_AGG)
         columns = daily_data_frame.columns.droplevel(1)
         daily_data_frame.columns = columns
         daily_data_frame.reset_index(inplace=True)
         return daily_data_frame
 
+    def get_daily_aggregator(self):
+        """Return the aggregator that merges daily data across chunks."""
+        return DailyDataAggregator(DAILY_GROUP_BY, DAILY_AGG)
+
     def process_dataframe(self, data_frame):
         """Process dataframe."""
         org_columns = data_frame.columns.unique()
@@ -344,6 +381,11 @@ class AWSPostProcessor:
         data_frame = data_frame.rename(columns=column_name_map)
         return data_frame, self._generate_daily_data(data_frame)
 
+    def merge_enabled_keys(self, other):
+        """Add the keys collected by another post processor, e.g. one that ran in a worker process."""
+        self.enabled_tag_keys.update(other.enabled_tag_keys)
+        self.enabled_categories.update(other.enabled_categories)
+
     def finalize_post_processing(self):
         """
         Uses information gather in the
@@ -5,13 +5,15 @@
 """AWS utility functions."""
 import datetime
 import logging
+import os
 import re
+import threading
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
 
 import boto3
-import pandas as pd
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 from botocore.exceptions import EndpointConnectionError
@@ -24,10 +26,19 @@ from api.provider.models import Provider
 from masu.database.aws_report_db_accessor import AWSReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.util import common as utils
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import contains_any
+from masu.util.ocp.common import endswith_any
+from masu.util.ocp.common import generate_uuids
+from masu.util.ocp.common import match_openshift_tags
+from masu.util.ocp.common import OPENSHIFT_SPECIAL_CASE_TAGS
 
 LOG = logging.getLogger(__name__)
 
+MANIFEST_OBJECT_PREFIX = "manifest-"
+MANIFEST_OBJECT_NAME_REGEX = re.compile(rf"^{MANIFEST_OBJECT_PREFIX}(\d+)_")
+# The most keys S3 accepts in one DeleteObjects request.
+S3_DELETE_BATCH_SIZE = 1000
+
 
 # pylint: disable=too-few-public-methods
 class AwsArn:
@@ -377,18 +388,55 @@ def get_bills_from_provider(provider_uuid, schema, start_date=None, end_date=Non
     return bills
 
 
+_S3_SESSION_LOCK = threading.Lock()
+_S3_SESSIONS = {}
+_S3_THREAD_LOCAL = threading.local()
+
+
+def get_s3_session():
+    """
+    Obtain the boto3 session of this process.
+
+    Creating a session loads the botocore service models, so it is done once per process
+    instead of once per call. Sessions are not shared with forked children.
+    """
+    pid = os.getpid()
+    with _S3_SESSION_LOCK:
+        session = _S3_SESSIONS.get(pid)
+        if session is None:
+            _S3_SESSIONS.clear()
+            session = _S3_SESSIONS[pid] = boto3.Session(
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET,
+                region_name=settings.S3_REGION,
+            )
+    return session
+
+
 def get_s3_resource():  # pragma: no cover
     """
     Obtain the s3 session client
-    """
-    config = Config(connect_timeout=settings.S3_TIMEOUT)
-    aws_session = boto3.Session(
-        aws_access_key_id=settings.S3_ACCESS_KEY,
-        aws_secret_access_key=settings.S3_SECRET,
-        region_name=settings.S3_REGION,
+
+    Resources are not thread safe, so each thread keeps its own, with its own connection
+    pool, built from the process session.
+    """
+    pid = os.getpid()
+    if getattr(_S3_THREAD_LOCAL, "pid", None) != pid:
+        config = Config(connect_timeout=settings.S3_TIMEOUT, max_pool_connections=settings.S3_MULTIPART_CONCURRENCY)
+        session = get_s3_session()
+        with _S3_SESSION_LOCK:
+            _S3_THREAD_LOCAL.resource = session.resource("s3", endpoint_url=settings.S3_ENDPOINT, config=config)
+        _S3_THREAD_LOCAL.pid = pid
+    return _S3_THREAD_LOCAL.resource
+
+
+def get_s3_transfer_config():
+    """Multipart settings for uploads."""
+    return TransferConfig(
+        multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+        multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+        max_concurrency=settings.S3_MULTIPART_CONCURRENCY,
     )
-    s3_resource = aws_session.resource("s3", endpoint_url=settings.S3_ENDPOINT, config=config)
-    return s3_resource
 
 
 def copy_data_to_s3_bucket(request_id, path, filename, data, manifest_id=None, context={}):
@@ -404,7 +452,7 @@ def copy_data_to_s3_bucket(request_id, path, filename, data, manifest_id=None, c
         s3_resource = get_s3_resource()
         s3_obj = {"bucket_name": settings.S3_BUCKET_NAME, "key": upload_key}
         upload = s3_resource.Object(**s3_obj)
-        upload.upload_fileobj(data, ExtraArgs=extra_args)
+        upload.upload_fileobj(data, ExtraArgs=extra_args, Config=get_s3_transfer_config())
     except (EndpointConnectionError, ClientError) as err:
         msg = f"Unable to copy data to {upload_key} in bucket {settings.S3_BUCKET_NAME}.  Reason: {str(err)}"
         LOG.info(log_json(request_id, msg=msg, context=context))
@@ -412,17 +460,100 @@ def copy_data_to_s3_bucket(request_id, path, filename, data, manifest_id=None, c
 
 
 def copy_local_report_file_to_s3_bucket(
-    request_id, s3_path, full_file_path, local_filename, manifest_id, start_date, context={}
+    request_id, s3_path, full_file_path, local_filename, manifest_id, start_date, context={}, uploads=None
 ):
     """
     Copies local report file to s3 bucket
+
+    When an S3UploadPipeline is given the upload runs in the background and is
+    complete once the pipeline is flushed.
     """
     if s3_path:
         LOG.info(f"copy_local_report_file_to_s3_bucket: {s3_path} {full_file_path}")
+        if uploads is not None:
+            uploads.upload_file(s3_path, full_file_path, local_filename, manifest_id)
+            return
         with open(full_file_path, "rb") as fin:
             copy_data_to_s3_bucket(request_id, s3_path, local_filename, fin, manifest_id, context)
 
 
+class S3UploadPipeline:
+    """
+    Upload local files to S3 in background threads.
+
+    `upload_file` returns as soon as the upload is queued so the caller can prepare the
+    next file while the previous one uploads. `flush` is the barrier: it waits for every
+    queued upload and returns whether all of them succeeded. Files must not be removed
+    before they are flushed.
+    """
+
+    def __init__(self, request_id, context=None, max_workers=None):
+        self.request_id = request_id
+        self.context = context or {}
+        self.max_workers = settings.S3_UPLOAD_THREADS if max_workers is None else max_workers
+        self._executor = None
+        self._pending = []
+        self._failed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        """Threads do not survive pickling, a copy starts with an empty pipeline."""
+        state = self.__dict__.copy()
+        state.update({"_executor": None, "_pending": [], "_failed": []})
+        return state
+
+    def _upload(self, s3_path, file_path, file_name, manifest_id):
+        with open(file_path, "rb") as fin:
+            copy_data_to_s3_bucket(
+                self.request_id, s3_path, file_name, fin, manifest_id=manifest_id, context=self.context
+            )
+        msg = f"{file_path} sent to S3."
+        LOG.info(log_json(self.request_id, msg=msg, context=self.context))
+
+    def upload_file(self, s3_path, file_path, file_name, manifest_id=None):
+        """Queue the upload of a local file to s3_path/file_name."""
+        if not self.max_workers:
+            try:
+                self._upload(s3_path, file_path, file_name, manifest_id)
+            except Exception as err:
+                self._log_failure(s3_path, file_name, err)
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="s3-upload")
+        future = self._executor.submit(self._upload, s3_path, file_path, file_name, manifest_id)
+        self._pending.append((s3_path, file_name, future))
+
+    def _log_failure(self, s3_path, file_name, err):
+        msg = f"File {file_name} could not be written to S3 {s3_path}. Reason: {str(err)}"
+        LOG.warn(log_json(self.request_id, msg=msg, context=self.context))
+        self._failed.append(f"{s3_path}/{file_name}")
+
+    def flush(self):
+        """Wait for the queued uploads and return whether all uploads since the last flush succeeded."""
+        for s3_path, file_name, future in self._pending:
+            try:
+                future.result()
+            except Exception as err:
+                self._log_failure(s3_path, file_name, err)
+        self._pending = []
+        success = not self._failed
+        self._failed = []
+        return success
+
+    def close(self):
+        """Flush and stop the upload threads."""
+        success = self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        return success
+
+
 def copy_hcs_data_to_s3_bucket(request_id, path, filename, data, finalize=False, context={}):
     """
     Copies HCS data to s3 bucket location
@@ -435,43 +566,62 @@ def copy_hcs_data_to_s3_bucket(request_id, path, filename, data, finalize=False,
         s3_resource = get_s3_resource()
         s3_obj = {"bucket_name": settings.S3_BUCKET_NAME, "key": upload_key}
         upload = s3_resource.Object(**s3_obj)
-        upload.upload_fileobj(data, ExtraArgs=extra_args)
+        upload.upload_fileobj(data, ExtraArgs=extra_args, Config=get_s3_transfer_config())
     except (EndpointConnectionError, ClientError) as err:
         msg = f"Unable to copy data to {upload_key} in bucket {settings.S3_BUCKET_NAME}.  Reason: {str(err)}"
         LOG.info(log_json(request_id, msg=msg, context=context))
     return upload
 
 
-def copy_local_hcs_report_file_to_s3_bucket(
-    request_id, s3_path, full_file_path, local_filename, finalize=False, context={}
-):
+def get_manifest_object_name(file_name, manifest_id):
     """
-    Copies local report file to s3 bucket
+    Prefix an S3 object name with the manifest that wrote it.
+
+    remove_files_not_in_set_from_s3_bucket reads the manifest from the key of such
+    objects instead of requesting their metadata one by one.
     """
-    if s3_path and settings.ENABLE_S3_ARCHIVING:
-        LOG.info(f"copy_local_HCS_report_file_to_s3_bucket: {s3_path} {full_file_path}")
-        with open(full_file_path, "rb") as fin:
-            copy_hcs_data_to_s3_bucket(request_id, s3_path, local_filename, fin, finalize, context)
+    if not manifest_id:
+        return file_name
+    return f"{MANIFEST_OBJECT_PREFIX}{manifest_id}_{file_name}"
+
+
+def get_manifest_id_from_key(key):
+    """Return the manifest id encoded in an S3 key as a string, or None for keys without one."""
+    match = MANIFEST_OBJECT_NAME_REGEX.match(key.rsplit("/", 1)[-1])
+    return match.group(1) if match else None
 
 
 def remove_files_not_in_set_from_s3_bucket(request_id, s3_path, manifest_id, context={}):
     """
     Removes all files in a given prefix if they are not within the given set.
+
+    Objects named with get_manifest_object_name are matched from a single listing. Objects
+    uploaded before manifests were part of the key fall back to a HEAD request for their
+    ManifestId metadata; they are replaced by manifest named objects the next time their
+    prefix is processed, so the fallback dies out on its own. Deletes are sent in batches.
     """
     removed = []
     if s3_path:
+        manifest_id_str = str(manifest_id)
         try:
             s3_resource = get_s3_resource()
-            existing_objects = s3_resource.Bucket(settings.S3_BUCKET_NAME).objects.filter(Prefix=s3_path)
-            for obj_summary in existing_objects:
-                existing_object = obj_summary.Object()
-                metadata = existing_object.metadata
-                manifest = metadata.get("manifestid")
-                manifest_id_str = str(manifest_id)
-                key = existing_object.key
+            bucket = s3_resource.Bucket(settings.S3_BUCKET_NAME)
+            keys_to_remove = []
+            for obj_summary in bucket.objects.filter(Prefix=s3_path):
+                key = obj_summary.key
+                manifest = get_manifest_id_from_key(key)
+                if manifest is None and manifest_id:
+                    manifest = obj_summary.Object().metadata.get("manifestid")
                 if manifest != manifest_id_str:
-                    s3_resource.Object(settings.S3_BUCKET_NAME, key).delete()
-                    removed.append(key)
+                    keys_to_remove.append(key)
+            for i in range(0, len(keys_to_remove), S3_DELETE_BATCH_SIZE):
+                batch = keys_to_remove[i : i + S3_DELETE_BATCH_SIZE]
+                response = bucket.delete_objects(Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True})
+                errors = {error.get("Key"): error.get("Message") for error in response.get("Errors", [])}
+                if errors:
+                    msg = f"Unable to remove files from s3 bucket {settings.S3_BUCKET_NAME}: {errors}."
+                    LOG.info(log_json(request_id, msg=msg, context=context))
+                removed.extend(key for key in batch if key not in errors)
             if removed:
                 msg = f"Removed files from s3 bucket {settings.S3_BUCKET_NAME}: {','.join(removed)}."
                 LOG.info(log_json(request_id, msg=msg, context=context))
@@ -486,46 +636,20 @@ def match_openshift_resources_and_labels(data_frame, cluster_topologies, matched
     resource_ids = chain.from_iterable(
         cluster_topology.get("resource_ids", []) for cluster_topology in cluster_topologies
     )
-    resource_ids = tuple(resource_ids)
     resource_id_df = data_frame["lineitem_resourceid"]
 
     LOG.info("Matching OpenShift on AWS by resource ID.")
-    resource_id_matched = resource_id_df.str.endswith(resource_ids)
-    data_frame["resource_id_matched"] = resource_id_matched
+    data_frame["resource_id_matched"] = endswith_any(resource_id_df, resource_ids)
 
     tags = data_frame["resourcetags"]
     tags = tags.str.lower()
 
-    special_case_tag_matched = tags.str.contains(
-        "|".join(["openshift_cluster", "openshift_project", "openshift_node"])
-    )
-    data_frame["special_case_tag_matched"] = special_case_tag_matched
+    data_frame["special_case_tag_matched"] = contains_any(tags, OPENSHIFT_SPECIAL_CASE_TAGS)
 
     if matched_tags:
-        tag_keys = []
-        tag_values = []
-        for tag in matched_tags:
-            tag_keys.extend(list(tag.keys()))
-            tag_values.extend(list(tag.values()))
-
-        tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
-        data_frame["tag_matched"] = tag_matched
-        any_tag_matched = tag_matched.any()
-
-        if any_tag_matched:
-            tag_df = pd.concat([tags, tag_matched], axis=1)
-            tag_df.columns = ("tags", "tag_matched")
-            tag_subset = tag_df[tag_df.tag_matched == True].tags  # noqa: E712
-
-            LOG.info("Matching OpenShift on AWS tags.")
-
-            matched_tag = tag_subset.apply(match_openshift_labels, args=(matched_tags,))
-            data_frame["matched_tag"] = matched_tag
-            data_frame["matched_tag"].fillna(value="", inplace=True)
-        else:
-            data_frame["matched_tag"] = ""
+        LOG.info("Matching OpenShift on AWS tags.")
+        data_frame["matched_tag"] = match_openshift_tags(tags, matched_tags)
     else:
-        data_frame["tag_matched"] = False
         data_frame["matched_tag"] = ""
     openshift_matched_data_frame = data_frame[
         (data_frame["resource_id_matched"] == True)  # noqa: E712
@@ -533,9 +657,7 @@ def match_openshift_resources_and_labels(data_frame, cluster_topologies, matched
         | (data_frame["matched_tag"] != "")  # noqa: E712
     ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
-    openshift_matched_data_frame = openshift_matched_data_frame.drop(
-        columns=["special_case_tag_matched", "tag_matched"]
-    )
+    openshift_matched_data_frame["uuid"] = generate_uuids(len(openshift_matched_data_frame))
+    openshift_matched_data_frame = openshift_matched_data_frame.drop(columns=["special_case_tag_matched"])
 
     return openshift_matched_data_frame
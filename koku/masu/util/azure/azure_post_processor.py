@@ -6,6 +6,7 @@ from numpy import nan
 from masu.util.common import create_enabled_keys
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
+from masu.util.daily_aggregator import PassthroughDailyAggregator
 from reporting.provider.azure.models import AzureEnabledTagKeys
 from reporting.provider.azure.models import TRINO_COLUMNS
 
@@ -150,6 +151,10 @@ class AzurePostProcessor:
         """
         return data_frame
 
+    def get_daily_aggregator(self):
+        """Azure daily data is the line item data, so it is not aggregated."""
+        return PassthroughDailyAggregator()
+
     def process_dataframe(self, data_frame):
         columns = list(data_frame)
         column_name_map = {}
@@ -172,6 +177,10 @@ class AzurePostProcessor:
         self.enabled_tag_keys.update(unique_tags)
         return data_frame, self._generate_daily_data(data_frame)
 
+    def merge_enabled_keys(self, other):
+        """Add the keys collected by another post processor, e.g. one that ran in a worker process."""
+        self.enabled_tag_keys.update(other.enabled_tag_keys)
+
     def finalize_post_processing(self):
         """
         Uses information gather in the post processing to update the cost models.
@@ -6,17 +6,18 @@
 import datetime
 import logging
 import re
-import uuid
 from enum import Enum
 from itertools import chain
 
-import pandas as pd
 from django_tenants.utils import schema_context
 
 from api.models import Provider
 from masu.database.azure_report_db_accessor import AzureReportDBAccessor
 from masu.database.provider_db_accessor import ProviderDBAccessor
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import contains_any
+from masu.util.ocp.common import generate_uuids
+from masu.util.ocp.common import match_openshift_tags
+from masu.util.ocp.common import OPENSHIFT_SPECIAL_CASE_TAGS
 
 LOG = logging.getLogger(__name__)
 
@@ -120,42 +121,17 @@ def match_openshift_resources_and_labels(data_frame, cluster_topologies, matched
         resource_id_df = data_frame["instanceid"]
 
     LOG.info("Matching OpenShift on Azure by resource ID.")
-    resource_id_matched = resource_id_df.str.contains("|".join(matchable_resources))
-    data_frame["resource_id_matched"] = resource_id_matched
+    data_frame["resource_id_matched"] = contains_any(resource_id_df, matchable_resources)
 
     tags = data_frame["tags"]
     tags = tags.str.lower()
 
-    special_case_tag_matched = tags.str.contains(
-        "|".join(["openshift_cluster", "openshift_project", "openshift_node"])
-    )
-    data_frame["special_case_tag_matched"] = special_case_tag_matched
+    data_frame["special_case_tag_matched"] = contains_any(tags, OPENSHIFT_SPECIAL_CASE_TAGS)
 
     if matched_tags:
-        tag_keys = []
-        tag_values = []
-        for tag in matched_tags:
-            tag_keys.extend(list(tag.keys()))
-            tag_values.extend(list(tag.values()))
-
-        tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
-        data_frame["tag_matched"] = tag_matched
-        any_tag_matched = tag_matched.any()
-
-        if any_tag_matched:
-            tag_df = pd.concat([tags, tag_matched], axis=1)
-            tag_df.columns = ("tags", "tag_matched")
-            tag_subset = tag_df[tag_df.tag_matched == True].tags  # noqa: E712
-
-            LOG.info("Matching OpenShift on Azure tags.")
-
-            matched_tag = tag_subset.apply(match_openshift_labels, args=(matched_tags,))
-            data_frame["matched_tag"] = matched_tag
-            data_frame["matched_tag"].fillna(value="", inplace=True)
-        else:
-            data_frame["matched_tag"] = ""
+        LOG.info("Matching OpenShift on Azure tags.")
+        data_frame["matched_tag"] = match_openshift_tags(tags, matched_tags)
     else:
-        data_frame["tag_matched"] = False
         data_frame["matched_tag"] = ""
 
     openshift_matched_data_frame = data_frame[
@@ -164,9 +140,7 @@ def match_openshift_resources_and_labels(data_frame, cluster_topologies, matched
         | (data_frame["matched_tag"] != "")  # noqa: E712
     ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
-    openshift_matched_data_frame = openshift_matched_data_frame.drop(
-        columns=["special_case_tag_matched", "tag_matched"]
-    )
+    openshift_matched_data_frame["uuid"] = generate_uuids(len(openshift_matched_data_frame))
+    openshift_matched_data_frame = openshift_matched_data_frame.drop(columns=["special_case_tag_matched"])
 
     return openshift_matched_data_frame
@@ -387,14 +387,14 @@ def update_enabled_keys(schema, enabled_keys_model, enabled_keys):
 
 def execute_trino_query(schema_name, sql, params=None):
     """Execute Trino SQL."""
-    connection = trino_db.connect(schema=schema_name)
-    cur = connection.cursor()
-    cur.execute(sql, params=params)
-    results = cur.fetchall()
-    if cur.description is None:
-        columns = []
-    else:
-        columns = [col[0] for col in cur.description]
+    with trino_db.connection(schema=schema_name) as connection:
+        cur = connection.cursor()
+        cur.execute(sql, params=params)
+        results = cur.fetchall()
+        if cur.description is None:
+            columns = []
+        else:
+            columns = [col[0] for col in cur.description]
     return results, columns
 
 
@@ -402,8 +402,9 @@ def trino_table_exists(schema_name, table_name):
     """Given a schema and table name, check for an existing table in Trino."""
     LOG.info(f"Checking for Trino table {schema_name}.{table_name}")
     table_check_sql = f"SHOW TABLES LIKE '{table_name}'"
-    table, _ = execute_trino_query(schema_name, table_check_sql)
-    return bool(table)
+    return trino_db.cached_exists(
+        lambda: execute_trino_query(schema_name, table_check_sql)[0], schema_name, table_name
+    )
 
 
 def convert_account(account):
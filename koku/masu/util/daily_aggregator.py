@@ -0,0 +1,90 @@
+#
+# Copyright 2023 Red Hat Inc.
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Merge per chunk daily data frames into a single daily aggregate."""
+import pandas as pd
+from django.conf import settings
+
+# How partial results of each aggregation are combined with each other.
+COMBINERS = {"sum": "sum", "max": "max", "min": "min", "count": "sum"}
+
+
+class DailyDataAggregator:
+    """Incrementally merge the daily data produced by a post processor.
+
+    Post processors group one `PARQUET_PROCESSING_BATCH_SIZE` chunk at a time. The
+    partial results are grouped again on the same keys (the day column included)
+    with the combiner of each aggregation, so the final frame is the same as grouping
+    the whole file at once. Partials are buffered and compacted whenever more than
+    `max_buffered_rows` rows were added since the last compaction, so memory is bounded
+    by the number of daily groups instead of the file size, and a compacted frame larger
+    than the threshold does not trigger a compaction on every chunk.
+    """
+
+    def __init__(self, group_by, agg, max_buffered_rows=None):
+        """Initialize the aggregator.
+
+        Args:
+            group_by (list): Columns of the daily frame that identify a group, including the day column
+            agg (dict): column -> aggregation, e.g. {"cost": ["sum"]}, as used to build the daily frame
+            max_buffered_rows (int): Compact once more rows than this are buffered
+        """
+        self.group_by = list(group_by)
+        self.combiners = {}
+        for column, how in agg.items():
+            how = how[0] if isinstance(how, (list, tuple)) else how
+            if how not in COMBINERS:
+                raise ValueError(f"No combiner for aggregation {how} on column {column}.")
+            self.combiners[column] = COMBINERS[how]
+        self.max_buffered_rows = max_buffered_rows or settings.PARQUET_PROCESSING_BATCH_SIZE
+        self._frames = []
+        self._buffered_rows = 0
+        self._columns = None
+
+    def add(self, data_frame):
+        """Add the daily frame of one chunk."""
+        if data_frame is None or data_frame.empty:
+            return
+        if self._columns is None:
+            self._columns = list(data_frame.columns)
+        self._frames.append(data_frame)
+        self._buffered_rows += len(data_frame)
+        if len(self._frames) > 1 and self._buffered_rows > self.max_buffered_rows:
+            self._compact()
+
+    def _compact(self):
+        """Merge the buffered frames into one."""
+        frame = pd.concat(self._frames, ignore_index=True)
+        agg_columns = [col for col in self._columns if col in self.combiners and col not in self.group_by]
+        # Columns that were filled with None (e.g. new_required_columns) can not be combined; keep them null.
+        null_columns = [col for col in agg_columns if frame[col].isna().all()]
+        combine = {col: self.combiners[col] for col in agg_columns if col not in null_columns}
+        merged = frame.groupby(self.group_by, dropna=False).agg(combine).reset_index()
+        for col in null_columns:
+            merged[col] = None
+        merged = merged.reindex(columns=self._columns)
+        self._frames = [merged]
+        self._buffered_rows = 0
+
+    def get_data_frames(self):
+        """Return the merged daily data as a list holding at most one frame."""
+        if len(self._frames) > 1:
+            self._compact()
+        return list(self._frames)
+
+
+class PassthroughDailyAggregator:
+    """Keep each chunk's daily frame as is, for providers without daily aggregation."""
+
+    def __init__(self):
+        """Initialize the aggregator."""
+        self._frames = []
+
+    def add(self, data_frame):
+        """Add the daily frame of one chunk."""
+        self._frames.append(data_frame)
+
+    def get_data_frames(self):
+        """Return every frame that was added."""
+        return list(self._frames)
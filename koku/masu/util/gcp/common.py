@@ -5,7 +5,6 @@
 """GCP utility functions and vars."""
 import datetime
 import logging
-import uuid
 
 import pandas as pd
 from django_tenants.utils import schema_context
@@ -14,7 +13,10 @@ from api.models import Provider
 from masu.database.provider_db_accessor import ProviderDBAccessor
 from masu.external.accounts_accessor import AccountsAccessor
 from masu.processor import is_gcp_resource_matching_disabled
-from masu.util.ocp.common import match_openshift_labels
+from masu.util.ocp.common import contains_any
+from masu.util.ocp.common import generate_uuids
+from masu.util.ocp.common import match_openshift_tags
+from masu.util.ocp.common import OPENSHIFT_SPECIAL_CASE_TAGS
 from reporting.provider.gcp.models import GCPCostEntryBill
 
 LOG = logging.getLogger(__name__)
@@ -83,13 +85,13 @@ def match_openshift_resources_and_labels(data_frame, cluster_topologies, matched
 
         if resource_id_df.any():
             LOG.info("Matching OpenShift on GCP by resource ID.")
-            ocp_matched = resource_id_df.str.contains("|".join(matchable_resources))
+            ocp_matched = contains_any(resource_id_df, matchable_resources)
         else:
             LOG.info("Matching OpenShift on GCP by labels.")
             cluster_strings = [
                 f"kubernetes-io-cluster-{cluster_identifier}" for cluster_identifier in (cluster_id, cluster_alias)
             ]
-            ocp_matched = tags.str.contains("|".join(cluster_strings))
+            ocp_matched = contains_any(tags, cluster_strings)
 
         # Add in OCP Cluster these resources matched to
         data_frame[match_col_name] = ocp_matched
@@ -103,41 +105,12 @@ def match_openshift_resources_and_labels(data_frame, cluster_topologies, matched
     data_frame = data_frame.drop(columns=match_columns)
     data_frame["ocp_source_uuid"].fillna(value="", inplace=True)
 
-    special_case_tag_matched = tags.str.contains(
-        "|".join(
-            [
-                "openshift_cluster",
-                "openshift_project",
-                "openshift_node",
-            ]
-        )
-    )
-    data_frame["special_case_tag_matched"] = special_case_tag_matched
+    data_frame["special_case_tag_matched"] = contains_any(tags, OPENSHIFT_SPECIAL_CASE_TAGS)
+
     if matched_tags:
-        tag_keys = []
-        tag_values = []
-        for tag in matched_tags:
-            tag_keys.extend(list(tag.keys()))
-            tag_values.extend(list(tag.values()))
-
-        tag_matched = tags.str.contains("|".join(tag_keys)) & tags.str.contains("|".join(tag_values))
-        data_frame["tag_matched"] = tag_matched
-        any_tag_matched = tag_matched.any()
-
-        if any_tag_matched:
-            tag_df = pd.concat([tags, tag_matched], axis=1)
-            tag_df.columns = ("tags", "tag_matched")
-            tag_subset = tag_df[tag_df.tag_matched == True].tags  # noqa: E712
-
-            LOG.info("Matching OpenShift on GCP tags.")
-
-            matched_tag = tag_subset.apply(match_openshift_labels, args=(matched_tags,))
-            data_frame["matched_tag"] = matched_tag
-            data_frame["matched_tag"].fillna(value="", inplace=True)
-        else:
-            data_frame["matched_tag"] = ""
+        LOG.info("Matching OpenShift on GCP tags.")
+        data_frame["matched_tag"] = match_openshift_tags(tags, matched_tags)
     else:
-        data_frame["tag_matched"] = False
         data_frame["matched_tag"] = ""
     openshift_matched_data_frame = data_frame[
         (data_frame["ocp_matched"] == True)  # noqa: E712
@@ -145,10 +118,8 @@ def match_openshift_resources_and_labels(data_frame, cluster_topologies, matched
         | (data_frame["matched_tag"] != "")  # noqa: E712
     ]
 
-    openshift_matched_data_frame["uuid"] = openshift_matched_data_frame.apply(lambda _: str(uuid.uuid4()), axis=1)
-    openshift_matched_data_frame = openshift_matched_data_frame.drop(
-        columns=["special_case_tag_matched", "tag_matched"]
-    )
+    openshift_matched_data_frame["uuid"] = generate_uuids(len(openshift_matched_data_frame))
+    openshift_matched_data_frame = openshift_matched_data_frame.drop(columns=["special_case_tag_matched"])
 
     return openshift_matched_data_frame
 
@@ -8,10 +8,37 @@ import pandas as pd
 from masu.util.common import create_enabled_keys
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
+from masu.util.daily_aggregator import DailyDataAggregator
 from reporting.provider.gcp.models import GCPEnabledTagKeys
 
 LOG = logging.getLogger(__name__)
 
+DAILY_DATE_COLUMN = "usage_start_time"
+DAILY_GROUP_BY = [
+    "invoice_month",
+    "billing_account_id",
+    "project_id",
+    DAILY_DATE_COLUMN,
+    "service_id",
+    "sku_id",
+    "system_labels",
+    "labels",
+    "cost_type",
+    "location_region",
+    "resource_name",
+]
+DAILY_AGG = {
+    "project_name": ["max"],
+    "service_description": ["max"],
+    "sku_description": ["max"],
+    "usage_pricing_unit": ["max"],
+    "usage_amount_in_pricing_units": ["sum"],
+    "currency": ["max"],
+    "cost": ["sum"],
+    "daily_credits": ["sum"],
+    "resource_global_name": ["max"],
+}
+
 
 def process_gcp_labels(label_string):
     """Convert the report string to a JSON dictionary.
@@ -137,40 +164,20 @@ class GCPPostProcessor:
             if not resource_df.any():
                 rollup_frame["resource_name"] = ""
                 rollup_frame["resource_global_name"] = ""
-        daily_data_frame = rollup_frame.groupby(
-            [
-                "invoice_month",
-                "billing_account_id",
-                "project_id",
-                pd.Grouper(key="usage_start_time", freq="D"),
-                "service_id",
-                "sku_id",
-                "system_labels",
-                "labels",
-                "cost_type",
-                "location_region",
-                "resource_name",
-            ],
-            dropna=False,
-        ).agg(
-            {
-                "project_name": ["max"],
-                "service_description": ["max"],
-                "sku_description": ["max"],
-                "usage_pricing_unit": ["max"],
-                "usage_amount_in_pricing_units": ["sum"],
-                "currency": ["max"],
-                "cost": ["sum"],
-                "daily_credits": ["sum"],
-                "resource_global_name": ["max"],
-            }
-        )
+        group_by = [
+            pd.Grouper(key=column, freq="D") if column == DAILY_DATE_COLUMN else column for column in DAILY_GROUP_BY
+        ]
+        daily_data_frame = rollup_frame.groupby(group_by, dropna=False).agg(DAILY_AGG)
         columns = daily_data_frame.columns.droplevel(1)
         daily_data_frame.columns = columns
         daily_data_frame.reset_index(inplace=True)
 
         return daily_data_frame
 
+    def get_daily_aggregator(self):
+        """Return the aggregator that merges daily data across chunks."""
+        return DailyDataAggregator(DAILY_GROUP_BY, DAILY_AGG)
+
     def process_dataframe(self, data_frame):
         """Guarantee column order for GCP parquet files"""
         columns = list(data_frame)
@@ -187,6 +194,10 @@ class GCPPostProcessor:
 
         return data_frame, self._generate_daily_data(data_frame)
 
+    def merge_enabled_keys(self, other):
+        """Add the keys collected by another post processor, e.g. one that ran in a worker process."""
+        self.enabled_tag_keys.update(other.enabled_tag_keys)
+
     def finalize_post_processing(self):
         """
         Uses information gather in the post processing to update the cost models.
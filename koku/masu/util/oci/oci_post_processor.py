@@ -6,9 +6,22 @@ import pandas as pd
 from masu.util.common import create_enabled_keys
 from masu.util.common import safe_float
 from masu.util.common import strip_characters_from_column_name
+from masu.util.daily_aggregator import DailyDataAggregator
 from reporting.provider.oci.models import OCIEnabledTagKeys
 from reporting.provider.oci.models import TRINO_REQUIRED_COLUMNS
 
+DAILY_DATE_COLUMN = "lineitem_intervalusagestart"
+DAILY_GROUP_BY = [
+    "product_resourceid",
+    DAILY_DATE_COLUMN,
+    "lineitem_tenantid",
+    "product_service",
+    "product_region",
+    "tags",
+]
+DAILY_COST_AGG = {"cost_currencycode": ["max"], "cost_mycost": ["sum"]}
+DAILY_USAGE_AGG = {"usage_consumedquantity": ["sum"]}
+
 
 def scrub_resource_col_name(res_col_name):
     return res_col_name.split(".")[-1]
@@ -46,36 +59,23 @@ class OCIPostProcessor:
     def _generate_daily_data(self, data_frame):
         """Given a dataframe, group the data to create daily data."""
 
+        group_by = [
+            pd.Grouper(key=column, freq="D") if column == DAILY_DATE_COLUMN else column for column in DAILY_GROUP_BY
+        ]
         if "cost_mycost" in data_frame:
-            daily_data_frame = data_frame.groupby(
-                [
-                    "product_resourceid",
-                    pd.Grouper(key="lineitem_intervalusagestart", freq="D"),
-                    "lineitem_tenantid",
-                    "product_service",
-                    "product_region",
-                    "tags",
-                ],
-                dropna=False,
-            ).agg({"cost_currencycode": ["max"], "cost_mycost": ["sum"]})
+            daily_data_frame = data_frame.groupby(group_by, dropna=False).agg(DAILY_COST_AGG)
         else:
-            daily_data_frame = data_frame.groupby(
-                [
-                    "product_resourceid",
-                    pd.Grouper(key="lineitem_intervalusagestart", freq="D"),
-                    "lineitem_tenantid",
-                    "product_service",
-                    "product_region",
-                    "tags",
-                ],
-                dropna=False,
-            ).agg({"usage_consumedquantity": ["sum"]})
+            daily_data_frame = data_frame.groupby(group_by, dropna=False).agg(DAILY_USAGE_AGG)
         columns = daily_data_frame.columns.droplevel(1)
         daily_data_frame.columns = columns
         daily_data_frame.reset_index(inplace=True)
 
         return daily_data_frame
 
+    def get_daily_aggregator(self):
+        """Return the aggregator that merges daily data across chunks."""
+        return DailyDataAggregator(DAILY_GROUP_BY, {**DAILY_COST_AGG, **DAILY_USAGE_AGG})
+
     def process_dataframe(self, data_frame):
         """
         Consume the OCI data and add a column creating a dictionary for the oci tags
@@ -110,6 +110,10 @@ class OCIPostProcessor:
         data_frame = data_frame.rename(columns=column_name_map)
         return data_frame, self._generate_daily_data(data_frame)
 
+    def merge_enabled_keys(self, other):
+        """Add the keys collected by another post processor, e.g. one that ran in a worker process."""
+        self.enabled_tag_keys.update(other.enabled_tag_keys)
+
     def finalize_post_processing(self):
         """
         Uses information gather in the post processing to update the cost models.
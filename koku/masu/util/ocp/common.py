@@ -10,6 +10,7 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
+import numpy as np
 import pandas as pd
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
@@ -381,20 +382,108 @@ def detect_type(report_path):
     return None, OCPReportTypes.UNKNOWN
 
 
+# Cloud tags that always mark a line item as OpenShift, whatever the matched tags are
+OPENSHIFT_SPECIAL_CASE_TAGS = ("openshift_cluster", "openshift_project", "openshift_node")
+
+
+def get_matched_tag_index(matched_tags):
+    """Return the set of (key, value) pairs of the single {key: value} dicts in matched_tags."""
+    return {(key, value) for tag in matched_tags if len(tag) == 1 for key, value in tag.items()}
+
+
 def match_openshift_labels(tag_dict, matched_tags):
-    """Match AWS data by OpenShift label associated with OpenShift cluster."""
+    """
+    Match AWS data by OpenShift label associated with OpenShift cluster.
+
+    matched_tags is a list of {key: value} dicts or the set returned by get_matched_tag_index.
+    """
+    if not isinstance(matched_tags, (set, frozenset)):
+        matched_tags = get_matched_tag_index(matched_tags)
     tag_dict = json.loads(tag_dict)
     tag_matches = []
     for key, value in tag_dict.items():
-        if not value:
+        if not value or not isinstance(value, str):
+            # labels are strings, numbers, lists and objects in the tag JSON never match
             continue
-        lower_tag = {key.lower(): value.lower()}
-        if lower_tag in matched_tags:
-            tag = json.dumps(lower_tag).replace("{", "").replace("}", "")
+        lower_key, lower_value = key.lower(), value.lower()
+        if (lower_key, lower_value) in matched_tags:
+            tag = json.dumps({lower_key: lower_value}).replace("{", "").replace("}", "")
             tag_matches.append(tag)
     return ",".join(tag_matches)
 
 
+def match_openshift_tags(tags, matched_tags):
+    """
+    Return the matched OpenShift labels of each tag JSON string in a Series, "" where none match.
+
+    Each distinct tag string is decoded and checked against a set of the matched tags once.
+    """
+    tag_index = get_matched_tag_index(matched_tags)
+    matches = {}
+    if tag_index:
+        for tag in tags.unique():
+            if not isinstance(tag, str) or not tag.startswith("{"):
+                continue
+            try:
+                matches[tag] = match_openshift_labels(tag, tag_index)
+            except ValueError:
+                continue
+    return tags.map(matches).fillna("")
+
+
+def _match_unique(values, match):
+    """Apply match to each distinct string in a Series and map the results back, NaN for non-strings."""
+    matches = {value: match(value) for value in values.unique() if isinstance(value, str)}
+    return values.map(matches)
+
+
+def contains_any(values, substrings):
+    """
+    Return whether each value contains any of the substrings, computed with hash lookups.
+
+    The substrings are matched literally, so node names such as ip-10-0-1-2.ec2.internal only
+    match themselves; a regex alternation would let each "." match any character. They are indexed
+    by length, so each distinct value costs one set lookup per window instead of a scan of every
+    substring at every position. Like str.contains(""), no substrings or an empty one matches
+    every value.
+    """
+    substrings = list(substrings)
+    if not substrings or "" in substrings:
+        # an empty alternative matches every string
+        return _match_unique(values, lambda value: True)
+
+    index = set(substrings)
+    lengths = sorted({len(substring) for substring in index})
+
+    def match(value):
+        return any(
+            value[start : start + length] in index for length in lengths for start in range(len(value) - length + 1)
+        )
+
+    return _match_unique(values, match)
+
+
+def endswith_any(values, suffixes):
+    """Return values.str.endswith(tuple(suffixes)) computed with one set lookup per suffix length."""
+    index = set(suffixes)
+    if "" in index:
+        return _match_unique(values, lambda value: True)
+    lengths = sorted({len(suffix) for suffix in index})
+    return _match_unique(values, lambda value: any(value[-length:] in index for length in lengths))
+
+
+def generate_uuids(count):
+    """Return count random (version 4) UUID strings generated from one block of random bytes."""
+    raw = np.frombuffer(os.urandom(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    digits = raw.tobytes().hex()
+    return [
+        "-".join((d[:8], d[8:12], d[12:16], d[16:20], d[20:]))
+        for d in (digits[i : i + 32] for i in range(0, len(digits), 32))
+    ]
+
+
 def get_amortized_monthly_cost_model_rate(monthly_rate, start_date):
     """Given a monthly rate, determine the per-day amortized rate."""
     if monthly_rate is None:
@@ -8,6 +8,7 @@ from dateutil.parser import ParserError
 
 from masu.util.common import create_enabled_keys
 from masu.util.common import safe_float
+from masu.util.daily_aggregator import DailyDataAggregator
 from masu.util.ocp.common import OCP_REPORT_TYPES
 from reporting.provider.ocp.models import OCPEnabledTagKeys
 
@@ -146,6 +147,12 @@ class OCPPostProcessor:
 
         return daily_data_frame
 
+    def get_daily_aggregator(self):
+        """Return the aggregator that merges daily data across chunks."""
+        report = self.ocp_report_types.get(self.report_type, {})
+        group_bys = report.get("group_by", []) + ["interval_start"]
+        return DailyDataAggregator(group_bys, report.get("agg", {}))
+
     def process_dataframe(self, data_frame):
         label_columns = {"pod_labels", "volume_labels", "namespace_labels", "node_labels"}
         df_columns = set(data_frame.columns)
@@ -158,6 +165,10 @@ class OCPPostProcessor:
         self.enabled_tag_keys.update(label_key_set)
         return data_frame, self._generate_daily_data(data_frame)
 
+    def merge_enabled_keys(self, other):
+        """Add the keys collected by another post processor, e.g. one that ran in a worker process."""
+        self.enabled_tag_keys.update(other.enabled_tag_keys)
+
     def finalize_post_processing(self):
         """
         Uses information gather in the post processing to update the cost models.